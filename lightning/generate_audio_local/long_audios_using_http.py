@@ -1,19 +1,25 @@
-import io
+import argparse
+import asyncio
+import hashlib
 import json
+import os
+import random
+import re
+import struct
 import time
-import argparse
 from datetime import datetime, timezone
-import requests
-from pydub import AudioSegment
-import re
+
+import aiohttp
 
 # Configuration constants
 TOKEN = "your_token_here"  # Replace with your token ID
 SAMPLE_RATE = 24000  # Sample rate of the audio that you wish to generate
 SPEED = 1.0  # Speed of the audio that you wish to generate
 MODEL = "lightning"  # Choose from either one of - 1. lightning 2. thunder
-TIMEOUT = 2  # Timeout in seconds for receiving a message
-CLOSE_CONNECTION_TIMEOUT = 500  # Timeout for your websocket connection
+REQUEST_TIMEOUT = 60  # Timeout in seconds for a single sentence request
+CONCURRENCY = 8  # Number of sentences synthesized at the same time
+MAX_RETRIES = 5  # Attempts per sentence before the job gives up
+RETRY_BASE_DELAY = 0.5  # Seconds, doubled on every retry and jittered
 URL = "https://waves-api.smallest.ai/api/v1/lightning/get_speech"
 HEADERS = {
     "Authorization": f"Bearer {TOKEN}",
@@ -22,97 +28,147 @@ HEADERS = {
 
 SAMPLE_WIDTH = 2
 CHANNELS = 1
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
 
-def fetch_audio(sentence, voice_id):
-    """Fetch audio for a given sentence and voice ID using the REST API.
 
-    Args:
-        sentence (str): Text to convert to speech.
-        voice_id (str): Voice ID for TTS.
+class SynthesisError(Exception):
+    pass
 
-    Returns:
-        bytes: Audio bytes for the given sentence.
-    """
-    payload = {
+
+def build_payload(sentence, voice_id):
+    return {
         "text": sentence,
         "voice_id": voice_id,
         "sample_rate": SAMPLE_RATE,
         "speed": SPEED,
+        "add_wav_header": False,
         "transliterate": False
     }
-    
-    start_time = time.time()
-    response = requests.post(URL, json=payload, headers=HEADERS)
-    
-    if response.status_code == 200:
-        latency = (time.time() - start_time) * 1000  # Convert to ms
-        print(f"Audio received! Status: {response.status_code}, Latency: {int(latency)} ms")
-        return response.content
-    else:
-        print(f"Error occurred: Status {response.status_code}, Message: {response.text}")
-        return b""
 
 
-def concatenate_audio(sentences_voices):
-    """Concatenate audio data for all sentences and voices.
+async def fetch_audio(session, sentence, voice_id):
+    """Fetch audio for a given sentence and voice ID using the REST API, retrying transient failures.
 
     Args:
-        sentences_voices (list): List of tuples containing sentence and voice ID.
+        session (aiohttp.ClientSession): Shared session, so connections are kept alive between sentences.
+        sentence (str): Text to convert to speech.
+        voice_id (str): Voice ID for TTS.
 
     Returns:
-        bytes: Concatenated audio bytes.
+        bytes: Raw PCM audio bytes for the given sentence.
     """
-    concatenated_audio = AudioSegment.silent(duration=0)
-    
-    for sentence, voice_id in sentences_voices:
-        audio_data = fetch_audio(sentence, voice_id)
-        if audio_data:
-            audio_segment = AudioSegment(data=audio_data, sample_width=SAMPLE_WIDTH, frame_rate=SAMPLE_RATE, channels=CHANNELS)
-            concatenated_audio += audio_segment
-    
-    return concatenated_audio.raw_data
-
-
-def save_audio_file(audio_data, filename="waves_demo_streaming.wav"):
-    """Save concatenated audio data to a WAV file with headers.
+    payload = build_payload(sentence, voice_id)
+    for attempt in range(1, MAX_RETRIES + 1):
+        start_time = time.time()
+        try:
+            async with session.post(URL, json=payload, headers=HEADERS) as response:
+                if response.status == 200:
+                    audio_data = await response.read()
+                    latency = (time.time() - start_time) * 1000  # Convert to ms
+                    print(f"Audio received! Status: {response.status}, Latency: {int(latency)} ms")
+                    return audio_data
+                message = await response.text()
+                if response.status not in RETRYABLE_STATUSES:
+                    raise SynthesisError(f"Status {response.status}, Message: {message}")
+                error = f"Status {response.status}, Message: {message}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = repr(e)
+        if attempt == MAX_RETRIES:
+            raise SynthesisError(f"Giving up after {MAX_RETRIES} attempts: {error}")
+        # exponential backoff with full jitter, so retries of many sentences don't line up
+        delay = random.uniform(0, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        print(f"Error occurred: {error}. Retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+
+def part_path(parts_dir, index, sentence, voice_id):
+    """Path of the finished audio of one sentence. The name depends on everything that affects the
+    audio, so a changed input file never reuses stale parts."""
+    key = json.dumps([URL, build_payload(sentence, voice_id)], sort_keys=True)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(parts_dir, f"{index:06d}_{digest}.pcm")
+
+
+async def render_sentence(session, semaphore, sentence, voice_id, path):
+    if os.path.exists(path):
+        return path
+    async with semaphore:
+        audio_data = await fetch_audio(session, sentence, voice_id)
+    # write then rename, so a crash never leaves a truncated part behind
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(audio_data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def wav_header(data_size, sample_rate=SAMPLE_RATE, sample_width=SAMPLE_WIDTH, channels=CHANNELS):
+    """Build a 44 byte PCM WAV header for `data_size` bytes of audio."""
+    byte_rate = sample_rate * sample_width * channels
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, sample_width * channels, sample_width * 8,
+        b"data", data_size,
+    )
 
-    Args:
-        audio_data (bytes): Concatenated audio data.
-        filename (str): Name of the output file.
-    """
-    audio_data_with_header = add_wav_header(audio_data, sample_rate=SAMPLE_RATE)
-    with open(filename, "wb") as f:
-        f.write(audio_data_with_header)
-    print(f"Audio file saved as {filename} at {datetime.now(timezone.utc)}")
 
+async def render_to_wav(sentences_voices, filename, concurrency=CONCURRENCY):
+    """Synthesize all sentences concurrently and write their audio, in order, to a WAV file.
 
-def add_wav_header(frame_input, sample_rate=24000, sample_width=2, channels=1):
-    """Ensure the WAV file is encoded with standard settings.
+    Each sentence's audio is stored in a parts directory next to the output as soon as it arrives, so a
+    restarted job only requests the sentences that are missing. The output file is written
+    sequentially while later sentences are still being synthesized: a placeholder header first, then
+    every sentence's PCM as soon as all sentences before it are done, and finally the real header.
 
     Args:
-        frame_input (bytes): Audio bytes.
-        sample_rate (int, optional): Sample rate needed. Defaults to 24000.
-        sample_width (int, optional): Sample width of audio. Defaults to 2.
-        channels (int, optional): Channels of the audio. Defaults to 1.
+        sentences_voices (list): List of tuples containing sentence and voice ID.
+        filename (str): Name of the output file.
+        concurrency (int): Maximum number of requests in flight.
 
     Returns:
-        bytes: Audio data with proper header.
+        int: Number of bytes of audio written.
     """
-    audio = AudioSegment(data=frame_input, sample_width=sample_width, frame_rate=sample_rate, channels=channels)
-    wav_buf = io.BytesIO()
-    audio.export(wav_buf, format="wav")
-    wav_buf.seek(0)
-    return wav_buf.read()
+    parts_dir = filename + ".parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    paths = [part_path(parts_dir, i, sentence, voice_id) for i, (sentence, voice_id) in enumerate(sentences_voices)]
+    missing = sum(1 for path in paths if not os.path.exists(path))
+    print(f"{len(paths) - missing} of {len(paths)} sentences already rendered, synthesizing {missing}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    data_size = 0
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = [
+            asyncio.create_task(render_sentence(session, semaphore, sentence, voice_id, path))
+            for (sentence, voice_id), path in zip(sentences_voices, paths)
+        ]
+        try:
+            with open(filename, "wb") as output:
+                output.write(wav_header(0))
+                for task in tasks:
+                    with open(await task, "rb") as part:
+                        audio_data = part.read()
+                    output.write(audio_data)
+                    data_size += len(audio_data)
+                output.seek(0)
+                output.write(wav_header(data_size))
+        finally:
+            for task in tasks:
+                task.cancel()
+    return data_size
+
 
 def split_paragraph_into_sentences(paragraph, min_length=10):
     # Regular expression to match sentences (ending with .!?)
     sentence_endings = r'(?<=[.!?]) +'
     sentences = re.split(sentence_endings, paragraph.strip())
-    
+
     # Join short sentences with the next one until they reach the minimum length
     result = []
     current_sentence = ""
-    
+
     for sentence in sentences:
         if len(current_sentence) + len(sentence) < min_length:
             current_sentence += " " + sentence
@@ -120,11 +176,11 @@ def split_paragraph_into_sentences(paragraph, min_length=10):
             if current_sentence:
                 result.append(current_sentence.strip())
             current_sentence = sentence
-    
+
     # Add the last sentence
     if current_sentence:
         result.append(current_sentence.strip())
-    
+
     return result
 
 
@@ -139,7 +195,7 @@ def load_input_data(json_file):
     """
     with open(json_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
-    
+
     all_sentences = []
 
     for ele in data:
@@ -147,9 +203,9 @@ def load_input_data(json_file):
         voice_id = ele['voice_id']
 
         split_sentences = split_paragraph_into_sentences(sentence)
-        
+
         sentences_voices = [(sen, voice_id) for sen in split_sentences]
-    
+
         all_sentences.extend(sentences_voices)
     print(all_sentences)
     return all_sentences
@@ -158,20 +214,31 @@ def main():
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Generate and save speech from text.")
     parser.add_argument(
-        "json_file", 
+        "json_file",
         nargs="?",  # Makes the argument optional
         default="input_data.json",  # Default to input_data.json if no argument is provided
         help="Path to the JSON file containing sentences and voice IDs (default: input_data.json)."
     )
+    parser.add_argument(
+        "--output",
+        default="waves_demo_streaming.wav",
+        help="Path of the WAV file to write (default: waves_demo_streaming.wav)."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=CONCURRENCY,
+        help=f"Number of sentences synthesized at the same time (default: {CONCURRENCY})."
+    )
     args = parser.parse_args()
 
     # Load input data from JSON file
     sentences_voices = load_input_data(args.json_file)
-    
-    # Concatenate audio and save the file
-    concatenated_audio_data = concatenate_audio(sentences_voices)
-    if concatenated_audio_data:
-        save_audio_file(concatenated_audio_data)
+
+    # Synthesize the sentences and save the file
+    data_size = asyncio.run(render_to_wav(sentences_voices, args.output, args.concurrency))
+    if data_size:
+        print(f"Audio file saved as {args.output} at {datetime.now(timezone.utc)}")
     else:
         print("No audio data to save.")
 
@@ -6,6 +6,29 @@ from pydub import AudioSegment
 
 MAX_BUFFER_SIZE = 16000000  # 16*10^6 * 2 Bytes -> 32 MB
 
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159
+ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+
+def _build_ulaw_encode_table() -> np.ndarray:
+    # indexed by every 16-bit sample reinterpreted as unsigned, same output as audioop.lin2ulaw
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment = np.searchsorted(ULAW_SEGMENT_ENDS, magnitude)
+    ulaw = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return (np.where(segment >= 8, 0x7F, ulaw) ^ mask).astype(np.uint8)
+
+
+ULAW_ENCODE_TABLE = _build_ulaw_encode_table()
+
+
+def lin2ulaw(pcm: Union[bytes, bytearray]) -> bytes:
+    """Converts 16-bit PCM to 8-bit mulaw, replacing audioop (removed in Python 3.13)."""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    return ULAW_ENCODE_TABLE[samples.view(np.uint16)].tobytes()
+
 
 class AudioBuffer:
 
@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import base64
 import io
 import json
@@ -14,6 +13,8 @@ from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.templating import Jinja2Templates
 from jinja2 import Environment, FileSystemLoader
 
+from audio import lin2ulaw
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -153,9 +154,7 @@ async def websocket_endpoint(ws: WebSocket, call_sid: str):
 
                             tts_audio = await response.read()
                             if isinstance(tts_audio, bytes):
-                                tts_audio = audioop.lin2ulaw(
-                                    tts_audio, 2
-                                )  # Convert audio format
+                                tts_audio = lin2ulaw(tts_audio)  # Convert audio format
 
                             async for chunk in waves_streaming(tts_audio):
                                 if not connection_active:
@@ -0,0 +1,88 @@
+"""Throughput of the audio_dsp conversions against the audioop functions they replace.
+
+audioop is deprecated and removed in Python 3.13; on those versions only audio_dsp is measured.
+Chunked resampling feeds 20ms chunks through one Resampler per stream, the way the ElevenLabs and
+Play.ht synthesizers use it, against audioop.ratecv with its state threaded between chunks.
+
+    poetry run python benchmarks/audio_dsp_throughput.py
+"""
+
+import timeit
+import warnings
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from vocode.streaming.utils.audio_dsp import Resampler, lin2ulaw, resample, ulaw2lin
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    try:
+        import audioop
+    except ImportError:
+        audioop = None
+
+SECONDS_OF_AUDIO = 10
+INPUT_SAMPLE_RATE = 24000
+OUTPUT_SAMPLE_RATE = 8000
+# 20ms at 24kHz, 16-bit
+CHUNK_SIZE = 960
+
+
+def make_pcm(sampling_rate: int) -> bytes:
+    t = np.arange(SECONDS_OF_AUDIO * sampling_rate) / sampling_rate
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+def audioop_chunked_resample(pcm: bytes) -> bytes:
+    state = None
+    output = []
+    for i in range(0, len(pcm), CHUNK_SIZE):
+        converted, state = audioop.ratecv(
+            pcm[i : i + CHUNK_SIZE], 2, 1, INPUT_SAMPLE_RATE, OUTPUT_SAMPLE_RATE, state
+        )
+        output.append(converted)
+    return b"".join(output)
+
+
+def audio_dsp_chunked_resample(pcm: bytes) -> bytes:
+    resampler = Resampler(INPUT_SAMPLE_RATE, OUTPUT_SAMPLE_RATE)
+    view = memoryview(pcm)
+    output = [resampler.process(view[i : i + CHUNK_SIZE]) for i in range(0, len(pcm), CHUNK_SIZE)]
+    output.append(resampler.flush())
+    return b"".join(output)
+
+
+def report(name: str, benchmark: Callable[[], object]):
+    seconds = min(timeit.repeat(benchmark, number=1, repeat=5))
+    print(f"  {name:<10} {SECONDS_OF_AUDIO / seconds:12,.0f}x realtime")
+
+
+def main():
+    pcm_8k = make_pcm(OUTPUT_SAMPLE_RATE)
+    pcm_24k = make_pcm(INPUT_SAMPLE_RATE)
+    ulaw = lin2ulaw(pcm_8k)
+
+    benchmarks: List[Tuple[str, Callable[[], object], Optional[Callable[[], object]]]] = [
+        ("lin2ulaw 8kHz", lambda: lin2ulaw(pcm_8k), lambda: audioop.lin2ulaw(pcm_8k, 2)),
+        ("ulaw2lin 8kHz", lambda: ulaw2lin(ulaw), lambda: audioop.ulaw2lin(ulaw, 2)),
+        (
+            "resample 24kHz -> 8kHz",
+            lambda: resample(pcm_24k, INPUT_SAMPLE_RATE, OUTPUT_SAMPLE_RATE),
+            lambda: audioop.ratecv(pcm_24k, 2, 1, INPUT_SAMPLE_RATE, OUTPUT_SAMPLE_RATE, None),
+        ),
+        (
+            "resample 24kHz -> 8kHz, 20ms chunks",
+            lambda: audio_dsp_chunked_resample(pcm_24k),
+            lambda: audioop_chunked_resample(pcm_24k),
+        ),
+    ]
+    for title, audio_dsp_benchmark, audioop_benchmark in benchmarks:
+        print(title)
+        if audioop is not None:
+            report("audioop", audioop_benchmark)
+        report("audio_dsp", audio_dsp_benchmark)
+
+
+if __name__ == "__main__":
+    main()
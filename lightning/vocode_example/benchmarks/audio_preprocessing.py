@@ -0,0 +1,141 @@
+"""Event loop lag caused by noise suppression on received audio, run inline or off the loop.
+
+Simulates concurrent calls, each receiving 20 ms of 16 kHz audio every 20 ms, with a
+preprocessor that spends a fixed time per 256-sample frame in native code that releases the GIL
+(as Koala's does). Processing each frame inline in `receive_audio`, the way
+VonagePhoneConversation used to, is compared against AudioPreprocessingWorker. A ticker measures
+how late the event loop runs a callback due every 10 ms; the worker's stats give the per-frame
+processing time and any frames dropped.
+
+    poetry run python benchmarks/audio_preprocessing.py [--calls 10 50] [--frame-ms 0.5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from vocode.streaming.utils.audio_preprocessor import (
+    AudioPreprocessingStats,
+    AudioPreprocessingWorker,
+    AudioPreprocessor,
+)
+
+FRAME_LENGTH = 256
+CHUNK = np.zeros(320, dtype=np.int16).tobytes()
+
+
+class SimulatedNativePreprocessor(AudioPreprocessor):
+    def __init__(self, seconds_per_frame: float):
+        self.frame_length = FRAME_LENGTH
+        self.seconds_per_frame = seconds_per_frame
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        time.sleep(self.seconds_per_frame)
+        return frame
+
+
+class InlinePreprocessing:
+    """Buffers the audio and processes every whole frame as soon as it arrives, on the loop."""
+
+    def __init__(self, audio_preprocessor: AudioPreprocessor, output: Callable[[bytes], None]):
+        self.audio_preprocessor = audio_preprocessor
+        self.output = output
+        self.buffer = bytearray()
+
+    def start(self):
+        pass
+
+    def consume_nonblocking(self, chunk: bytes):
+        self.buffer.extend(chunk)
+        frame_bytes = FRAME_LENGTH * 2
+        while len(self.buffer) >= frame_bytes:
+            frame = np.frombuffer(self.buffer[:frame_bytes], dtype=np.int16)
+            self.output(self.audio_preprocessor.process(frame).tobytes())
+            self.buffer = self.buffer[frame_bytes:]
+
+    async def terminate(self):
+        pass
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.01) -> List[float]:
+    lags = []
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - due)
+    return lags
+
+
+async def simulate_call(stage, seconds: float):
+    stage.start()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for i in range(int(seconds / 0.02)):
+        await asyncio.sleep(max(0.0, start + i * 0.02 - loop.time()))
+        stage.consume_nonblocking(CHUNK)
+    await stage.terminate()
+
+
+async def run(calls: int, seconds_per_frame: float, seconds: float, off_loop: bool):
+    received = [0]
+
+    def output(chunk: bytes):
+        received[0] += len(chunk)
+
+    if off_loop:
+        stages = [
+            AudioPreprocessingWorker(SimulatedNativePreprocessor(seconds_per_frame), output)
+            for _ in range(calls)
+        ]
+    else:
+        stages = [
+            InlinePreprocessing(SimulatedNativePreprocessor(seconds_per_frame), output)
+            for _ in range(calls)
+        ]
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop))
+    await asyncio.gather(*(simulate_call(stage, seconds) for stage in stages))
+    stop.set()
+    lags_ms = sorted(lag * 1000 for lag in await lag_task)
+    line = (
+        f"{calls:>6} calls  {'worker' if off_loop else 'inline':>7}   loop lag p50 "
+        f"{statistics.median(lags_ms):6.1f} ms  p99 {lags_ms[int(len(lags_ms) * 0.99)]:6.1f} ms"
+    )
+    if off_loop:
+        stats = AudioPreprocessingStats()
+        for stage in stages:
+            stats.frames_processed += stage.stats.frames_processed
+            stats.frames_dropped += stage.stats.frames_dropped
+            stats.processing_seconds += stage.stats.processing_seconds
+            stats.max_processing_seconds = max(
+                stats.max_processing_seconds, stage.stats.max_processing_seconds
+            )
+            stats.max_backlog_frames = max(stats.max_backlog_frames, stage.stats.max_backlog_frames)
+        line += (
+            f"   per frame avg {stats.average_processing_seconds * 1000:.2f} ms"
+            f" max {stats.max_processing_seconds * 1000:.2f} ms"
+            f"   max backlog {stats.max_backlog_frames} frames"
+            f"   dropped {stats.frames_dropped}"
+        )
+    print(line)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--frame-ms", type=float, default=0.5, help="processing time per frame")
+    parser.add_argument("--seconds", type=float, default=5, help="audio per call")
+    args = parser.parse_args()
+
+    for calls in args.calls:
+        for off_loop in [False, True]:
+            await run(calls, args.frame_ms / 1000, args.seconds, off_loop)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
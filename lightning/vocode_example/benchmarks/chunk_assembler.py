@@ -0,0 +1,86 @@
+"""Cost of cutting websocket TTS messages into output chunks, as the audio per message grows.
+
+Feeds a stream of messages, each carrying the given number of chunks plus an odd remainder (so
+chunks straddle messages), through the receive loops ElevenLabsWSSynthesizer and
+CartesiaSynthesizer used to run and through ChunkAssembler, and reports the time per output chunk.
+The Cartesia loop copies the whole backlog after every chunk it cuts, so its cost per chunk grows
+with the backlog; the ElevenLabs loop copies every chunk once; ChunkAssembler hands out views and
+only copies the chunks that straddle two messages, so its cost per chunk stays flat. With a single
+chunk per message its fixed cost per call dominates, a couple of microseconds per chunk of audio.
+
+    poetry run python benchmarks/chunk_assembler.py [--chunk-size 1600] [--seconds 60]
+"""
+
+import argparse
+import time
+from typing import Callable, Iterable, List
+
+from vocode.streaming.utils.chunk_assembler import ChunkAssembler
+
+
+def eleven_labs_loop(messages: Iterable[bytes], chunk_size: int) -> int:
+    chunks = 0
+    buffer = bytearray()
+    for message in messages:
+        buffer.extend(message)
+        for chunk_idx in range(0, len(buffer) - chunk_size, chunk_size):
+            buffer[chunk_idx : chunk_idx + chunk_size]
+            chunks += 1
+        buffer = buffer[len(buffer) - (len(buffer) % chunk_size) :]
+    return chunks
+
+
+def cartesia_loop(messages: Iterable[bytes], chunk_size: int) -> int:
+    chunks = 0
+    buffer = bytearray()
+    for message in messages:
+        buffer.extend(message)
+        while len(buffer) >= chunk_size:
+            buffer[:chunk_size]
+            buffer = buffer[chunk_size:]
+            chunks += 1
+    return chunks
+
+
+def chunk_assembler_loop(messages: Iterable[bytes], chunk_size: int) -> int:
+    chunks = 0
+    chunk_assembler = ChunkAssembler(chunk_size)
+    for message in messages:
+        chunks += len(chunk_assembler.feed(message))
+    return chunks
+
+
+def time_per_chunk_us(
+    loop: Callable[[Iterable[bytes], int], int], messages: List[bytes], chunk_size: int
+) -> float:
+    start = time.perf_counter()
+    chunks = loop(messages, chunk_size)
+    return (time.perf_counter() - start) / chunks * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=1600, help="bytes per output chunk")
+    parser.add_argument("--seconds", type=float, default=60, help="audio per run, at 16 kHz")
+    args = parser.parse_args()
+
+    total_bytes = int(args.seconds * 16000 * 2)
+    loops = {
+        "ElevenLabs loop": eleven_labs_loop,
+        "Cartesia loop": cartesia_loop,
+        "ChunkAssembler": chunk_assembler_loop,
+    }
+    print(f"{'chunks per message':>18}" + "".join(f"{name:>18}" for name in loops))
+    for chunks_per_message in [1, 4, 16, 64, 256]:
+        message_size = chunks_per_message * args.chunk_size + args.chunk_size // 3
+        message = bytes(message_size)
+        messages = [message] * max(1, total_bytes // message_size)
+        timings = [time_per_chunk_us(loop, messages, args.chunk_size) for loop in loops.values()]
+        print(
+            f"{chunks_per_message:>18}"
+            + "".join(f"{f'{timing:.2f} us/chunk':>18}" for timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""How many concurrent StreamingConversations one process can sustain.
+
+Runs N conversations side by side, each with a scripted fake transcriber, a fake LLM that
+streams tokens, a fake streaming synthesizer and a TwilioOutputDevice writing to a fake Twilio
+websocket. A simulated caller streams 20ms mulaw frames into every conversation in real time,
+speaks the scripted lines and waits for the bot to finish playing its answer before the next
+one; the fake websocket sends mark messages back once each audio chunk would have played.
+
+Every N runs in a fresh process, and reports:
+  - turn latency: from the final transcription to the first bot audio frame on the websocket
+  - event loop lag: how late a periodic timer fires
+  - CPU time and peak memory growth, per conversation
+
+    poetry run python benchmarks/conversation_load.py [--conversations 1 10 50 100]
+        [--turns 3] [--llm-latency 0.3] [--tts-latency 0.2]
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import AsyncGenerator, Callable, Dict, List, Optional
+
+from fastapi.websockets import WebSocketState
+from loguru import logger
+
+from vocode.streaming.agent.base_agent import GeneratedResponse, RespondAgent
+from vocode.streaming.agent.streaming_utils import collate_response_async
+from vocode.streaming.models.agent import AgentConfig
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.models.transcriber import TranscriberConfig, Transcription
+from vocode.streaming.output_device.twilio_output_device import (
+    ChunkFinishedMarkMessage,
+    TwilioOutputDevice,
+)
+from vocode.streaming.streaming_conversation import StreamingConversation
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.telephony.constants import (
+    DEFAULT_AUDIO_ENCODING,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SAMPLING_RATE,
+)
+from vocode.streaming.telephony.twilio_framing import TwilioFramer, parse_twilio_message
+from vocode.streaming.transcriber.base_transcriber import BaseAsyncTranscriber
+from vocode.streaming.utils.create_task import asyncio_create_task
+
+DEFAULT_CONVERSATIONS = [1, 10, 50, 100]
+CALLER_LINES = [
+    "Hi, I am calling about the order I placed last week.",
+    "It still has not arrived and the tracking page has not changed in days.",
+    "Can you send a replacement to the same address please?",
+    "Great, thank you so much for sorting that out for me.",
+]
+BOT_RESPONSES = [
+    "I am sorry to hear that. Let me look up your order. Could you tell me the order number?",
+    "Thanks for your patience. I can see the package has been stuck at the depot since Monday.",
+    "Of course. I have sent a replacement to the same address and it should arrive on Friday.",
+    "You are welcome. Is there anything else I can help you with today?",
+]
+INBOUND_FRAME_SECONDS = 0.02
+INBOUND_FRAME_SIZE = int(DEFAULT_SAMPLING_RATE * INBOUND_FRAME_SECONDS)
+# mulaw 0xFF is silence; anything else counts as speech for the fake transcriber
+SILENCE_BYTE = 0xFF
+SPEECH_FRAME = bytes(INBOUND_FRAME_SIZE)
+SILENCE_FRAME = bytes([SILENCE_BYTE]) * INBOUND_FRAME_SIZE
+WORDS_PER_SECOND = 2.5
+LOOP_LAG_INTERVAL_SECONDS = 0.05
+# how long the websocket has to stay quiet after the bot's audio played for the turn to be over
+TURN_SETTLE_SECONDS = 0.5
+
+
+class LoadTestMetrics:
+    def __init__(self):
+        self.turn_latencies: List[float] = []
+        self.loop_lags: List[float] = []
+
+
+class ScriptedTranscriberConfig(TranscriberConfig, type="transcriber_scripted"):  # type: ignore
+    script: List[str]
+
+
+class ScriptedTranscriber(BaseAsyncTranscriber[ScriptedTranscriberConfig]):
+    """Sends the next line of the script as a final transcription whenever speech stops."""
+
+    def __init__(
+        self,
+        transcriber_config: ScriptedTranscriberConfig,
+        on_final_transcription: Callable[[], None],
+    ):
+        super().__init__(transcriber_config)
+        self.on_final_transcription = on_final_transcription
+        self.line_index = 0
+        self.in_speech = False
+
+    async def _run_loop(self):
+        while True:
+            try:
+                audio_chunk = await self._input_queue.get()
+            except asyncio.CancelledError:
+                return
+            is_speech = audio_chunk[0] != SILENCE_BYTE
+            if self.in_speech and not is_speech:
+                script = self.transcriber_config.script
+                self.on_final_transcription()
+                self.produce_nonblocking(
+                    Transcription(
+                        message=script[self.line_index % len(script)],
+                        confidence=1.0,
+                        is_final=True,
+                    )
+                )
+                self.line_index += 1
+            self.in_speech = is_speech
+
+
+class FakeLLMAgentConfig(AgentConfig, type="agent_fake_llm"):  # type: ignore
+    responses: List[str]
+    time_to_first_token_seconds: float
+    seconds_per_token: float = 0.01
+
+
+class FakeLLMAgent(RespondAgent[FakeLLMAgentConfig]):
+    """Streams the next canned response word by word, like an LLM token stream."""
+
+    def __init__(self, agent_config: FakeLLMAgentConfig):
+        super().__init__(agent_config)
+        self.response_index = 0
+
+    async def _stream_tokens(self, response: str) -> AsyncGenerator[str, None]:
+        await asyncio.sleep(self.agent_config.time_to_first_token_seconds)
+        for i, word in enumerate(response.split(" ")):
+            if i > 0:
+                await asyncio.sleep(self.agent_config.seconds_per_token)
+            yield word if i == 0 else f" {word}"
+
+    async def generate_response(
+        self,
+        human_input: str,
+        conversation_id: str,
+        is_interrupt: bool = False,
+        bot_was_in_medias_res: bool = False,
+    ) -> AsyncGenerator[GeneratedResponse, None]:
+        responses = self.agent_config.responses
+        response = responses[self.response_index % len(responses)]
+        self.response_index += 1
+        async for message in collate_response_async(
+            conversation_id=conversation_id, gen=self._stream_tokens(response)
+        ):
+            if isinstance(message, str):
+                yield GeneratedResponse(message=BaseMessage(text=message), is_interruptible=True)
+
+
+class FakeStreamingSynthesizerConfig(SynthesizerConfig, type="synthesizer_fake_streaming"):  # type: ignore
+    time_to_first_chunk_seconds: float
+    # how long the fake provider takes to send each chunk after the first one
+    seconds_per_chunk: float = 0.005
+
+
+class FakeStreamingSynthesizer(BaseSynthesizer[FakeStreamingSynthesizerConfig]):
+    """Streams mulaw audio as long as the message would take to say, through a chunk queue."""
+
+    async def _produce_chunks(
+        self, chunk_queue: asyncio.Queue[Optional[bytes]], num_bytes: int, chunk_size: int
+    ):
+        await asyncio.sleep(self.synthesizer_config.time_to_first_chunk_seconds)
+        for offset in range(0, num_bytes, chunk_size):
+            if offset > 0:
+                await asyncio.sleep(self.synthesizer_config.seconds_per_chunk)
+            chunk_queue.put_nowait(bytes([offset % 0x7F]) * min(chunk_size, num_bytes - offset))
+        chunk_queue.put_nowait(None)
+
+    async def create_speech_uncached(
+        self,
+        message: BaseMessage,
+        chunk_size: int,
+        is_first_text_chunk: bool = False,
+        is_sole_text_chunk: bool = False,
+    ) -> SynthesisResult:
+        seconds = len(message.text.split()) / WORDS_PER_SECOND
+        num_bytes = int(seconds * self.synthesizer_config.sampling_rate)
+        chunk_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        asyncio_create_task(self._produce_chunks(chunk_queue, num_bytes, chunk_size))
+        return SynthesisResult(
+            self.chunk_result_generator_from_queue(chunk_queue),
+            lambda seconds: self.get_message_cutoff_from_total_response_length(
+                self.synthesizer_config, message, seconds, num_bytes
+            ),
+        )
+
+    @classmethod
+    def get_voice_identifier(cls, synthesizer_config: FakeStreamingSynthesizerConfig) -> str:
+        return "fake_streaming_voice"
+
+
+class FakeTwilioWebSocket:
+    """Plays back what the output device sends at real-time speed and echoes the marks, like
+    Twilio does once the audio before them has played."""
+
+    def __init__(self):
+        self.application_state = WebSocketState.CONNECTED
+        self.output_device: Optional[TwilioOutputDevice] = None
+        self.playback_finished_at = 0.0
+        self.last_sent_at = 0.0
+        self.on_media: Optional[Callable[[], None]] = None
+
+    async def send_text(self, message: str):
+        now = time.monotonic()
+        self.last_sent_at = now
+        parsed_message = parse_twilio_message(message)
+        if parsed_message.event == "media":
+            if self.on_media is not None:
+                self.on_media()
+            assert parsed_message.audio is not None
+            self.playback_finished_at = max(self.playback_finished_at, now) + len(
+                parsed_message.audio
+            ) / float(DEFAULT_SAMPLING_RATE)
+        elif parsed_message.event == "mark":
+            assert parsed_message.data is not None and self.output_device is not None
+            asyncio.get_running_loop().call_later(
+                max(self.playback_finished_at - now, 0),
+                self.output_device.enqueue_mark_message,
+                ChunkFinishedMarkMessage(chunk_id=parsed_message.data["mark"]["name"]),
+            )
+        elif parsed_message.event == "clear":
+            self.playback_finished_at = now
+
+
+class SimulatedCall:
+    def __init__(self, args: argparse.Namespace, metrics: LoadTestMetrics, index: int):
+        self.turns = args.turns
+        self.metrics = metrics
+        self.turn_started_at: Optional[float] = None
+        self.first_audio_event = asyncio.Event()
+        self.ws = FakeTwilioWebSocket()
+        self.ws.on_media = self.on_media
+        self.output_device = TwilioOutputDevice(ws=self.ws, stream_sid=f"MZ{index:032x}")  # type: ignore
+        self.ws.output_device = self.output_device
+        # what Twilio would send for each inbound frame
+        inbound_framer = TwilioFramer(self.output_device.stream_sid)
+        self.speech_message = inbound_framer.media(SPEECH_FRAME)
+        self.silence_message = inbound_framer.media(SILENCE_FRAME)
+        self.speaking = False
+        self.conversation = StreamingConversation(
+            output_device=self.output_device,
+            transcriber=ScriptedTranscriber(
+                ScriptedTranscriberConfig(
+                    sampling_rate=DEFAULT_SAMPLING_RATE,
+                    audio_encoding=DEFAULT_AUDIO_ENCODING,
+                    chunk_size=DEFAULT_CHUNK_SIZE,
+                    script=CALLER_LINES,
+                ),
+                on_final_transcription=self.on_final_transcription,
+            ),
+            agent=FakeLLMAgent(
+                FakeLLMAgentConfig(
+                    initial_message=BaseMessage(text="Hello, thanks for calling. How can I help?"),
+                    responses=BOT_RESPONSES,
+                    time_to_first_token_seconds=args.llm_latency,
+                )
+            ),
+            synthesizer=FakeStreamingSynthesizer(
+                FakeStreamingSynthesizerConfig(
+                    sampling_rate=DEFAULT_SAMPLING_RATE,
+                    audio_encoding=AudioEncoding.MULAW,
+                    time_to_first_chunk_seconds=args.tts_latency,
+                )
+            ),
+        )
+
+    def on_final_transcription(self):
+        self.turn_started_at = time.monotonic()
+
+    def on_media(self):
+        if self.turn_started_at is not None:
+            self.metrics.turn_latencies.append(time.monotonic() - self.turn_started_at)
+            self.turn_started_at = None
+            self.first_audio_event.set()
+
+    def handle_twilio_message(self, message: str):
+        # what TwilioPhoneConversation does with media messages
+        parsed_message = parse_twilio_message(message)
+        assert parsed_message.audio is not None
+        self.conversation.receive_audio(parsed_message.audio)
+
+    async def stream_inbound_audio(self):
+        next_frame_at = time.monotonic()
+        while True:
+            self.handle_twilio_message(
+                self.speech_message if self.speaking else self.silence_message
+            )
+            next_frame_at += INBOUND_FRAME_SECONDS
+            await asyncio.sleep(max(next_frame_at - time.monotonic(), 0))
+
+    async def wait_for_bot_to_finish(self):
+        while True:
+            quiet_at = max(self.ws.playback_finished_at, self.ws.last_sent_at) + TURN_SETTLE_SECONDS
+            now = time.monotonic()
+            if now >= quiet_at:
+                return
+            await asyncio.sleep(quiet_at - now)
+
+    async def run(self):
+        await self.conversation.start()
+        inbound_audio_task = asyncio_create_task(self.stream_inbound_audio())
+        try:
+            await self.conversation.initial_message_tracker.wait()
+            await self.wait_for_bot_to_finish()
+            for turn in range(self.turns):
+                line = CALLER_LINES[turn % len(CALLER_LINES)]
+                self.first_audio_event.clear()
+                self.speaking = True
+                await asyncio.sleep(len(line.split()) / WORDS_PER_SECOND)
+                self.speaking = False
+                await self.first_audio_event.wait()
+                await self.wait_for_bot_to_finish()
+        finally:
+            inbound_audio_task.cancel()
+            await self.conversation.terminate()
+
+
+async def monitor_loop_lag(metrics: LoadTestMetrics):
+    while True:
+        expected_at = time.monotonic() + LOOP_LAG_INTERVAL_SECONDS
+        await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+        metrics.loop_lags.append(time.monotonic() - expected_at)
+
+
+def get_peak_rss_bytes() -> int:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": quantiles[49], "p95": quantiles[94], "p99": quantiles[98]}
+
+
+async def run_calls(args: argparse.Namespace) -> Dict[str, float]:
+    metrics = LoadTestMetrics()
+    calls = [SimulatedCall(args, metrics, index) for index in range(args.conversations)]
+    lag_task = asyncio_create_task(monitor_loop_lag(metrics))
+    start_cpu = time.process_time()
+    start = time.monotonic()
+    results = await asyncio.gather(*(call.run() for call in calls), return_exceptions=True)
+    wall_seconds = time.monotonic() - start
+    cpu_seconds = time.process_time() - start_cpu
+    lag_task.cancel()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for error in errors[:3]:
+        logger.opt(exception=error).error("Conversation failed")
+    turn_latency = percentiles(metrics.turn_latencies)
+    loop_lag = percentiles(metrics.loop_lags)
+    return {
+        "conversations": args.conversations,
+        "errors": len(errors),
+        "turns": len(metrics.turn_latencies),
+        "turn_latency_p50_ms": turn_latency["p50"] * 1000,
+        "turn_latency_p95_ms": turn_latency["p95"] * 1000,
+        "turn_latency_p99_ms": turn_latency["p99"] * 1000,
+        "loop_lag_p50_ms": loop_lag["p50"] * 1000,
+        "loop_lag_p99_ms": loop_lag["p99"] * 1000,
+        "loop_lag_max_ms": max(metrics.loop_lags, default=0.0) * 1000,
+        "cpu_ms_per_call_second": cpu_seconds / (wall_seconds * args.conversations) * 1000,
+        "cpu_percent": cpu_seconds / wall_seconds * 100,
+    }
+
+
+def run_scale(args: argparse.Namespace) -> Dict[str, float]:
+    # keep the audio cache off disk and out of the numbers; only warnings are logged
+    os.environ["AUDIO_CACHE_DIR"] = ""
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    baseline_rss = get_peak_rss_bytes()
+    result = asyncio.run(run_calls(args))
+    result["peak_memory_mb_per_call"] = (
+        (get_peak_rss_bytes() - baseline_rss) / args.conversations / 1024 / 1024
+    )
+    return result
+
+
+def report(result: Dict[str, float]):
+    print(
+        "{conversations:>6} {turns:>6} {errors:>6} "
+        "{turn_latency_p50_ms:>8.0f} {turn_latency_p95_ms:>8.0f} {turn_latency_p99_ms:>8.0f} "
+        "{loop_lag_p50_ms:>9.1f} {loop_lag_p99_ms:>9.1f} {loop_lag_max_ms:>9.1f} "
+        "{cpu_ms_per_call_second:>11.1f} {cpu_percent:>6.0f}% "
+        "{peak_memory_mb_per_call:>10.2f}".format(**result)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--conversations", type=int, nargs="+", default=DEFAULT_CONVERSATIONS)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="time to first token")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="time to first chunk")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per N")
+    args = parser.parse_args()
+
+    if not args.json:
+        print(
+            "calls  turns errors   turn latency (ms)       loop lag (ms)          "
+            "CPU ms per   CPU   peak MB\n"
+            "                       p50      p95      p99       p50       p99       max  "
+            "call-second         per call"
+        )
+    # a fresh process for every N, so peak memory and warm caches don't carry over
+    mp_context = multiprocessing.get_context("spawn")
+    for conversations in args.conversations:
+        scale_args = argparse.Namespace(**{**vars(args), "conversations": conversations})
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=mp_context) as executor:
+            result = executor.submit(run_scale, scale_args).result()
+        if args.json:
+            print(json.dumps(result))
+        else:
+            report(result)
+
+
+if __name__ == "__main__":
+    main()
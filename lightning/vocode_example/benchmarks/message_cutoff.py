@@ -0,0 +1,87 @@
+"""Cost of the voice-speed message cutoff checked for every chunk of a playing message.
+
+Plays messages of increasing length in 20 ms chunks at 150 words per minute and calls
+`get_message_cutoff_from_voice_speed` after each chunk, the way the output device's callbacks
+do while a bot turn plays. Compares tokenizing and detokenizing the message on every call (how
+the cutoff used to be computed) against the word index built once per message text, and reports
+the cost per lookup and the one-off cost of building the index.
+
+    poetry run python benchmarks/message_cutoff.py [--words 100 500 2000] [--chunk-ms 20]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+
+from nltk.tokenize import word_tokenize
+from nltk.tokenize.treebank import TreebankWordDetokenizer
+
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, get_message_word_index
+
+WORDS_PER_MINUTE = 150
+VOCABULARY = ["the", "order", "ships", "tomorrow,", "and", "you'll", "get", "a", "tracking"]
+VOCABULARY += ["number", "by", "email.", "Is", "there", "anything", "else?", "I", "can", "help"]
+
+
+def tokenize_every_call(message: BaseMessage, seconds: Optional[float]) -> str:
+    if seconds is None:
+        return message.text
+    estimated_words_spoken = int(WORDS_PER_MINUTE / 60 * seconds)
+    tokens = word_tokenize(message.text)
+    return TreebankWordDetokenizer().detokenize(tokens[:estimated_words_spoken])
+
+
+def word_index(message: BaseMessage, seconds: Optional[float]) -> str:
+    return BaseSynthesizer.get_message_cutoff_from_voice_speed(message, seconds, WORDS_PER_MINUTE)
+
+
+def time_per_lookup_us(
+    cutoff: Callable[[BaseMessage, Optional[float]], str],
+    message: BaseMessage,
+    seconds_played: List[float],
+) -> float:
+    start = time.perf_counter()
+    for seconds in seconds_played:
+        cutoff(message, seconds)
+    return (time.perf_counter() - start) / len(seconds_played) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--chunk-ms", type=float, default=20)
+    parser.add_argument(
+        "--max-lookups",
+        type=int,
+        default=500,
+        help="lookups timed per message when tokenizing on every call, spread over its playback",
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(
+        f"{'words':>6}{'lookups':>10}{'tokenize every call':>22}{'word index':>16}"
+        f"{'index built in':>18}"
+    )
+    for num_words in args.words:
+        message = BaseMessage(text=" ".join(random.choices(VOCABULARY, k=num_words)))
+        playback_seconds = num_words / (WORDS_PER_MINUTE / 60)
+        num_chunks = int(playback_seconds * 1000 / args.chunk_ms)
+        seconds_played = [(i + 1) * args.chunk_ms / 1000 for i in range(num_chunks)]
+        step = max(1, num_chunks // args.max_lookups)
+
+        start = time.perf_counter()
+        get_message_word_index(message.text)
+        build_ms = (time.perf_counter() - start) * 1000
+        before = time_per_lookup_us(tokenize_every_call, message, seconds_played[::step])
+        after = time_per_lookup_us(word_index, message, seconds_played)
+        print(
+            f"{num_words:>6}{num_chunks:>10}{f'{before:.1f} us':>22}{f'{after:.2f} us':>16}"
+            f"{f'{build_ms:.1f} ms':>18}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-chunk CPU cost of decoding a streamed MP3 utterance.
+
+Compares re-decoding the whole accumulated buffer on every chunk (how MiniaudioWorker used
+to work) against StreamingMp3Decoder, for utterances of increasing length. The cost per
+chunk of the streaming decoder should stay flat as the utterance grows.
+
+    poetry run python benchmarks/mp3_streaming_decode.py [path/to/file.mp3]
+"""
+
+import os
+import sys
+import time
+from typing import Callable, List
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.utils import convert_wav
+from vocode.streaming.utils.mp3_helper import StreamingMp3Decoder, decode_mp3
+
+DEFAULT_MP3_PATH = os.path.join(os.path.dirname(__file__), "../tests/fakedata/chirp.mp3")
+NETWORK_CHUNK_SIZE = 1024
+OUTPUT_SAMPLE_RATE = 8000
+UTTERANCE_REPEATS = [1, 4, 16]
+
+
+def redecode_whole_buffer(mp3_chunks: List[bytes]) -> List[float]:
+    timings = []
+    current_mp3_buffer = bytearray()
+    for mp3_chunk in mp3_chunks:
+        start = time.perf_counter()
+        current_mp3_buffer.extend(mp3_chunk)
+        convert_wav(
+            decode_mp3(bytes(current_mp3_buffer)),
+            output_sample_rate=OUTPUT_SAMPLE_RATE,
+            output_encoding=AudioEncoding.MULAW,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def streaming_decode(mp3_chunks: List[bytes]) -> List[float]:
+    timings = []
+    decoder = StreamingMp3Decoder(
+        output_sample_rate=OUTPUT_SAMPLE_RATE, output_encoding=AudioEncoding.MULAW
+    )
+    for mp3_chunk in mp3_chunks:
+        start = time.perf_counter()
+        decoder.feed(mp3_chunk)
+        timings.append(time.perf_counter() - start)
+    decoder.flush()
+    return timings
+
+
+def report(name: str, timings: List[float]):
+    quarter = max(len(timings) // 4, 1)
+    first, last = timings[:quarter], timings[-quarter:]
+    print(
+        "  {:<24} total {:8.1f} ms   per chunk: first quarter {:7.3f} ms, last quarter {:7.3f} ms".format(
+            name,
+            sum(timings) * 1000,
+            sum(first) / len(first) * 1000,
+            sum(last) / len(last) * 1000,
+        )
+    )
+
+
+def main(mp3_path: str):
+    with open(mp3_path, "rb") as f:
+        mp3_bytes = f.read()
+    benchmarks: List[Callable[[List[bytes]], List[float]]] = [
+        redecode_whole_buffer,
+        streaming_decode,
+    ]
+    for repeats in UTTERANCE_REPEATS:
+        utterance = mp3_bytes * repeats
+        mp3_chunks = [
+            utterance[i : i + NETWORK_CHUNK_SIZE]
+            for i in range(0, len(utterance), NETWORK_CHUNK_SIZE)
+        ]
+        print(f"{len(utterance)} bytes of mp3 in {len(mp3_chunks)} chunks")
+        for benchmark in benchmarks:
+            report(benchmark.__name__, benchmark(mp3_chunks))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MP3_PATH)
@@ -0,0 +1,186 @@
+"""Throughput of the Redis access patterns vocode uses, against a local Redis stand-in.
+
+Starts fakeredis' TCP server in a background thread (or uses REDISHOST/REDISPORT with
+--use-env), so it runs in CI without a Redis server, and compares:
+  - audio cache writes: SET then EXPIRE, against a single SET with EX
+  - saving and reading the configs of an outbound fan-out: one command per call, against
+    RedisConfigManager.save_configs/get_configs, which pipeline them
+  - connections left open by the config manager, audio cache and message queues with a client
+    each, against the shared RedisClientRegistry clients
+
+Round trips to fakeredis are cheaper than to a real Redis over the network, so the gains from
+pipelining here are a lower bound.
+
+    poetry run python benchmarks/redis_throughput.py [--calls 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from typing import Awaitable, Callable, List
+
+from redis.asyncio import Redis
+
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.telephony import TwilioCallConfig, TwilioConfig
+from vocode.streaming.telephony.config_manager.redis_config_manager import (
+    ONE_DAY_SECONDS,
+    RedisConfigManager,
+)
+from vocode.streaming.utils.redis import RedisClientRegistry
+
+AUDIO = b"\xff" * 16000
+
+
+def start_stand_in() -> None:
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["REDISHOST"] = "127.0.0.1"
+    os.environ["REDISPORT"] = str(server.server_address[1])
+
+
+def create_call_config(i: int) -> TwilioCallConfig:
+    return TwilioCallConfig(
+        transcriber_config=TwilioCallConfig.default_transcriber_config(),
+        agent_config=ChatGPTAgentConfig(prompt_preamble="Have a pleasant conversation about life"),
+        synthesizer_config=TwilioCallConfig.default_synthesizer_config(),
+        twilio_config=TwilioConfig(account_sid="account_sid", auth_token="auth_token"),
+        twilio_sid=f"twilio_sid_{i}",
+        from_phone="+15555555555",
+        to_phone=f"+1555{i:07d}",
+        direction="outbound",
+    )
+
+
+async def run_concurrently(operations: List[Callable[[], Awaitable]], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation: Callable[[], Awaitable]):
+        async with semaphore:
+            await operation()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(operation) for operation in operations))
+    return time.perf_counter() - start
+
+
+def report(name: str, count: int, seconds: float):
+    print(f"  {name:<32} {count / seconds:10,.0f}/s")
+
+
+def count_connections(*clients: Redis) -> int:
+    pools = {id(client.connection_pool): client.connection_pool for client in clients}
+    return sum(
+        len(pool._available_connections) + len(pool._in_use_connections)  # type: ignore
+        for pool in pools.values()
+    )
+
+
+async def benchmark_audio_cache_writes(redis: Redis, args):
+    async def set_then_expire(key: str):
+        await redis.set(key, AUDIO)
+        await redis.expire(key, ONE_DAY_SECONDS)
+
+    print(f"audio cache writes ({len(AUDIO)} bytes)")
+    seconds = await run_concurrently(
+        [lambda i=i: set_then_expire(f"audio:{i}") for i in range(args.calls)], args.concurrency
+    )
+    report("SET + EXPIRE", args.calls, seconds)
+    seconds = await run_concurrently(
+        [lambda i=i: redis.set(f"audio:{i}", AUDIO, ex=ONE_DAY_SECONDS) for i in range(args.calls)],
+        args.concurrency,
+    )
+    report("SET EX", args.calls, seconds)
+
+
+async def benchmark_config_fan_out(config_manager: RedisConfigManager, args):
+    configs = {f"conversation_{i}": create_call_config(i) for i in range(args.calls)}
+    conversation_ids = list(configs)
+
+    print(f"outbound fan-out of {args.calls} calls")
+    seconds = await run_concurrently(
+        [
+            lambda conversation_id=conversation_id, config=config: config_manager.save_config(
+                conversation_id, config
+            )
+            for conversation_id, config in configs.items()
+        ],
+        args.concurrency,
+    )
+    report("save_config per call", args.calls, seconds)
+    start = time.perf_counter()
+    await config_manager.save_configs(configs)
+    report("save_configs (pipeline)", args.calls, time.perf_counter() - start)
+
+    seconds = await run_concurrently(
+        [
+            lambda conversation_id=conversation_id: config_manager.get_config(conversation_id)
+            for conversation_id in conversation_ids
+        ],
+        args.concurrency,
+    )
+    report("get_config per call", args.calls, seconds)
+    start = time.perf_counter()
+    await config_manager.get_configs(conversation_ids)
+    report("get_configs (MGET)", args.calls, time.perf_counter() - start)
+
+
+async def benchmark_connections(args):
+    def create_client(**kwargs) -> Redis:
+        return Redis(host=os.environ["REDISHOST"], port=int(os.environ["REDISPORT"]), **kwargs)
+
+    async def load(*clients: Redis):
+        # each component has its own burst of traffic
+        for client in clients:
+            await run_concurrently(
+                [client.ping for _ in range(args.concurrency * 4)], args.concurrency
+            )
+
+    # what RedisConfigManager, AudioCache, RedisConversationMessageQueue and
+    # RedisGenericMessageQueue each created before
+    separate_clients = [
+        create_client(decode_responses=True),
+        create_client(),
+        create_client(decode_responses=True),
+        create_client(decode_responses=True),
+    ]
+    await load(*separate_clients)
+    registry = RedisClientRegistry()
+    shared_clients = [
+        registry.get_client(decode_responses=True),
+        registry.get_client(decode_responses=False),
+        registry.get_client(decode_responses=True),
+        registry.get_client(decode_responses=True),
+    ]
+    await load(*shared_clients)
+
+    print(f"connections left open by 4 components at concurrency {args.concurrency}")
+    print(f"  {'a client each':<32} {count_connections(*separate_clients):10}")
+    print(f"  {'shared registry':<32} {count_connections(*shared_clients):10}")
+    for client in separate_clients:
+        await client.aclose()
+
+
+async def main(args):
+    if not args.use_env:
+        start_stand_in()
+    # first, while the registry has not opened any connections yet
+    await benchmark_connections(args)
+    registry = RedisClientRegistry()
+    await benchmark_audio_cache_writes(registry.get_client(decode_responses=False), args)
+    await benchmark_config_fan_out(RedisConfigManager(), args)
+    await registry.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--use-env", action="store_true", help="use the Redis at REDISHOST/REDISPORT instead"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""Allocations made while chunking cached audio, trailing silence and WAV synthesis results.
+
+Drains each synthesis result into a list, the way StreamingConversation queues every chunk on the
+output device before they are played, and counts the memory blocks and bytes still allocated
+with tracemalloc, and the peak. Every chunk is a small object either way, so the savings show in
+the bytes rather than the number of blocks. Compares slicing copies out of `bytes` and building
+every silence chunk anew (how CachedAudio and create_synthesis_result_from_wav used to chunk
+audio) against the memoryview slices and shared silence chunk they use now.
+
+    poetry run python benchmarks/synthesis_chunk_allocations.py [--seconds 30] [--chunk-ms 100]
+"""
+
+import argparse
+import asyncio
+import io
+import time
+import tracemalloc
+import wave
+from typing import AsyncGenerator, Callable, List
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.base_synthesizer import (
+    BaseSynthesizer,
+    CachedAudio,
+    SynthesisResult,
+)
+from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE
+from vocode.streaming.utils import convert_wav
+
+SAMPLING_RATE = 8000
+
+
+async def copied_audio_chunks(audio_data: bytes, chunk_size: int):
+    for i in range(0, len(audio_data), chunk_size):
+        yield SynthesisResult.ChunkResult(
+            bytes(audio_data[i : i + chunk_size]), i + chunk_size >= len(audio_data)
+        )
+
+
+async def copied_silence_chunks(seconds: float, chunk_size: int):
+    for _ in range(0, int(seconds * SAMPLING_RATE), chunk_size):
+        yield SynthesisResult.ChunkResult(MULAW_SILENCE_BYTE * chunk_size, False)
+    yield SynthesisResult.ChunkResult(MULAW_SILENCE_BYTE * chunk_size, True)
+
+
+async def copied_wav_chunks(synthesizer_config: SynthesizerConfig, wav_file, chunk_size: int):
+    output_bytes = convert_wav(
+        wav_file,
+        output_sample_rate=synthesizer_config.sampling_rate,
+        output_encoding=synthesizer_config.audio_encoding,
+    )
+    async for chunk_result in copied_audio_chunks(output_bytes, chunk_size):
+        yield chunk_result
+
+
+async def measure(name: str, create_chunk_generator: Callable[[], AsyncGenerator]):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks: List[SynthesisResult.ChunkResult] = [
+        chunk_result async for chunk_result in create_chunk_generator()
+    ]
+    elapsed = time.perf_counter() - start
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    statistics = snapshot.statistics("filename")
+    blocks = sum(statistic.count for statistic in statistics)
+    size = sum(statistic.size for statistic in statistics)
+    print(
+        f"  {name:<24} {len(chunks):4} chunks {blocks:6,} blocks {size / 1024:8,.1f} KiB held "
+        f"{peak / 1024:8,.1f} KiB peak {elapsed * 1000:6.2f}ms"
+    )
+
+
+def create_wav_file(audio: bytes) -> io.BytesIO:
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLING_RATE)
+        wav.writeframes(audio)
+    wav_file.seek(0)
+    return wav_file
+
+
+async def main(args):
+    synthesizer_config = SynthesizerConfig(
+        sampling_rate=SAMPLING_RATE, audio_encoding=AudioEncoding.MULAW
+    )
+    chunk_size = SAMPLING_RATE * args.chunk_ms // 1000
+    audio_data = bytes(range(256)) * (SAMPLING_RATE * args.seconds // 256)
+    message = BaseMessage(text="Thanks for calling, how can I help you today?")
+    cached_audio = CachedAudio(message, audio_data, synthesizer_config)
+    silence = CachedAudio(
+        BaseMessage(text=""), b"", synthesizer_config, trailing_silence_seconds=args.seconds
+    )
+    linear16_audio = bytes(range(256)) * (SAMPLING_RATE * 2 * args.seconds // 256)
+
+    print(f"{args.seconds}s of 8kHz mulaw in {args.chunk_ms}ms chunks, all chunks held")
+    print("cached audio")
+    await measure("bytes slices", lambda: copied_audio_chunks(audio_data, chunk_size))
+    await measure(
+        "memoryview slices",
+        lambda: cached_audio.create_synthesis_result(chunk_size).chunk_generator,
+    )
+    print("trailing silence")
+    await measure(
+        "new chunk per iteration", lambda: copied_silence_chunks(args.seconds, chunk_size)
+    )
+    await measure(
+        "shared silence chunk",
+        lambda: silence.create_silence_synthesis_result(chunk_size).chunk_generator,
+    )
+    print("synthesis result from wav")
+    await measure(
+        "bytes slices",
+        lambda: copied_wav_chunks(synthesizer_config, create_wav_file(linear16_audio), chunk_size),
+    )
+    await measure(
+        "memoryview slices",
+        lambda: BaseSynthesizer.create_synthesis_result_from_wav(
+            synthesizer_config, create_wav_file(linear16_audio), message, chunk_size
+        ).chunk_generator,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""Messages per second for framing and parsing Twilio media stream messages.
+
+Compares building a dict and calling json.dumps for every outbound media and mark message, and
+json.loads plus base64.b64decode for every inbound frame (how TwilioOutputDevice and
+TwilioPhoneConversation used to work), against TwilioFramer and parse_twilio_message.
+
+    poetry run python benchmarks/twilio_media_framing.py
+"""
+
+import base64
+import json
+import timeit
+import uuid
+from typing import Callable, List, Tuple
+
+from vocode.streaming.telephony.twilio_framing import TwilioFramer, parse_twilio_message
+
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+# 100ms of 8kHz mulaw per outbound chunk, 20ms per inbound frame, as Twilio sends them
+OUTBOUND_CHUNK = bytes(range(256)) * 3 + bytes(32)
+INBOUND_CHUNK = bytes(range(160))
+ITERATIONS = 20000
+
+
+def json_dumps_outbound(chunk: bytes, chunk_id: str) -> Tuple[str, str]:
+    media_message = {
+        "event": "media",
+        "streamSid": STREAM_SID,
+        "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
+    }
+    mark_message = {
+        "event": "mark",
+        "streamSid": STREAM_SID,
+        "mark": {
+            "name": chunk_id,
+        },
+    }
+    return json.dumps(media_message), json.dumps(mark_message)
+
+
+def json_loads_inbound(message: str) -> bytes:
+    data = json.loads(message)
+    return base64.b64decode(data["media"]["payload"])
+
+
+def report(name: str, benchmark: Callable[[], object], messages_per_call: int):
+    seconds = min(timeit.repeat(benchmark, number=ITERATIONS, repeat=5))
+    messages_per_second = ITERATIONS * messages_per_call / seconds
+    print(f"  {name:<24} {messages_per_second:12,.0f} messages/sec")
+
+
+def main():
+    framer = TwilioFramer(STREAM_SID)
+    chunk_id = str(uuid.uuid4())
+    inbound_message = json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": "4",
+            "media": {
+                "track": "inbound",
+                "chunk": "3",
+                "timestamp": "60",
+                "payload": base64.b64encode(INBOUND_CHUNK).decode("utf-8"),
+            },
+            "streamSid": STREAM_SID,
+        },
+        separators=(",", ":"),
+    )
+    # the same messages, only without the whitespace json.dumps puts after separators
+    assert [json.loads(message) for message in json_dumps_outbound(OUTBOUND_CHUNK, chunk_id)] == [
+        json.loads(framer.media(OUTBOUND_CHUNK)),
+        json.loads(framer.mark(chunk_id)),
+    ]
+    assert json_loads_inbound(inbound_message) == parse_twilio_message(inbound_message).audio
+
+    benchmarks: List[Tuple[str, List[Tuple[str, Callable[[], object]]]]] = [
+        (
+            "outbound media + mark",
+            [
+                ("json.dumps", lambda: json_dumps_outbound(OUTBOUND_CHUNK, chunk_id)),
+                (
+                    "TwilioFramer",
+                    lambda: (framer.media(OUTBOUND_CHUNK), framer.mark(chunk_id)),
+                ),
+            ],
+        ),
+        (
+            "inbound media",
+            [
+                ("json.loads", lambda: json_loads_inbound(inbound_message)),
+                ("parse_twilio_message", lambda: parse_twilio_message(inbound_message)),
+            ],
+        ),
+    ]
+    for title, implementations in benchmarks:
+        print(title)
+        messages_per_call = 2 if title.startswith("outbound") else 1
+        for name, benchmark in implementations:
+            report(name, benchmark, messages_per_call)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Recall and latency of retrieval through PineconeDB against the in-process LocalVectorDB.
+
+Nothing leaves the machine: embeddings come from a fake OpenAI client that maps each text to a
+fixed random vector after --embedding-latency, and Pinecone is a local aiohttp server with the
+same upsert/query API that answers with an exact search after --pinecone-latency. Every query is
+a noisy copy of one document, so recall@k is the share of queries that find their document.
+
+Queries run twice: cold, then again with the embeddings cached.
+
+    poetry run python benchmarks/vector_db_retrieval.py [--documents 2000] [--queries 200]
+        [--dimensions 1536] [--top-k 3] [--embedding-latency 0.1] [--pinecone-latency 0.03]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import numpy as np
+from aiohttp import web
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig, PineconeConfig
+from vocode.streaming.utils.async_requester import AsyncRequestor
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+from vocode.streaming.vector_db.embedding_cache import EmbeddingCache
+from vocode.streaming.vector_db.local import LocalVectorDB
+from vocode.streaming.vector_db.pinecone import PineconeDB
+
+QUERY_NOISE = 0.5
+
+
+class FakeEmbeddings:
+    def __init__(self, vectors: Dict[str, List[float]], latency: float):
+        self.vectors = vectors
+        self.latency = latency
+        self.requests = 0
+
+    async def create(self, input: List[str], model: str):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=self.vectors[text])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+class PineconeStandIn:
+    """Exact search behind Pinecone's upsert and query endpoints."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.ids: List[str] = []
+        self.metadatas: List[dict] = []
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=1024**3)
+        app.router.add_post("/vectors/upsert", self.upsert)
+        app.router.add_post("/query", self.query)
+        return app
+
+    async def upsert(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        vectors = np.asarray([doc["values"] for doc in body["vectors"]], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors = vectors if not len(self.ids) else np.concatenate([self.vectors, vectors])
+        self.ids += [doc["id"] for doc in body["vectors"]]
+        self.metadatas += [doc["metadata"] for doc in body["vectors"]]
+        return web.json_response({"upsertedCount": len(body["vectors"])})
+
+    async def query(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.latency)
+        body = await request.json()
+        query = np.asarray(body["vector"], dtype=np.float32)
+        scores = self.vectors @ (query / np.linalg.norm(query))
+        top = np.argsort(scores)[::-1][: body["top_k"]]
+        return web.json_response(
+            {
+                "matches": [
+                    {"id": self.ids[i], "score": float(scores[i]), "metadata": self.metadatas[i]}
+                    for i in top.tolist()
+                ]
+            }
+        )
+
+
+def make_corpus(
+    num_documents: int, num_queries: int, dimensions: int
+) -> Tuple[List[str], List[Tuple[str, str]], Dict[str, List[float]]]:
+    rng = np.random.default_rng(0)
+    document_vectors = rng.standard_normal((num_documents, dimensions)).astype(np.float32)
+    document_vectors /= np.linalg.norm(document_vectors, axis=1, keepdims=True)
+    documents = [f"document {i}" for i in range(num_documents)]
+    vectors = dict(zip(documents, document_vectors.tolist()))
+    queries = []
+    for j, i in enumerate(rng.integers(num_documents, size=num_queries).tolist()):
+        noise = rng.standard_normal(dimensions).astype(np.float32) / np.sqrt(dimensions)
+        query = f"query {j}"
+        vectors[query] = (document_vectors[i] + QUERY_NOISE * noise).tolist()
+        queries.append((query, documents[i]))
+    return documents, queries, vectors
+
+
+async def measure_queries(
+    vector_db: VectorDB, queries: List[Tuple[str, str]]
+) -> Tuple[float, List[float]]:
+    hits = 0
+    latencies = []
+    for query, expected_document in queries:
+        start = time.perf_counter()
+        docs_with_scores = await vector_db.similarity_search_with_score(query)
+        latencies.append(time.perf_counter() - start)
+        hits += any(doc.page_content == expected_document for doc, _ in docs_with_scores)
+    return hits / len(queries), latencies
+
+
+def report(name: str, recall: float, latencies: List[float]):
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(
+        f"  {name:<24} recall {recall:6.1%}  "
+        f"p50 {statistics.median(latencies_ms):8.2f}ms  p95 {p95:8.2f}ms"
+    )
+
+
+async def benchmark(name: str, create_vector_db: Callable[[], Awaitable[VectorDB]], args, corpus):
+    documents, queries, vectors = corpus
+    EmbeddingCache().clear()
+    vector_db = await create_vector_db()
+    embeddings = FakeEmbeddings(vectors, args.embedding_latency)
+    vector_db.openai_client = SimpleNamespace(embeddings=embeddings)  # type: ignore
+
+    start = time.perf_counter()
+    await vector_db.add_texts(documents, ids=[str(i) for i in range(len(documents))])
+    print(
+        f"{name}: added {len(documents)} documents in {time.perf_counter() - start:.2f}s "
+        f"with {embeddings.requests} embeddings requests"
+    )
+    report("cold", *await measure_queries(vector_db, queries))
+    report("cached embeddings", *await measure_queries(vector_db, queries))
+    await vector_db.tear_down()
+
+
+async def main(args):
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    corpus = make_corpus(args.documents, args.queries, args.dimensions)
+
+    stand_in = PineconeStandIn(args.pinecone_latency)
+    runner = web.AppRunner(stand_in.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    async def create_pinecone_db() -> VectorDB:
+        pinecone_db = PineconeDB(
+            PineconeConfig(index="benchmark", api_key="benchmark", top_k=args.top_k)
+        )
+        pinecone_db.pinecone_url = f"http://127.0.0.1:{port}"
+        return pinecone_db
+
+    with tempfile.TemporaryDirectory() as storage_path:
+
+        async def create_local_vector_db() -> VectorDB:
+            return LocalVectorDB(LocalVectorDBConfig(top_k=args.top_k, storage_path=storage_path))
+
+        await benchmark("PineconeDB (local stand-in)", create_pinecone_db, args, corpus)
+        await benchmark("LocalVectorDB (memory-mapped)", create_local_vector_db, args, corpus)
+
+    await AsyncRequestor().close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--embedding-latency", type=float, default=0.1)
+    parser.add_argument("--pinecone-latency", type=float, default=0.03)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""Upstream audio and serialization cost per call with and without the voice activity gate.
+
+Builds a call of 20 ms mu-law chunks at 8 kHz in which the caller speaks for the given share of
+the time, in utterances separated by line noise, and passes it through a VoiceActivityGate with
+the default settings. Reports the bytes that would be streamed to the transcriber, the time
+spent base64-encoding them into JSON the way the AssemblyAI and Gladia senders do, and the time
+the gate itself takes.
+
+    poetry run python benchmarks/voice_activity_gate.py [--minutes 5] [--speech-share 0.3]
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+import numpy as np
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.websocket import AudioMessage
+from vocode.streaming.utils.audio_dsp import lin2ulaw
+from vocode.streaming.utils.vad import EnergyVoiceActivityDetector, VoiceActivityGate
+
+SAMPLING_RATE = 8000
+CHUNK_SECONDS = 0.02
+UTTERANCE_SECONDS = 3.0
+
+
+def make_call(minutes: float, speech_share: float) -> List[bytes]:
+    rng = np.random.default_rng(0)
+    total = int(minutes * 60 * SAMPLING_RATE)
+    samples = rng.normal(0, 10, total)
+    utterance = int(UTTERANCE_SECONDS * SAMPLING_RATE)
+    period = int(utterance / speech_share)
+    t = np.arange(utterance) / SAMPLING_RATE
+    # a voice-like signal: a few harmonics of a wobbling pitch
+    pitch = 150 + 30 * np.sin(2 * np.pi * 2 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLING_RATE
+    voice = sum(3000 / k * np.sin(k * phase) for k in range(1, 5))
+    for start in range(period - utterance, total - utterance, period):
+        samples[start : start + utterance] += voice
+    pcm = np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+    ulaw = lin2ulaw(pcm)
+    chunk_size = int(SAMPLING_RATE * CHUNK_SECONDS)
+    return [ulaw[i : i + chunk_size] for i in range(0, len(ulaw), chunk_size)]
+
+
+def serialize(chunks: List[bytes]) -> float:
+    start = time.perf_counter()
+    for chunk in chunks:
+        json.dumps({"audio_data": AudioMessage.from_bytes(chunk).data})
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=5)
+    parser.add_argument("--speech-share", type=float, default=0.3)
+    args = parser.parse_args()
+
+    chunks = make_call(args.minutes, args.speech_share)
+    gate = VoiceActivityGate(
+        SAMPLING_RATE,
+        AudioEncoding.MULAW,
+        detector=EnergyVoiceActivityDetector(max_zero_crossing_rate=0.4),
+    )
+    start = time.perf_counter()
+    gated_chunks = [piece for chunk in chunks for piece in gate.process(chunk)]
+    gate_seconds = time.perf_counter() - start
+
+    print(f"{args.minutes:g} min call, caller speaking {args.speech_share:.0%} of the time")
+    for name, sent in [("ungated", chunks), ("gated", gated_chunks)]:
+        sent_bytes = sum(len(chunk) for chunk in sent)
+        print(
+            f"{name:>8}  {len(sent):6d} messages  {sent_bytes / 1024:8.1f} KiB audio  "
+            f"JSON serialization {serialize(sent) * 1000:7.1f} ms"
+        )
+    print(
+        f"    gate  {gate_seconds * 1000:.1f} ms total, "
+        f"{gate_seconds / len(chunks) * 1e6:.1f} us per chunk, "
+        f"{gate.stats.keepalives} keepalives, {gate.stats.saved_fraction:.0%} of the audio held back"
+    )
+
+
+if __name__ == "__main__":
+    main()
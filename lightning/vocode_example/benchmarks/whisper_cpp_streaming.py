@@ -0,0 +1,90 @@
+"""Real-time factor of the streaming WhisperCPPTranscriber on CPU.
+
+Feeds a 16-bit mono WAV file through the transcriber in 20ms chunks, as fast as it can process
+them, and reports how long whisper took against how long the audio is (a real-time factor below
+1 keeps up with a live call), how long each window took to transcribe, and the transcriptions.
+Needs a whisper.cpp shared library and a ggml model.
+
+    poetry run python benchmarks/whisper_cpp_streaming.py --libname libwhisper.so
+        --fname-model ggml-base.en.bin --wav call.wav [--step 1] [--window 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import wave
+from typing import List
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.transcriber import Transcription, WhisperCPPTranscriberConfig
+from vocode.streaming.transcriber.whisper_cpp_transcriber import WhisperCPPTranscriber
+
+CHUNK_SECONDS = 0.02
+
+
+class TimedWhisperCPPTranscriber(WhisperCPPTranscriber):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transcribe_seconds: List[float] = []
+        self.transcriptions: List[Transcription] = []
+
+    def transcribe_window(self) -> str:
+        start = time.perf_counter()
+        message = super().transcribe_window()
+        self.transcribe_seconds.append(time.perf_counter() - start)
+        return message
+
+    def produce_nonblocking(self, item: Transcription):
+        self.transcriptions.append(item)
+
+
+async def main(args):
+    with wave.open(args.wav, "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError("Expected a 16-bit mono WAV file")
+        sampling_rate = wav.getframerate()
+        audio = wav.readframes(wav.getnframes())
+    audio_seconds = len(audio) / 2 / sampling_rate
+    chunk_size = round(sampling_rate * CHUNK_SECONDS) * 2
+
+    # the transcriber's janus queues need a running event loop
+    transcriber = TimedWhisperCPPTranscriber(
+        WhisperCPPTranscriberConfig(
+            sampling_rate=sampling_rate,
+            audio_encoding=AudioEncoding.LINEAR16,
+            chunk_size=chunk_size,
+            libname=args.libname,
+            fname_model=args.fname_model,
+            streaming=True,
+            buffer_size_seconds=args.step,
+            window_seconds=args.window,
+        )
+    )
+    start = time.perf_counter()
+    for i in range(0, len(audio), chunk_size):
+        transcriber.process_chunk(audio[i : i + chunk_size])
+    elapsed = time.perf_counter() - start
+
+    for transcription in transcriber.transcriptions:
+        print(f"{'final' if transcription.is_final else 'interim':<8} {transcription.message}")
+    print()
+    window_ms = sorted(seconds * 1000 for seconds in transcriber.transcribe_seconds)
+    print(f"audio:            {audio_seconds:.1f}s")
+    print(f"processing:       {elapsed:.1f}s")
+    print(f"real-time factor: {elapsed / audio_seconds:.3f}")
+    if window_ms:
+        print(
+            f"whisper runs:     {len(window_ms)}, p50 {statistics.median(window_ms):.0f}ms, "
+            f"max {window_ms[-1]:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--libname", required=True)
+    parser.add_argument("--fname-model", required=True)
+    parser.add_argument("--wav", required=True)
+    parser.add_argument("--step", type=float, default=1)
+    parser.add_argument("--window", type=float, default=10)
+    asyncio.run(main(parser.parse_args()))
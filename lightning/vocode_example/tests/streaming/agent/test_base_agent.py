@@ -14,7 +14,7 @@ from vocode.streaming.agent.base_agent import (
 )
 from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
 from vocode.streaming.models.actions import EndOfTurn
-from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.agent import ChatGPTAgentConfig, SpeculativeResponseConfig
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.transcriber import Transcription
 from vocode.streaming.models.transcript import Transcript
@@ -147,6 +147,137 @@ async def test_generate_responses(mocker: MockerFixture):
     assert messages == [BaseMessage(text="Hi, how are you doing today?"), EndOfTurn()]
 
 
+def _mock_generate_response_by_input(mocker: MockerFixture, agent: BaseAgent) -> List[str]:
+    human_inputs: List[str] = []
+
+    async def mock_generate_response(human_input: str, *args, **kwargs):
+        human_inputs.append(human_input)
+        yield GeneratedResponse(
+            message=BaseMessage(text=f"You said: {human_input}"), is_interruptible=True
+        )
+
+    mocker.patch.object(agent, "generate_response", mock_generate_response)
+    return human_inputs
+
+
+@pytest.mark.asyncio
+async def test_speculative_response_is_used_when_final_transcription_matches(
+    mocker: MockerFixture,
+):
+    agent_config = ChatGPTAgentConfig(
+        prompt_preamble="Have a pleasant conversation about life",
+        speculative_response=SpeculativeResponseConfig(),
+    )
+    agent = _create_agent(mocker, agent_config)
+    human_inputs = _mock_generate_response_by_input(mocker, agent)
+
+    agent.start_speculative_response(
+        Transcription(message="hello there", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    await asyncio.sleep(0)
+    _send_transcription(
+        agent,
+        Transcription(message="Hello there.", confidence=1.0, is_final=True),
+    )
+    agent_consumer = QueueConsumer()
+    agent.agent_responses_consumer = agent_consumer
+    agent.start()
+    agent_responses = await _consume_until_end_of_turn(agent_consumer)
+    await agent.terminate()
+
+    messages = [response.message for response in agent_responses]
+    assert messages == [BaseMessage(text="You said: hello there"), EndOfTurn()]
+    assert human_inputs == ["hello there"]
+    assert agent.speculative_response_stats.hits == 1
+    assert agent.speculative_response_stats.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_speculative_response_is_discarded_when_final_transcription_differs(
+    mocker: MockerFixture,
+):
+    agent_config = ChatGPTAgentConfig(
+        prompt_preamble="Have a pleasant conversation about life",
+        speculative_response=SpeculativeResponseConfig(),
+    )
+    agent = _create_agent(mocker, agent_config)
+    human_inputs = _mock_generate_response_by_input(mocker, agent)
+
+    agent.start_speculative_response(
+        Transcription(message="hello there", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    speculative_response = agent.speculative_response
+    await asyncio.sleep(0)
+    _send_transcription(
+        agent,
+        Transcription(message="Hello there, my friend.", confidence=1.0, is_final=True),
+    )
+    agent_consumer = QueueConsumer()
+    agent.agent_responses_consumer = agent_consumer
+    agent.start()
+    agent_responses = await _consume_until_end_of_turn(agent_consumer)
+    await agent.terminate()
+
+    messages = [response.message for response in agent_responses]
+    assert messages == [BaseMessage(text="You said: Hello there, my friend."), EndOfTurn()]
+    assert human_inputs == ["hello there", "Hello there, my friend."]
+    assert speculative_response is not None
+    assert speculative_response.interruptible_event.is_interrupted()
+    assert agent.speculative_response_stats.hits == 0
+    assert agent.speculative_response_stats.misses == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fails_before_final_transcription", [True, False])
+async def test_failed_speculative_response_is_regenerated(
+    mocker: MockerFixture, fails_before_final_transcription: bool
+):
+    agent_config = ChatGPTAgentConfig(
+        prompt_preamble="Have a pleasant conversation about life",
+        speculative_response=SpeculativeResponseConfig(),
+    )
+    agent = _create_agent(mocker, agent_config)
+    human_inputs: List[str] = []
+
+    async def mock_generate_response(human_input: str, *args, **kwargs):
+        human_inputs.append(human_input)
+        if len(human_inputs) == 1:
+            # the speculative response fails, either before or after it is claimed
+            await asyncio.sleep(0 if fails_before_final_transcription else 0.02)
+            raise RuntimeError("transient error")
+        yield GeneratedResponse(
+            message=BaseMessage(text=f"You said: {human_input}"), is_interruptible=True
+        )
+
+    mocker.patch.object(agent, "generate_response", mock_generate_response)
+
+    agent.start_speculative_response(
+        Transcription(message="hello there", confidence=1.0, is_final=False),
+        conversation_id="conversation_id",
+    )
+    speculative_response = agent.speculative_response
+    assert speculative_response is not None
+    if fails_before_final_transcription:
+        await asyncio.wait_for(speculative_response.task, timeout=1)
+    _send_transcription(
+        agent,
+        Transcription(message="Hello there.", confidence=1.0, is_final=True),
+    )
+    agent_consumer = QueueConsumer()
+    agent.agent_responses_consumer = agent_consumer
+    agent.start()
+    agent_responses = await _consume_until_end_of_turn(agent_consumer)
+    await agent.terminate()
+
+    messages = [response.message for response in agent_responses]
+    assert messages == [BaseMessage(text="You said: Hello there."), EndOfTurn()]
+    assert human_inputs == ["hello there", "Hello there."]
+    assert speculative_response.failed_without_response()
+    assert agent.speculative_response_stats.misses == int(fails_before_final_transcription)
+
+
 @pytest.mark.asyncio
 async def test_function_call(mocker: MockerFixture):
     # TODO: assert that when we return a function call with a user message, it sends out a message alongside
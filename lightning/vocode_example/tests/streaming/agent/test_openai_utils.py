@@ -301,3 +301,40 @@ def test_format_openai_chat_messages_from_transcript_context_limit():
 
     for params, expected_output in test_cases:
         assert format_openai_chat_messages_from_transcript(*params) == expected_output
+
+
+def test_format_openai_chat_messages_from_transcript_incremental(mocker):
+    from vocode.streaming.agent import openai_utils
+
+    transcript = Transcript(
+        event_logs=[
+            Message(sender=Sender.BOT, text="Hello!", is_final=True),
+            Message(sender=Sender.HUMAN, text="Hi, I have a question."),
+            Message(sender=Sender.BOT, text="Sure, go"),
+        ]
+    )
+    params = (transcript, "gpt-3.5-turbo-0613", None, "prompt preamble")
+    format_openai_chat_messages_from_transcript(*params)
+
+    count_tokens = mocker.spy(openai_utils.ChatPromptBuilder, "count_tokens")
+    transcript.update_last_bot_message_on_cut_off("Sure, go ahead.")
+    transcript.event_logs[-1].is_final = True
+    transcript.event_logs.append(Message(sender=Sender.HUMAN, text="What is the weather?"))
+
+    assert format_openai_chat_messages_from_transcript(*params) == [
+        {"role": "system", "content": "prompt preamble"},
+        {"role": "assistant", "content": "Hello!"},
+        {"role": "user", "content": "Hi, I have a question."},
+        {"role": "assistant", "content": "Sure, go ahead."},
+        {"role": "user", "content": "What is the weather?"},
+    ]
+    # only the edited bot message and the new message are counted again
+    assert count_tokens.call_count == 2
+
+    # consecutive bot messages are still merged as they come in
+    transcript.event_logs.append(Message(sender=Sender.BOT, text="It is sunny.", is_final=True))
+    transcript.event_logs.append(Message(sender=Sender.BOT, text="Anything else?"))
+    assert format_openai_chat_messages_from_transcript(*params)[-1] == {
+        "role": "assistant",
+        "content": "It is sunny. Anything else?-",
+    }
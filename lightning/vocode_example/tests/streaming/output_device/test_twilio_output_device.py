@@ -146,7 +146,7 @@ def test_dtmf_tone_generator_caches(
 ):
     del SingletonMeta._instances[DTMFToneGenerator]
     lin2ulaw_mock = mocker.patch(
-        "audioop.lin2ulaw",
+        "vocode.streaming.utils.dtmf_utils.lin2ulaw",
         return_value=b"ulaw_encoded",
     )
 
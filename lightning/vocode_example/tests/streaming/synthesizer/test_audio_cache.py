@@ -1,3 +1,6 @@
+import asyncio
+import os
+
 import pytest
 from fakeredis import FakeAsyncRedis, FakeServer
 from pytest_mock import MockerFixture
@@ -6,23 +9,27 @@ from vocode.streaming.utils.singleton import Singleton
 
 
 @pytest.fixture(autouse=True)
-def cleanup_singleton_audio_cache():
+def cleanup_singleton_audio_cache(tmp_path, monkeypatch):
     from vocode.streaming.synthesizer.audio_cache import AudioCache
 
+    monkeypatch.setenv("AUDIO_CACHE_DIR", str(tmp_path / "audio_cache"))
     if AudioCache in Singleton._instances:
         del Singleton._instances[AudioCache]
     yield
 
 
-@pytest.mark.asyncio
-async def test_set_and_get(mocker: MockerFixture):
-    from vocode.streaming.synthesizer.audio_cache import AudioCache
-
+@pytest.fixture
+def fake_redis(mocker: MockerFixture) -> FakeAsyncRedis:
     fake_redis = FakeAsyncRedis()
-
     mocker.patch(
         "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
     )
+    return fake_redis
+
+
+@pytest.mark.asyncio
+async def test_set_and_get(fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
 
     cache = await AudioCache.safe_create()
     voice_identifier = "voice_id"
@@ -33,10 +40,16 @@ async def test_set_and_get(mocker: MockerFixture):
 
     await cache.set_audio(voice_identifier, text, audio_data)
     assert await cache.get_audio(voice_identifier, text) == b"chunk"
+    # the raw text is not part of the key
+    assert await fake_redis.keys() == [
+        f"audio_cache:{cache.get_audio_key(voice_identifier, text)}".encode()
+    ]
+    assert cache.stats.misses == 1
+    assert cache.stats.memory_hits == 1
 
 
 @pytest.mark.asyncio
-async def test_safe_create_set_and_get_disabled(mocker: MockerFixture):
+async def test_safe_create_set_and_get_redis_unavailable(mocker: MockerFixture):
     from vocode.streaming.synthesizer.audio_cache import AudioCache
 
     # will fail the ping
@@ -54,8 +67,132 @@ async def test_safe_create_set_and_get_disabled(mocker: MockerFixture):
     text = "text"
     audio_data = b"chunk"
 
+    assert cache.redis_disabled
     assert await cache.get_audio(voice_identifier, text) is None
 
     await cache.set_audio(voice_identifier, text, audio_data)
 
-    assert await cache.get_audio(voice_identifier, text) is None
+    # the local tiers keep working without redis
+    assert await cache.get_audio(voice_identifier, text) == b"chunk"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_safe_create_waits_for_ping(mocker: MockerFixture):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    server = FakeServer()
+    server.connected = False
+    fake_redis = FakeAsyncRedis(server=server)
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes", return_value=fake_redis
+    )
+    ping = mocker.spy(fake_redis, "ping")
+
+    caches = await asyncio.gather(*(AudioCache.safe_create() for _ in range(3)))
+
+    assert all(cache is caches[0] and cache.redis_disabled for cache in caches)
+    ping.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_key_normalizes_whitespace(fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    cache = await AudioCache.safe_create()
+    await cache.set_audio("voice_id", "  Hello   there\n", b"chunk")
+
+    assert await cache.get_audio("voice_id", "Hello there") == b"chunk"
+    assert await cache.get_audio("other_voice_id", "Hello there") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_eviction_falls_back_to_disk(tmp_path, fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    cache = AudioCache(memory_budget_bytes=10)
+    await cache.set_audio("voice_id", "first", b"a" * 6)
+    await cache.set_audio("voice_id", "second", b"b" * 6)
+
+    assert cache.stats.memory_evictions == 1
+    audio = await cache.get_audio("voice_id", "first")
+    # served from the memory-mapped file, without copying it
+    assert isinstance(audio, memoryview)
+    assert audio.readonly
+    assert audio == b"a" * 6
+    assert cache.stats.disk_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_survives_restarts(fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    await AudioCache().set_audio("voice_id", "text", b"chunk")
+    await fake_redis.flushall()
+    del Singleton._instances[AudioCache]
+
+    cache = AudioCache()
+    assert await cache.get_audio("voice_id", "text") == b"chunk"
+    assert cache.stats.disk_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_eviction(tmp_path, fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    cache = AudioCache(memory_budget_bytes=0, disk_budget_bytes=10)
+    await cache.set_audio("voice_id", "first", b"a" * 6)
+    await cache.set_audio("voice_id", "second", b"b" * 6)
+    await fake_redis.flushall()
+
+    assert cache.stats.disk_evictions == 1
+    assert len(os.listdir(tmp_path / "audio_cache")) == 1
+    assert await cache.get_audio("voice_id", "first") is None
+    assert await cache.get_audio("voice_id", "second") == b"b" * 6
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_cached_locally(fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    cache = AudioCache()
+    await fake_redis.set(cache.get_redis_key(cache.get_audio_key("voice_id", "text")), b"chunk")
+
+    assert await cache.get_audio("voice_id", "text") == b"chunk"
+    await fake_redis.flushall()
+    assert await cache.get_audio("voice_id", "text") == b"chunk"
+    assert cache.stats.to_dict() == {
+        "memory_hits": 1,
+        "disk_hits": 0,
+        "redis_hits": 1,
+        "misses": 0,
+        "memory_evictions": 0,
+        "disk_evictions": 0,
+        "hits": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_is_opt_in(tmp_path, monkeypatch, fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    monkeypatch.delenv("AUDIO_CACHE_DIR")
+    assert AudioCache().disk_store is None
+
+    del Singleton._instances[AudioCache]
+    cache = AudioCache(disk_cache_dir=str(tmp_path / "private"))
+    assert cache.disk_store is not None
+    assert os.stat(tmp_path / "private").st_mode & 0o777 == 0o700
+
+
+@pytest.mark.asyncio
+async def test_legacy_redis_key_is_read_and_migrated(fake_redis: FakeAsyncRedis):
+    from vocode.streaming.synthesizer.audio_cache import AudioCache
+
+    cache = AudioCache()
+    await fake_redis.set("audio_cache:voice_id:text", b"chunk", ex=60)
+
+    assert await cache.get_audio("voice_id", "text") == b"chunk"
+    redis_key = cache.get_redis_key(cache.get_audio_key("voice_id", "text"))
+    assert await fake_redis.keys() == [redis_key.encode()]
+    assert 0 < await fake_redis.ttl(redis_key) <= 60
+    assert cache.stats.redis_hits == 1
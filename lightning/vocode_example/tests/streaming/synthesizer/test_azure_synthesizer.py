@@ -0,0 +1,113 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import AzureSynthesizerConfig
+from vocode.streaming.synthesizer.azure_synthesizer import AzureSynthesizer
+
+CHUNK_SIZE = 160
+READ_SECONDS = 0.05
+
+
+class SlowAudioDataStream:
+    """Blocks in read_data like the SDK does while it waits for Azure to send audio."""
+
+    def __init__(self, result, num_chunks: int = 6):
+        self.remaining_chunks = num_chunks
+        self.cancellation_details = None
+
+    def read_data(self, audio_buffer: bytes) -> int:
+        time.sleep(READ_SECONDS)
+        if self.remaining_chunks == 0:
+            return 0
+        self.remaining_chunks -= 1
+        return len(audio_buffer)
+
+
+def word_boundary_event(result_id: str, text: str, text_offset: int, seconds: float):
+    return SimpleNamespace(
+        result_id=result_id,
+        text=text,
+        text_offset=text_offset,
+        audio_offset=int(seconds * 10000 * 1000),
+        boundary_type="Word",
+    )
+
+
+@pytest.fixture
+def synthesizer(mocker: MockerFixture) -> AzureSynthesizer:
+    mocker.patch(
+        "vocode.streaming.synthesizer.azure_synthesizer.speechsdk.AudioDataStream",
+        SlowAudioDataStream,
+    )
+    return AzureSynthesizer(
+        AzureSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.MULAW),
+        azure_speech_key="key",
+        azure_speech_region="eastus",
+    )
+
+
+@pytest.mark.asyncio
+async def test_reading_audio_does_not_block_event_loop(
+    synthesizer: AzureSynthesizer, mocker: MockerFixture
+):
+    result_ids = iter(["first", "second"])
+    mocker.patch.object(
+        synthesizer,
+        "synthesize_ssml",
+        side_effect=lambda ssml: SimpleNamespace(result_id=next(result_ids)),
+    )
+    lags: List[float] = []
+
+    async def measure_lag():
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(0.005)
+            lags.append(time.monotonic() - start - 0.005)
+
+    async def read_all(text: str) -> bytes:
+        synthesis_result = await synthesizer.create_speech_uncached(
+            BaseMessage(text=text), CHUNK_SIZE
+        )
+        return b"".join([chunk.chunk async for chunk in synthesis_result.chunk_generator])
+
+    lag_task = asyncio.create_task(measure_lag())
+    audio = await asyncio.gather(read_all("Hello there."), read_all("How are you?"))
+    lag_task.cancel()
+
+    assert [len(chunks) for chunks in audio] == [6 * CHUNK_SIZE, 6 * CHUNK_SIZE]
+    # both utterances were read concurrently, and the loop kept ticking while they blocked
+    assert max(lags) < READ_SECONDS / 2
+    assert synthesizer.word_boundary_event_pools == {}
+
+
+@pytest.mark.asyncio
+async def test_word_boundaries_are_routed_per_utterance(
+    synthesizer: AzureSynthesizer, mocker: MockerFixture
+):
+    mocker.patch.object(
+        synthesizer, "synthesize_ssml", return_value=SimpleNamespace(result_id="result")
+    )
+    # events can arrive before the result id is known
+    synthesizer.word_boundary_cb(word_boundary_event("result", "Hello", 0, 0.1))
+    synthesizer.word_boundary_cb(word_boundary_event("other", "Other", 0, 0.1))
+
+    synthesis_result = await synthesizer.create_speech_uncached(
+        BaseMessage(text="Hello there friend"), CHUNK_SIZE
+    )
+    ssml = synthesizer.create_ssml("Hello there friend", synthesizer.synthesizer_config)
+    text_offset = ssml.index("friend")
+    synthesizer.word_boundary_cb(word_boundary_event("result", "friend", text_offset, 0.6))
+
+    assert synthesis_result.get_message_up_to(0.5) == ssml[:text_offset].split(">")[-1]
+    assert synthesis_result.get_message_up_to(None) == "Hello there friend"
+
+    async for _ in synthesis_result.chunk_generator:
+        pass
+    assert set(synthesizer.word_boundary_event_pools) == {"other"}
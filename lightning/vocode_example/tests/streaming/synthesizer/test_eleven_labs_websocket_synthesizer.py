@@ -0,0 +1,71 @@
+import base64
+import json
+from typing import List, Optional
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.audio import AudioEncoding, SamplingRate
+from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
+from vocode.streaming.synthesizer.eleven_labs_websocket_synthesizer import ElevenLabsWSSynthesizer
+from vocode.streaming.utils.audio_dsp import Resampler
+
+ELEVEN_LABS_AUDIO = (
+    (3000 * np.sin(2 * np.pi * 440 * np.arange(4410) / 44100)).astype(np.int16).tobytes()
+)
+
+
+class FakeWebsocket:
+    def __init__(self, messages: List[str]):
+        self.messages = messages
+        self.sent: List[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def send(self, message: str):
+        self.sent.append(message)
+
+    async def recv(self) -> str:
+        return self.messages.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_upsampled_turn_ends_with_the_resampler_tail(mocker: MockerFixture):
+    synthesizer = ElevenLabsWSSynthesizer(
+        ElevenLabsSynthesizerConfig(
+            sampling_rate=SamplingRate.RATE_48000,
+            audio_encoding=AudioEncoding.LINEAR16,
+            api_key="api_key",
+            voice_id="voice_id",
+            experimental_websocket=True,
+        )
+    )
+    messages = [
+        json.dumps({"audio": base64.b64encode(ELEVEN_LABS_AUDIO[start : start + 2000]).decode()})
+        for start in range(0, len(ELEVEN_LABS_AUDIO), 2000)
+    ]
+    messages.append(json.dumps({"audio": None, "isFinal": True}))
+    mocker.patch(
+        "vocode.streaming.synthesizer.eleven_labs_websocket_synthesizer.websockets.connect",
+        return_value=FakeWebsocket(messages),
+    )
+    await synthesizer.text_chunk_queue.put(None)
+
+    await synthesizer.establish_websocket_listeners(chunk_size=960)
+    chunks: List[bytes] = []
+    while True:
+        chunk: Optional[bytes] = synthesizer.voice_packet_queue.get_nowait()
+        if chunk is None:
+            break
+        chunks.append(bytes(chunk))
+
+    resampler = Resampler(44100, 48000)
+    expected = resampler.process(ELEVEN_LABS_AUDIO) + resampler.flush()
+    assert b"".join(chunks)[: len(expected)] == expected
+    # the last chunk is padded with silence to the chunk size
+    assert not any(b"".join(chunks)[len(expected) :])
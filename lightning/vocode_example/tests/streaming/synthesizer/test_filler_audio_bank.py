@@ -0,0 +1,215 @@
+import asyncio
+import io
+import wave
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from pytest_mock import MockerFixture
+
+from tests.fixtures.synthesizer import TestSynthesizer, TestSynthesizerConfig
+from vocode.streaming.models.agent import FillerAudioConfig
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage, BotBackchannel, LLMToken
+from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
+from vocode.streaming.synthesizer import base_synthesizer
+from vocode.streaming.synthesizer.audio_cache import AudioCache
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, CachedAudio, FillerAudio
+from vocode.streaming.synthesizer.eleven_labs_websocket_synthesizer import ElevenLabsWSSynthesizer
+from vocode.streaming.synthesizer.filler_audio_bank import FillerAudioBank
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest.fixture(autouse=True)
+def cleanup_singletons(tmp_path, monkeypatch, mocker: MockerFixture):
+    monkeypatch.setenv("AUDIO_CACHE_DIR", str(tmp_path / "audio_cache"))
+    mocker.patch(
+        "vocode.streaming.synthesizer.audio_cache.initialize_redis_bytes",
+        return_value=FakeAsyncRedis(),
+    )
+    for singleton_class in (AudioCache, FillerAudioBank):
+        Singleton._instances.pop(singleton_class, None)
+    yield
+
+
+def create_synthesizer(**kwargs) -> TestSynthesizer:
+    return TestSynthesizer(
+        TestSynthesizerConfig(sampling_rate=8000, audio_encoding=AudioEncoding.LINEAR16, **kwargs)
+    )
+
+
+async def collect_chunks(synthesis_result):
+    return [
+        (chunk_result.chunk, chunk_result.is_last_chunk)
+        async for chunk_result in synthesis_result.chunk_generator
+    ]
+
+
+@pytest.fixture
+def typing_noise_path(tmp_path, mocker: MockerFixture) -> str:
+    path = str(tmp_path / "typing-noise.wav")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(bytes(range(256)) * 500)
+    mocker.patch("vocode.streaming.synthesizer.base_synthesizer.TYPING_NOISE_PATH", path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_typing_noise_is_shared_between_synthesizers(typing_noise_path: str):
+    typing_noise = create_synthesizer().get_typing_noise_filler_audio()
+
+    assert create_synthesizer().get_typing_noise_filler_audio() is typing_noise
+    chunks = await collect_chunks(typing_noise.create_synthesis_result())
+    assert b"".join(chunk for chunk, _ in chunks) == typing_noise.audio_data
+    assert all(isinstance(chunk, memoryview) and chunk.readonly for chunk, _ in chunks)
+    assert [is_last for _, is_last in chunks] == [False] * (len(chunks) - 1) + [True]
+    # a second use serves the same precomputed chunks
+    assert [chunk for chunk, _ in chunks] == list(typing_noise.get_chunks())
+
+
+@pytest.mark.asyncio
+async def test_phrase_filler_audios_are_created_once(mocker: MockerFixture):
+    get_phrase_filler_audios = mocker.AsyncMock(
+        side_effect=lambda: [
+            FillerAudio(
+                BaseMessage(text="Um..."), b"\x01\x00" * 10000, synthesizer.synthesizer_config
+            )
+        ]
+    )
+    synthesizer = create_synthesizer()
+    other_synthesizer = create_synthesizer()
+    for s in (synthesizer, other_synthesizer):
+        mocker.patch.object(s, "get_phrase_filler_audios", get_phrase_filler_audios)
+        await s.set_filler_audios(FillerAudioConfig())
+
+    get_phrase_filler_audios.assert_awaited_once()
+    assert synthesizer.filler_audios is other_synthesizer.filler_audios
+    assert synthesizer.filler_audios[0].chunks is not None
+
+
+@pytest.mark.asyncio
+async def test_filler_audio_chunks_encoded_as_wav_once(mocker: MockerFixture):
+    synthesizer = create_synthesizer(should_encode_as_wav=True)
+    filler_audio = FillerAudio(
+        BaseMessage(text="Um..."), b"\x01\x00" * 10000, synthesizer.synthesizer_config
+    )
+    encode_as_wav = mocker.spy(base_synthesizer, "encode_as_wav")
+
+    for _ in range(3):
+        chunks = await collect_chunks(filler_audio.create_synthesis_result())
+
+    assert encode_as_wav.call_count == len(chunks) == 2
+    with wave.open(io.BytesIO(chunks[0][0]), "rb") as wav:
+        assert wav.getframerate() == 8000
+        assert wav.getnframes() == 8000
+
+
+@pytest.mark.asyncio
+async def test_loaded_phrases_are_not_synthesized_again(mocker: MockerFixture):
+    synthesizer = create_synthesizer()
+    chunk_size = 4
+    expected = await collect_chunks(
+        await synthesizer.create_speech_uncached(BaseMessage(text="Oh okay, got it."), chunk_size)
+    )
+    create_speech_uncached = mocker.spy(synthesizer, "create_speech_uncached")
+
+    await synthesizer.load_phrase_audios(["Oh okay, got it."], chunk_size)
+    await synthesizer.load_phrase_audios(["Oh okay, got it."], chunk_size)
+    assert create_speech_uncached.call_count == 1
+
+    other_synthesizer = create_synthesizer()
+    other_create_speech_uncached = mocker.spy(other_synthesizer, "create_speech_uncached")
+    synthesis_result = await other_synthesizer.create_speech(
+        BotBackchannel(text="Oh okay, got it."), chunk_size
+    )
+
+    other_create_speech_uncached.assert_not_called()
+    assert synthesis_result.cached
+    assert synthesis_result.get_message_up_to(0.1) == "Oh okay, got it."
+    chunks = await collect_chunks(synthesis_result)
+    assert [chunk for chunk, _ in chunks] == [chunk for chunk, _ in expected]
+    assert chunks[-1][1]
+    # other chunk sizes are synthesized as usual
+    await other_synthesizer.create_speech(BaseMessage(text="Oh okay, got it."), chunk_size * 2)
+    other_create_speech_uncached.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_input_streaming_synthesizer_does_not_use_the_phrase_bank(mocker: MockerFixture):
+    synthesizer = ElevenLabsWSSynthesizer(
+        ElevenLabsSynthesizerConfig(
+            sampling_rate=16000,
+            audio_encoding=AudioEncoding.LINEAR16,
+            api_key="api_key",
+            voice_id="voice_id",
+            experimental_websocket=True,
+        )
+    )
+    mocker.patch.object(synthesizer, "establish_websocket_listeners", mocker.AsyncMock())
+    chunk_size = 4
+    # a turn is streaming over the conversation's websocket
+    await synthesizer.send_token_to_synthesizer(LLMToken(text="Sure, "), chunk_size)
+    await synthesizer.voice_packet_queue.put(b"\x01\x00" * 2)
+
+    await asyncio.wait_for(
+        synthesizer.load_phrase_audios(["Oh okay, got it."], chunk_size), timeout=1
+    )
+
+    assert [synthesizer.text_chunk_queue.get_nowait().text] == ["Sure, "]
+    assert synthesizer.voice_packet_queue.qsize() == 1
+    key = synthesizer.get_audio_bank_key(chunk_size)
+    assert FillerAudioBank().get_phrase_chunks(key, "Oh okay, got it.") is None
+
+    # even with the phrase in the bank, a backchannel goes over the websocket
+    FillerAudioBank().set_phrase_chunks(key, "Oh okay, got it.", [b"\x01\x00" * 2])
+    synthesis_result = await synthesizer.create_speech(
+        BotBackchannel(text="Oh okay, got it."), chunk_size, is_first_text_chunk=True
+    )
+    assert not synthesis_result.cached
+    assert isinstance(synthesizer.text_chunk_queue.get_nowait(), BotBackchannel)
+
+
+@pytest.mark.asyncio
+async def test_cached_audio_chunks_are_views_of_the_cached_audio():
+    synthesizer_config = create_synthesizer().synthesizer_config
+    audio_data = bytes(range(256)) * 10
+    cached_audio = CachedAudio(
+        BaseMessage(text="Hi there"), audio_data, synthesizer_config, trailing_silence_seconds=0.1
+    )
+
+    chunks = await collect_chunks(cached_audio.create_synthesis_result(chunk_size=1000))
+
+    assert all(isinstance(chunk, memoryview) and chunk.readonly for chunk, _ in chunks)
+    assert b"".join(chunk for chunk, _ in chunks[:3]) == audio_data
+    assert all(chunk.obj is audio_data for chunk, _ in chunks[:3])
+    # 0.1s of 8kHz linear16 is 1600 bytes, the same preallocated silence chunk every time
+    silence_chunks = [chunk for chunk, _ in chunks[3:]]
+    assert len(silence_chunks) == 3
+    assert all(chunk is silence_chunks[0] for chunk in silence_chunks)
+    assert silence_chunks[0] == bytes(1000)
+    assert [is_last for _, is_last in chunks] == [False] * 5 + [True]
+
+
+@pytest.mark.asyncio
+async def test_synthesis_result_from_wav_is_sliced_without_copying():
+    synthesizer_config = create_synthesizer().synthesizer_config
+    wav_file = io.BytesIO()
+    with wave.open(wav_file, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(bytes(range(256)) * 10)
+    wav_file.seek(0)
+
+    synthesis_result = BaseSynthesizer.create_synthesis_result_from_wav(
+        synthesizer_config, wav_file, BaseMessage(text="Hi there"), chunk_size=1000
+    )
+    chunks = await collect_chunks(synthesis_result)
+
+    assert [len(chunk) for chunk, _ in chunks] == [1000, 1000, 560]
+    assert all(isinstance(chunk, memoryview) for chunk, _ in chunks)
+    assert chunks[0][0].obj is chunks[-1][0].obj
+    assert b"".join(chunk for chunk, _ in chunks) == bytes(range(256)) * 10
+    assert [is_last for _, is_last in chunks] == [False, False, True]
@@ -0,0 +1,25 @@
+from nltk.tokenize import TreebankWordTokenizer
+from nltk.tokenize.treebank import TreebankWordDetokenizer
+
+from vocode.streaming.synthesizer.base_synthesizer import MessageWordIndex
+
+
+def test_cutoffs_match_the_detokenized_words():
+    text = 'He said "don\'t go"... then left. It costs $5.50, (maybe) more?'
+    tokens = TreebankWordTokenizer().tokenize(text)
+    index = MessageWordIndex(text, tokens)
+
+    assert len(index) == len(tokens)
+    for num_words in range(len(tokens) + 1):
+        assert index.text_up_to_words(num_words) == TreebankWordDetokenizer().detokenize(
+            tokens[:num_words]
+        )
+    assert index.text_up_to_words(len(tokens) + 10) == text
+
+
+def test_cutoffs_keep_the_original_whitespace():
+    text = "First line.\n\nSecond   line"
+    index = MessageWordIndex(text, TreebankWordTokenizer().tokenize(text))
+
+    assert index.text_up_to_words(0) == ""
+    assert index.text_up_to_words(3) == "First line.\n\nSecond"
@@ -0,0 +1,60 @@
+from typing import List
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.synthesizer import PlayHtSynthesizerConfig
+from vocode.streaming.synthesizer.play_ht_synthesizer_v2 import PlayHtSynthesizerV2
+from vocode.streaming.utils.audio_dsp import Resampler
+
+PLAY_HT_AUDIO = (
+    (3000 * np.sin(2 * np.pi * 440 * np.arange(4800) / 24000)).astype(np.int16).tobytes()
+)
+
+
+@pytest_asyncio.fixture
+async def create_synthesizer():
+    synthesizers: List[PlayHtSynthesizerV2] = []
+
+    def create(sampling_rate: int) -> PlayHtSynthesizerV2:
+        synthesizer = PlayHtSynthesizerV2(
+            PlayHtSynthesizerConfig(
+                voice_id="voice_id",
+                api_key="api_key",
+                user_id="user_id",
+                sampling_rate=sampling_rate,
+                audio_encoding=AudioEncoding.LINEAR16,
+            )
+        )
+        synthesizers.append(synthesizer)
+        return synthesizer
+
+    yield create
+    for synthesizer in synthesizers:
+        await synthesizer.playht_client_saas.close()
+
+
+async def play_ht_chunks():
+    for start in range(0, len(PLAY_HT_AUDIO), 1000):
+        yield PLAY_HT_AUDIO[start : start + 1000]
+
+
+@pytest.mark.asyncio
+async def test_downsampled_stream_ends_with_the_resampler_tail(create_synthesizer):
+    synthesizer = create_synthesizer(16000)
+
+    chunks = [chunk async for chunk in synthesizer.downsample_async_generator(play_ht_chunks())]
+
+    resampler = Resampler(24000, 16000)
+    assert b"".join(chunks) == resampler.process(PLAY_HT_AUDIO) + resampler.flush()
+
+
+@pytest.mark.asyncio
+async def test_stream_at_24khz_is_passed_through(create_synthesizer):
+    synthesizer = create_synthesizer(24000)
+
+    chunks = [chunk async for chunk in synthesizer.downsample_async_generator(play_ht_chunks())]
+
+    assert chunks == [chunk async for chunk in play_ht_chunks()]
@@ -0,0 +1,106 @@
+import base64
+import json
+
+import pytest
+from aioresponses import aioresponses
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.synthesizer import WavesSynthesizerConfig
+from vocode.streaming.synthesizer.custom_waves_lightning_synthesizer import (
+    WAVES_LIGHTNING_V2_STREAM_URL,
+    WavesSynthesizer,
+)
+
+PCM_AUDIO = bytes(range(256)) * 10
+
+
+def sse_body(audio: bytes, events: int) -> str:
+    event_size = len(audio) // events + 1  # odd sized, so samples get split across events
+    lines = [
+        "data: " + json.dumps({"audio": base64.b64encode(audio[i : i + event_size]).decode()})
+        for i in range(0, len(audio), event_size)
+    ]
+    lines.append('data: {"done": true}')
+    return "\n\n".join(lines) + "\n\n"
+
+
+@pytest.fixture
+def synthesizer() -> WavesSynthesizer:
+    return WavesSynthesizer(
+        WavesSynthesizerConfig(
+            api_token="token",
+            sampling_rate=16000,
+            audio_encoding=AudioEncoding.LINEAR16,
+        )
+    )
+
+
+def test_request_body_passes_on_text_options(synthesizer: WavesSynthesizer):
+    body = synthesizer.get_request_body("Namaste")
+
+    assert body["remove_extra_silence"] is False
+    assert body["transliterate"] is True
+
+
+def test_voice_identifier_covers_text_options(synthesizer: WavesSynthesizer):
+    config = synthesizer.synthesizer_config
+    voice_identifiers = {
+        WavesSynthesizer.get_voice_identifier(config),
+        WavesSynthesizer.get_voice_identifier(config.copy(update={"remove_extra_silence": True})),
+        WavesSynthesizer.get_voice_identifier(config.copy(update={"transliterate": False})),
+    }
+
+    assert len(voice_identifiers) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_speech_streams_chunks(synthesizer: WavesSynthesizer):
+    message = BaseMessage(text="Hello there, how are you?")
+    with aioresponses() as m:
+        m.post(WAVES_LIGHTNING_V2_STREAM_URL, status=200, body=sse_body(PCM_AUDIO, 7))
+        synthesis_result = await synthesizer.create_speech_uncached(message, chunk_size=320)
+        chunks = [chunk_result.chunk async for chunk_result in synthesis_result.chunk_generator]
+
+    assert b"".join(chunks) == PCM_AUDIO
+    assert all(len(chunk) == 320 for chunk in chunks[:-1])
+    # 2560 bytes of 16kHz linear16 audio is 0.08 seconds
+    assert synthesis_result.get_message_up_to(0.04) == message.text[: len(message.text) // 2]
+    assert synthesis_result.get_message_up_to(None) == message.text
+
+
+@pytest.mark.asyncio
+async def test_create_speech_error_ends_stream(synthesizer: WavesSynthesizer):
+    with aioresponses() as m:
+        m.post(WAVES_LIGHTNING_V2_STREAM_URL, status=401, body="Unauthorized")
+        synthesis_result = await synthesizer.create_speech_uncached(
+            BaseMessage(text="Hello"), chunk_size=320
+        )
+        chunks = [chunk_result.chunk async for chunk_result in synthesis_result.chunk_generator]
+
+    assert chunks == []
+
+
+@pytest.mark.asyncio
+async def test_create_speech_caches_cacheable_messages(
+    synthesizer: WavesSynthesizer, mocker: MockerFixture
+):
+    audio_cache = mocker.AsyncMock()
+    mocker.patch(
+        "vocode.streaming.synthesizer.custom_waves_lightning_synthesizer.AudioCache.safe_create",
+        return_value=audio_cache,
+    )
+    with aioresponses() as m:
+        m.post(WAVES_LIGHTNING_V2_STREAM_URL, status=200, body=sse_body(PCM_AUDIO, 3))
+        synthesis_result = await synthesizer.create_speech_uncached(
+            BaseMessage(text="Hi!", cache_phrase="greeting"), chunk_size=320
+        )
+        async for _ in synthesis_result.chunk_generator:
+            pass
+
+    audio_cache.set_audio.assert_awaited_once_with(
+        WavesSynthesizer.get_voice_identifier(synthesizer.synthesizer_config),
+        "greeting",
+        PCM_AUDIO,
+    )
@@ -0,0 +1,88 @@
+from typing import Generator
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.telephony import TwilioCallConfig, TwilioConfig
+from vocode.streaming.telephony.config_manager.redis_config_manager import RedisConfigManager
+from vocode.streaming.utils.redis import (
+    RedisClientRegistry,
+    initialize_redis,
+    initialize_redis_bytes,
+)
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest.fixture
+def fake_redis(mocker: MockerFixture) -> FakeAsyncRedis:
+    fake_redis = FakeAsyncRedis(decode_responses=True)
+    mocker.patch(
+        "vocode.streaming.telephony.config_manager.redis_config_manager.initialize_redis",
+        return_value=fake_redis,
+    )
+    return fake_redis
+
+
+@pytest.fixture
+def registry() -> Generator[RedisClientRegistry, None, None]:
+    Singleton._instances.pop(RedisClientRegistry, None)
+    yield RedisClientRegistry()
+    del Singleton._instances[RedisClientRegistry]
+
+
+def _create_call_config(to_phone: str) -> TwilioCallConfig:
+    return TwilioCallConfig(
+        transcriber_config=TwilioCallConfig.default_transcriber_config(),
+        agent_config=ChatGPTAgentConfig(prompt_preamble="Test prompt"),
+        synthesizer_config=TwilioCallConfig.default_synthesizer_config(),
+        twilio_config=TwilioConfig(account_sid="account_sid", auth_token="auth_token"),
+        twilio_sid="twilio_sid",
+        from_phone="+15555555555",
+        to_phone=to_phone,
+        direction="outbound",
+    )
+
+
+def test_registry_shares_clients(registry: RedisClientRegistry):
+    assert initialize_redis() is initialize_redis()
+    assert initialize_redis_bytes() is initialize_redis_bytes()
+    assert initialize_redis() is not initialize_redis_bytes()
+    assert len(registry.clients) == 2
+
+
+@pytest.mark.asyncio
+async def test_save_and_get_configs_in_one_round_trip(
+    fake_redis: FakeAsyncRedis, mocker: MockerFixture
+):
+    config_manager = RedisConfigManager()
+    configs = {f"conversation_{i}": _create_call_config(f"+1555000000{i}") for i in range(3)}
+    pipeline = mocker.spy(fake_redis, "pipeline")
+    mget = mocker.spy(fake_redis, "mget")
+
+    await config_manager.save_configs(configs)
+    fetched_configs = await config_manager.get_configs(
+        ["conversation_2", "missing", "conversation_0"]
+    )
+
+    assert pipeline.call_count == 1
+    assert mget.call_count == 1
+    assert fetched_configs == [configs["conversation_2"], None, configs["conversation_0"]]
+    assert 0 < await fake_redis.ttl("conversation_0") <= 60 * 60 * 24
+
+
+@pytest.mark.asyncio
+async def test_local_cache_skips_redis(fake_redis: FakeAsyncRedis, mocker: MockerFixture):
+    config_manager = RedisConfigManager(local_cache_seconds=60)
+    config = _create_call_config("+15550000000")
+    await config_manager.save_config("conversation", config)
+    get = mocker.spy(fake_redis, "get")
+
+    assert await config_manager.get_config("conversation") == config
+    assert await config_manager.get_configs(["conversation"]) == [config]
+    assert get.call_count == 0
+
+    await config_manager.delete_config("conversation")
+    assert await config_manager.get_config("conversation") is None
+    assert get.call_count == 1
@@ -0,0 +1,86 @@
+import base64
+import json
+
+import pytest
+
+from vocode.streaming.telephony.twilio_framing import TwilioFramer, parse_twilio_message
+
+
+@pytest.mark.parametrize(
+    "stream_sid", ["MZ18ad3ab5a668481ce02b83e7395059f0", 'a "quoted"\\sid', None]
+)
+def test_framed_messages_match_json_dumps(stream_sid):
+    framer = TwilioFramer(stream_sid)
+    chunk = bytes(range(256)) * 4
+
+    assert json.loads(framer.media(chunk)) == {
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
+    }
+    assert json.loads(framer.media(b"")) == {
+        "event": "media",
+        "streamSid": stream_sid,
+        "media": {"payload": ""},
+    }
+    assert json.loads(framer.mark('chunk "1"')) == {
+        "event": "mark",
+        "streamSid": stream_sid,
+        "mark": {"name": 'chunk "1"'},
+    }
+    assert json.loads(framer.clear()) == {"event": "clear", "streamSid": stream_sid}
+
+
+def test_parse_media_message():
+    chunk = bytes(range(160))
+    message = json.dumps(
+        {
+            "event": "media",
+            "sequenceNumber": "3",
+            "media": {
+                "track": "inbound",
+                "chunk": "1",
+                "timestamp": "5",
+                "payload": base64.b64encode(chunk).decode("utf-8"),
+            },
+            "streamSid": "MZ18ad3ab5a668481ce02b83e7395059f0",
+        },
+        separators=(",", ":"),
+    )
+
+    parsed_message = parse_twilio_message(message)
+    assert parsed_message.event == "media"
+    assert parsed_message.audio == chunk
+    # the fast path does not parse the rest of the message
+    assert parsed_message.data is None
+
+
+def test_parse_media_message_with_unexpected_layout():
+    chunk = bytes(range(160))
+    message = json.dumps(
+        {
+            "streamSid": "MZ18ad3ab5a668481ce02b83e7395059f0",
+            "event": "media",
+            "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
+        },
+        indent=2,
+    )
+
+    parsed_message = parse_twilio_message(message)
+    assert parsed_message.event == "media"
+    assert parsed_message.audio == chunk
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"event": "mark", "streamSid": "MZ1", "mark": {"name": "chunk_id"}},
+        {"event": "stop", "streamSid": "MZ1", "stop": {"callSid": "CA1"}},
+        {"event": "start", "start": {"streamSid": "MZ1", "customParameters": {"payload": "x"}}},
+    ],
+)
+def test_parse_other_messages(data):
+    parsed_message = parse_twilio_message(json.dumps(data, separators=(",", ":")))
+    assert parsed_message.event == data["event"]
+    assert parsed_message.data == data
+    assert parsed_message.audio is None
@@ -0,0 +1,149 @@
+import asyncio
+from typing import List, Optional
+
+import numpy as np
+import pytest
+
+from tests.fixtures.transcriber import TestTranscriberConfig
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.transcriber import Transcription, VoiceActivityGateConfig
+from vocode.streaming.transcriber.base_transcriber import BaseAsyncTranscriber
+from vocode.streaming.utils.vad import EnergyVoiceActivityDetector, VoiceActivityGate, get_rms_dbfs
+
+SAMPLING_RATE = 16000
+FRAME_LENGTH = 320  # 20 ms
+FRAME_BYTES = FRAME_LENGTH * 2
+WORD_FREQUENCIES = {400: "hello", 700: "how", 1000: "are", 1300: "you"}
+
+
+class ToneWordTranscriber(BaseAsyncTranscriber[TestTranscriberConfig]):
+    """An offline stand-in for a streaming transcriber: hears each 20 ms frame of a pure tone as
+    the word for its frequency, and finalizes the utterance after 0.5 s without words, the way
+    a service's endpointing does."""
+
+    __test__ = False
+
+    def transcribe_frame(self, frame: np.ndarray) -> Optional[str]:
+        if get_rms_dbfs(frame) < -60:
+            return None
+        power = np.abs(np.fft.rfft(frame)) ** 2
+        peak = int(np.argmax(power))
+        if power[peak] < 0.5 * power.sum():
+            return None
+        return WORD_FREQUENCIES.get(peak * SAMPLING_RATE // FRAME_LENGTH)
+
+    async def _run_loop(self):
+        buffer = bytearray()
+        words: List[str] = []
+        quiet_seconds = 0.0
+        while True:
+            try:
+                buffer.extend(await self._input_queue.get())
+            except asyncio.CancelledError:
+                return
+            while len(buffer) >= FRAME_BYTES:
+                word = self.transcribe_frame(np.frombuffer(buffer[:FRAME_BYTES], dtype=np.int16))
+                del buffer[:FRAME_BYTES]
+                if word is not None:
+                    quiet_seconds = 0.0
+                    if not words or words[-1] != word:
+                        words.append(word)
+                    continue
+                quiet_seconds += FRAME_LENGTH / SAMPLING_RATE
+                if words and quiet_seconds >= 0.5:
+                    self.produce_nonblocking(
+                        Transcription(message=" ".join(words), confidence=1, is_final=True)
+                    )
+                    words = []
+
+
+class TranscriptionCollector:
+    def __init__(self):
+        self.messages: List[str] = []
+
+    def consume_nonblocking(self, transcription: Transcription):
+        self.messages.append(transcription.message)
+
+
+def tone(frequency: int, seconds: float, dbfs: float) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLING_RATE)) / SAMPLING_RATE
+    return 32768 * 10 ** (dbfs / 20) * np.sqrt(2) * np.sin(2 * np.pi * frequency * t)
+
+
+def noise(seconds: float, dbfs: float, rng: np.random.Generator) -> np.ndarray:
+    return rng.normal(0, 32768 * 10 ** (dbfs / 20), int(seconds * SAMPLING_RATE))
+
+
+def make_call_audio() -> bytes:
+    """Two utterances between stretches of line noise, one of them starting with a word too quiet
+    for the gate to detect, and a burst of loud hiss."""
+    rng = np.random.default_rng(0)
+    pieces = [
+        noise(1.5, -70, rng),
+        *(tone(frequency, 0.3, -20) for frequency in [400, 700, 1000, 1300]),
+        noise(2.0, -70, rng),
+        noise(0.2, -20, rng),
+        noise(2.0, -70, rng),
+        tone(400, 0.1, -55),
+        tone(700, 0.3, -20),
+        noise(4.0, -70, rng),
+        tone(1300, 0.3, -20),
+        tone(1000, 0.3, -20),
+        noise(3.0, -70, rng),
+    ]
+    return np.concatenate(pieces).astype(np.int16).tobytes()
+
+
+async def transcribe(audio: bytes, voice_activity_gate: Optional[VoiceActivityGateConfig]):
+    transcriber = ToneWordTranscriber(
+        TestTranscriberConfig(
+            sampling_rate=SAMPLING_RATE,
+            audio_encoding=AudioEncoding.LINEAR16,
+            chunk_size=FRAME_BYTES,
+            voice_activity_gate=voice_activity_gate,
+        )
+    )
+    collector = TranscriptionCollector()
+    transcriber.consumer = collector  # type: ignore
+    transcriber.start()
+    for start in range(0, len(audio), FRAME_BYTES):
+        transcriber.send_audio(audio[start : start + FRAME_BYTES])
+    while not transcriber._input_queue.empty():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await transcriber.terminate()
+    return collector.messages, transcriber
+
+
+@pytest.mark.asyncio
+async def test_gated_transcripts_are_unchanged():
+    audio = make_call_audio()
+    ungated_messages, _ = await transcribe(audio, None)
+    gated_messages, transcriber = await transcribe(audio, VoiceActivityGateConfig())
+
+    assert ungated_messages == ["hello how are you", "hello how", "you are"]
+    assert gated_messages == ungated_messages
+    assert transcriber.voice_activity_gate is not None
+    assert transcriber.voice_activity_gate.stats.saved_fraction > 0.3
+
+
+def test_silence_is_replaced_with_keepalives():
+    gate = VoiceActivityGate(SAMPLING_RATE // 2, AudioEncoding.MULAW, keepalive_interval_seconds=1)
+    silence = b"\xff" * 160
+
+    output = [piece for _ in range(150) for piece in gate.process(silence)]
+
+    assert output == [gate.keepalive_chunk] * 3
+    assert gate.keepalive_chunk == b"\xff" * 160
+    assert gate.stats.keepalives == 3
+
+
+def test_zero_crossing_rate_rejects_hiss():
+    rng = np.random.default_rng(0)
+    hiss = noise(0.02, -20, rng).astype(np.int16)
+    voice = tone(200, 0.02, -20).astype(np.int16)
+    detector = EnergyVoiceActivityDetector(max_zero_crossing_rate=0.4)
+
+    assert EnergyVoiceActivityDetector().is_speech(hiss)
+    assert not detector.is_speech(hiss)
+    assert detector.is_speech(voice)
@@ -0,0 +1,81 @@
+from typing import List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.transcriber import Transcription, WhisperCPPTranscriberConfig
+from vocode.streaming.transcriber.whisper_cpp_transcriber import WhisperCPPTranscriber
+from vocode.utils.whisper_cpp.helpers import merge_overlapping_text
+
+SAMPLING_RATE = 16000
+CHUNK_LENGTH = 320  # 20 ms
+# each word is "spoken" as a constant signal at its own level
+WORD_LEVELS = {1000: "w1", 2000: "w2"}
+
+
+def test_merge_overlapping_text_drops_repeated_words():
+    assert (
+        merge_overlapping_text("I placed an order last", "Last week, and it has not arrived.")
+        == "I placed an order last week, and it has not arrived."
+    )
+
+
+def test_merge_overlapping_text_without_overlap():
+    assert merge_overlapping_text("", "Hello there.") == "Hello there."
+    assert merge_overlapping_text("Hello there.", "How are you?") == "Hello there. How are you?"
+
+
+@pytest.fixture
+def transcriber(mocker: MockerFixture) -> WhisperCPPTranscriber:
+    mocker.patch("ctypes.CDLL")
+    transcriber = WhisperCPPTranscriber(
+        WhisperCPPTranscriberConfig(
+            sampling_rate=SAMPLING_RATE,
+            audio_encoding=AudioEncoding.LINEAR16,
+            chunk_size=CHUNK_LENGTH * 2,
+            libname="libwhisper.so",
+            fname_model="ggml-tiny.bin",
+            streaming=True,
+        )
+    )
+
+    def transcribe_window() -> str:
+        levels = np.unique(np.concatenate(transcriber.window.views()))
+        return " ".join(WORD_LEVELS[level] for level in levels if level in WORD_LEVELS)
+
+    mocker.patch.object(transcriber, "transcribe_window", side_effect=transcribe_window)
+    return transcriber
+
+
+def final_messages(transcriber: WhisperCPPTranscriber, mocker: MockerFixture, audio: np.ndarray):
+    produce_nonblocking = mocker.patch.object(transcriber, "produce_nonblocking")
+    for start in range(0, len(audio), CHUNK_LENGTH):
+        transcriber.process_chunk(audio[start : start + CHUNK_LENGTH].tobytes())
+    transcriptions: List[Transcription] = [call.args[0] for call in produce_nonblocking.mock_calls]
+    return [transcription.message for transcription in transcriptions if transcription.is_final]
+
+
+def segment(level: int, seconds: float) -> np.ndarray:
+    return np.full(int(seconds * SAMPLING_RATE), level, dtype=np.int16)
+
+
+def test_streaming_window_keeps_only_pre_roll_before_speech(
+    transcriber: WhisperCPPTranscriber, mocker: MockerFixture
+):
+    final_messages(transcriber, mocker, segment(0, 0.02))
+    assert len(transcriber.window) == CHUNK_LENGTH
+
+    final_messages(transcriber, mocker, segment(0, 2))
+    assert len(transcriber.window) == transcriber.overlap_size
+
+
+def test_streaming_finals_do_not_repeat_the_previous_utterance(
+    transcriber: WhisperCPPTranscriber, mocker: MockerFixture
+):
+    audio = np.concatenate(
+        [segment(1000, 0.5), segment(0, 0.7), segment(2000, 0.5), segment(0, 0.7)]
+    )
+
+    assert final_messages(transcriber, mocker, audio) == ["w1", "w2"]
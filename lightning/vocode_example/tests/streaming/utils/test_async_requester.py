@@ -0,0 +1,67 @@
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from vocode.streaming.utils.async_requester import AsyncRequestor
+from vocode.streaming.utils.singleton import Singleton
+
+
+@pytest_asyncio.fixture
+async def requestor() -> AsyncGenerator[AsyncRequestor, None]:
+    Singleton._instances.pop(AsyncRequestor, None)
+    requestor = AsyncRequestor()
+    yield requestor
+    await requestor.close()
+    del Singleton._instances[AsyncRequestor]
+
+
+@pytest_asyncio.fixture
+async def server_url() -> AsyncGenerator[str, None]:
+    app = web.Application()
+    app.router.add_get("/", lambda request: web.json_response({"ok": True}))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield f"http://127.0.0.1:{port}/"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_connections(requestor: AsyncRequestor, server_url: str):
+    for _ in range(3):
+        async with requestor.get_session().get(server_url) as response:
+            assert await response.json() == {"ok": True}
+
+    assert requestor.stats.to_dict() == {
+        "requests": 3,
+        "new_connections": 1,
+        "reused_connections": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_connections(requestor: AsyncRequestor, server_url: str):
+    for _ in range(3):
+        response = await requestor.get_client().get(server_url)
+        assert response.json() == {"ok": True}
+
+    assert requestor.stats.requests == 3
+    assert requestor.stats.new_connections == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_session_and_client_are_recreated(requestor: AsyncRequestor):
+    session = requestor.get_session()
+    client = requestor.get_client()
+    assert requestor.get_session() is session
+    assert requestor.get_client() is client
+
+    await requestor.close()
+
+    assert session.closed and client.is_closed
+    assert not requestor.get_session().closed
+    assert not requestor.get_client().is_closed
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from vocode.streaming.utils.audio_dsp import (
+    Resampler,
+    apply_gain,
+    lin2ulaw,
+    mix,
+    resample,
+    ulaw2lin,
+)
+
+
+def pcm(*samples: int) -> bytes:
+    return np.array(samples, dtype="<i2").tobytes()
+
+
+def sine(frequency: float, sampling_rate: int, seconds: float, amplitude: float = 10000):
+    t = np.arange(int(sampling_rate * seconds)) / sampling_rate
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def test_ulaw_known_values():
+    assert lin2ulaw(pcm(0, 32767, -32768, 100, -100)) == bytes([0xFF, 0x80, 0x00, 0xF2, 0x72])
+    assert ulaw2lin(bytes([0xFF, 0x7F, 0x80, 0x00])) == pcm(0, 0, 32124, -32124)
+    assert lin2ulaw(memoryview(pcm(0, 0))) == b"\xff\xff"
+
+
+def test_ulaw_round_trip():
+    # 0x7F is negative zero, which encodes back to 0xFF
+    ulaw = bytes(i for i in range(256) if i != 0x7F)
+    assert lin2ulaw(ulaw2lin(ulaw)) == ulaw
+
+
+def test_ulaw_matches_audioop():
+    audioop = pytest.importorskip("audioop")
+    every_sample = np.arange(-32768, 32768, dtype="<i2").tobytes()
+    every_byte = bytes(range(256))
+
+    assert lin2ulaw(every_sample) == audioop.lin2ulaw(every_sample, 2)
+    assert lin2ulaw(every_byte, 1) == audioop.lin2ulaw(every_byte, 1)
+    assert ulaw2lin(every_byte) == audioop.ulaw2lin(every_byte, 2)
+    assert ulaw2lin(every_byte, 1) == audioop.ulaw2lin(every_byte, 1)
+
+
+def test_gain_and_mix_clip():
+    assert apply_gain(pcm(100, -100, 20000), 2) == pcm(200, -200, 32767)
+    assert apply_gain(memoryview(pcm(1000)), 0.5) == pcm(500)
+    assert mix(pcm(1, 2, 3), pcm(10)) == pcm(11, 2, 3)
+    assert mix(pcm(30000), pcm(30000)) == pcm(32767)
+
+
+@pytest.mark.parametrize(
+    "input_sample_rate,output_sample_rate",
+    [(24000, 8000), (22050, 8000), (44100, 16000), (8000, 16000), (16000, 48000)],
+)
+def test_resample_preserves_tone(input_sample_rate: int, output_sample_rate: int):
+    audio = sine(440, input_sample_rate, 0.5)
+
+    output = np.frombuffer(
+        resample(audio.astype("<i2").tobytes(), input_sample_rate, output_sample_rate),
+        dtype="<i2",
+    )
+
+    expected = sine(440, output_sample_rate, 0.5)
+    assert len(output) == len(expected)
+    # apart from the edges, where the filter sees the silence around the utterance
+    assert np.abs(output[100:-100] - expected[100:-100]).max() < 4
+
+
+def test_resampler_chunks_match_whole_stream():
+    audio = sine(1000, 24000, 1).astype("<i2").tobytes()
+    whole_resampler = Resampler(24000, 8000)
+    whole = whole_resampler.process(audio) + whole_resampler.flush()
+
+    resampler = Resampler(24000, 8000)
+    # odd chunk sizes split samples between chunks
+    chunked = b"".join(resampler.process(audio[i : i + 777]) for i in range(0, len(audio), 777))
+
+    assert chunked + resampler.flush() == whole
+
+
+def test_resampler_filters_frequencies_above_nyquist():
+    # 6kHz cannot be represented at 8kHz and must not alias down to 2kHz
+    audio = sine(6000, 24000, 0.5).astype("<i2").tobytes()
+
+    output = np.frombuffer(resample(audio, 24000, 8000), dtype="<i2")
+
+    assert np.abs(output[100:-100]).max() < 100
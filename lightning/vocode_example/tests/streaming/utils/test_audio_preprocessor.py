@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from typing import List
+
+import numpy as np
+import pytest
+
+from vocode.streaming.utils.audio_preprocessor import (
+    AudioPreprocessingWorker,
+    PassthroughAudioPreprocessor,
+)
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class BlockingAudioPreprocessor(PassthroughAudioPreprocessor):
+    def __init__(self, frame_length: int):
+        super().__init__(frame_length)
+        self.unblocked = threading.Event()
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        self.unblocked.wait()
+        return frame
+
+
+@pytest.mark.asyncio
+async def test_audio_is_passed_on_in_whole_frames_in_order():
+    output: List[bytes] = []
+    worker = AudioPreprocessingWorker(PassthroughAudioPreprocessor(frame_length=256), output.append)
+    worker.start()
+    audio = np.arange(1000, dtype=np.int16).tobytes()
+    # chunks that split frames, and samples
+    for start in range(0, len(audio), 333):
+        worker.consume_nonblocking(audio[start : start + 333])
+
+    await wait_for(lambda: len(output) == 3)
+    assert all(len(chunk) == 512 for chunk in output)
+    assert b"".join(output) == audio[: 3 * 512]
+    await worker.terminate()
+    assert worker.stats.frames_processed == 3
+    assert worker.stats.frames_dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_oldest_frames_are_dropped_when_the_backlog_is_full():
+    output: List[bytes] = []
+    audio_preprocessor = BlockingAudioPreprocessor(frame_length=4)
+    worker = AudioPreprocessingWorker(audio_preprocessor, output.append, max_backlog_frames=2)
+    worker.start()
+    frames = [np.full(4, i, dtype=np.int16).tobytes() for i in range(5)]
+    worker.consume_nonblocking(frames[0])
+    # the first frame is being processed, the next ones fill the backlog and push out frame 1
+    await wait_for(lambda: len(worker.ring_buffer) == 0)
+    for frame in frames[1:4]:
+        worker.consume_nonblocking(frame)
+    audio_preprocessor.unblocked.set()
+
+    await wait_for(lambda: len(output) == 3)
+    assert output == [frames[0], frames[2], frames[3]]
+    assert worker.stats.frames_dropped == 1
+    assert worker.stats.max_backlog_frames == 2
+    await worker.terminate()
+    worker.consume_nonblocking(frames[4])
+    assert len(output) == 3
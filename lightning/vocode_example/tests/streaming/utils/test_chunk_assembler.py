@@ -0,0 +1,45 @@
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE
+from vocode.streaming.utils.chunk_assembler import ChunkAssembler
+
+
+def test_feed_cuts_exact_chunks_across_pieces():
+    audio = bytes(range(256)) * 4
+    chunk_assembler = ChunkAssembler(100)
+    chunks = []
+    offset = 0
+    for piece_size in [1, 99, 100, 250, 7, 300, 267]:
+        chunks.extend(chunk_assembler.feed(audio[offset : offset + piece_size]))
+        offset += piece_size
+    tail = chunk_assembler.flush(pad=False)
+
+    assert offset == len(audio)
+    assert all(len(chunk) == 100 for chunk in chunks)
+    assert tail is not None and len(tail) == len(audio) % 100
+    assert b"".join(chunks) + tail == audio
+    assert chunk_assembler.pending_bytes == 0
+
+
+def test_whole_chunks_are_views_of_the_piece():
+    piece = bytearray(b"a" * 250)
+    chunk_assembler = ChunkAssembler(100)
+    first, second = chunk_assembler.feed(piece)
+    straddling = chunk_assembler.feed(b"b" * 50)[0]
+
+    assert first.obj is piece and second.obj is piece
+    assert first.readonly
+    # the chunk put together from two pieces is a copy, which the next pieces don't touch
+    assert bytes(straddling) == b"a" * 50 + b"b" * 50
+    chunk_assembler.feed(b"c" * 150)
+    assert bytes(straddling) == b"a" * 50 + b"b" * 50
+
+
+def test_flush_pads_with_the_encodings_silence():
+    chunk_assembler = ChunkAssembler.for_encoding(4, AudioEncoding.MULAW)
+    assert chunk_assembler.feed(b"\x01") == []
+    assert bytes(chunk_assembler.flush()) == b"\x01" + MULAW_SILENCE_BYTE * 3
+
+    chunk_assembler = ChunkAssembler.for_encoding(4, AudioEncoding.LINEAR16)
+    chunk_assembler.feed(b"\x01\x02\x03\x04\x05\x06")
+    assert bytes(chunk_assembler.flush()) == b"\x05\x06\x00\x00"
+    assert chunk_assembler.flush() is None
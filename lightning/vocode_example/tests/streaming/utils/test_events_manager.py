@@ -1,9 +1,16 @@
 import asyncio
+import time
+from typing import List
 
 import pytest
 
-from vocode.streaming.models.events import EventType, PhoneCallEndedEvent
-from vocode.streaming.utils.events_manager import EventsManager
+from vocode.streaming.models.events import Event, EventType, PhoneCallEndedEvent
+from vocode.streaming.utils.events_manager import (
+    EventsBatchingConfig,
+    EventsManager,
+    EventsOverflowPolicy,
+    EventsSink,
+)
 
 CONVERSATION_ID = "1"
 
@@ -77,3 +84,133 @@ async def test_queue_empty_and_timeout():
     manager = EventsManager([EventType.TRANSCRIPT])
     await manager.flush()
     assert manager.queue.empty()
+
+
+class RecordingSink(EventsSink):
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.batches: List[List[str]] = []
+
+    async def handle_events(self, events: List[Event]):
+        await asyncio.sleep(self.delay)
+        self.batches.append([event.conversation_id for event in events])
+
+
+def _create_event(conversation_id: str) -> PhoneCallEndedEvent:
+    return PhoneCallEndedEvent(conversation_id=conversation_id, type=EventType.PHONE_CALL_ENDED)
+
+
+@pytest.mark.asyncio
+async def test_batches_flush_on_size_and_time():
+    fast_sink, slow_sink = RecordingSink(), RecordingSink(delay=0.05)
+    manager = EventsManager(
+        [EventType.PHONE_CALL_ENDED],
+        batching_config=EventsBatchingConfig(max_batch_size=3, flush_interval_seconds=0.05),
+        sinks=[fast_sink, slow_sink],
+    )
+    task = asyncio.create_task(manager.start())
+    start = time.monotonic()
+    for i in range(4):
+        manager.publish_event(_create_event(str(i)))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    await manager.flush()
+
+    # the full batch went out at once, the rest when the flush interval ran out
+    assert fast_sink.batches == slow_sink.batches == [["0", "1", "2"], ["3"]]
+    # counted once per sink
+    assert manager.stats.flushed_batches == 4
+    assert manager.stats.flushed_events == 8
+    assert manager.stats.max_flush_seconds < 0.09
+    assert time.monotonic() - start < 0.3
+
+
+@pytest.mark.asyncio
+async def test_slow_sink_does_not_hold_up_other_sinks():
+    fast_sink, slow_sink = RecordingSink(), RecordingSink(delay=0.2)
+    manager = EventsManager(
+        [EventType.PHONE_CALL_ENDED],
+        batching_config=EventsBatchingConfig(max_batch_size=1, flush_interval_seconds=0.01),
+        sinks=[slow_sink, fast_sink],
+    )
+    task = asyncio.create_task(manager.start())
+    for i in range(3):
+        manager.publish_event(_create_event(str(i)))
+    await asyncio.sleep(0.1)
+
+    assert fast_sink.batches == [["0"], ["1"], ["2"]]
+    assert slow_sink.batches == []
+    task.cancel()
+    await manager.flush()
+    assert slow_sink.batches == [["0"], ["1"], ["2"]]
+
+
+@pytest.mark.asyncio
+async def test_flush_delivers_batches_in_flight_when_cancelled():
+    sink = RecordingSink(delay=0.05)
+    manager = EventsManager(
+        [EventType.PHONE_CALL_ENDED],
+        batching_config=EventsBatchingConfig(max_batch_size=2, flush_interval_seconds=10),
+        sinks=[sink],
+    )
+    task = asyncio.create_task(manager.start())
+    for i in range(5):
+        manager.publish_event(_create_event(str(i)))
+    await asyncio.sleep(0.01)
+    # the first batch is being handled, the second is queued for the sink, the last event is
+    # waiting for its batch to fill up
+    task.cancel()
+    for sink_worker in manager.sink_workers:
+        assert sink_worker.task is not None
+        sink_worker.task.cancel()
+    await asyncio.sleep(0)
+    await manager.flush()
+
+    assert sink.batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow_policy,expected_ids",
+    [
+        (EventsOverflowPolicy.DROP_OLDEST, ["2", "3", "4"]),
+        (EventsOverflowPolicy.DROP_NEWEST, ["0", "1", "2"]),
+    ],
+)
+async def test_bounded_queue_drops_events(
+    overflow_policy: EventsOverflowPolicy, expected_ids: List[str]
+):
+    sink = RecordingSink()
+    manager = EventsManager(
+        [EventType.PHONE_CALL_ENDED],
+        batching_config=EventsBatchingConfig(max_queue_size=3, overflow_policy=overflow_policy),
+        sinks=[sink],
+    )
+    for i in range(5):
+        manager.publish_event(_create_event(str(i)))
+    assert manager.queue_depth == 3
+    await manager.flush()
+
+    assert sink.batches == [expected_ids]
+    assert manager.stats.dropped == 2
+    assert manager.stats.flushed_events == 3
+    assert manager.stats.max_queue_depth == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_sends_events_of_unfinished_batch():
+    sink = RecordingSink()
+    manager = EventsManager(
+        [EventType.PHONE_CALL_ENDED],
+        batching_config=EventsBatchingConfig(flush_interval_seconds=10),
+        sinks=[sink],
+    )
+    task = asyncio.create_task(manager.start())
+    manager.publish_event(_create_event("0"))
+    manager.publish_event(_create_event("1"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.sleep(0)
+    await manager.flush()
+
+    assert sink.batches == [["0", "1"]]
@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+import pytest
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
+from vocode.streaming.utils.mp3_helper import StreamingMp3Decoder, parse_mp3_frame_header
+from vocode.streaming.utils.worker import QueueConsumer
+
+CHIRP_MP3_PATH = os.path.join(os.path.dirname(__file__), "../../fakedata/chirp.mp3")
+
+
+@pytest.fixture(scope="module")
+def mp3_bytes() -> bytes:
+    with open(CHIRP_MP3_PATH, "rb") as f:
+        return f.read()
+
+
+def decode_in_chunks(decoder: StreamingMp3Decoder, mp3_bytes: bytes, chunk_size: int):
+    outputs = [
+        decoder.feed(mp3_bytes[i : i + chunk_size]) for i in range(0, len(mp3_bytes), chunk_size)
+    ]
+    return outputs, decoder.flush()
+
+
+def test_parse_mp3_frame_header(mp3_bytes: bytes):
+    assert parse_mp3_frame_header(mp3_bytes[:4]) == (216, 1152, 32000)
+    assert parse_mp3_frame_header(b"\x00\x00\x00\x00") is None
+    # layer I header
+    assert parse_mp3_frame_header(b"\xff\xff\x90\x00") is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 417, 4096])
+def test_streaming_decoder_matches_decoding_at_once(mp3_bytes: bytes, chunk_size: int):
+    whole_decoder = StreamingMp3Decoder(output_sample_rate=16000)
+    expected = whole_decoder.feed(mp3_bytes) + whole_decoder.flush()
+
+    outputs, tail = decode_in_chunks(
+        StreamingMp3Decoder(output_sample_rate=16000), mp3_bytes, chunk_size
+    )
+
+    assert b"".join(outputs) + tail == expected
+    # audio is produced as the frames arrive, not only at the end
+    assert len(tail) < len(expected) // 4
+
+
+def test_streaming_decoder_mulaw(mp3_bytes: bytes):
+    linear_outputs, linear_tail = decode_in_chunks(
+        StreamingMp3Decoder(output_sample_rate=8000), mp3_bytes, 500
+    )
+    mulaw_outputs, mulaw_tail = decode_in_chunks(
+        StreamingMp3Decoder(output_sample_rate=8000, output_encoding=AudioEncoding.MULAW),
+        mp3_bytes,
+        500,
+    )
+
+    assert len(b"".join(mulaw_outputs) + mulaw_tail) * 2 == len(
+        b"".join(linear_outputs) + linear_tail
+    )
+
+
+def test_streaming_decoder_empty_stream():
+    assert StreamingMp3Decoder(output_sample_rate=16000).flush() == b""
+
+
+@pytest.mark.asyncio
+async def test_miniaudio_worker_chunks_utterance(mp3_bytes: bytes):
+    chunk_size = 640
+    synthesizer_config = SynthesizerConfig(
+        sampling_rate=16000, audio_encoding=AudioEncoding.LINEAR16
+    )
+    consumer: QueueConsumer = QueueConsumer()
+    worker = MiniaudioWorker(synthesizer_config, chunk_size)
+    worker.consumer = consumer
+    worker.start()
+    try:
+        for i in range(0, len(mp3_bytes), 1000):
+            worker.consume_nonblocking(mp3_bytes[i : i + 1000])
+        worker.consume_nonblocking(None)
+
+        chunks = []
+        while True:
+            chunk, is_last = await asyncio.wait_for(consumer.input_queue.get(), timeout=5)
+            chunks.append(chunk)
+            if is_last:
+                break
+    finally:
+        await worker.terminate()
+
+    expected_decoder = StreamingMp3Decoder(output_sample_rate=16000)
+    assert b"".join(chunks) == expected_decoder.feed(mp3_bytes) + expected_decoder.flush()
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
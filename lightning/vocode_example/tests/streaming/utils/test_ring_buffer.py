@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from vocode.streaming.utils.ring_buffer import SampleRingBuffer
+
+
+def test_write_wraps_around_and_overwrites_oldest():
+    ring_buffer = SampleRingBuffer(5)
+    ring_buffer.write(np.arange(3, dtype=np.int16))
+    ring_buffer.discard(2)
+    ring_buffer.write(np.arange(3, 7, dtype=np.int16))
+
+    assert len(ring_buffer) == 5
+    assert [view.tolist() for view in ring_buffer.views()] == [[2, 3, 4], [5, 6]]
+    assert np.concatenate(ring_buffer.views(3, from_end=True)).tolist() == [4, 5, 6]
+
+    ring_buffer.write(np.arange(7, 9, dtype=np.int16))
+    assert ring_buffer.overwritten_samples == 2
+    assert ring_buffer.read(4).tolist() == [4, 5, 6, 7]
+    assert ring_buffer.read(4).tolist() == [8]
+    assert len(ring_buffer) == 0
+
+
+def test_write_longer_than_capacity_keeps_newest():
+    ring_buffer = SampleRingBuffer(4)
+    ring_buffer.write(np.arange(10, dtype=np.int16))
+
+    assert np.concatenate(ring_buffer.views()).tolist() == [6, 7, 8, 9]
+    assert ring_buffer.overwritten_samples == 6
+
+
+def test_discard_rejects_negative_counts():
+    ring_buffer = SampleRingBuffer(4)
+    ring_buffer.write(np.arange(2, dtype=np.int16))
+
+    with pytest.raises(ValueError):
+        ring_buffer.discard(-1)
+    assert ring_buffer.read(4).tolist() == [0, 1]
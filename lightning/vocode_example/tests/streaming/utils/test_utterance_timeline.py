@@ -0,0 +1,37 @@
+import pytest
+
+from vocode.streaming.utils.utterance_timeline import UtteranceTimeline
+
+
+def test_text_up_to_includes_the_piece_playing():
+    timeline = UtteranceTimeline()
+    timeline.append("Hello there ", 1.0)
+    timeline.append("how are ", 0.5)
+    timeline.append("you ", 0.5)
+
+    assert timeline.text_up_to(0.2) == "Hello there "
+    assert timeline.text_up_to(1.0) == "Hello there "
+    assert timeline.text_up_to(1.2) == "Hello there how are "
+    assert timeline.text_up_to(5.0) == "Hello there how are you "
+    assert timeline.text_up_to(None) == "Hello there how are you "
+    assert timeline.end_time == 2.0
+
+
+def test_words_are_joined_with_the_separator_as_they_arrive():
+    timeline = UtteranceTimeline(separator=" ")
+    assert timeline.text_up_to(1.0) == ""
+    with pytest.raises(IndexError):
+        timeline.index_at(1.0)
+
+    timeline.add("one", 0.3)
+    timeline.add("two", 0.6)
+    assert timeline.text_up_to(0.5) == "one two"
+    timeline.add("three", 0.9)
+    # a timestamp that steps back is kept in order
+    timeline.add("four", 0.8)
+
+    assert len(timeline) == 4
+    assert timeline.index_at(0.85) == 2
+    assert timeline.end_time_at(3) == 0.9
+    assert timeline.text_through(2) == "one two three"
+    assert timeline.text == "one two three four"
@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+from typing import Dict, Generator, List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.utils.singleton import Singleton
+from vocode.streaming.vector_db.embedding_cache import EmbeddingCache
+from vocode.streaming.vector_db.local import LocalVectorDB
+
+EMBEDDINGS: Dict[str, List[float]] = {
+    "How do I reset my password?": [1.0, 0.0, 0.0],
+    "Where is my order?": [0.0, 1.0, 0.0],
+    "Can I change my delivery address?": [0.1, 0.9, 0.1],
+    "What are your opening hours?": [0.0, 0.0, 1.0],
+}
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.requests: List[List[str]] = []
+
+    async def create(self, input: List[str], model: str):
+        self.requests.append(input)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=EMBEDDINGS[" ".join(text.split())])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+@pytest.fixture(autouse=True)
+def embedding_cache() -> Generator[EmbeddingCache, None, None]:
+    Singleton._instances.pop(EmbeddingCache, None)
+    yield EmbeddingCache()
+    del Singleton._instances[EmbeddingCache]
+
+
+def _create_vector_db(mocker: MockerFixture, **config_kwargs) -> LocalVectorDB:
+    mocker.patch.dict("os.environ", {"OPENAI_API_KEY": "openai_api_key"})
+    vector_db = LocalVectorDB(LocalVectorDBConfig(**config_kwargs))
+    vector_db.openai_client = mocker.MagicMock(embeddings=FakeEmbeddings())
+    return vector_db
+
+
+@pytest.mark.asyncio
+async def test_document_embeddings_are_batched_and_not_cached(
+    mocker: MockerFixture, embedding_cache: EmbeddingCache
+):
+    vector_db = _create_vector_db(mocker)
+
+    embeddings = await vector_db.create_openai_embeddings(
+        ["Where is my order?", "How do I reset\nmy password?", "Where is my order?"],
+        batch_size=1,
+    )
+    assert embeddings == [
+        EMBEDDINGS["Where is my order?"],
+        EMBEDDINGS["How do I reset my password?"],
+        EMBEDDINGS["Where is my order?"],
+    ]
+    # documents are sent as written, once each
+    assert vector_db.openai_client.embeddings.requests == [
+        ["Where is my order?"],
+        ["How do I reset\nmy password?"],
+    ]
+    assert not embedding_cache.entries
+
+
+@pytest.mark.asyncio
+async def test_query_embeddings_are_cached(mocker: MockerFixture, embedding_cache: EmbeddingCache):
+    vector_db = _create_vector_db(mocker)
+
+    embedding = await vector_db.create_openai_embedding("Can I change my delivery address?")
+    assert embedding == EMBEDDINGS["Can I change my delivery address?"]
+
+    cached_embedding = await vector_db.create_openai_embedding(
+        "Can I change  my delivery address? "
+    )
+    assert cached_embedding == pytest.approx(EMBEDDINGS["Can I change my delivery address?"])
+    cached_embedding[0] = 42.0
+    assert await vector_db.create_openai_embedding(
+        "Can I change my delivery address?"
+    ) == pytest.approx(EMBEDDINGS["Can I change my delivery address?"])
+    assert vector_db.openai_client.embeddings.requests == [["Can I change my delivery address?"]]
+    assert embedding_cache.stats.hits == 2
+    assert embedding_cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_similarity_search(mocker: MockerFixture):
+    vector_db = _create_vector_db(mocker, top_k=2)
+    texts = list(EMBEDDINGS)
+    await vector_db.add_texts(
+        texts,
+        metadatas=[
+            {"source": f"faq-{i}", "topic": "orders" if i in (1, 2) else "other"}
+            for i in range(len(texts))
+        ],
+        ids=[str(i) for i in range(len(texts))],
+    )
+    assert vector_db.openai_client.embeddings.requests == [texts]
+
+    docs_with_scores = await vector_db.similarity_search_with_score("Where is my order?")
+    assert [doc.page_content for doc, _ in docs_with_scores] == [
+        "Where is my order?",
+        "Can I change my delivery address?",
+    ]
+    assert docs_with_scores[0][0].metadata == {"source": "faq-1", "topic": "orders"}
+    assert docs_with_scores[0][1] == pytest.approx(1.0)
+    assert docs_with_scores[0][1] > docs_with_scores[1][1]
+
+    docs_with_scores = await vector_db.similarity_search_with_score(
+        "Where is my order?", filter={"topic": {"$ne": "orders"}}
+    )
+    assert {doc.metadata["source"] for doc, _ in docs_with_scores} == {"faq-0", "faq-3"}
+    assert await vector_db.similarity_search_with_score("Where is my order?", namespace="x") == []
+
+
+@pytest.mark.asyncio
+async def test_add_texts_replaces_ids_and_persists(mocker: MockerFixture, tmp_path):
+    vector_db = _create_vector_db(mocker, storage_path=str(tmp_path), top_k=1)
+    await vector_db.add_texts(["How do I reset my password?", "Where is my order?"], ids=["a", "b"])
+    await vector_db.add_texts(["What are your opening hours?"], ids=["a"])
+
+    reloaded_vector_db = _create_vector_db(mocker, storage_path=str(tmp_path), top_k=1)
+    assert reloaded_vector_db.ids == ["b", "a"]
+    docs_with_scores = await reloaded_vector_db.similarity_search_with_score(
+        "What are your opening hours?"
+    )
+    assert [doc.page_content for doc, _ in docs_with_scores] == ["What are your opening hours?"]
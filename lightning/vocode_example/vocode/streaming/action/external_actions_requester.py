@@ -8,6 +8,8 @@ import httpx
 from loguru import logger
 from pydantic.v1 import BaseModel
 
+from vocode.streaming.utils.async_requester import AsyncRequestor
+
 
 class ExternalActionValueError(ValueError):
     pass
@@ -53,7 +55,7 @@ class ExternalActionsRequester:
         signature_secret: str,
         additional_payload_values: Dict[str, Any] = {},
         additional_headers: Dict[str, str] = {},
-        transport: httpx.AsyncHTTPTransport = httpx.AsyncHTTPTransport(retries=2),
+        transport: Optional[httpx.AsyncHTTPTransport] = None,
     ) -> ExternalActionResponse:
         encoded_payload = json.dumps({"payload": payload} | additional_payload_values).encode(
             "utf-8"
@@ -66,52 +68,58 @@ class ExternalActionsRequester:
             **additional_headers,
         }
 
-        async with httpx.AsyncClient(
-            headers=headers,
-            transport=transport,
-            timeout=10,
-        ) as client:
-            try:
-                response = await client.post(
-                    self.url,
-                    content=encoded_payload,
+        if transport is None:
+            # the shared client keeps the connection to the action's server alive between calls
+            return await self._send(AsyncRequestor().get_client(), encoded_payload, headers)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await self._send(client, encoded_payload, headers)
+
+    async def _send(
+        self, client: httpx.AsyncClient, encoded_payload: bytes, headers: Dict[str, str]
+    ) -> ExternalActionResponse:
+        try:
+            response = await client.post(
+                self.url,
+                content=encoded_payload,
+                headers=headers,
+                timeout=10,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return self._validate_response(data)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"[External Actions] Request failed: {e}")
+            if e.response.status_code == 401:
+                return ExternalActionResponse(
+                    result={"info": ExternalActionsErrorResponses.unauthorized},
+                    success=False,
                 )
-                response.raise_for_status()
-                data = response.json()
-                return self._validate_response(data)
-            except httpx.HTTPStatusError as e:
-                logger.error(f"[External Actions] Request failed: {e}")
-                if e.response.status_code == 401:
-                    return ExternalActionResponse(
-                        result={"info": ExternalActionsErrorResponses.unauthorized},
-                        success=False,
-                    )
-                elif e.response.status_code == 403:
-                    return ExternalActionResponse(
-                        result={"info": ExternalActionsErrorResponses.forbidden},
-                        success=False,
-                    )
-                if 400 <= e.response.status_code < 500:
-                    return ExternalActionResponse(
-                        result={"info": ExternalActionsErrorResponses.client_error},
-                        success=False,
-                    )
-                elif e.response.status_code >= 500:
-                    return ExternalActionResponse(
-                        result={
-                            "info": ExternalActionsErrorResponses.server_error.format(
-                                status=e.response.status_code, text=e.response.text
-                            )
-                        },
-                        success=False,
-                    )
-                else:
-                    raise e
-            except ExternalActionValueError as e:
+            elif e.response.status_code == 403:
                 return ExternalActionResponse(
-                    result={"info": ExternalActionsErrorResponses.input_error.format(error=str(e))},
+                    result={"info": ExternalActionsErrorResponses.forbidden},
                     success=False,
                 )
+            if 400 <= e.response.status_code < 500:
+                return ExternalActionResponse(
+                    result={"info": ExternalActionsErrorResponses.client_error},
+                    success=False,
+                )
+            elif e.response.status_code >= 500:
+                return ExternalActionResponse(
+                    result={
+                        "info": ExternalActionsErrorResponses.server_error.format(
+                            status=e.response.status_code, text=e.response.text
+                        )
+                    },
+                    success=False,
+                )
+            else:
+                raise e
+        except ExternalActionValueError as e:
+            return ExternalActionResponse(
+                result={"info": ExternalActionsErrorResponses.input_error.format(error=str(e))},
+                success=False,
+            )
 
     def _encode_payload(self, payload: bytes, signature_secret: str) -> str:
         signature_as_bytes = base64.b64decode(signature_secret)
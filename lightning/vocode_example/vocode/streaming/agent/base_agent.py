@@ -5,7 +5,17 @@ import json
 import random
 import typing
 from enum import Enum
-from typing import TYPE_CHECKING, AsyncGenerator, Dict, Generic, Optional, Tuple, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import sentry_sdk
 from loguru import logger
@@ -22,6 +32,10 @@ from vocode.streaming.action.phone_call_action import (
 )
 from vocode.streaming.agent.goodbye import is_goodbye_simple
 from vocode.streaming.agent.phrase_trigger import matches_phrase_trigger
+from vocode.streaming.agent.speculative_response import (
+    SpeculativeResponse,
+    SpeculativeResponseStats,
+)
 from vocode.streaming.models.actions import (
     ActionConfig,
     ActionInput,
@@ -179,6 +193,8 @@ class BaseAgent(AbstractAgent[AgentConfigType], InterruptibleWorker):
         self.post_question_bot_backchannel_randomizer = unrepeating_randomizer(
             POST_QUESTION_BACKCHANNELS,
         )
+        self.speculative_response: Optional[SpeculativeResponse] = None
+        self.speculative_response_stats = SpeculativeResponseStats()
 
     def get_functions(self):
         raise NotImplementedError
@@ -244,19 +260,107 @@ class RespondAgent(BaseAgent[AgentConfigType]):
         async for response in responses_stream:
             yield response
 
+    def start_speculative_response(
+        self,
+        transcription: Transcription,
+        conversation_id: str,
+        bot_was_in_medias_res: bool = False,
+    ):
+        if self.speculative_response is not None:
+            if self.speculative_response.matches(transcription.message):
+                return
+            self.cancel_speculative_response()
+        if transcription.is_interrupt and self.agent_config.cut_off_response:
+            # the cut off response is sent instead of a generated one
+            return
+        logger.debug(f"Speculatively responding to interim transcription: {transcription.message}")
+        self.speculative_response = SpeculativeResponse(
+            transcription,
+            self.interruptible_event_factory.create_interruptible_event(transcription),
+            lambda: self.generate_response(
+                transcription.message,
+                conversation_id=conversation_id,
+                is_interrupt=transcription.is_interrupt,
+                bot_was_in_medias_res=bot_was_in_medias_res,
+            ),
+        )
+        self.speculative_response_stats.started += 1
+
+    def cancel_speculative_response(self):
+        if self.speculative_response is None:
+            return
+        self.speculative_response.cancel()
+        self.speculative_response = None
+        self.speculative_response_stats.cancelled += 1
+
+    def _claim_speculative_response(
+        self, transcription: Transcription
+    ) -> Optional[SpeculativeResponse]:
+        speculative_response, self.speculative_response = self.speculative_response, None
+        if speculative_response is None:
+            return None
+        if (
+            speculative_response.matches(transcription.message)
+            and not speculative_response.interruptible_event.is_interrupted()
+            and not speculative_response.failed_without_response()
+        ):
+            self.speculative_response_stats.hits += 1
+            self.speculative_response_stats.saved_seconds += (
+                speculative_response.get_saved_seconds()
+            )
+            # from here on, the final transcription's event decides if the response is interrupted
+            speculative_response.interruptible_event.is_interruptible = False
+            return speculative_response
+        logger.debug(
+            f"Discarding speculative response to {speculative_response.text!r}, "
+            f"final transcription was {transcription.message!r}"
+        )
+        speculative_response.cancel()
+        self.speculative_response_stats.misses += 1
+        return None
+
+    async def _claimed_speculative_responses(
+        self,
+        speculative_response: SpeculativeResponse,
+        generate_responses: Callable[[], AsyncGenerator[GeneratedResponse, None]],
+    ) -> AsyncGenerator[GeneratedResponse, None]:
+        async for response in speculative_response.responses():
+            yield response
+        if speculative_response.failed_without_response():
+            # it failed after being claimed, so the final transcription still needs a response
+            logger.debug(
+                f"Speculative response to {speculative_response.text!r} failed, "
+                "generating a fresh response"
+            )
+            async for response in generate_responses():
+                yield response
+
     async def handle_generate_response(
         self,
         transcription: Transcription,
         agent_input: AgentInput,
     ) -> bool:
         conversation_id = agent_input.conversation_id
-        responses = self._maybe_prepend_interrupt_responses(
-            transcription=transcription,
-            responses_stream=self.generate_response(
+        speculative_response = (
+            self._claim_speculative_response(transcription)
+            if isinstance(agent_input, TranscriptionAgentInput)
+            else None
+        )
+
+        def generate_responses() -> AsyncGenerator[GeneratedResponse, None]:
+            return self.generate_response(
                 transcription.message,
                 is_interrupt=transcription.is_interrupt,
                 conversation_id=conversation_id,
                 bot_was_in_medias_res=transcription.bot_was_in_medias_res,
+            )
+
+        responses = self._maybe_prepend_interrupt_responses(
+            transcription=transcription,
+            responses_stream=(
+                self._claimed_speculative_responses(speculative_response, generate_responses)
+                if speculative_response is not None
+                else generate_responses()
             ),
         )
         is_first_response_of_turn = True
@@ -431,6 +535,7 @@ class RespondAgent(BaseAgent[AgentConfigType]):
 
             if self.is_muted:
                 logger.debug("Agent is muted, skipping processing")
+                self.cancel_speculative_response()
                 return
 
             if self.agent_config.send_filler_audio:
@@ -568,6 +673,12 @@ class RespondAgent(BaseAgent[AgentConfigType]):
     ) -> Tuple[Optional[str], bool]:
         raise NotImplementedError
 
+    async def terminate(self):
+        self.cancel_speculative_response()
+        if self.speculative_response_stats.started:
+            logger.info(f"Speculative responses: {self.speculative_response_stats.to_dict()}")
+        return await super().terminate()
+
     def generate_response(
         self,
         human_input,
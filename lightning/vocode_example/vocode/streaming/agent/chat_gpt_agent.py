@@ -16,6 +16,7 @@ from vocode.streaming.agent.openai_utils import (
     openai_get_tokens,
     vector_db_result_to_openai_chat_message,
 )
+from vocode.streaming.agent.speculative_response import speculative_human_input
 from vocode.streaming.agent.streaming_utils import collate_response_async, stream_response_async
 from vocode.streaming.models.actions import FunctionCallActionTrigger
 from vocode.streaming.models.agent import ChatGPTAgentConfig
@@ -83,16 +84,25 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
             if isinstance(action_config.action_trigger, FunctionCallActionTrigger)
         ]
 
-    def get_chat_parameters(self, messages: Optional[List] = None, use_functions: bool = True):
+    def format_chat_messages(self) -> List[dict]:
         assert self.transcript is not None
-        is_azure = self._is_azure_model()
-
-        messages = messages or format_openai_chat_messages_from_transcript(
+        messages = format_openai_chat_messages_from_transcript(
             self.transcript,
             self.get_model_name_for_tokenizer(),
             self.functions,
             self.agent_config.prompt_preamble,
         )
+        pending_human_input = speculative_human_input.get()
+        if pending_human_input is not None:
+            messages.append({"role": "user", "content": pending_human_input})
+        return messages
+
+    def get_chat_parameters(self, messages: Optional[List] = None, use_functions: bool = True):
+        assert self.transcript is not None
+        is_azure = self._is_azure_model()
+
+        if not messages:
+            messages = self.format_chat_messages()
 
         parameters: Dict[str, Any] = {
             "messages": messages,
@@ -190,33 +200,27 @@ class ChatGPTAgent(RespondAgent[ChatGPTAgentConfigType]):
 
         chat_parameters = {}
         if self.agent_config.vector_db_config:
+            messages = self.format_chat_messages()
             try:
                 docs_with_scores = await self.vector_db.similarity_search_with_score(
-                    self.transcript.get_last_user_message()[1]
+                    speculative_human_input.get() or self.transcript.get_last_user_message()[1]
                 )
                 docs_with_scores_str = "\n\n".join(
                     [
                         "Document: "
                         + doc[0].metadata["source"]
                         + f" (Confidence: {doc[1]})\n"
-                        + doc[0].lc_kwargs["page_content"].replace(r"\n", "\n")
+                        + doc[0].page_content.replace(r"\n", "\n")
                         for doc in docs_with_scores
                     ]
                 )
                 vector_db_result = (
                     f"Found {len(docs_with_scores)} similar documents:\n{docs_with_scores_str}"
                 )
-                messages = format_openai_chat_messages_from_transcript(
-                    self.transcript,
-                    self.agent_config.model_name,
-                    self.functions,
-                    self.agent_config.prompt_preamble,
-                )
                 messages.insert(-1, vector_db_result_to_openai_chat_message(vector_db_result))
-                chat_parameters = self.get_chat_parameters(messages)
             except Exception as e:
                 logger.error(f"Error while hitting vector db: {e}", exc_info=True)
-                chat_parameters = self.get_chat_parameters()
+            chat_parameters = self.get_chat_parameters(messages)
         else:
             chat_parameters = self.get_chat_parameters()
         chat_parameters["stream"] = True
@@ -1,13 +1,15 @@
-from copy import deepcopy
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+import bisect
+import typing
+from typing import Any, AsyncGenerator, Dict, List, NamedTuple, Optional, Union
 
 from loguru import logger
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from vocode.streaming.agent.token_utils import (
     get_chat_gpt_max_tokens,
+    get_tokenizer_info,
     num_tokens_from_functions,
-    num_tokens_from_messages,
+    tokens_from_dict,
 )
 from vocode.streaming.models.actions import FunctionFragment, PhraseBasedActionTrigger
 from vocode.streaming.models.agent import LLM_AGENT_DEFAULT_MAX_TOKENS
@@ -37,50 +39,59 @@ def is_phrase_based_action_event_log(event_log: EventLog) -> bool:
     )
 
 
+def event_log_to_openai_chat_message(event_log: EventLog) -> Optional[Dict[str, Any]]:
+    """Returns the chat message for an event log, or None if it is left out of the prompt."""
+    if isinstance(event_log, Message):
+        if len(event_log.text.strip()) == 0:
+            return None
+        return {
+            "role": ("assistant" if event_log.sender == Sender.BOT else "user"),
+            "content": event_log.to_string(include_sender=False),
+        }
+    elif isinstance(event_log, ActionStart):
+        if is_phrase_based_action_event_log(event_log=event_log):
+            return None
+        return {
+            "role": "assistant",
+            "content": None,
+            "function_call": {
+                "name": event_log.action_type,
+                "arguments": event_log.action_input.params.json(),
+            },
+        }
+    elif isinstance(event_log, ActionFinish):
+        return {
+            "role": "function",
+            "name": event_log.action_type,
+            "content": event_log.to_string(include_header=False),
+        }
+    elif isinstance(event_log, ConferenceEvent):
+        return {"role": "user", "content": event_log.to_string(include_sender=False)}
+    return None
+
+
 def get_openai_chat_messages_from_transcript(
     merged_event_logs: List[EventLog],
     prompt_preamble: str,
 ) -> List[dict]:
     chat_messages = [{"role": "system", "content": prompt_preamble}]
     for event_log in merged_event_logs:
-        if isinstance(event_log, Message):
-            if len(event_log.text.strip()) == 0:
-                continue
-            else:
-                chat_messages.append(
-                    {
-                        "role": ("assistant" if event_log.sender == Sender.BOT else "user"),
-                        "content": event_log.to_string(include_sender=False),
-                    },
-                )
-        elif isinstance(event_log, ActionStart):
-            action_message: Dict[str, Any]
-            if is_phrase_based_action_event_log(event_log=event_log):
-                pass
-            else:
-                action_message = {
-                    "role": "assistant",
-                    "content": None,
-                    "function_call": {
-                        "name": event_log.action_type,
-                        "arguments": event_log.action_input.params.json(),
-                    },
-                }
-                chat_messages.append(action_message)
-        elif isinstance(event_log, ActionFinish):
-            action_message = {
-                "role": "function",
-                "name": event_log.action_type,
-                "content": event_log.to_string(include_header=False),
-            }
-            chat_messages.append(action_message)
-        elif isinstance(event_log, ConferenceEvent):
-            chat_messages.append(
-                {"role": "user", "content": event_log.to_string(include_sender=False)},
-            )
+        chat_message = event_log_to_openai_chat_message(event_log)
+        if chat_message is not None:
+            chat_messages.append(chat_message)
     return chat_messages
 
 
+def is_bot_message(event_log: EventLog) -> bool:
+    return isinstance(event_log, Message) and event_log.sender == Sender.BOT
+
+
+def merge_bot_messages(bot_messages: List[Message]) -> Message:
+    return bot_messages[-1].copy(
+        update={"text": " ".join(event_log.text for event_log in bot_messages)}
+    )
+
+
 def merge_event_logs(event_logs: List[EventLog]) -> List[EventLog]:
     """Returns a new list of event logs where consecutive bot messages are merged."""
     new_event_logs: List[EventLog] = []
@@ -88,17 +99,15 @@ def merge_event_logs(event_logs: List[EventLog]) -> List[EventLog]:
     while idx < len(event_logs):
         bot_messages_buffer: List[Message] = []
         current_log = event_logs[idx]
-        while isinstance(current_log, Message) and current_log.sender == Sender.BOT:
-            bot_messages_buffer.append(current_log)
+        while is_bot_message(current_log):
+            bot_messages_buffer.append(typing.cast(Message, current_log))
             idx += 1
             try:
                 current_log = event_logs[idx]
             except IndexError:
                 break
         if bot_messages_buffer:
-            merged_bot_message = deepcopy(bot_messages_buffer[-1])
-            merged_bot_message.text = " ".join(event_log.text for event_log in bot_messages_buffer)
-            new_event_logs.append(merged_bot_message)
+            new_event_logs.append(merge_bot_messages(bot_messages_buffer))
         else:
             new_event_logs.append(current_log)
             idx += 1
@@ -106,47 +115,156 @@ def merge_event_logs(event_logs: List[EventLog]) -> List[EventLog]:
     return new_event_logs
 
 
+class ChatPromptEntry(NamedTuple):
+    # index into the event logs after the last event that makes up this entry
+    event_logs_end: int
+    last_event_log: EventLog
+    chat_message: Optional[Dict[str, Any]]
+    num_tokens: int
+
+
+class ChatPromptBuilder:
+    """Builds the chat messages for a transcript, trimmed to fit the model's context window.
+
+    Token counts are cached per chat message, and only the event logs added since the last
+    call are converted, along with the entry holding the latest bot message, which is updated
+    in place while it is spoken or cut off. Trimming finds the oldest message to keep with a
+    binary search over the running token sums, instead of recounting the whole prompt after
+    every removed message.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        tokenizer_info = get_tokenizer_info(model_name)
+        if tokenizer_info is None:
+            raise NotImplementedError(
+                f"ChatPromptBuilder is not implemented for model {model_name}, its tokens cannot be counted"
+            )
+        self.tokenizer_info = tokenizer_info
+        self.entries: List[ChatPromptEntry] = []
+        # token_sums[i] is the number of tokens in the first i entries
+        self.token_sums: List[int] = [0]
+        self.last_bot_entry_idx: Optional[int] = None
+        self.prompt_preamble: Optional[str] = None
+        self.prompt_preamble_tokens = 0
+        self.functions: Optional[List[Dict]] = None
+        self.functions_tokens = 0
+
+    def count_tokens(self, chat_message: Dict[str, Any]) -> int:
+        return self.tokenizer_info.tokens_per_message + tokens_from_dict(
+            encoding=self.tokenizer_info.encoding,
+            d=chat_message,
+            tokens_per_name=self.tokenizer_info.tokens_per_name,
+        )
+
+    def build(
+        self,
+        event_logs: List[EventLog],
+        functions: Optional[List[Dict]],
+        prompt_preamble: str,
+    ) -> List[dict]:
+        self._update_entries(event_logs)
+        system_message = {"role": "system", "content": prompt_preamble}
+        if prompt_preamble != self.prompt_preamble:
+            self.prompt_preamble = prompt_preamble
+            self.prompt_preamble_tokens = self.count_tokens(system_message)
+        if functions is not self.functions:
+            self.functions = functions
+            self.functions_tokens = num_tokens_from_functions(
+                functions=functions, model=self.model_name
+            )
+
+        # context limit includes the max tokens, and 50 for safety
+        max_context_size = (
+            get_chat_gpt_max_tokens(self.model_name) - LLM_AGENT_DEFAULT_MAX_TOKENS - 50
+        )
+        # every reply is primed with <|start|>assistant<|message|>
+        fixed_context_size = 3 + self.prompt_preamble_tokens + self.functions_tokens
+        tokens_to_remove = fixed_context_size + self.token_sums[-1] - max_context_size
+        first_entry = 0
+        if tokens_to_remove > 0:
+            first_entry = bisect.bisect_left(self.token_sums, tokens_to_remove)
+            if first_entry >= len(self.token_sums):
+                first_entry = len(self.entries)
+                logger.error(
+                    f"Prompt is too long to fit in context window, num tokens {fixed_context_size}"
+                )
+            num_removed_messages = sum(
+                1 for entry in self.entries[:first_entry] if entry.chat_message is not None
+            )
+            if num_removed_messages > 0:
+                logger.info(
+                    "Removed %d messages from prompt to satisfy context limit",
+                    num_removed_messages,
+                )
+
+        chat_messages: List[dict] = [system_message]
+        for entry in self.entries[first_entry:]:
+            if entry.chat_message is not None:
+                # callers may edit the messages, keep the cached ones intact
+                chat_messages.append(dict(entry.chat_message))
+        return chat_messages
+
+    def _update_entries(self, event_logs: List[EventLog]):
+        num_kept_entries = self._get_num_reusable_entries(event_logs)
+        del self.entries[num_kept_entries:]
+        del self.token_sums[num_kept_entries + 1 :]
+        if self.last_bot_entry_idx is not None and self.last_bot_entry_idx >= num_kept_entries:
+            self.last_bot_entry_idx = None
+        idx = self.entries[-1].event_logs_end if self.entries else 0
+        while idx < len(event_logs):
+            bot_messages: List[Message] = []
+            while idx < len(event_logs) and is_bot_message(event_logs[idx]):
+                bot_messages.append(typing.cast(Message, event_logs[idx]))
+                idx += 1
+            if bot_messages:
+                merged_event_log: EventLog = merge_bot_messages(bot_messages)
+                self.last_bot_entry_idx = len(self.entries)
+            else:
+                merged_event_log = event_logs[idx]
+                idx += 1
+            chat_message = event_log_to_openai_chat_message(merged_event_log)
+            num_tokens = self.count_tokens(chat_message) if chat_message is not None else 0
+            self.entries.append(
+                ChatPromptEntry(
+                    event_logs_end=idx,
+                    last_event_log=event_logs[idx - 1],
+                    chat_message=chat_message,
+                    num_tokens=num_tokens,
+                )
+            )
+            self.token_sums.append(self.token_sums[-1] + num_tokens)
+
+    def _get_num_reusable_entries(self, event_logs: List[EventLog]) -> int:
+        if not self.entries:
+            return 0
+        # the last entry can grow, and the latest bot message is edited in place
+        num_entries = len(self.entries) - 1
+        if self.last_bot_entry_idx is not None:
+            num_entries = min(num_entries, self.last_bot_entry_idx)
+        if num_entries == 0:
+            return 0
+        last_kept_entry = self.entries[num_entries - 1]
+        if (
+            len(event_logs) < last_kept_entry.event_logs_end
+            or event_logs[last_kept_entry.event_logs_end - 1] is not last_kept_entry.last_event_log
+        ):
+            # the event logs were replaced or rewritten, start over
+            return 0
+        return num_entries
+
+
 def format_openai_chat_messages_from_transcript(
     transcript: Transcript,
     model_name: str,
     functions: Optional[List[Dict]],
     prompt_preamble: str,
 ) -> List[dict]:
-    # merge consecutive bot messages
-    merged_event_logs: List[EventLog] = merge_event_logs(event_logs=transcript.event_logs)
-
-    chat_messages: List[Dict[str, Optional[Any]]]
-    chat_messages = get_openai_chat_messages_from_transcript(
-        merged_event_logs=merged_event_logs,
-        prompt_preamble=prompt_preamble,
-    )
-
-    context_size = num_tokens_from_messages(
-        messages=chat_messages,
-        model=model_name,
-    ) + num_tokens_from_functions(functions=functions, model=model_name)
-
-    num_removed_messages = 0
-    while (
-        context_size > get_chat_gpt_max_tokens(model_name) - LLM_AGENT_DEFAULT_MAX_TOKENS - 50
-    ):  # context limit includes the max tokens, and 50 for safety
-        if len(chat_messages) <= 1:
-            logger.error(f"Prompt is too long to fit in context window, num tokens {context_size}")
-            break
-        num_removed_messages += 1
-        chat_messages.pop(1)
-        context_size = num_tokens_from_messages(
-            messages=chat_messages,
-            model=model_name,
-        ) + num_tokens_from_functions(functions=functions, model=model_name)
-
-    if num_removed_messages > 0:
-        logger.info(
-            "Removed %d messages from prompt to satisfy context limit",
-            num_removed_messages,
-        )
-
-    return chat_messages
+    chat_prompt_builder = transcript.chat_prompt_builders.get(model_name)
+    if chat_prompt_builder is None:
+        chat_prompt_builder = ChatPromptBuilder(model_name)
+        transcript.chat_prompt_builders[model_name] = chat_prompt_builder
+    return chat_prompt_builder.build(transcript.event_logs, functions, prompt_preamble)
 
 
 async def openai_get_tokens(
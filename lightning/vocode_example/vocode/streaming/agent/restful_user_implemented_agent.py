@@ -11,6 +11,7 @@ from vocode.streaming.models.agent import (
     RESTfulAgentText,
     RESTfulUserImplementedAgentConfig,
 )
+from vocode.streaming.utils.async_requester import AsyncRequestor
 
 
 class RESTfulUserImplementedAgent(RespondAgent[RESTfulUserImplementedAgentConfig]):
@@ -32,26 +33,24 @@ class RESTfulUserImplementedAgent(RespondAgent[RESTfulUserImplementedAgentConfig
     ) -> Tuple[Optional[str], bool]:
         config = self.agent_config.respond
         try:
-            # TODO: cache session
-            async with aiohttp.ClientSession() as session:
-                payload = RESTfulAgentInput(
-                    human_input=human_input, conversation_id=conversation_id
-                ).dict()
-                async with session.request(
-                    config.method,
-                    config.url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    assert response.status == 200
-                    output: RESTfulAgentOutput = RESTfulAgentOutput.parse_obj(await response.json())
-                    output_response = None
-                    should_stop = False
-                    if output.type == RESTfulAgentOutputType.TEXT:
-                        output_response = cast(RESTfulAgentText, output).response
-                    elif output.type == RESTfulAgentOutputType.END:
-                        should_stop = True
-                    return output_response, should_stop
+            payload = RESTfulAgentInput(
+                human_input=human_input, conversation_id=conversation_id
+            ).dict()
+            async with AsyncRequestor().get_session().request(
+                config.method,
+                config.url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as response:
+                assert response.status == 200
+                output: RESTfulAgentOutput = RESTfulAgentOutput.parse_obj(await response.json())
+                output_response = None
+                should_stop = False
+                if output.type == RESTfulAgentOutputType.TEXT:
+                    output_response = cast(RESTfulAgentText, output).response
+                elif output.type == RESTfulAgentOutputType.END:
+                    should_stop = True
+                return output_response, should_stop
         except Exception as e:
             logger.error(f"Error in response from RESTful agent: {e}")
             return None, True
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, AsyncGenerator, Callable, Dict, Optional, Union
+
+from loguru import logger
+
+from vocode.streaming.models.transcriber import Transcription
+from vocode.streaming.utils.create_task import asyncio_create_task
+from vocode.streaming.utils.worker import InterruptibleEvent
+
+if TYPE_CHECKING:
+    from vocode.streaming.agent.base_agent import GeneratedResponse
+
+# the interim transcription a speculative response is generated for, which is not in the
+# transcript yet. Only set inside the task generating the speculative response
+speculative_human_input: ContextVar[Optional[str]] = ContextVar(
+    "speculative_human_input", default=None
+)
+
+
+def normalize_speculative_text(text: str) -> str:
+    """Final transcriptions often only differ from the interim ones in casing and punctuation."""
+    return " ".join(re.sub(r"[^\w\s]", "", text).lower().split())
+
+
+@dataclass
+class SpeculativeResponseStats:
+    started: int = 0
+    # the final transcription matched and the speculative response was used
+    hits: int = 0
+    # the final transcription did not match, or the speculative response failed before its
+    # first response
+    misses: int = 0
+    # the interim transcription changed, or the utterance was ignored, before the final one
+    cancelled: int = 0
+    # head start the hits got on generating a response, up to their first response
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        num_finals = self.hits + self.misses
+        return self.hits / num_finals if num_finals else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class SpeculativeResponse:
+    """Generates the agent's response to an interim transcription in the background, buffering
+    it until the final transcription either claims it with `responses` or it is cancelled.
+
+    The interruptible event is registered like any other, so a broadcast interrupt stops the
+    generation too.
+    """
+
+    def __init__(
+        self,
+        transcription: Transcription,
+        interruptible_event: InterruptibleEvent[Transcription],
+        generate_responses: Callable[[], AsyncGenerator[GeneratedResponse, None]],
+    ):
+        self.text = transcription.message
+        self.normalized_text = normalize_speculative_text(self.text)
+        self.interruptible_event = interruptible_event
+        self.started_at = time.monotonic()
+        self.first_response_at: Optional[float] = None
+        self.error: Optional[Exception] = None
+        self.queue: asyncio.Queue[Optional[GeneratedResponse]] = asyncio.Queue()
+        self.task = asyncio_create_task(self._generate(generate_responses))
+
+    async def _generate(
+        self, generate_responses: Callable[[], AsyncGenerator[GeneratedResponse, None]]
+    ):
+        speculative_human_input.set(self.text)
+        try:
+            async for response in generate_responses():
+                if self.interruptible_event.is_interrupted():
+                    break
+                if self.first_response_at is None:
+                    self.first_response_at = time.monotonic()
+                self.queue.put_nowait(response)
+        except Exception as e:
+            logger.exception("Error while generating speculative response")
+            self.error = e
+        finally:
+            self.queue.put_nowait(None)
+
+    def matches(self, text: str) -> bool:
+        return normalize_speculative_text(text) == self.normalized_text
+
+    def failed_without_response(self) -> bool:
+        """Whether the generation failed before producing anything, so the final transcription
+        needs a fresh response instead."""
+        return self.error is not None and self.first_response_at is None
+
+    def get_saved_seconds(self) -> float:
+        now = time.monotonic()
+        head_start_until = min(now, self.first_response_at) if self.first_response_at else now
+        return head_start_until - self.started_at
+
+    async def responses(self) -> AsyncGenerator[GeneratedResponse, None]:
+        try:
+            while True:
+                response = await self.queue.get()
+                if response is None:
+                    return
+                yield response
+        finally:
+            # the consumer was interrupted, so the rest of the response is not needed either
+            self.task.cancel()
+
+    def cancel(self):
+        self.interruptible_event.interrupt()
+        self.task.cancel()
@@ -10,6 +10,7 @@ from .model import BaseModel, TypedModel
 from .vector_db import VectorDBConfig
 
 FILLER_AUDIO_DEFAULT_SILENCE_THRESHOLD_SECONDS = 0.5
+SPECULATIVE_RESPONSE_DEFAULT_STABILITY_SECONDS = 0.3
 LLM_AGENT_DEFAULT_TEMPERATURE = 1.0
 LLM_AGENT_DEFAULT_MAX_TOKENS = 256
 LLM_AGENT_DEFAULT_MODEL_NAME = "text-curie-001"
@@ -72,6 +73,11 @@ class FillerAudioConfig(BaseModel):
         return v
 
 
+class SpeculativeResponseConfig(BaseModel):
+    # how long an interim transcription must stay unchanged before a response is generated for it
+    stability_seconds: float = SPECULATIVE_RESPONSE_DEFAULT_STABILITY_SECONDS
+
+
 class WebhookConfig(BaseModel):
     url: str
 
@@ -132,6 +138,8 @@ class ChatGPTAgentConfig(AgentConfig, type=AgentType.CHAT_GPT.value):  # type: i
     backchannel_probability: float = 0.7
     first_response_filler_message: Optional[str] = None
     llm_fallback: Optional[LLMFallback] = None
+    # start generating the response to interim transcriptions, see SpeculativeResponse
+    speculative_response: Optional[SpeculativeResponseConfig] = None
 
 
 class AnthropicAgentConfig(AgentConfig, type=AgentType.ANTHROPIC.value):  # type: ignore
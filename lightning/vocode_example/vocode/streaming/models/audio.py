@@ -1,4 +1,9 @@
 from enum import Enum
+from typing import Union
+
+# audio handed between synthesizers and output devices: bytes, or a read-only view of a shared
+# buffer (precomputed chunks, a memory-mapped cache file) that is sliced without copying
+AudioBuffer = Union[bytes, memoryview]
 
 
 class AudioEncoding(str, Enum):
@@ -51,6 +51,20 @@ class PunctuationEndpointingConfig(
     time_cutoff_seconds: float = 0.4
 
 
+class VoiceActivityGateConfig(BaseModel):
+    """Holds back the audio between utterances instead of streaming it to the transcriber."""
+
+    speech_threshold_dbfs: float = -45.0
+    # loud audio that crosses zero more often than this, like hiss, is not counted as speech
+    max_zero_crossing_rate: Optional[float] = 0.4
+    # audio from just before speech is detected that is sent along with it
+    pre_roll_seconds: float = 0.3
+    # audio keeps flowing this long after speech, so the transcriber's endpointing still works
+    hangover_seconds: float = 2.0
+    # while audio is held back, a short chunk of silence is sent this often
+    keepalive_interval_seconds: float = 1.0
+
+
 class TranscriberConfig(TypedModel, type=TranscriberType.BASE.value):  # type: ignore
     sampling_rate: int
     audio_encoding: AudioEncoding
@@ -59,6 +73,7 @@ class TranscriberConfig(TypedModel, type=TranscriberType.BASE.value):  # type: i
     downsampling: Optional[int] = None
     min_interrupt_confidence: Optional[float] = None
     mute_during_speech: bool = False
+    voice_activity_gate: Optional[VoiceActivityGateConfig] = None
 
     @validator("min_interrupt_confidence")
     def min_interrupt_confidence_must_be_between_0_and_1(cls, v):
@@ -155,6 +170,13 @@ class WhisperCPPTranscriberConfig(
     buffer_size_seconds: float = 1
     libname: str
     fname_model: str
+    # transcribe a sliding window of the utterance every buffer_size_seconds, sending interim
+    # transcriptions, and end the utterance after endpointing_silence_seconds of silence
+    streaming: bool = False
+    window_seconds: float = 10
+    window_overlap_seconds: float = 1
+    endpointing_silence_seconds: float = 0.6
+    speech_threshold_dbfs: float = -45
 
 
 class RevAITranscriberConfig(TranscriberConfig, type=TranscriberType.REV_AI.value):  # type: ignore
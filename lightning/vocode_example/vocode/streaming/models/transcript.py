@@ -1,8 +1,8 @@
 import time
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic.v1 import BaseModel, Field
+from pydantic.v1 import BaseModel, Field, PrivateAttr
 
 from vocode.streaming.models.actions import ActionInput, ActionOutput
 from vocode.streaming.models.events import ActionEvent, Event, EventType, Sender
@@ -120,10 +120,16 @@ class Transcript(BaseModel):
     event_logs: List[EventLog] = []
     start_time: float = Field(default_factory=time.time)
     events_manager: Optional[EventsManager] = None
+    # ChatPromptBuilders by model name, so each turn only converts the new event logs
+    _chat_prompt_builders: Dict[str, Any] = PrivateAttr(default_factory=dict)
 
     class Config:
         arbitrary_types_allowed = True
 
+    @property
+    def chat_prompt_builders(self) -> Dict[str, Any]:
+        return self._chat_prompt_builders
+
     def to_string(
         self, include_timestamps: bool = False, mark_human_backchannels_with_brackets: bool = False
     ) -> str:
@@ -147,7 +153,9 @@ class Transcript(BaseModel):
         self.events_manager = events_manager
 
     def maybe_publish_transcript_event_from_message(self, message: Message, conversation_id: str):
-        if self.events_manager is not None:
+        if self.events_manager is not None and self.events_manager.is_subscribed(
+            EventType.TRANSCRIPT
+        ):
             self.events_manager.publish_event(
                 TranscriptEvent(
                     text=message.text,
@@ -222,7 +230,7 @@ class Transcript(BaseModel):
                 timestamp=timestamp,
             )
         )
-        if self.events_manager is not None:
+        if self.events_manager is not None and self.events_manager.is_subscribed(EventType.ACTION):
             self.events_manager.publish_event(
                 ActionEvent(
                     action_input=action_input.dict(),
@@ -245,7 +253,7 @@ class Transcript(BaseModel):
                 timestamp=timestamp,
             )
         )
-        if self.events_manager is not None:
+        if self.events_manager is not None and self.events_manager.is_subscribed(EventType.ACTION):
             self.events_manager.publish_event(
                 ActionEvent(
                     action_input=action_input.dict(),
@@ -9,6 +9,7 @@ DEFAULT_EMBEDDINGS_MODEL = "text-embedding-ada-002"
 class VectorDBType(str, Enum):
     BASE = "vector_db_base"
     PINECONE = "vector_db_pinecone"
+    LOCAL = "vector_db_local"
 
 
 class VectorDBConfig(TypedModel, type=VectorDBType.BASE.value):  # type: ignore
@@ -20,3 +21,9 @@ class PineconeConfig(VectorDBConfig, type=VectorDBType.PINECONE.value):  # type:
     api_key: Optional[str]
     api_environment: Optional[str]
     top_k: int = 3
+
+
+class LocalVectorDBConfig(VectorDBConfig, type=VectorDBType.LOCAL.value):  # type: ignore
+    # directory the index is saved to and memory-mapped from, kept in memory only if not set
+    storage_path: Optional[str] = None
+    top_k: int = 3
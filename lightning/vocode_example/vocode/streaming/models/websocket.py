@@ -2,6 +2,7 @@ import base64
 from enum import Enum
 from typing import Optional
 
+from vocode.streaming.models.audio import AudioBuffer
 from vocode.streaming.models.client_backend import InputAudioConfig, OutputAudioConfig
 
 from .agent import AgentConfig
@@ -30,7 +31,7 @@ class AudioMessage(WebSocketMessage, type=WebSocketMessageType.AUDIO):  # type:
     data: str
 
     @classmethod
-    def from_bytes(cls, chunk: bytes):
+    def from_bytes(cls, chunk: AudioBuffer):
         return cls(data=base64.b64encode(chunk).decode("utf-8"))
 
     def get_bytes(self) -> bytes:
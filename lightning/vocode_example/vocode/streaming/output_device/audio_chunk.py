@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from uuid import UUID
 
+from vocode.streaming.models.audio import AudioBuffer
+
 
 class ChunkState(int, Enum):
     UNPLAYED = 0
@@ -12,7 +14,7 @@ class ChunkState(int, Enum):
 
 @dataclass
 class AudioChunk:
-    data: bytes
+    data: AudioBuffer
     state: ChunkState = ChunkState.UNPLAYED
     chunk_id: UUID = field(default_factory=uuid.uuid4)
 
@@ -3,7 +3,7 @@ import wave
 
 import numpy as np
 
-from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
 from vocode.streaming.output_device.rate_limit_interruptions_output_device import (
     RateLimitInterruptionsOutputDevice,
 )
@@ -27,7 +27,7 @@ class FileOutputDevice(RateLimitInterruptionsOutputDevice):
         wav.setframerate(self.sampling_rate)
         self.wav = wav
 
-    async def play(self, chunk: bytes):
+    async def play(self, chunk: AudioBuffer):
         await asyncio.to_thread(lambda: self.wav.writeframes(chunk))
 
     async def terminate(self):
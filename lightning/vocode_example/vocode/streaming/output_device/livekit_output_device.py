@@ -3,7 +3,7 @@ import asyncio
 from livekit import rtc
 
 from vocode.streaming.livekit.constants import AUDIO_ENCODING, DEFAULT_SAMPLING_RATE
-from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
 from vocode.streaming.output_device.abstract_output_device import AbstractOutputDevice
 from vocode.streaming.output_device.audio_chunk import ChunkState
 
@@ -59,7 +59,7 @@ class LiveKitOutputDevice(AbstractOutputDevice):
     async def uninitialize_source(self):
         await self.room.local_participant.unpublish_track(self.track.sid)
 
-    async def play(self, item: bytes):
+    async def play(self, item: AudioBuffer):
         audio_frame = rtc.AudioFrame(
             item, self.sampling_rate, num_channels=1, samples_per_channel=len(item) // 2
         )
@@ -3,7 +3,7 @@ import time
 from abc import abstractmethod
 
 from vocode.streaming.constants import PER_CHUNK_ALLOWANCE_SECONDS
-from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
 from vocode.streaming.output_device.abstract_output_device import AbstractOutputDevice
 from vocode.streaming.output_device.audio_chunk import ChunkState
 from vocode.streaming.utils import get_chunk_size_per_second
@@ -58,7 +58,7 @@ class RateLimitInterruptionsOutputDevice(AbstractOutputDevice):
             self.interruptible_event.is_interruptible = False
 
     @abstractmethod
-    async def play(self, chunk: bytes):
+    async def play(self, chunk: AudioBuffer):
         """Sends an audio chunk to immediate playback"""
         pass
 
@@ -1,9 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import audioop
-import base64
-import json
 from typing import List, Optional, Union
 
 from fastapi import WebSocket
@@ -11,9 +8,11 @@ from fastapi.websockets import WebSocketState
 from loguru import logger
 from pydantic import BaseModel
 
+from vocode.streaming.models.audio import AudioBuffer
 from vocode.streaming.output_device.abstract_output_device import AbstractOutputDevice
 from vocode.streaming.output_device.audio_chunk import AudioChunk, ChunkState
 from vocode.streaming.telephony.constants import DEFAULT_AUDIO_ENCODING, DEFAULT_SAMPLING_RATE
+from vocode.streaming.telephony.twilio_framing import TwilioFramer
 from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.dtmf_utils import DTMFToneGenerator, KeypadEntry
 from vocode.streaming.utils.worker import InterruptibleEvent
@@ -30,7 +29,7 @@ class TwilioOutputDevice(AbstractOutputDevice):
     def __init__(self, ws: Optional[WebSocket] = None, stream_sid: Optional[str] = None):
         super().__init__(sampling_rate=DEFAULT_SAMPLING_RATE, audio_encoding=DEFAULT_AUDIO_ENCODING)
         self.ws = ws
-        self.stream_sid = stream_sid
+        self.stream_sid = stream_sid  # also builds self._framer
         self.active = True
 
         self._twilio_events_queue: asyncio.Queue[str] = asyncio.Queue()
@@ -39,6 +38,16 @@ class TwilioOutputDevice(AbstractOutputDevice):
             asyncio.Queue()
         )
 
+    @property
+    def stream_sid(self) -> Optional[str]:
+        return self._stream_sid
+
+    @stream_sid.setter
+    def stream_sid(self, stream_sid: Optional[str]):
+        # the stream SID is only known once Twilio sends the start event
+        self._stream_sid = stream_sid
+        self._framer = TwilioFramer(stream_sid)
+
     def consume_nonblocking(self, item: InterruptibleEvent[AudioChunk]):
         if not item.is_interrupted():
             self._send_audio_chunk_and_mark(
@@ -63,12 +72,7 @@ class TwilioOutputDevice(AbstractOutputDevice):
             dtmf_tone = tone_generator.generate(
                 keypad_entry, sampling_rate=self.sampling_rate, audio_encoding=self.audio_encoding
             )
-            dtmf_message = {
-                "event": "media",
-                "streamSid": self.stream_sid,
-                "media": {"payload": base64.b64encode(dtmf_tone).decode("utf-8")},
-            }
-            self._twilio_events_queue.put_nowait(json.dumps(dtmf_message))
+            self._twilio_events_queue.put_nowait(self._framer.media(dtmf_tone))
 
     async def _send_twilio_messages(self):
         while True:
@@ -114,25 +118,9 @@ class TwilioOutputDevice(AbstractOutputDevice):
         process_mark_messages_task = asyncio_create_task(self._process_mark_messages())
         await asyncio.gather(send_twilio_messages_task, process_mark_messages_task)
 
-    def _send_audio_chunk_and_mark(self, chunk: bytes, chunk_id: str):
-        media_message = {
-            "event": "media",
-            "streamSid": self.stream_sid,
-            "media": {"payload": base64.b64encode(chunk).decode("utf-8")},
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(media_message))
-        mark_message = {
-            "event": "mark",
-            "streamSid": self.stream_sid,
-            "mark": {
-                "name": chunk_id,
-            },
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(mark_message))
+    def _send_audio_chunk_and_mark(self, chunk: AudioBuffer, chunk_id: str):
+        self._twilio_events_queue.put_nowait(self._framer.media(chunk))
+        self._twilio_events_queue.put_nowait(self._framer.mark(chunk_id))
 
     def _send_clear_message(self):
-        clear_message = {
-            "event": "clear",
-            "streamSid": self.stream_sid,
-        }
-        self._twilio_events_queue.put_nowait(json.dumps(clear_message))
+        self._twilio_events_queue.put_nowait(self._framer.clear())
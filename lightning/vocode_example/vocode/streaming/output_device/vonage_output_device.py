@@ -3,6 +3,7 @@ from typing import Optional
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
 
+from vocode.streaming.models.audio import AudioBuffer
 from vocode.streaming.output_device.blocking_speaker_output import BlockingSpeakerOutput
 from vocode.streaming.output_device.rate_limit_interruptions_output_device import (
     RateLimitInterruptionsOutputDevice,
@@ -29,11 +30,12 @@ class VonageOutputDevice(RateLimitInterruptionsOutputDevice):
                 sampling_rate=VONAGE_SAMPLING_RATE, blocksize=VONAGE_CHUNK_SIZE // 2
             )
 
-    async def play(self, chunk: bytes):
+    async def play(self, chunk: AudioBuffer):
         if self.output_to_speaker:
             self.output_speaker.consume_nonblocking(chunk)
         for i in range(0, len(chunk), VONAGE_CHUNK_SIZE):
-            subchunk = chunk[i : i + VONAGE_CHUNK_SIZE]
+            # chunks can be memoryviews, which can't be padded in place
+            subchunk = bytes(chunk[i : i + VONAGE_CHUNK_SIZE])
             if len(subchunk) % 2 == 1:
                 subchunk += PCM_SILENCE_BYTE  # pad with silence, Vonage goes crazy otherwise
             if self.ws and self.ws.application_state != WebSocketState.DISCONNECTED:
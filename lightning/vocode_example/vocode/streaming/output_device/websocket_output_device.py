@@ -4,7 +4,7 @@ import asyncio
 
 from fastapi import WebSocket
 
-from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
 from vocode.streaming.models.transcript import TranscriptEvent
 from vocode.streaming.models.websocket import AudioMessage, TranscriptMessage
 from vocode.streaming.output_device.rate_limit_interruptions_output_device import (
@@ -26,7 +26,7 @@ class WebsocketOutputDevice(RateLimitInterruptionsOutputDevice):
     def mark_closed(self):
         self.active = False
 
-    async def play(self, chunk: bytes):
+    async def play(self, chunk: AudioBuffer):
         await self.ws.send_text(AudioMessage.from_bytes(chunk).json())
 
     async def send_transcript(self, event: TranscriptEvent):
@@ -27,22 +27,29 @@ from sentry_sdk.tracing import Span
 from vocode import conversation_id as ctx_conversation_id
 from vocode.streaming.action.worker import ActionsWorker
 from vocode.streaming.agent.base_agent import (
+    POST_QUESTION_BACKCHANNELS,
     AgentInput,
     AgentResponse,
     AgentResponseFillerAudio,
     AgentResponseMessage,
     AgentResponseStop,
     BaseAgent,
+    RespondAgent,
     TranscriptionAgentInput,
 )
 from vocode.streaming.agent.chat_gpt_agent import ChatGPTAgent
+from vocode.streaming.agent.speculative_response import normalize_speculative_text
 from vocode.streaming.constants import (
     ALLOWED_IDLE_TIME,
     CHECK_HUMAN_PRESENT_MESSAGE_CHOICES,
     TEXT_TO_SPEECH_CHUNK_SIZE_SECONDS,
 )
 from vocode.streaming.models.actions import EndOfTurn
-from vocode.streaming.models.agent import FillerAudioConfig
+from vocode.streaming.models.agent import (
+    ChatGPTAgentConfig,
+    FillerAudioConfig,
+    SpeculativeResponseConfig,
+)
 from vocode.streaming.models.events import Sender
 from vocode.streaming.models.message import BaseMessage, BotBackchannel, LLMToken, SilenceMessage
 from vocode.streaming.models.transcriber import TranscriberConfig, Transcription
@@ -63,6 +70,7 @@ from vocode.streaming.utils import (
     get_chunk_size_per_second,
 )
 from vocode.streaming.utils.audio_pipeline import AudioPipeline, OutputDeviceType
+from vocode.streaming.utils.audio_preprocessor import AudioPreprocessingWorker, AudioPreprocessor
 from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.events_manager import EventsManager
 from vocode.streaming.utils.speed_manager import SpeedManager
@@ -162,6 +170,10 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
             self.has_associated_unignored_utterance: bool = False
             self.human_backchannels_buffer: List[Transcription] = []
             self.ignore_next_message: bool = False
+            # normalized text of the latest interim transcription, and the task waiting for it to
+            # stay unchanged long enough to start a speculative response
+            self.speculative_transcription_text: Optional[str] = None
+            self.speculative_response_timer: Optional[asyncio.Task] = None
 
         def should_ignore_utterance(self, transcription: Transcription):
             if self.has_associated_unignored_utterance:
@@ -226,6 +238,49 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 and not (is_first_bot_message and last_message.text.strip() == "")
             )
 
+        def get_speculative_response_config(self) -> Optional[SpeculativeResponseConfig]:
+            # only the ChatGPT agent can prompt with a transcription that is not in the transcript
+            agent_config = self.conversation.agent.get_agent_config()
+            if isinstance(agent_config, ChatGPTAgentConfig):
+                return agent_config.speculative_response
+            return None
+
+        def schedule_speculative_response(self, transcription: Transcription):
+            config = self.get_speculative_response_config()
+            if config is None:
+                return
+            text = normalize_speculative_text(transcription.message)
+            if text == self.speculative_transcription_text:
+                return
+            self.speculative_transcription_text = text
+            if self.speculative_response_timer is not None:
+                self.speculative_response_timer.cancel()
+            # the transcription changed, so any response generated for it so far is stale
+            typing.cast(RespondAgent, self.conversation.agent).cancel_speculative_response()
+            self.speculative_response_timer = asyncio_create_task(
+                self._start_speculative_response_when_stable(
+                    transcription, config.stability_seconds
+                )
+            )
+
+        async def _start_speculative_response_when_stable(
+            self, transcription: Transcription, stability_seconds: float
+        ):
+            await asyncio.sleep(stability_seconds)
+            typing.cast(RespondAgent, self.conversation.agent).start_speculative_response(
+                transcription,
+                conversation_id=self.conversation.id,
+                bot_was_in_medias_res=self.is_bot_in_medias_res(),
+            )
+
+        def reset_speculative_response(self, cancel_response: bool):
+            self.speculative_transcription_text = None
+            if self.speculative_response_timer is not None:
+                self.speculative_response_timer.cancel()
+                self.speculative_response_timer = None
+            if cancel_response and self.get_speculative_response_config() is not None:
+                typing.cast(RespondAgent, self.conversation.agent).cancel_speculative_response()
+
         async def process(self, transcription: Transcription):
             self.conversation.mark_last_action_timestamp()
             if transcription.message.strip() == "":
@@ -243,10 +298,12 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 if transcription.is_final:
                     # for all ignored backchannels, store them to be added to the transcript later
                     self.human_backchannels_buffer.append(transcription)
+                    self.reset_speculative_response(cancel_response=True)
                 return
             if self.ignore_next_message and transcription.is_final:
                 # TODO: delete this once transcription reset is implemented for processing conference voicemail
                 # Push human message to transcript but do not respond
+                self.reset_speculative_response(cancel_response=True)
                 self.has_associated_ignored_utterance = False
                 agent_response_tracker = None
                 self.ignore_next_message = False
@@ -282,7 +339,11 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
 
             transcription.is_interrupt = self.conversation.current_transcription_is_interrupt
             self.conversation.is_human_speaking = not transcription.is_final
+            if not transcription.is_final:
+                self.schedule_speculative_response(transcription)
             if transcription.is_final:
+                # the agent claims or discards the speculative response when it gets the final
+                self.reset_speculative_response(cancel_response=False)
                 self.has_associated_ignored_utterance = False
                 self.has_associated_unignored_utterance = False
                 agent_response_tracker = None
@@ -318,6 +379,10 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
                 )
                 self.consumer.consume_nonblocking(event)
 
+        async def terminate(self):
+            self.reset_speculative_response(cancel_response=False)
+            return await super().terminate()
+
     class FillerAudioWorker(InterruptibleWorker[InterruptibleAgentResponseEvent[FillerAudio]]):
         """
         - Waits for a configured number of seconds and then sends filler audio to the output
@@ -594,12 +659,19 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         speed_coefficient: float = 1.0,
         conversation_id: Optional[str] = None,
         events_manager: Optional[EventsManager] = None,
+        audio_preprocessor: Optional[AudioPreprocessor] = None,
     ):
         self.id = conversation_id or create_conversation_id()
         ctx_conversation_id.set(self.id)
 
         self.output_device = output_device
         self.transcriber = transcriber
+        # processes the received audio off the event loop before it is transcribed
+        self.audio_preprocessing_worker: Optional[AudioPreprocessingWorker] = None
+        if audio_preprocessor is not None:
+            self.audio_preprocessing_worker = AudioPreprocessingWorker(
+                audio_preprocessor, output=self.transcriber.send_audio
+            )
         self.agent = agent
         self.synthesizer = synthesizer
         self.synthesis_enabled = True
@@ -670,6 +742,7 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         self.mark_last_action_timestamp()
 
         self.check_for_idle_task: Optional[asyncio.Task] = None
+        self.load_phrase_audios_task: Optional[asyncio.Task] = None
         self.check_for_idle_paused = False
         self.is_human_still_there = True
 
@@ -692,6 +765,8 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
 
     async def start(self, mark_ready: Optional[Callable[[], Awaitable[None]]] = None):
         self.transcriber.start()
+        if self.audio_preprocessing_worker is not None:
+            self.audio_preprocessing_worker.start()
         self.transcriber.streaming_conversation = self
         self.transcriptions_worker.start()
         self.agent_responses_worker.start()
@@ -730,11 +805,31 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         self.check_for_idle_task = asyncio_create_task(
             self.check_for_idle(),
         )
+        phrases = self.get_phrases_to_load()
+        if phrases and self.synthesizer.uses_phrase_audio_bank():
+            self.load_phrase_audios_task = asyncio_create_task(
+                self.load_phrase_audios(phrases),
+            )
         if len(self.events_manager.subscriptions) > 0:
             self.events_task = asyncio_create_task(
                 self.events_manager.start(),
             )
 
+    def get_phrases_to_load(self) -> List[str]:
+        """Phrases the bot says often enough to be worth keeping in the FillerAudioBank."""
+        agent_config = self.agent.get_agent_config()
+        phrases: List[str] = []
+        if getattr(agent_config, "use_backchannels", False):
+            phrases.extend(POST_QUESTION_BACKCHANNELS)
+        if agent_config.num_check_human_present_times > 0:
+            phrases.extend(CHECK_HUMAN_PRESENT_MESSAGE_CHOICES)
+        return phrases
+
+    async def load_phrase_audios(self, phrases: List[str]):
+        # don't compete with the initial message for the synthesizer
+        await self.initial_message_tracker.wait()
+        await self.synthesizer.load_phrase_audios(phrases, self._get_synthesizer_chunk_size())
+
     def set_check_for_idle_paused(self, paused: bool):
         logger.debug(f"Setting idle check paused to {paused}")
         if not paused:
@@ -813,7 +908,10 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         self.transcriptions_worker.consume_nonblocking(transcription)
 
     def consume_nonblocking(self, item: bytes):
-        self.transcriber.send_audio(item)
+        if self.audio_preprocessing_worker is not None:
+            self.audio_preprocessing_worker.consume_nonblocking(item)
+        else:
+            self.transcriber.send_audio(item)
 
     def warmup_synthesizer(self):
         self.synthesizer.ready_synthesizer(self._get_synthesizer_chunk_size())
@@ -1015,6 +1113,8 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         if self.check_for_idle_task:
             logger.debug("Terminating check_for_idle Task")
             self.check_for_idle_task.cancel()
+        if self.load_phrase_audios_task:
+            self.load_phrase_audios_task.cancel()
         if self.events_manager and self.events_task:
             logger.debug("Terminating events Task")
             self.events_task.cancel()
@@ -1025,6 +1125,9 @@ class StreamingConversation(AudioPipeline[OutputDeviceType]):
         await self.agent.terminate()
         logger.debug("Terminating output device")
         await self.output_device.terminate()
+        if self.audio_preprocessing_worker is not None:
+            logger.debug("Terminating audio preprocessing worker")
+            await self.audio_preprocessing_worker.terminate()
         logger.debug("Terminating speech transcriber")
         await self.transcriber.terminate()
         logger.debug("Terminating transcriptions worker")
@@ -1,47 +1,270 @@
-from typing import Optional
+import asyncio
+import hashlib
+import mmap
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
 
 from loguru import logger
 
+from vocode.streaming.models.audio import AudioBuffer
+from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.redis import initialize_redis_bytes
 from vocode.streaming.utils.singleton import Singleton
 
+DEFAULT_MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+# every memory-mapped entry holds a file descriptor, so the number of entries is capped too
+DEFAULT_MEMORY_MAX_ENTRIES = 256
+DEFAULT_DISK_BUDGET_BYTES = 1024 * 1024 * 1024
+DISK_CACHE_SUFFIX = ".audio"
+
+
+def normalize_cache_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+@dataclass
+class AudioCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits + self.redis_hits
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "hits": self.hits}
+
+
+class MemoryAudioStore:
+    """In-process LRU of audio buffers, bounded by total size and number of entries."""
+
+    def __init__(self, budget_bytes: int, max_entries: int, stats: AudioCacheStats):
+        self.budget_bytes = budget_bytes
+        self.max_entries = max_entries
+        self.stats = stats
+        self.size_bytes = 0
+        self.entries: "OrderedDict[str, AudioBuffer]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[AudioBuffer]:
+        audio = self.entries.get(key)
+        if audio is not None:
+            self.entries.move_to_end(key)
+        return audio
+
+    def put(self, key: str, audio: AudioBuffer):
+        if len(audio) > self.budget_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self.entries[key] = audio
+        self.size_bytes += len(audio)
+        while self.size_bytes > self.budget_bytes or len(self.entries) > self.max_entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.stats.memory_evictions += 1
+
+
+class DiskAudioStore:
+    """Content-addressed audio files, read back through mmap.
+
+    Files are evicted least recently used first once the directory exceeds its budget. Access
+    times are recorded in the file mtimes, so the order survives restarts. The budget is tracked
+    per process, so workers sharing a directory can together use a multiple of it. The
+    directory is created private to the current user, since its files are played to callers.
+    """
+
+    def __init__(self, directory: str, budget_bytes: int, stats: AudioCacheStats):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.stats = stats
+        self.size_bytes = 0
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        existing = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(DISK_CACHE_SUFFIX):
+                stat = entry.stat()
+                existing.append(
+                    (stat.st_mtime, entry.name[: -len(DISK_CACHE_SUFFIX)], stat.st_size)
+                )
+        for _, key, size in sorted(existing):
+            self.entries[key] = size
+            self.size_bytes += size
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + DISK_CACHE_SUFFIX)
+
+    def get(self, key: str) -> Optional[memoryview]:
+        if key not in self.entries:
+            return None
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as f:
+                # the mapping stays valid after the file is closed, or even removed
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            # removed by another process, or an empty file that cannot be mapped
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return memoryview(mapped)
+
+    def write(self, key: str, audio: AudioBuffer):
+        """Writes the file without touching the index, so it can run off the event loop."""
+        path = self.get_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        # atomic, so concurrent readers never map a partially written file
+        os.replace(tmp_path, path)
+
+    def add(self, key: str, size: int):
+        self.size_bytes += size - self.entries.pop(key, 0)
+        self.entries[key] = size
+        while self.size_bytes > self.budget_bytes:
+            evicted_key = next(iter(self.entries))
+            self._remove(evicted_key)
+            self.stats.disk_evictions += 1
+
+    def _remove(self, key: str):
+        self.size_bytes -= self.entries.pop(key, 0)
+        try:
+            os.remove(self.get_path(key))
+        except OSError:
+            pass
+
 
 class AudioCache(Singleton):
-    def __init__(self):
+    """Synthesized audio keyed by voice and text, looked up in memory, on disk and then in Redis.
+
+    Entries are addressed by a hash of the voice identifier (which encodes the synthesizer
+    config) and the whitespace-normalized text. Disk and memory hits return views of the
+    memory-mapped file rather than copies of the audio.
+
+    The disk tier is off unless AUDIO_CACHE_DIR points at a directory only trusted processes
+    can write to.
+
+    Entries written before the keys were hashed (audio_cache:{voice}:{text}) are still read;
+    a hit moves the entry to its hashed key, so the old keys drain as they are used.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        memory_max_entries: int = DEFAULT_MEMORY_MAX_ENTRIES,
+        disk_cache_dir: Optional[str] = None,
+        disk_budget_bytes: Optional[int] = None,
+    ):
+        if memory_budget_bytes is None:
+            memory_budget_bytes = int(
+                os.environ.get("AUDIO_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BUDGET_BYTES)
+            )
+        if disk_cache_dir is None:
+            disk_cache_dir = os.environ.get("AUDIO_CACHE_DIR")
+        if disk_budget_bytes is None:
+            disk_budget_bytes = int(
+                os.environ.get("AUDIO_CACHE_DISK_BYTES", DEFAULT_DISK_BUDGET_BYTES)
+            )
         self.redis = initialize_redis_bytes()
-        self.disabled = False
+        self.redis_disabled = False
+        self.redis_ping_task: Optional[asyncio.Task] = None
+        self.stats = AudioCacheStats()
+        self.memory_store = MemoryAudioStore(memory_budget_bytes, memory_max_entries, self.stats)
+        self.disk_store: Optional[DiskAudioStore] = None
+        if disk_cache_dir:
+            try:
+                self.disk_store = DiskAudioStore(disk_cache_dir, disk_budget_bytes, self.stats)
+            except OSError:
+                logger.warning(f"Could not use {disk_cache_dir} for the audio cache, skipping disk")
 
     @staticmethod
     async def safe_create():
-        if AudioCache in Singleton._instances:
-            return Singleton._instances[AudioCache]
-
         audio_cache = AudioCache()
+        if audio_cache.redis_ping_task is None:
+            audio_cache.redis_ping_task = asyncio_create_task(audio_cache._ping_redis())
+        # callers that race the first one wait for its ping instead of using Redis unchecked
+        await asyncio.shield(audio_cache.redis_ping_task)
+        return audio_cache
+
+    async def _ping_redis(self):
         try:
-            await audio_cache.redis.ping()
+            await self.redis.ping()
         except Exception:
-            logger.warning("Redis ping failed on startup, disabling audio cache")
-            audio_cache.disabled = True
-        return audio_cache
+            logger.warning("Redis ping failed on startup, using the local audio cache only")
+            self.redis_disabled = True
 
     def get_audio_key(self, voice_identifier: str, text: str) -> str:
+        return hashlib.sha256(
+            f"{voice_identifier}\n{normalize_cache_text(text)}".encode("utf-8")
+        ).hexdigest()
+
+    def get_redis_key(self, audio_key: str) -> str:
+        return f"audio_cache:{audio_key}"
+
+    def get_legacy_redis_key(self, voice_identifier: str, text: str) -> str:
         return f"audio_cache:{voice_identifier}:{text}"
 
-    async def get_audio(self, voice_identifier: str, text: str) -> Optional[bytes]:
+    async def get_audio(self, voice_identifier: str, text: str) -> Optional[AudioBuffer]:
         audio_key = self.get_audio_key(voice_identifier, text)
-        if self.disabled:
-            return None
-        return await self.redis.get(audio_key)
+        audio = self.memory_store.get(audio_key)
+        if audio is not None:
+            self.stats.memory_hits += 1
+            return audio
+        if self.disk_store is not None:
+            audio = self.disk_store.get(audio_key)
+            if audio is not None:
+                self.stats.disk_hits += 1
+                self.memory_store.put(audio_key, audio)
+                return audio
+        if not self.redis_disabled:
+            redis_key = self.get_redis_key(audio_key)
+            legacy_redis_key = self.get_legacy_redis_key(voice_identifier, text)
+            audio, legacy_audio = await self.redis.mget(redis_key, legacy_redis_key)
+            if audio is None and legacy_audio is not None:
+                audio = legacy_audio
+                await self._migrate_legacy_audio(legacy_redis_key, redis_key, audio)
+            if audio is not None:
+                self.stats.redis_hits += 1
+                await self._set_local_audio(audio_key, audio)
+                return audio
+        self.stats.misses += 1
+        return None
+
+    async def _migrate_legacy_audio(self, legacy_redis_key: str, redis_key: str, audio: bytes):
+        ttl = await self.redis.ttl(legacy_redis_key)
+        if ttl == -2:
+            # expired since it was read
+            return
+        # -1 means the legacy entry never expires, and the migrated one keeps that
+        await self.redis.set(redis_key, audio, ex=ttl if ttl > 0 else None)
+        await self.redis.delete(legacy_redis_key)
 
     async def set_audio(
         self, voice_identifier: str, text: str, audio: bytes, ttl: Optional[int] = None
     ):
-        # TODO: cache eviction
-        if self.disabled:
-            logger.warning("Audio cache is disabled")
-            return
         logger.info(f"Setting audio for {voice_identifier} {text}")
         audio_key = self.get_audio_key(voice_identifier, text)
-        await self.redis.set(audio_key, audio)
-        if ttl is not None:
-            await self.redis.expire(audio_key, ttl)
+        await self._set_local_audio(audio_key, audio)
+        if self.redis_disabled:
+            return
+        # SET with EX, rather than SET and then EXPIRE, is one round trip
+        await self.redis.set(self.get_redis_key(audio_key), audio, ex=ttl)
+
+    async def _set_local_audio(self, audio_key: str, audio: bytes):
+        self.memory_store.put(audio_key, audio)
+        if self.disk_store is None or len(audio) > self.disk_store.budget_bytes:
+            return
+        try:
+            await asyncio.to_thread(self.disk_store.write, audio_key, audio)
+        except OSError as e:
+            logger.warning(f"Could not write audio to the disk cache: {e}")
+            return
+        self.disk_store.add(audio_key, len(audio))
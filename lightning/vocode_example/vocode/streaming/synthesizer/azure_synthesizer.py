@@ -1,8 +1,6 @@
-import asyncio
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Optional
+from typing import Dict, List, Optional
 from xml.etree import ElementTree
 
 import azure.cognitiveservices.speech as speechsdk
@@ -20,6 +18,7 @@ from vocode.streaming.synthesizer.base_synthesizer import (
     SynthesisResult,
     encode_as_wav,
 )
+from vocode.streaming.utils.blocking_io import BlockingIOExecutor
 
 NAMESPACES = {
     "mstts": "https://www.w3.org/2001/mstts",
@@ -110,7 +109,11 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         self.voice_name = self.synthesizer_config.voice_name
         self.pitch = self.synthesizer_config.pitch
         self.rate = self.synthesizer_config.rate
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.blocking_io_executor = BlockingIOExecutor()
+        # word boundary events of the utterances being synthesized, by result id. A single
+        # callback is connected for the lifetime of the synthesizer and routes each event
+        self.word_boundary_event_pools: Dict[str, WordBoundaryEventPool] = {}
+        self.synthesizer.synthesis_word_boundary.connect(self.word_boundary_cb)
 
     @classmethod
     def get_voice_identifier(cls, synthesizer_config: AzureSynthesizerConfig) -> str:
@@ -148,9 +151,8 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
                     message=filler_phrase.text, synthesizer_config=self.synthesizer_config
                 )
                 self.total_chars += self.get_total_chars_from_ssml(ssml)
-                result = await asyncio.get_event_loop().run_in_executor(
-                    self.thread_pool_executor, self.synthesizer.speak_ssml, ssml
-                )
+                result = await self.blocking_io_executor.run(self.synthesizer.speak_ssml, ssml)
+                self.word_boundary_event_pools.pop(result.result_id, None)
                 offset = self.synthesizer_config.sampling_rate * self.OFFSET_MS // 1000
                 audio_data = result.audio_data[offset:]
                 with open(filler_audio_path, "wb") as f:
@@ -176,8 +178,9 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
             return with_mark
         return with_mark + self.add_marks(rest_stripped, index + 1)
 
-    def word_boundary_cb(self, evt, pool):
-        pool.add(evt)
+    def word_boundary_cb(self, evt: speechsdk.SpeechSynthesisWordBoundaryEventArgs):
+        # called on an SDK thread, possibly before synthesize_ssml has returned the result id
+        self.word_boundary_event_pools.setdefault(evt.result_id, WordBoundaryEventPool()).add(evt)
 
     @classmethod
     def compute_total_chars(
@@ -226,9 +229,8 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
         ssml = ElementTree.tostring(ssml_root, encoding="unicode")
         return ssml
 
-    def synthesize_ssml(self, ssml: str) -> speechsdk.AudioDataStream:
-        result = self.synthesizer.start_speaking_ssml_async(ssml).get()
-        return speechsdk.AudioDataStream(result)
+    def synthesize_ssml(self, ssml: str) -> speechsdk.SpeechSynthesisResult:
+        return self.synthesizer.start_speaking_ssml_async(ssml).get()
 
     def ready_synthesizer(self, chunk_size: int):
         # TODO: remove warming up the synthesizer for now
@@ -284,50 +286,50 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
             )
 
         async def chunk_generator(
-            audio_data_stream: speechsdk.AudioDataStream, chunk_transform=lambda x: x
+            audio_data_stream: speechsdk.AudioDataStream,
+            result_id: str,
+            chunk_transform=lambda x: x,
         ):
-            audio_buffer = bytes(chunk_size)
-            filled_size = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
-                lambda: audio_data_stream.read_data(audio_buffer),
-            )
-
-            await self._check_stream_for_errors(audio_data_stream)
-            if filled_size != chunk_size:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer[offset:]), True)
-                return
-            else:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer[offset:]), False)
-            while True:
-                audio_buffer = bytes(chunk_size)
-                filled_size = audio_data_stream.read_data(audio_buffer)
-                if filled_size != chunk_size:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(audio_buffer[: filled_size - offset]), True
+            try:
+                is_first_chunk = True
+                while True:
+                    audio_buffer = bytes(chunk_size)
+                    # read_data blocks until Azure has sent enough audio, so it must never run
+                    # on the event loop
+                    filled_size = await self.blocking_io_executor.run(
+                        audio_data_stream.read_data, audio_buffer
                     )
-                    break
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
+                    if is_first_chunk:
+                        await self._check_stream_for_errors(audio_data_stream)
+                        is_first_chunk = False
+                    if filled_size != chunk_size:
+                        yield SynthesisResult.ChunkResult(
+                            chunk_transform(audio_buffer[: filled_size - offset]), True
+                        )
+                        break
+                    yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
+            finally:
+                self.word_boundary_event_pools.pop(result_id, None)
 
-        word_boundary_event_pool = WordBoundaryEventPool()
-        self.synthesizer.synthesis_word_boundary.connect(
-            lambda event: self.word_boundary_cb(event, word_boundary_event_pool)
-        )
         ssml = (
             message.ssml
             if isinstance(message, SSMLMessage)
             else self.create_ssml(message=message.text, synthesizer_config=self.synthesizer_config)
         )
         self.total_chars += self.get_total_chars_from_ssml(ssml)
-        audio_data_stream = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.synthesize_ssml, ssml
+        result = await self.blocking_io_executor.run(self.synthesize_ssml, ssml)
+        word_boundary_event_pool = self.word_boundary_event_pools.setdefault(
+            result.result_id, WordBoundaryEventPool()
         )
+        audio_data_stream = speechsdk.AudioDataStream(result)
         if self.synthesizer_config.should_encode_as_wav:
             output_generator = chunk_generator(
                 audio_data_stream,
+                result.result_id,
                 lambda chunk: encode_as_wav(chunk, self.synthesizer_config),
             )
         else:
-            output_generator = chunk_generator(audio_data_stream)
+            output_generator = chunk_generator(audio_data_stream, result.result_id)
 
         return SynthesisResult(
             output_generator,
@@ -335,3 +337,8 @@ class AzureSynthesizer(BaseSynthesizer[AzureSynthesizerConfig]):
                 message.text, ssml, seconds, word_boundary_event_pool
             ),
         )
+
+    async def tear_down(self):
+        await super().tear_down()
+        self.synthesizer.synthesis_word_boundary.disconnect_all()
+        self.word_boundary_event_pools.clear()
@@ -1,15 +1,17 @@
 import asyncio
-import audioop
 import io
 import math
 import os
+import re
 import wave
+from functools import lru_cache
 from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
     Callable,
     Generic,
+    Hashable,
     List,
     Optional,
     Tuple,
@@ -20,18 +22,25 @@ from typing import (
 import aiohttp
 from loguru import logger
 from nltk.tokenize import word_tokenize
-from nltk.tokenize.treebank import TreebankWordDetokenizer
 from sentry_sdk.tracing import Span as SentrySpan
 
 from vocode.streaming.models.agent import FillerAudioConfig
-from vocode.streaming.models.audio import AudioEncoding, SamplingRate
-from vocode.streaming.models.message import BaseMessage, BotBackchannel, SilenceMessage
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding, SamplingRate
+from vocode.streaming.models.message import BaseMessage, BotBackchannel, SilenceMessage, SSMLMessage
 from vocode.streaming.models.synthesizer import SynthesizerConfig
 from vocode.streaming.synthesizer.audio_cache import AudioCache
+from vocode.streaming.synthesizer.filler_audio_bank import (
+    ChunkViews,
+    FillerAudioBank,
+    freeze_chunks,
+    get_silence_chunk,
+    slice_into_chunk_views,
+)
+from vocode.streaming.synthesizer.input_streaming_synthesizer import InputStreamingSynthesizer
 from vocode.streaming.synthesizer.miniaudio_worker import MiniaudioWorker
-from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE, PCM_SILENCE_BYTE
 from vocode.streaming.utils import convert_wav, get_chunk_size_per_second
 from vocode.streaming.utils.async_requester import AsyncRequestor
+from vocode.streaming.utils.audio_dsp import lin2ulaw, resample
 from vocode.streaming.utils.create_task import asyncio_create_task
 from vocode.streaming.utils.worker import QueueConsumer
 
@@ -50,6 +59,43 @@ FILLER_PHRASES = [
 ]
 FILLER_AUDIO_PATH = os.path.join(os.path.dirname(__file__), "filler_audio")
 TYPING_NOISE_PATH = "%s/typing-noise.wav" % FILLER_AUDIO_PATH
+# the tokenizer turns double quotes into `` and ''
+QUOTE_TOKENS = {"``", "''"}
+QUOTE_PATTERN = re.compile(r"\"|``|''")
+
+
+class MessageWordIndex:
+    """Where each word of a message ends in its text, so the message can be cut off after any
+    number of words with a slice instead of tokenizing it again."""
+
+    def __init__(self, text: str, tokens: List[str]):
+        self.text = text
+        self.word_end_offsets: List[int] = []
+        offset = 0
+        for token in tokens:
+            if token in QUOTE_TOKENS:
+                match = QUOTE_PATTERN.search(text, offset)
+                if match is not None:
+                    offset = match.end()
+            else:
+                start = text.find(token, offset)
+                if start != -1:
+                    offset = start + len(token)
+            self.word_end_offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self.word_end_offsets)
+
+    def text_up_to_words(self, num_words: int) -> str:
+        if num_words <= 0 or not self.word_end_offsets:
+            return ""
+        return self.text[: self.word_end_offsets[min(num_words, len(self.word_end_offsets)) - 1]]
+
+
+@lru_cache(maxsize=256)
+def get_message_word_index(text: str) -> MessageWordIndex:
+    """Tokenizes each message text once, however many times its cutoff is checked while it plays."""
+    return MessageWordIndex(text, word_tokenize(text))
 
 
 def encode_as_wav(chunk: bytes, synthesizer_config: SynthesizerConfig) -> bytes:
@@ -73,7 +119,7 @@ class SynthesisResult:
     """
 
     class ChunkResult:
-        def __init__(self, chunk: bytes, is_last_chunk: bool):
+        def __init__(self, chunk: AudioBuffer, is_last_chunk: bool):
             self.chunk = chunk
             self.is_last_chunk = is_last_chunk
 
@@ -108,39 +154,42 @@ class FillerAudio:
         self.synthesizer_config = synthesizer_config
         self.is_interruptible = is_interruptible
         self.seconds_per_chunk = seconds_per_chunk
+        self.chunks: Optional[ChunkViews] = None
+
+    def get_chunks(self) -> ChunkViews:
+        """The audio split into chunks of `seconds_per_chunk`, computed on first use and shared by
+        every synthesis result created from this filler audio."""
+        if self.chunks is None:
+            chunk_size = (
+                get_chunk_size_per_second(
+                    self.synthesizer_config.audio_encoding,
+                    self.synthesizer_config.sampling_rate,
+                )
+                * self.seconds_per_chunk
+            )
+            chunks = slice_into_chunk_views(self.audio_data, chunk_size)
+            if self.synthesizer_config.should_encode_as_wav:
+                chunks = freeze_chunks(
+                    encode_as_wav(chunk, self.synthesizer_config) for chunk in chunks
+                )
+            self.chunks = chunks
+        return self.chunks
 
     def create_synthesis_result(self) -> SynthesisResult:
-        chunk_size = (
-            get_chunk_size_per_second(
-                self.synthesizer_config.audio_encoding,
-                self.synthesizer_config.sampling_rate,
-            )
-            * self.seconds_per_chunk
-        )
+        chunks = self.get_chunks()
 
-        async def chunk_generator(chunk_transform=lambda x: x):
-            for i in range(0, len(self.audio_data), chunk_size):
-                if i + chunk_size > len(self.audio_data):
-                    yield SynthesisResult.ChunkResult(chunk_transform(self.audio_data[i:]), True)
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(self.audio_data[i : i + chunk_size]), False
-                    )
+        async def chunk_generator():
+            for i, chunk in enumerate(chunks):
+                yield SynthesisResult.ChunkResult(chunk, i == len(chunks) - 1)
 
-        if self.synthesizer_config.should_encode_as_wav:
-            output_generator = chunk_generator(
-                lambda chunk: encode_as_wav(chunk, self.synthesizer_config)
-            )
-        else:
-            output_generator = chunk_generator()
-        return SynthesisResult(output_generator, lambda _: self.message.text)
+        return SynthesisResult(chunk_generator(), lambda _: self.message.text)
 
 
 class CachedAudio:
     def __init__(
         self,
         message: BaseMessage,
-        audio_data: bytes,
+        audio_data: AudioBuffer,
         synthesizer_config: SynthesizerConfig,
         trailing_silence_seconds: float = 0.0,
     ):
@@ -151,20 +200,17 @@ class CachedAudio:
 
     def create_synthesis_result(self, chunk_size) -> SynthesisResult:
         async def chunk_generator():
+            # views of the cached audio, which can be a memory-mapped cache file, are sent as is
             if isinstance(self.message, BotBackchannel):
                 yield SynthesisResult.ChunkResult(
-                    self.audio_data, self.trailing_silence_seconds == 0.0
+                    memoryview(self.audio_data).toreadonly(), self.trailing_silence_seconds == 0.0
                 )
             else:
-                for i in range(0, len(self.audio_data), chunk_size):
-                    if i + chunk_size > len(self.audio_data):
-                        yield SynthesisResult.ChunkResult(
-                            self.audio_data[i:], self.trailing_silence_seconds == 0.0
-                        )
-                    else:
-                        yield SynthesisResult.ChunkResult(
-                            self.audio_data[i : i + chunk_size], False
-                        )
+                chunks = slice_into_chunk_views(self.audio_data, chunk_size)
+                for i, chunk in enumerate(chunks):
+                    yield SynthesisResult.ChunkResult(
+                        chunk, i == len(chunks) - 1 and self.trailing_silence_seconds == 0.0
+                    )
             if self.trailing_silence_seconds > 0:
                 silence_synthesis_result = self.create_silence_synthesis_result(chunk_size)
                 async for chunk_result in silence_synthesis_result.chunk_generator:
@@ -193,20 +239,17 @@ class CachedAudio:
             size_of_silence = int(
                 self.trailing_silence_seconds * self.synthesizer_config.sampling_rate
             )
-            silence_byte: bytes
             if self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
-                silence_byte = PCM_SILENCE_BYTE
                 size_of_silence *= 2
-            elif self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-                silence_byte = MULAW_SILENCE_BYTE
+            silence_chunk = get_silence_chunk(self.synthesizer_config.audio_encoding, chunk_size)
 
             for _ in range(
                 0,
                 size_of_silence,
                 chunk_size,
             ):
-                yield SynthesisResult.ChunkResult(silence_byte * chunk_size, False)
-            yield SynthesisResult.ChunkResult(silence_byte * chunk_size, True)
+                yield SynthesisResult.ChunkResult(silence_chunk, False)
+            yield SynthesisResult.ChunkResult(silence_chunk, True)
 
         def get_message_up_to(seconds):
             return ""
@@ -265,18 +308,33 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
     def get_synthesizer_config(self) -> SynthesizerConfig:
         return self.synthesizer_config
 
+    def get_audio_bank_key(self, chunk_size: Optional[int] = None) -> Hashable:
+        try:
+            voice_key = self.get_voice_identifier(self.synthesizer_config)
+        except NotImplementedError:
+            # the config models are pydantic v1 models, whose repr lists every field
+            voice_key = f"{type(self).__name__}:{self.synthesizer_config!r}"
+        return FillerAudioBank.get_key(voice_key, self.synthesizer_config, chunk_size)
+
     def get_typing_noise_filler_audio(self) -> FillerAudio:
-        return FillerAudio(
-            message=BaseMessage(text="<typing noise>"),
-            audio_data=convert_wav(
-                TYPING_NOISE_PATH,
-                output_sample_rate=self.synthesizer_config.sampling_rate,
-                output_encoding=self.synthesizer_config.audio_encoding,
-            ),
-            synthesizer_config=self.synthesizer_config,
-            is_interruptible=True,
-            seconds_per_chunk=2,
-        )
+        filler_audio_bank = FillerAudioBank()
+        # the typing noise sounds the same for every voice
+        key = FillerAudioBank.get_key("<typing noise>", self.synthesizer_config)
+        if key not in filler_audio_bank.filler_audios:
+            typing_noise = FillerAudio(
+                message=BaseMessage(text="<typing noise>"),
+                audio_data=convert_wav(
+                    TYPING_NOISE_PATH,
+                    output_sample_rate=self.synthesizer_config.sampling_rate,
+                    output_encoding=self.synthesizer_config.audio_encoding,
+                ),
+                synthesizer_config=self.synthesizer_config,
+                is_interruptible=True,
+                seconds_per_chunk=2,
+            )
+            typing_noise.get_chunks()
+            filler_audio_bank.filler_audios[key] = [typing_noise]
+        return filler_audio_bank.filler_audios[key][0]
 
     @classmethod
     def get_cost(cls, total_chars) -> float:
@@ -288,13 +346,89 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
 
     async def set_filler_audios(self, filler_audio_config: FillerAudioConfig):
         if filler_audio_config.use_phrases:
-            self.filler_audios = await self.get_phrase_filler_audios()
+            self.filler_audios = await FillerAudioBank().get_filler_audios(
+                self.get_audio_bank_key(), self.get_phrase_filler_audios
+            )
         elif filler_audio_config.use_typing_noise:
             self.filler_audios = [self.get_typing_noise_filler_audio()]
 
     async def get_phrase_filler_audios(self) -> List[FillerAudio]:
         return []
 
+    def uses_phrase_audio_bank(self) -> bool:
+        """Whether phrases can be synthesized into and served from the FillerAudioBank.
+
+        Not the case for synthesizers that stream every message of a turn through state shared
+        across the conversation, like one websocket: synthesizing a phrase in the background would
+        mix it into the live turn, and serving one from the bank would skip that state.
+        """
+        return not isinstance(self, InputStreamingSynthesizer)
+
+    async def load_phrase_audios(self, texts: List[str], chunk_size: int):
+        """Synthesizes short phrases that are said often, e.g. backchannels, into the process-wide
+        FillerAudioBank, so that create_speech can serve them without synthesizing them again."""
+        if not self.uses_phrase_audio_bank():
+            return
+        filler_audio_bank = FillerAudioBank()
+        key = self.get_audio_bank_key(chunk_size)
+        for text in texts:
+            if not filler_audio_bank.start_loading_phrase(key, text):
+                continue
+            try:
+                synthesis_result = await self.create_speech(
+                    BaseMessage(text=text), chunk_size, is_sole_text_chunk=True
+                )
+                chunks = [
+                    chunk_result.chunk async for chunk_result in synthesis_result.chunk_generator
+                ]
+                filler_audio_bank.set_phrase_chunks(key, text, chunks)
+            except Exception as e:
+                logger.warning(f"Could not load audio for phrase {text}: {e}")
+            finally:
+                filler_audio_bank.finish_loading_phrase(key, text)
+
+    def get_phrase_synthesis_result(
+        self, message: BaseMessage, chunk_size: int
+    ) -> Optional[SynthesisResult]:
+        if isinstance(message, SSMLMessage) or not self.uses_phrase_audio_bank():
+            return None
+        chunks = FillerAudioBank().get_phrase_chunks(
+            self.get_audio_bank_key(chunk_size), message.text
+        )
+        if chunks is None:
+            return None
+        trailing_silence = CachedAudio(
+            message,
+            b"",
+            self.synthesizer_config,
+            trailing_silence_seconds=message.trailing_silence_seconds,
+        )
+
+        async def chunk_generator():
+            for i, chunk in enumerate(chunks):
+                yield SynthesisResult.ChunkResult(
+                    chunk,
+                    i == len(chunks) - 1 and message.trailing_silence_seconds == 0.0,
+                )
+            if message.trailing_silence_seconds > 0:
+                silence_synthesis_result = trailing_silence.create_silence_synthesis_result(
+                    chunk_size
+                )
+                async for chunk_result in silence_synthesis_result.chunk_generator:
+                    yield chunk_result
+
+        def get_message_up_to(seconds: Optional[float]) -> str:
+            if isinstance(message, BotBackchannel):
+                return message.text
+            return BaseSynthesizer.get_message_cutoff_from_total_response_length(
+                self.synthesizer_config,
+                message,
+                seconds,
+                sum(len(chunk) for chunk in chunks),
+            )
+
+        return SynthesisResult(chunk_generator(), get_message_up_to, cached=True)
+
     def ready_synthesizer(self, chunk_size: int):
         pass
 
@@ -326,8 +460,7 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
 
         words_per_second = words_per_minute / 60
         estimated_words_spoken = math.floor(words_per_second * seconds)
-        tokens = word_tokenize(message.text)
-        return TreebankWordDetokenizer().detokenize(tokens[:estimated_words_spoken])
+        return get_message_word_index(message.text).text_up_to_words(estimated_words_spoken)
 
     async def get_cached_audio(
         self,
@@ -369,6 +502,9 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
                 self.synthesizer_config,
             ).create_synthesis_result(chunk_size)
 
+        maybe_phrase_synthesis_result = self.get_phrase_synthesis_result(message, chunk_size)
+        if maybe_phrase_synthesis_result is not None:
+            return maybe_phrase_synthesis_result
         maybe_cached_audio = await self.get_cached_audio(message)
         if maybe_cached_audio is not None:
             return maybe_cached_audio.create_synthesis_result(chunk_size)
@@ -379,7 +515,9 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             is_sole_text_chunk=is_sole_text_chunk,
         )
 
-    async def chunk_result_generator_from_queue(self, chunk_queue: asyncio.Queue[Optional[bytes]]):
+    async def chunk_result_generator_from_queue(
+        self, chunk_queue: asyncio.Queue[Optional[AudioBuffer]]
+    ):
         while True:
             try:
                 chunk = await chunk_queue.get()
@@ -413,13 +551,9 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
             chunk_transform = lambda chunk: chunk  # noqa: E731
 
         async def chunk_generator(output_bytes):
-            for i in range(0, len(output_bytes), chunk_size):
-                if i + chunk_size > len(output_bytes):
-                    yield SynthesisResult.ChunkResult(chunk_transform(output_bytes[i:]), True)
-                else:
-                    yield SynthesisResult.ChunkResult(
-                        chunk_transform(output_bytes[i : i + chunk_size]), False
-                    )
+            chunks = slice_into_chunk_views(output_bytes, chunk_size)
+            for i, chunk in enumerate(chunks):
+                yield SynthesisResult.ChunkResult(chunk_transform(chunk), i == len(chunks) - 1)
 
         return SynthesisResult(
             chunk_generator(output_bytes),
@@ -459,7 +593,7 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
                     wav_chunk = encode_as_wav(wav_chunk, self.synthesizer_config)
 
                 if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-                    wav_chunk = audioop.lin2ulaw(wav_chunk, 2)
+                    wav_chunk = lin2ulaw(wav_chunk)
 
                 yield SynthesisResult.ChunkResult(wav_chunk, is_last)
                 # If this is the last chunk, break the loop
@@ -476,16 +610,7 @@ class BaseSynthesizer(Generic[SynthesizerConfigType]):
         current_sample_rate: int,
         target_sample_rate: int,
     ) -> bytes:
-        resampled_chunk, _ = audioop.ratecv(
-            chunk,
-            2,
-            1,
-            current_sample_rate,
-            target_sample_rate,
-            None,
-        )
-
-        return resampled_chunk
+        return resample(chunk, current_sample_rate, target_sample_rate)
 
     async def tear_down(self):
         pass
@@ -1,6 +1,5 @@
 import asyncio
 import hashlib
-from typing import List, Tuple
 
 from loguru import logger
 
@@ -9,6 +8,8 @@ from vocode.streaming.models.audio import AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import CartesiaSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.chunk_assembler import ChunkAssembler
+from vocode.streaming.utils.utterance_timeline import UtteranceTimeline
 
 
 class CartesiaSynthesizer(BaseSynthesizer[CartesiaSynthesizerConfig]):
@@ -92,10 +93,14 @@ class CartesiaSynthesizer(BaseSynthesizer[CartesiaSynthesizerConfig]):
         self.ws = None
         self.ctx = None
         self.ctx_message = BaseMessage(text="")
-        self.ctx_timestamps: List[Tuple[str, float, float]] = []
+        self.ctx_timeline = UtteranceTimeline(separator=" ")
         self.no_more_inputs_task = None
         self.no_more_inputs_lock = asyncio.Lock()
 
+    def uses_phrase_audio_bank(self) -> bool:
+        # every message goes into the conversation's current context
+        return False
+
     async def initialize_ws(self):
         if self.ws is None:
             self.ws = await self.client.tts.websocket()
@@ -103,13 +108,13 @@ class CartesiaSynthesizer(BaseSynthesizer[CartesiaSynthesizerConfig]):
     async def initialize_ctx(self, is_first_text_chunk: bool):
         if self.ctx is None or self.ctx.is_closed():
             self.ctx_message = BaseMessage(text="")
-            self.ctx_timestamps = []
+            self.ctx_timeline = UtteranceTimeline(separator=" ")
             if self.ws:
                 self.ctx = self.ws.context()
         else:
             if is_first_text_chunk:
                 self.ctx_message = BaseMessage(text="")
-                self.ctx_timestamps = []
+                self.ctx_timeline = UtteranceTimeline(separator=" ")
                 if self.no_more_inputs_task:
                     self.no_more_inputs_task.cancel()
                 await self.ctx.no_more_inputs()
@@ -161,7 +166,9 @@ class CartesiaSynthesizer(BaseSynthesizer[CartesiaSynthesizerConfig]):
                     logger.info(f"Caught error while sending no more inputs: {e}")
 
         async def chunk_generator(context):
-            buffer = bytearray()
+            chunk_assembler = ChunkAssembler.for_encoding(
+                chunk_size, self.synthesizer_config.audio_encoding
+            )
             if context.is_closed():
                 return
             try:
@@ -170,49 +177,31 @@ class CartesiaSynthesizer(BaseSynthesizer[CartesiaSynthesizerConfig]):
                     word_timestamps = event.get("word_timestamps")
                     if word_timestamps:
                         words = word_timestamps["words"]
-                        start_times = word_timestamps["start"]
                         end_times = word_timestamps["end"]
-                        for word, start, end in zip(words, start_times, end_times):
-                            self.ctx_timestamps.append((word, start, end))
+                        for word, end in zip(words, end_times):
+                            self.ctx_timeline.add(word, end)
                     if audio:
-                        buffer.extend(audio)
-                        while len(buffer) >= chunk_size:
-                            yield SynthesisResult.ChunkResult(
-                                chunk=buffer[:chunk_size], is_last_chunk=False
-                            )
-                            buffer = buffer[chunk_size:]
+                        for chunk in chunk_assembler.feed(audio):
+                            yield SynthesisResult.ChunkResult(chunk=chunk, is_last_chunk=False)
             except Exception as e:
                 logger.info(
                     f"Caught error while receiving audio chunks from CartesiaSynthesizer: {e}"
                 )
                 self.ctx._close()
-            if buffer:
-                # pad the leftover buffer with silence
-                if len(buffer) < chunk_size:
-                    padding_size = chunk_size - len(buffer)
-                    if self.output_format["encoding"] == "pcm_mulaw":
-                        buffer.extend(b"\x7f" * padding_size)  # 127 is silence in mu-law
-                    elif self.output_format["encoding"] == "pcm_s16le":
-                        buffer.extend(b"\x00\x00" * padding_size)  # 0 is silence in s16le
-                yield SynthesisResult.ChunkResult(chunk=buffer, is_last_chunk=True)
+            # the leftover audio, padded with silence
+            tail = chunk_assembler.flush()
+            if tail is not None:
+                yield SynthesisResult.ChunkResult(chunk=tail, is_last_chunk=True)
 
         self.ctx_message.text += transcript
 
         def get_message_cutoff_ctx(message, seconds, words_per_minute=150):
-            if seconds:
-                closest_index = 0
-                if len(self.ctx_timestamps) > 0:
-                    for index, word_timestamp in enumerate(self.ctx_timestamps):
-                        _word, start, end = word_timestamp
-                        closest_index = index
-                        if end >= seconds:
-                            break
+            if seconds and self.ctx_timeline:
+                closest_index = self.ctx_timeline.index_at(seconds)
                 if closest_index:
                     # Check if they're less than 2 seconds apart, fall back to words per minute otherwise
-                    if self.ctx_timestamps[closest_index][2] - seconds < 2:
-                        return " ".join(
-                            [word for word, *_ in self.ctx_timestamps[: closest_index + 1]]
-                        )
+                    if self.ctx_timeline.end_time_at(closest_index) - seconds < 2:
+                        return self.ctx_timeline.text_through(closest_index)
             return self.get_message_cutoff_from_voice_speed(message, seconds, words_per_minute)
 
         return SynthesisResult(
@@ -1,69 +1,194 @@
 import asyncio
-import datetime
+import base64
+import hashlib
 import json
-import requests
-import websockets
-from concurrent.futures import ThreadPoolExecutor
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+
 from loguru import logger
 
-from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
 from vocode.streaming.models.message import BaseMessage
-from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
-from vocode.streaming.models.synthesizer import SynthesizerConfig
 from vocode.streaming.models.synthesizer import WavesSynthesizerConfig
-    
+from vocode.streaming.synthesizer.audio_cache import AudioCache
+from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.audio_dsp import lin2ulaw
+from vocode.streaming.utils.chunk_assembler import ChunkAssembler
+from vocode.streaming.utils.create_task import asyncio_create_task
+
+WAVES_LIGHTNING_V2_STREAM_URL = "https://waves-api.smallest.ai/api/v1/lightning-v2/stream"
+SSE_DATA_PREFIX = b"data:"
+
+
+class WavesException(Exception):
+    pass
+
+
 class WavesSynthesizer(BaseSynthesizer[WavesSynthesizerConfig]):
-    CHUNK_SIZE = 320
-    
     def __init__(self, synthesizer_config: WavesSynthesizerConfig):
         super().__init__(synthesizer_config)
-        self.waves_lightning_url = f"http://waves-api.smallest.ai/api/v1/lightning/get_speech"
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
-        
-    async def create_speech(
-            self,
-            message: BaseMessage,
-            chunk_size: int,
-            is_first_text_chunk: bool = False,
-            is_sole_text_chunk: bool = False
-        ) -> SynthesisResult:
-            audio_data = await self._generate_audio(message.text)
-            
-            async def chunk_generator() -> AsyncGenerator[SynthesisResult.ChunkResult, None]:
-                for i in range(0, len(audio_data), chunk_size):
-                    chunk = audio_data[i:i+chunk_size]
-                    yield SynthesisResult.ChunkResult(chunk, i+chunk_size >= len(audio_data))
-
-            def get_message_up_to(seconds: float) -> str:
-                # This is a simplified implementation. You might want to improve this
-                # based on the actual audio duration and text alignment.
-                return message.text
-            
-            return SynthesisResult(chunk_generator(), get_message_up_to)
-    
-    async def _generate_audio(self, text: str) -> bytes:
-        payload = {
+        self.waves_lightning_url = WAVES_LIGHTNING_V2_STREAM_URL
+        self.words_per_minute = 150
+        # lightning-v2 streams 16-bit PCM, mulaw output is encoded locally from 8kHz PCM
+        self.sample_width = 2 if synthesizer_config.audio_encoding == AudioEncoding.LINEAR16 else 1
+
+    @classmethod
+    def get_voice_identifier(cls, synthesizer_config: WavesSynthesizerConfig) -> str:
+        hashed_api_token = hashlib.sha256(
+            f"{synthesizer_config.api_token}".encode("utf-8")
+        ).hexdigest()
+        return ":".join(
+            (
+                "waves",
+                hashed_api_token,
+                synthesizer_config.voice_id,
+                synthesizer_config.language,
+                str(synthesizer_config.speed),
+                str(synthesizer_config.sampling_rate),
+                synthesizer_config.audio_encoding,
+                str(synthesizer_config.remove_extra_silence),
+                str(synthesizer_config.transliterate),
+            )
+        )
+
+    def get_request_body(self, text: str) -> dict:
+        return {
             "text": text,
             "voice_id": self.synthesizer_config.voice_id,
-            "add_wav_header": False,
             "sample_rate": self.synthesizer_config.sampling_rate,
             "language": self.synthesizer_config.language,
             "speed": self.synthesizer_config.speed,
-            "keep_ws_open": True,
             "remove_extra_silence": self.synthesizer_config.remove_extra_silence,
             "transliterate": self.synthesizer_config.transliterate,
-            "get_end_of_response_token": True,
         }
-        logger.info(f"payload for generate audio: {payload}")
-        audio_data = b""
-        first = False
-        
+
+    async def create_speech_uncached(
+        self,
+        message: BaseMessage,
+        chunk_size: int,
+        is_first_text_chunk: bool = False,
+        is_sole_text_chunk: bool = False,
+    ) -> SynthesisResult:
+        self.total_chars += len(message.text)
         headers = {
             "Authorization": f"Bearer {self.synthesizer_config.api_token}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
         }
-        
-        response = requests.request("POST", self.waves_lightning_url, json=payload, headers=headers)
-        return response.content
+        body = self.get_request_body(message.text)
+        logger.debug(f"Waves lightning-v2 request body: {body}")
+
+        chunk_queue: asyncio.Queue[Optional[AudioBuffer]] = asyncio.Queue()
+        # the number of bytes streamed so far, and whether the stream has finished
+        synthesis_state = {"output_bytes": 0, "complete": False}
+
+        async def chunk_generator() -> AsyncGenerator[SynthesisResult.ChunkResult, None]:
+            try:
+                async for chunk_result in self.chunk_result_generator_from_queue(chunk_queue):
+                    synthesis_state["output_bytes"] += len(chunk_result.chunk)
+                    yield chunk_result
+                synthesis_state["complete"] = True
+            finally:
+                # stop downloading audio nobody is going to play, e.g. after an interruption
+                get_chunks_task.cancel()
+
+        def get_message_up_to(seconds: Optional[float]) -> str:
+            if not synthesis_state["complete"]:
+                return self.get_message_cutoff_from_voice_speed(
+                    message, seconds, self.words_per_minute
+                )
+            return self.get_message_cutoff_from_total_response_length(
+                self.synthesizer_config,
+                message,
+                seconds,
+                synthesis_state["output_bytes"] // self.sample_width,
+            )
+
+        get_chunks_task = asyncio_create_task(
+            self.get_chunks(message, headers, body, chunk_size, chunk_queue),
+        )
+        return SynthesisResult(chunk_generator(), get_message_up_to)
+
+    async def get_chunks(
+        self,
+        message: BaseMessage,
+        headers: dict,
+        body: dict,
+        chunk_size: int,
+        chunk_queue: asyncio.Queue[Optional[AudioBuffer]],
+    ):
+        chunk_assembler = ChunkAssembler.for_encoding(
+            chunk_size, self.synthesizer_config.audio_encoding
+        )
+        # only kept if the message is cacheable
+        cached_audio: Optional[bytearray] = bytearray() if message.cache_phrase else None
+        try:
+            async with self.async_requestor.get_session().post(
+                self.waves_lightning_url,
+                headers=headers,
+                json=body,
+            ) as response:
+                if not response.ok:
+                    raise WavesException(
+                        f"Waves API returned {response.status} status code with the following details: {await response.text()}"
+                    )
+                async for audio in self._iter_sse_audio(response.content.iter_any()):
+                    if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
+                        audio = lin2ulaw(audio)
+                    if cached_audio is not None:
+                        cached_audio.extend(audio)
+                    # send out audio as soon as there is a full chunk of it
+                    for chunk in chunk_assembler.feed(audio):
+                        chunk_queue.put_nowait(chunk)
+            # the last chunk is left short, so the cutoff position counts only real audio
+            tail = chunk_assembler.flush(pad=False)
+            if tail is not None:
+                chunk_queue.put_nowait(tail)
+            if cached_audio:
+                audio_cache = await AudioCache.safe_create()
+                await audio_cache.set_audio(
+                    self.get_voice_identifier(self.synthesizer_config),
+                    message.cache_phrase or message.text.strip(),
+                    bytes(cached_audio),
+                )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Waves synthesis failed: {e}")
+        finally:
+            chunk_queue.put_nowait(None)  # treated as sentinel
+
+    @staticmethod
+    async def _iter_sse_audio(byte_stream) -> AsyncGenerator[bytes, None]:
+        """Yields the decoded PCM of each server-sent event, as soon as its line is complete.
 
+        Lines are split out of the raw byte stream rather than with readline, since the base64
+        audio can exceed the reader's line length limit.
+        """
+        line_buffer = bytearray()
+        # 16-bit samples can be split across events
+        odd_byte = b""
+        async for data in byte_stream:
+            line_buffer.extend(data)
+            line_start = 0
+            while True:
+                line_end = line_buffer.find(b"\n", line_start)
+                if line_end == -1:
+                    break
+                line = bytes(line_buffer[line_start:line_end]).strip()
+                line_start = line_end + 1
+                if not line.startswith(SSE_DATA_PREFIX):
+                    continue
+                try:
+                    event = json.loads(line[len(SSE_DATA_PREFIX) :])
+                except json.JSONDecodeError:
+                    logger.warning(f"Could not parse Waves event: {line[:100]!r}")
+                    continue
+                if not isinstance(event, dict) or not event.get("audio"):
+                    continue
+                audio = odd_byte + base64.b64decode(event["audio"])
+                if len(audio) % 2:
+                    audio, odd_byte = audio[:-1], audio[-1:]
+                else:
+                    odd_byte = b""
+                if audio:
+                    yield audio
+            del line_buffer[:line_start]
@@ -10,6 +10,7 @@ from vocode.streaming.models.audio import AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.audio_dsp import Resampler
 from vocode.streaming.utils.create_task import asyncio_create_task
 
 ELEVEN_LABS_BASE_URL = "https://api.elevenlabs.io/v1/"
@@ -151,14 +152,14 @@ class ElevenLabsSynthesizer(BaseSynthesizer[ElevenLabsSynthesizerConfig]):
                 raise ElevenlabsException(
                     f"ElevenLabs API returned {stream.status_code} status code and the following details: {error.decode('utf-8')}"
                 )
+            # one resampler for the whole stream, so chunk boundaries don't click
+            resampler = Resampler(self.sample_rate, self.upsample) if self.upsample else None
             async for chunk in stream.aiter_bytes(chunk_size):
-                if self.upsample:
-                    chunk = self._resample_chunk(
-                        chunk,
-                        self.sample_rate,
-                        self.upsample,
-                    )
+                if resampler is not None:
+                    chunk = resampler.process(chunk)
                 chunk_queue.put_nowait(chunk)
+            if resampler is not None:
+                chunk_queue.put_nowait(resampler.flush())
         except asyncio.CancelledError:
             pass
         finally:
@@ -1,19 +1,20 @@
 import asyncio
-import audioop
 import base64
-from typing import AsyncGenerator, List, Optional, Tuple
+from typing import AsyncGenerator, Optional
 
-import numpy as np
 import websockets
 from loguru import logger
 from pydantic import BaseModel, conint
 
-from vocode.streaming.models.audio import AudioEncoding, SamplingRate
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding, SamplingRate
 from vocode.streaming.models.message import BaseMessage, BotBackchannel, LLMToken
 from vocode.streaming.models.synthesizer import ElevenLabsSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
 from vocode.streaming.synthesizer.eleven_labs_synthesizer import ElevenLabsSynthesizer
 from vocode.streaming.synthesizer.input_streaming_synthesizer import InputStreamingSynthesizer
+from vocode.streaming.utils.audio_dsp import Resampler, apply_gain, lin2ulaw, ulaw2lin
+from vocode.streaming.utils.chunk_assembler import ChunkAssembler
+from vocode.streaming.utils.utterance_timeline import UtteranceTimeline
 
 NONCE = "071b5f21-3b24-4427-817e-62508007ae60"
 ELEVEN_LABS_BASE_URL = "wss://api.elevenlabs.io/v1/"
@@ -98,8 +99,8 @@ class ElevenLabsWSSynthesizer(
         self.words_per_minute = 150
 
         self.text_chunk_queue: asyncio.Queue[Optional[BotBackchannel | LLMToken]] = asyncio.Queue()
-        self.voice_packet_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
-        self.current_turn_utterances_by_chunk: List[Tuple[str, float]] = []
+        self.voice_packet_queue: asyncio.Queue[Optional[AudioBuffer]] = asyncio.Queue()
+        self.current_turn_timeline = UtteranceTimeline()
         self.sample_width = 2 if synthesizer_config.audio_encoding == AudioEncoding.LINEAR16 else 1
 
         self.websocket_listener: asyncio.Task | None = None
@@ -152,12 +153,10 @@ class ElevenLabsWSSynthesizer(
 
     def reduce_chunk_amplitude(self, chunk: bytes, factor: float) -> bytes:
         if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            chunk = audioop.ulaw2lin(chunk, 2)
-        pcm = np.frombuffer(chunk, dtype=np.int16)
-        pcm = (pcm * factor).astype(np.int16)
-        pcm_bytes = pcm.tobytes()
+            chunk = ulaw2lin(chunk)
+        pcm_bytes = apply_gain(chunk, factor)
         if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            return audioop.lin2ulaw(pcm_bytes, 2)
+            return lin2ulaw(pcm_bytes)
         else:
             return pcm_bytes
 
@@ -214,7 +213,10 @@ class ElevenLabsWSSynthesizer(
                 """Listen to the websocket for audio data and stream it."""
 
                 first_message = True
-                buffer = bytearray()
+                chunk_assembler = ChunkAssembler.for_encoding(
+                    chunk_size, self.synthesizer_config.audio_encoding
+                )
+                resampler = Resampler(self.sample_rate, self.upsample) if self.upsample else None
                 while True:
                     message = await ws.recv()
                     if "audio" not in message:
@@ -226,37 +228,35 @@ class ElevenLabsWSSynthesizer(
                             self.sample_width * self.synthesizer_config.sampling_rate
                         )
 
-                        if self.upsample:
-                            decoded = self._resample_chunk(
-                                decoded,
-                                self.sample_rate,
-                                self.upsample,
-                            )
+                        if resampler is not None:
+                            decoded = resampler.process(decoded)
                             seconds = len(decoded) / (self.sample_width * self.sample_rate)
 
                         if response.alignment:
                             utterance_chunk = "".join(response.alignment.chars) + " "
-                            self.current_turn_utterances_by_chunk.append((utterance_chunk, seconds))
+                            self.current_turn_timeline.append(utterance_chunk, seconds)
                         # For backchannels, send them all as one chunk (so it can't be interrupted) and reduce the volume
                         # so that in the case of a false endpoint, the backchannel is not too loud.
                         if first_message and backchannelled:
-                            buffer.extend(decoded)
                             logger.info("First message was a backchannel, reducing volume.")
                             reduced_amplitude_buffer = self.reduce_chunk_amplitude(
-                                buffer, factor=self.synthesizer_config.backchannel_amplitude_factor
+                                decoded,
+                                factor=self.synthesizer_config.backchannel_amplitude_factor,
                             )
                             await self.voice_packet_queue.put(reduced_amplitude_buffer)
-                            buffer = bytearray()
                             first_message = False
                         else:
-                            buffer.extend(decoded)
-                            for chunk_idx in range(0, len(buffer) - chunk_size, chunk_size):
-                                await self.voice_packet_queue.put(
-                                    buffer[chunk_idx : chunk_idx + chunk_size]
-                                )
-                            buffer = buffer[len(buffer) - (len(buffer) % chunk_size) :]
+                            for chunk in chunk_assembler.feed(decoded):
+                                await self.voice_packet_queue.put(chunk)
 
                     if response.isFinal:
+                        if resampler is not None:
+                            # the resampler holds back the last few milliseconds of audio
+                            for chunk in chunk_assembler.feed(resampler.flush()):
+                                await self.voice_packet_queue.put(chunk)
+                        tail = chunk_assembler.flush()
+                        if tail is not None:
+                            await self.voice_packet_queue.put(tail)
                         await self.voice_packet_queue.put(None)
                         break
 
@@ -330,14 +330,7 @@ class ElevenLabsWSSynthesizer(
         )
 
     def get_current_message_so_far(self, seconds: Optional[float]) -> str:
-        seconds_idx = 0.0
-        buffer = ""
-        for utterance, duration in self.current_turn_utterances_by_chunk:
-            if seconds is not None and seconds_idx > seconds:
-                return buffer
-            buffer += utterance
-            seconds_idx += duration
-        return buffer
+        return self.current_turn_timeline.text_up_to(seconds)
 
     @classmethod
     def get_voice_identifier(cls, synthesizer_config: ElevenLabsSynthesizerConfig):
@@ -346,7 +339,7 @@ class ElevenLabsWSSynthesizer(
     async def handle_end_of_turn(self):
         self.end_of_turn = True
         await self.text_chunk_queue.put(None)
-        self.current_turn_utterances_by_chunk = []
+        self.current_turn_timeline = UtteranceTimeline()
 
     async def cancel_websocket_tasks(self):
         self._cleanup_websocket_tasks()
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
+from vocode.streaming.models.synthesizer import SynthesizerConfig
+from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE, PCM_SILENCE_BYTE
+from vocode.streaming.utils.singleton import Singleton
+
+if TYPE_CHECKING:
+    from vocode.streaming.synthesizer.base_synthesizer import FillerAudio
+
+ChunkViews = Tuple[memoryview, ...]
+
+
+def slice_into_chunk_views(audio: AudioBuffer, chunk_size: int) -> ChunkViews:
+    """Splits audio into read-only views of `chunk_size` bytes, without copying it."""
+    audio_view = memoryview(audio).toreadonly().cast("B")
+    return tuple(audio_view[i : i + chunk_size] for i in range(0, len(audio_view), chunk_size))
+
+
+@lru_cache(maxsize=64)
+def get_silence_chunk(audio_encoding: AudioEncoding, chunk_size: int) -> memoryview:
+    """A read-only chunk of silence, allocated once per encoding and size and shared by every
+    synthesis result that plays silence."""
+    if audio_encoding == AudioEncoding.LINEAR16:
+        silence_byte = PCM_SILENCE_BYTE
+    elif audio_encoding == AudioEncoding.MULAW:
+        silence_byte = MULAW_SILENCE_BYTE
+    else:
+        raise ValueError(f"No silence for audio encoding {audio_encoding}")
+    return memoryview(silence_byte * chunk_size).toreadonly()
+
+
+def freeze_chunks(chunks: Iterable[bytes]) -> ChunkViews:
+    """Copies chunks into one immutable buffer and returns views of it with the same boundaries."""
+    chunk_list = list(chunks)
+    buffer_view = memoryview(b"".join(chunk_list)).toreadonly()
+    chunk_views = []
+    offset = 0
+    for chunk in chunk_list:
+        chunk_views.append(buffer_view[offset : offset + len(chunk)])
+        offset += len(chunk)
+    return tuple(chunk_views)
+
+
+class FillerAudioBank(Singleton):
+    """Process-wide store of audio that every conversation with the same voice plays unchanged:
+    filler phrases, typing noise and short phrases like backchannels.
+
+    Entries are keyed by the voice and output format (see `get_key`) and hold precomputed,
+    immutable chunk views that are handed to the output without further slicing or encoding.
+    """
+
+    def __init__(self):
+        self.filler_audios: Dict[Hashable, List["FillerAudio"]] = {}
+        self.phrase_chunks: Dict[Hashable, Dict[str, ChunkViews]] = {}
+        self.loading_phrases: Set[Tuple[Hashable, str]] = set()
+
+    @staticmethod
+    def get_key(
+        voice_key: str, synthesizer_config: SynthesizerConfig, chunk_size: Optional[int] = None
+    ) -> Hashable:
+        return (
+            voice_key,
+            synthesizer_config.sampling_rate,
+            synthesizer_config.audio_encoding,
+            synthesizer_config.should_encode_as_wav,
+            chunk_size,
+        )
+
+    async def get_filler_audios(
+        self,
+        key: Hashable,
+        create_filler_audios: Callable[[], Awaitable[List["FillerAudio"]]],
+    ) -> List["FillerAudio"]:
+        filler_audios = self.filler_audios.get(key)
+        if filler_audios is None:
+            filler_audios = await create_filler_audios()
+            for filler_audio in filler_audios:
+                filler_audio.get_chunks()
+            # another conversation with the same voice may have finished first
+            filler_audios = self.filler_audios.setdefault(key, filler_audios)
+        return filler_audios
+
+    def get_phrase_chunks(self, key: Hashable, text: str) -> Optional[ChunkViews]:
+        return self.phrase_chunks.get(key, {}).get(text)
+
+    def set_phrase_chunks(self, key: Hashable, text: str, chunks: Iterable[bytes]):
+        self.phrase_chunks.setdefault(key, {})[text] = freeze_chunks(chunks)
+
+    def start_loading_phrase(self, key: Hashable, text: str) -> bool:
+        """Returns False if the phrase is already loaded or being loaded."""
+        if self.get_phrase_chunks(key, text) is not None or (key, text) in self.loading_phrases:
+            return False
+        self.loading_phrases.add((key, text))
+        return True
+
+    def finish_loading_phrase(self, key: Hashable, text: str):
+        self.loading_phrases.discard((key, text))
@@ -1,7 +1,6 @@
 import asyncio
 import io
 import wave
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import google.auth
@@ -10,6 +9,7 @@ from google.cloud import texttospeech_v1beta1 as tts  # type: ignore
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import GoogleSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.blocking_io import BlockingIOExecutor
 
 
 class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
@@ -39,7 +39,7 @@ class GoogleSynthesizer(BaseSynthesizer[GoogleSynthesizerConfig]):
             pitch=synthesizer_config.pitch,
             effects_profile_id=["telephony-class-application"],
         )
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.thread_pool_executor = BlockingIOExecutor().executor
 
     def synthesize(self, message: str) -> Any:
         synthesis_input = tts.SynthesisInput(text=message)
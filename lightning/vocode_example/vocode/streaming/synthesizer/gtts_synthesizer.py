@@ -1,5 +1,4 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 
 from gtts import gTTS
@@ -8,6 +7,7 @@ from pydub import AudioSegment
 from vocode.streaming.models.message import BaseMessage
 from vocode.streaming.models.synthesizer import GTTSSynthesizerConfig
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.blocking_io import BlockingIOExecutor
 
 
 class GTTSSynthesizer(BaseSynthesizer):
@@ -17,7 +17,7 @@ class GTTSSynthesizer(BaseSynthesizer):
     ):
         super().__init__(synthesizer_config)
 
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.thread_pool_executor = BlockingIOExecutor().executor
 
     async def create_speech(
         self,
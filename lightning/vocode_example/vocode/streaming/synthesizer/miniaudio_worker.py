@@ -2,14 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import queue
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import miniaudio
 from loguru import logger
 
 from vocode.streaming.models.synthesizer import SynthesizerConfig
-from vocode.streaming.utils import convert_wav
-from vocode.streaming.utils.mp3_helper import decode_mp3
+from vocode.streaming.utils.mp3_helper import StreamingMp3Decoder
 from vocode.streaming.utils.worker import AbstractWorker, ThreadAsyncWorker
 
 
@@ -44,10 +43,10 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 break
 
     def _run_loop(self):
-        # tracks the mp3 so far
-        current_mp3_buffer = bytearray()
-        # tracks the wav so far
-        current_wav_buffer = bytearray()
+        # decodes the mp3 of the current utterance, created when its first chunk arrives
+        decoder: Optional[StreamingMp3Decoder] = None
+        # set when decoding fails, the rest of the utterance is dropped
+        discard_until_end = False
         # the leftover chunks of the wav that haven't been sent to the output queue yet
         current_wav_output_buffer = bytearray()
         while not self._ended:
@@ -57,32 +56,40 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
             except queue.Empty:
                 continue
             if mp3_chunk is None:
-                current_mp3_buffer.clear()
-                current_wav_buffer.clear()
+                if discard_until_end:
+                    discard_until_end = False
+                    continue
+                if decoder is not None:
+                    try:
+                        current_wav_output_buffer.extend(decoder.flush())
+                    except miniaudio.DecodeError as e:
+                        logger.exception("MiniaudioWorker error: " + str(e), exc_info=True)
+                    decoder = None
                 self.output_janus_queue.sync_q.put((bytes(current_wav_output_buffer), True))
                 current_wav_output_buffer.clear()
                 continue
+            if discard_until_end:
+                continue
+            if decoder is None:
+                decoder = StreamingMp3Decoder(
+                    output_sample_rate=self.synthesizer_config.sampling_rate,
+                    output_encoding=self.synthesizer_config.audio_encoding,
+                )
             try:
-                current_mp3_buffer.extend(mp3_chunk)
-                output_bytes = decode_mp3(bytes(current_mp3_buffer))
+                # only the frames completed by this chunk are decoded
+                current_wav_output_buffer.extend(decoder.feed(mp3_chunk))
             except miniaudio.DecodeError as e:
                 # TODO: better logging
                 logger.exception("MiniaudioWorker error: " + str(e), exc_info=True)
                 self.output_janus_queue.sync_q.put(
                     (bytes(current_wav_output_buffer), True)
                 )  # sentinel
+                current_wav_output_buffer.clear()
+                decoder = None
+                discard_until_end = True
                 continue
-            converted_output_bytes = convert_wav(
-                output_bytes,
-                output_sample_rate=self.synthesizer_config.sampling_rate,
-                output_encoding=self.synthesizer_config.audio_encoding,
-            )
-            # take the difference between the current_wav_buffer and the converted_output_bytes
-            # and put the difference in the output buffer
-            new_bytes = converted_output_bytes[len(current_wav_buffer) :]
-            current_wav_output_buffer.extend(new_bytes)
 
-            # chunk up new_bytes in chunks of chunk_size bytes, but keep the last chunk (less than chunk size) in the wav output buffer
+            # chunk up the decoded bytes in chunks of chunk_size bytes, but keep the last chunk (less than chunk size) in the wav output buffer
             output_buffer_idx = 0
             while output_buffer_idx < len(current_wav_output_buffer) - self.chunk_size:
                 chunk = current_wav_output_buffer[
@@ -93,8 +100,7 @@ class MiniaudioWorker(ThreadAsyncWorker[Union[bytes, None]]):
                 )  # don't need to use bytes() since we already sliced it (which is a copy)
                 output_buffer_idx += self.chunk_size
 
-            current_wav_output_buffer = current_wav_output_buffer[output_buffer_idx:]
-            current_wav_buffer.extend(new_bytes)
+            del current_wav_output_buffer[:output_buffer_idx]
 
     async def terminate(self):
         self._ended = True
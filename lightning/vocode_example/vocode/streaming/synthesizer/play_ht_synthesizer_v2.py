@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import os
 from typing import AsyncGenerator, AsyncIterator, Optional
 
@@ -18,6 +17,7 @@ from vocode.streaming.synthesizer.play_ht_synthesizer import (
 )
 from vocode.streaming.synthesizer.synthesizer_utils import split_text
 from vocode.streaming.utils import generate_from_async_iter_with_lookahead, generate_with_is_last
+from vocode.streaming.utils.audio_dsp import Resampler, lin2ulaw, ulaw2lin
 from vocode.streaming.utils.create_task import asyncio_create_task
 
 PLAY_HT_ON_PREM_ADDR = os.environ.get("VOCODE_PLAYHT_ON_PREM_ADDR", None)
@@ -110,7 +110,7 @@ class PlayHtSynthesizerV2(VocodePlayHtSynthesizer):
     def _contains_voice_experimental(self, chunk: bytes):
         pcm = np.frombuffer(
             (
-                audioop.ulaw2lin(chunk, 2)
+                ulaw2lin(chunk)
                 if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW
                 else chunk
             ),
@@ -123,39 +123,39 @@ class PlayHtSynthesizerV2(VocodePlayHtSynthesizer):
         for buffer_idx in range(0, len(buffer) - chunk_size, chunk_size):
             yield buffer_idx, buffer[buffer_idx : buffer_idx + chunk_size]
 
-    async def _downsample_from_24khz(self, chunk: bytes) -> bytes:
+    async def _downsample_from_24khz(self, chunk: bytes, resampler: Resampler) -> bytes:
         if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-            return await self._downsample_mulaw(chunk)
+            return await self._downsample_mulaw(chunk, resampler)
         elif self.synthesizer_config.audio_encoding == AudioEncoding.LINEAR16:
-            return await self._downsample_pcm(chunk)
+            return await self._downsample_pcm(chunk, resampler)
         else:
             raise Exception(f"Unsupported audio format: {self.synthesizer_config.audio_encoding}")
 
-    async def _downsample_pcm(self, chunk: bytes) -> bytes:
-        downsampled_chunk, _ = audioop.ratecv(
-            chunk,
-            2,
-            1,
-            24000,
-            self.synthesizer_config.sampling_rate,
-            None,
-        )
-
-        return downsampled_chunk
+    async def _downsample_pcm(self, chunk: bytes, resampler: Resampler) -> bytes:
+        return resampler.process(chunk)
 
-    async def _downsample_mulaw(self, chunk: bytes) -> bytes:
-        pcm_data = audioop.ulaw2lin(chunk, 2)
-        downsampled_pcm_data = await self._downsample_pcm(pcm_data)
-        downsampled_chunk = audioop.lin2ulaw(downsampled_pcm_data, 2)
+    async def _downsample_mulaw(self, chunk: bytes, resampler: Resampler) -> bytes:
+        pcm_data = ulaw2lin(chunk)
+        downsampled_pcm_data = await self._downsample_pcm(pcm_data, resampler)
+        downsampled_chunk = lin2ulaw(downsampled_pcm_data)
         return downsampled_chunk
 
     async def downsample_async_generator(self, async_gen: AsyncGenerator[bytes, None]):
-        async for play_ht_chunk in async_gen:
-            if self.synthesizer_config.sampling_rate >= 24000:
+        if self.synthesizer_config.sampling_rate >= 24000:
+            async for play_ht_chunk in async_gen:
                 yield play_ht_chunk
-            else:
-                downsampled_chunk = await self._downsample_from_24khz(play_ht_chunk)
-                yield downsampled_chunk
+            return
+        # one resampler per stream, so chunk boundaries don't click
+        resampler = Resampler(24000, self.synthesizer_config.sampling_rate)
+        async for play_ht_chunk in async_gen:
+            downsampled_chunk = await self._downsample_from_24khz(play_ht_chunk, resampler)
+            yield downsampled_chunk
+        # the resampler holds back the last few milliseconds of audio until the stream ends
+        tail = resampler.flush()
+        if tail:
+            if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
+                tail = lin2ulaw(tail)
+            yield tail
 
     async def _cut_leading_trailing_silence(
         self,
@@ -1,6 +1,4 @@
-import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 import boto3
@@ -12,6 +10,7 @@ from vocode.streaming.synthesizer.base_synthesizer import (
     SynthesisResult,
     encode_as_wav,
 )
+from vocode.streaming.utils.blocking_io import BlockingIOExecutor
 
 
 class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
@@ -34,7 +33,7 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         self.client = client
         self.language_code = synthesizer_config.language_code
         self.voice_id = synthesizer_config.voice_id
-        self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
+        self.blocking_io_executor = BlockingIOExecutor()
 
     def synthesize(self, message: str) -> Any:
         # Perform the text-to-speech request on the text input with the selected
@@ -81,13 +80,11 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         is_first_text_chunk: bool = False,
         is_sole_text_chunk: bool = False,
     ) -> SynthesisResult:
-        audio_response = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.synthesize, message.text
-        )
+        audio_response = await self.blocking_io_executor.run(self.synthesize, message.text)
         audio_stream = audio_response.get("AudioStream")
 
-        speech_marks_response = await asyncio.get_event_loop().run_in_executor(
-            self.thread_pool_executor, self.get_speech_marks, message.text
+        speech_marks_response = await self.blocking_io_executor.run(
+            self.get_speech_marks, message.text
         )
         word_events = [
             json.loads(v)
@@ -96,17 +93,8 @@ class PollySynthesizer(BaseSynthesizer[PollySynthesizerConfig]):
         ]
 
         async def chunk_generator(audio_data_stream, chunk_transform=lambda x: x):
-            audio_buffer = await asyncio.get_event_loop().run_in_executor(
-                self.thread_pool_executor,
-                lambda: audio_stream.read(chunk_size),
-            )
-            if len(audio_buffer) != chunk_size:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), True)
-                return
-            else:
-                yield SynthesisResult.ChunkResult(chunk_transform(audio_buffer), False)
             while True:
-                audio_buffer = audio_stream.read(chunk_size)
+                audio_buffer = await self.blocking_io_executor.run(audio_stream.read, chunk_size)
                 if len(audio_buffer) != chunk_size:
                     yield SynthesisResult.ChunkResult(
                         chunk_transform(audio_buffer[: len(audio_buffer)]), True
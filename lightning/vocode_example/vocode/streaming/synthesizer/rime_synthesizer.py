@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import base64
 import io
 import json
@@ -17,6 +16,7 @@ from vocode.streaming.models.synthesizer import (
     RimeSynthesizerConfig,
 )
 from vocode.streaming.synthesizer.base_synthesizer import BaseSynthesizer, SynthesisResult
+from vocode.streaming.utils.audio_dsp import lin2ulaw
 
 # TODO: [OSS] Remove call to internal library with Synthesizers refactor
 
@@ -84,7 +84,7 @@ class RimeSynthesizer(BaseSynthesizer[RimeSynthesizerConfig]):
             output_bytes = base64.b64decode(audio_content)[WAV_HEADER_LENGTH:]
 
             if self.synthesizer_config.audio_encoding == AudioEncoding.MULAW:
-                output_bytes = audioop.lin2ulaw(output_bytes, 2)
+                output_bytes = lin2ulaw(output_bytes)
 
             return SynthesisResult(
                 self._chunk_generator(output_bytes, chunk_size),
@@ -73,8 +73,8 @@ class TwilioClient(AbstractTelephonyClient):
                     raise TwilioException(
                         f"Twilio failed to create call: {response.status} {response.reason}"
                     )
-            response = await response.json()
-            return response["sid"]
+            response_json = await response.json()
+            return response_json["sid"]
 
     def get_connection_twiml(self, conversation_id: str):
         return get_connection_twiml(call_id=conversation_id, base_url=self.base_url)
@@ -87,5 +87,5 @@ class TwilioClient(AbstractTelephonyClient):
         ) as response:
             if not response.ok:
                 raise RuntimeError(f"Failed to end call: {response.status} {response.reason}")
-            response = await response.json()
-            return response["status"] == "completed"
+            response_json = await response.json()
+            return response_json["status"] == "completed"
@@ -1,4 +1,5 @@
-from typing import Optional
+import asyncio
+from typing import Dict, List, Optional
 
 from vocode.streaming.models.telephony import BaseCallConfig
 
@@ -12,3 +13,18 @@ class BaseConfigManager:
 
     async def delete_config(self, conversation_id):
         raise NotImplementedError
+
+    async def save_configs(self, configs: Dict[str, BaseCallConfig]):
+        await asyncio.gather(
+            *(
+                self.save_config(conversation_id, config)
+                for conversation_id, config in configs.items()
+            )
+        )
+
+    async def get_configs(self, conversation_ids: List[str]) -> List[Optional[BaseCallConfig]]:
+        return list(
+            await asyncio.gather(
+                *(self.get_config(conversation_id) for conversation_id in conversation_ids)
+            )
+        )
@@ -1,32 +1,116 @@
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
-from redis import Redis
+from redis.asyncio import Redis
 
 from vocode.streaming.models.telephony import BaseCallConfig
 from vocode.streaming.telephony.config_manager.base_config_manager import BaseConfigManager
 from vocode.streaming.utils.redis import initialize_redis
 
+ONE_DAY_SECONDS = 60 * 60 * 24
+DEFAULT_LOCAL_CACHE_MAX_ENTRIES = 1024
+
 
 class RedisConfigManager(BaseConfigManager):
-    def __init__(self):
+    """Call configs in Redis, which expire after a day.
+
+    With `local_cache_seconds`, configs read or written by this process are kept in memory for
+    that long, so the webhook and the websocket of a call handled by the same process only
+    reach Redis once. Changes made by other processes show up once the local copy expires.
+    """
+
+    def __init__(
+        self,
+        local_cache_seconds: float = 0,
+        local_cache_max_entries: int = DEFAULT_LOCAL_CACHE_MAX_ENTRIES,
+    ):
         self.redis: Redis = initialize_redis()
+        self.local_cache_seconds = local_cache_seconds
+        self.local_cache_max_entries = local_cache_max_entries
+        # raw configs by conversation id, with the time they expire at
+        self.local_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
 
     async def _set_with_one_day_expiration(self, *args, **kwargs):
-        ONE_DAY_SECONDS = 60 * 60 * 24
         return await self.redis.set(*args, **{**kwargs, "ex": ONE_DAY_SECONDS})
 
+    def _get_local(self, conversation_id: str) -> Optional[str]:
+        entry = self.local_cache.get(conversation_id)
+        if entry is None:
+            return None
+        expires_at, raw_config = entry
+        if expires_at < time.monotonic():
+            del self.local_cache[conversation_id]
+            return None
+        self.local_cache.move_to_end(conversation_id)
+        return raw_config
+
+    def _set_local(self, conversation_id: str, raw_config: str):
+        if self.local_cache_seconds <= 0:
+            return
+        self.local_cache.pop(conversation_id, None)
+        self.local_cache[conversation_id] = (
+            time.monotonic() + self.local_cache_seconds,
+            raw_config,
+        )
+        while len(self.local_cache) > self.local_cache_max_entries:
+            self.local_cache.popitem(last=False)
+
     async def save_config(self, conversation_id: str, config: BaseCallConfig):
         logger.debug(f"Saving config for {conversation_id}")
-        await self._set_with_one_day_expiration(conversation_id, config.json())
+        raw_config = config.json()
+        await self._set_with_one_day_expiration(conversation_id, raw_config)
+        self._set_local(conversation_id, raw_config)
+
+    async def save_configs(self, configs: Dict[str, BaseCallConfig]):
+        """Saves the configs of many calls, e.g. an outbound campaign, in one round trip."""
+        logger.debug(f"Saving {len(configs)} configs")
+        raw_configs = {
+            conversation_id: config.json() for conversation_id, config in configs.items()
+        }
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            for conversation_id, raw_config in raw_configs.items():
+                pipeline.set(conversation_id, raw_config, ex=ONE_DAY_SECONDS)
+            await pipeline.execute()
+        for conversation_id, raw_config in raw_configs.items():
+            self._set_local(conversation_id, raw_config)
 
     async def get_config(self, conversation_id) -> Optional[BaseCallConfig]:
         logger.debug(f"Getting config for {conversation_id}")
-        raw_config = await self.redis.get(conversation_id)  # type: ignore
+        raw_config = self._get_local(conversation_id)
+        if raw_config is None:
+            raw_config = await self.redis.get(conversation_id)  # type: ignore
+            if raw_config:
+                self._set_local(conversation_id, raw_config)
         if raw_config:
             return BaseCallConfig.parse_raw(raw_config)
         return None
 
+    async def get_configs(self, conversation_ids: List[str]) -> List[Optional[BaseCallConfig]]:
+        """Gets the configs of many calls in one round trip, None for the ones not found."""
+        raw_configs: Dict[str, Optional[str]] = {
+            conversation_id: self._get_local(conversation_id)
+            for conversation_id in conversation_ids
+        }
+        missing_ids = [
+            conversation_id
+            for conversation_id, raw_config in raw_configs.items()
+            if raw_config is None
+        ]
+        if missing_ids:
+            for conversation_id, raw_config in zip(
+                missing_ids, await self.redis.mget(missing_ids)  # type: ignore
+            ):
+                raw_configs[conversation_id] = raw_config
+                if raw_config:
+                    self._set_local(conversation_id, raw_config)
+        return [
+            BaseCallConfig.parse_raw(raw_config) if raw_config else None
+            for raw_config in (raw_configs[conversation_id] for conversation_id in conversation_ids)
+        ]
+
     async def delete_config(self, conversation_id):
         logger.debug(f"Deleting config for {conversation_id}")
+        self.local_cache.pop(conversation_id, None)
         await self.redis.delete(conversation_id)
@@ -18,6 +18,7 @@ from vocode.streaming.synthesizer.abstract_factory import AbstractSynthesizerFac
 from vocode.streaming.telephony.config_manager.base_config_manager import BaseConfigManager
 from vocode.streaming.transcriber.abstract_factory import AbstractTranscriberFactory
 from vocode.streaming.utils import create_conversation_id
+from vocode.streaming.utils.audio_preprocessor import AudioPreprocessor
 from vocode.streaming.utils.events_manager import EventsManager
 
 TelephonyOutputDeviceType = TypeVar(
@@ -49,6 +50,7 @@ class AbstractPhoneConversation(StreamingConversation[TelephonyOutputDeviceType]
         conversation_id: Optional[str] = None,
         events_manager: Optional[EventsManager] = None,
         speed_coefficient: float = 1.0,
+        audio_preprocessor: Optional[AudioPreprocessor] = None,
     ):
         conversation_id = conversation_id or create_conversation_id()
         ctx_conversation_id.set(conversation_id)
@@ -65,6 +67,7 @@ class AbstractPhoneConversation(StreamingConversation[TelephonyOutputDeviceType]
             conversation_id=conversation_id,
             events_manager=events_manager,
             speed_coefficient=speed_coefficient,
+            audio_preprocessor=audio_preprocessor,
         )
         self.config_manager = config_manager
 
@@ -1,4 +1,3 @@
-import base64
 import json
 import os
 from enum import Enum
@@ -23,6 +22,7 @@ from vocode.streaming.telephony.config_manager.base_config_manager import BaseCo
 from vocode.streaming.telephony.conversation.abstract_phone_conversation import (
     AbstractPhoneConversation,
 )
+from vocode.streaming.telephony.twilio_framing import parse_twilio_message
 from vocode.streaming.transcriber.abstract_factory import AbstractTranscriberFactory
 from vocode.streaming.utils.events_manager import EventsManager
 from vocode.streaming.utils.state_manager import TwilioPhoneConversationStateManager
@@ -123,15 +123,15 @@ class TwilioPhoneConversation(AbstractPhoneConversation[TwilioOutputDevice]):
         if message is None:
             return TwilioPhoneConversationWebsocketAction.CLOSE_WEBSOCKET
 
-        data = json.loads(message)
-        if data["event"] == "media":
-            media = data["media"]
-            chunk = base64.b64decode(media["payload"])
-            self.receive_audio(chunk)
-        if data["event"] == "mark":
-            chunk_id = data["mark"]["name"]
+        parsed_message = parse_twilio_message(message)
+        if parsed_message.event == "media":
+            assert parsed_message.audio is not None
+            self.receive_audio(parsed_message.audio)
+        elif parsed_message.event == "mark":
+            assert parsed_message.data is not None
+            chunk_id = parsed_message.data["mark"]["name"]
             self.output_device.enqueue_mark_message(ChunkFinishedMarkMessage(chunk_id=chunk_id))
-        elif data["event"] == "stop":
+        elif parsed_message.event == "stop":
             logger.debug(f"Media WS: Received event 'stop': {message}")
             logger.debug("Stopping...")
             return TwilioPhoneConversationWebsocketAction.CLOSE_WEBSOCKET
@@ -1,7 +1,5 @@
-import os
 from typing import Optional
 
-import numpy as np
 from fastapi import WebSocket, WebSocketDisconnect
 from loguru import logger
 
@@ -19,11 +17,10 @@ from vocode.streaming.telephony.conversation.abstract_phone_conversation import
     AbstractPhoneConversation,
 )
 from vocode.streaming.transcriber.abstract_factory import AbstractTranscriberFactory
+from vocode.streaming.utils.audio_preprocessor import KoalaAudioPreprocessor
 from vocode.streaming.utils.events_manager import EventsManager
 from vocode.streaming.utils.state_manager import VonagePhoneConversationStateManager
 
-KOALA_CHUNK_SIZE = 512  # 16 bit samples, size 256
-
 
 class VonagePhoneConversation(AbstractPhoneConversation[VonageOutputDevice]):
     telephony_provider = "vonage"
@@ -50,6 +47,9 @@ class VonagePhoneConversation(AbstractPhoneConversation[VonageOutputDevice]):
         noise_suppression: bool = False,
     ):
         self.speed_coefficient = speed_coefficient
+        self.noise_suppression = noise_suppression
+        if self.noise_suppression:
+            logger.info("Using PV koala noise suppression")
         super().__init__(
             direction=direction,
             speed_coefficient=speed_coefficient,
@@ -66,6 +66,7 @@ class VonagePhoneConversation(AbstractPhoneConversation[VonageOutputDevice]):
             transcriber_factory=transcriber_factory,
             agent_factory=agent_factory,
             synthesizer_factory=synthesizer_factory,
+            audio_preprocessor=KoalaAudioPreprocessor() if noise_suppression else None,
         )
         self.vonage_config = vonage_config
         self.telephony_client = VonageClient(
@@ -73,15 +74,6 @@ class VonagePhoneConversation(AbstractPhoneConversation[VonageOutputDevice]):
             maybe_vonage_config=self.vonage_config,
         )
         self.vonage_uuid = vonage_uuid
-        self.noise_suppression = noise_suppression
-        if self.noise_suppression:
-            import pvkoala
-
-            logger.info("Using PV koala noise suppression")
-            self.buffer = bytearray()
-            self.koala = pvkoala.create(
-                access_key=os.environ["KOALA_ACCESS_KEY"],
-            )
 
     def create_state_manager(self) -> VonagePhoneConversationStateManager:
         return VonagePhoneConversationStateManager(self)
@@ -119,20 +111,3 @@ class VonagePhoneConversation(AbstractPhoneConversation[VonageOutputDevice]):
         await self.terminate()
         if not disconnected:
             await ws.close()
-
-    def receive_audio(self, chunk: bytes):
-        if self.noise_suppression:
-            self.buffer.extend(chunk)
-
-            while len(self.buffer) >= KOALA_CHUNK_SIZE:
-                koala_chunk = np.frombuffer(self.buffer[:KOALA_CHUNK_SIZE], dtype=np.int16)
-                try:
-                    denoised_chunk = np.array(
-                        self.koala.process(koala_chunk), dtype=np.int16
-                    ).tobytes()
-                except Exception:
-                    denoised_chunk = koala_chunk.tobytes()
-                super().receive_audio(denoised_chunk)
-                self.buffer = self.buffer[KOALA_CHUNK_SIZE:]
-        else:
-            super().receive_audio(chunk)
@@ -0,0 +1,82 @@
+import binascii
+import json
+from typing import Any, Dict, NamedTuple, Optional
+
+from vocode.streaming.models.audio import AudioBuffer
+
+# Twilio sends compact JSON with "event" as the first key, e.g.
+# {"event":"media","sequenceNumber":"4","media":{...,"payload":"..."},"streamSid":"MZ..."}
+EVENT_PREFIX = '{"event":"'
+PAYLOAD_KEY = '"payload":"'
+
+
+class TwilioFramer:
+    """Builds outbound Twilio media stream messages from templates with the streamSid already
+    JSON-encoded, instead of serializing a dict for every chunk.
+
+    The messages are the same JSON objects that `json.dumps` would produce for the equivalent
+    dicts, so Twilio sees no difference.
+    """
+
+    def __init__(self, stream_sid: Optional[str]):
+        encoded_stream_sid = json.dumps(stream_sid)
+        self._media_prefix = (
+            f'{{"event":"media","streamSid":{encoded_stream_sid},"media":{{"payload":"'
+        )
+        self._media_suffix = '"}}'
+        self._mark_prefix = f'{{"event":"mark","streamSid":{encoded_stream_sid},"mark":{{"name":'
+        self._clear_message = f'{{"event":"clear","streamSid":{encoded_stream_sid}}}'
+
+    def media(self, chunk: AudioBuffer) -> str:
+        # base64 output is plain ASCII, so it can go into the JSON string without escaping
+        payload = binascii.b2a_base64(chunk, newline=False).decode("ascii")
+        return self._media_prefix + payload + self._media_suffix
+
+    def mark(self, name: str) -> str:
+        return self._mark_prefix + json.dumps(name) + "}}"
+
+    def clear(self) -> str:
+        return self._clear_message
+
+
+class TwilioInboundMessage(NamedTuple):
+    event: str
+    # the decoded audio of a media message
+    audio: Optional[bytes] = None
+    # the full message, for everything but media messages
+    data: Optional[Dict[str, Any]] = None
+
+
+def _parse_media_payload(message: str) -> Optional[bytes]:
+    payload_start = message.find(PAYLOAD_KEY)
+    if payload_start == -1:
+        return None
+    payload_start += len(PAYLOAD_KEY)
+    payload_end = message.find('"', payload_start)
+    if payload_end == -1:
+        return None
+    try:
+        return binascii.a2b_base64(message[payload_start:payload_end])
+    except (binascii.Error, ValueError):
+        return None
+
+
+def parse_twilio_message(message: str) -> TwilioInboundMessage:
+    """Parses a message from the Twilio media stream websocket.
+
+    Media messages arrive every 20ms for the whole call, so their event and payload are sliced
+    out of the string directly. Any other event, or a message that isn't laid out the way Twilio
+    sends it, goes through `json.loads`.
+    """
+    if message.startswith(EVENT_PREFIX):
+        event_end = message.find('"', len(EVENT_PREFIX))
+        if message[len(EVENT_PREFIX) : event_end] == "media":
+            audio = _parse_media_payload(message)
+            if audio is not None:
+                return TwilioInboundMessage(event="media", audio=audio)
+    data = json.loads(message)
+    if data["event"] == "media":
+        return TwilioInboundMessage(
+            event="media", audio=binascii.a2b_base64(data["media"]["payload"]), data=data
+        )
+    return TwilioInboundMessage(event=data["event"], data=data)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import audioop
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Generic, Optional, TypeVar, Union
 
+from loguru import logger
+
 from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.transcriber import TranscriberConfig, Transcription
+from vocode.streaming.utils.audio_dsp import lin2ulaw
 from vocode.streaming.utils.speed_manager import SpeedManager
+from vocode.streaming.utils.vad import EnergyVoiceActivityDetector, VoiceActivityGate
 from vocode.streaming.utils.worker import AbstractWorker, AsyncWorker, ThreadAsyncWorker
 
 if TYPE_CHECKING:
@@ -46,7 +49,7 @@ class AbstractTranscriber(Generic[TranscriberConfigType], AbstractWorker[bytes])
         if self.get_transcriber_config().audio_encoding == AudioEncoding.LINEAR16:
             return linear_audio
         elif self.get_transcriber_config().audio_encoding == AudioEncoding.MULAW:
-            return audioop.lin2ulaw(linear_audio, sample_width)
+            return lin2ulaw(linear_audio, sample_width)
 
     @abstractmethod
     async def _run_loop(self):
@@ -66,8 +69,34 @@ class BaseAsyncTranscriber(AbstractTranscriber[TranscriberConfigType], AsyncWork
     def __init__(self, transcriber_config: TranscriberConfigType):
         AbstractTranscriber.__init__(self, transcriber_config)
         AsyncWorker.__init__(self)
+        self.voice_activity_gate: Optional[VoiceActivityGate] = None
+        gate_config = transcriber_config.voice_activity_gate
+        if gate_config is not None:
+            self.voice_activity_gate = VoiceActivityGate(
+                transcriber_config.sampling_rate,
+                transcriber_config.audio_encoding,
+                detector=EnergyVoiceActivityDetector(
+                    gate_config.speech_threshold_dbfs, gate_config.max_zero_crossing_rate
+                ),
+                pre_roll_seconds=gate_config.pre_roll_seconds,
+                hangover_seconds=gate_config.hangover_seconds,
+                keepalive_interval_seconds=gate_config.keepalive_interval_seconds,
+            )
+
+    def send_audio(self, chunk: bytes):
+        if self.voice_activity_gate is None:
+            self.forward_audio(chunk)
+            return
+        for gated_chunk in self.voice_activity_gate.process(chunk):
+            self.forward_audio(gated_chunk)
+
+    def forward_audio(self, chunk: bytes):
+        """Passes on audio that made it through the voice activity gate, if there is one."""
+        AbstractTranscriber.send_audio(self, chunk)
 
     async def terminate(self):
+        if self.voice_activity_gate is not None:
+            logger.debug(f"Voice activity gate stats: {self.voice_activity_gate.stats.to_dict()}")
         await AsyncWorker.terminate(self)
 
 
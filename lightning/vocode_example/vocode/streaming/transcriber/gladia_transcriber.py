@@ -1,5 +1,4 @@
 import asyncio
-import audioop
 import json
 from typing import Optional
 
@@ -12,6 +11,7 @@ from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.transcriber import GladiaTranscriberConfig, Transcription
 from vocode.streaming.models.websocket import AudioMessage
 from vocode.streaming.transcriber.base_transcriber import BaseAsyncTranscriber
+from vocode.streaming.utils.audio_dsp import ulaw2lin
 
 GLADIA_URL = "wss://api.gladia.io/audio/text/audio-transcription"
 
@@ -40,13 +40,13 @@ class GladiaTranscriber(BaseAsyncTranscriber[GladiaTranscriberConfig]):
     async def _run_loop(self):
         await self.process()
 
-    def send_audio(self, chunk):
+    def forward_audio(self, chunk):
         if self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
             sample_width = 1
             if isinstance(chunk, np.ndarray):
                 chunk = chunk.astype(np.int16)
                 chunk = chunk.tobytes()
-            chunk = audioop.ulaw2lin(chunk, sample_width)
+            chunk = ulaw2lin(chunk, sample_width)
 
         self.buffer.extend(chunk)
 
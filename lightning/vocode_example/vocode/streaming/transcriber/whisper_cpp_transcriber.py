@@ -1,19 +1,32 @@
 import ctypes
 import io
 import pathlib
+import queue
 import wave
 from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 from pydub import AudioSegment
 
 from vocode.streaming.constants import SENTENCE_ENDINGS
+from vocode.streaming.models.audio import AudioEncoding
 from vocode.streaming.models.transcriber import Transcription, WhisperCPPTranscriberConfig
 from vocode.streaming.transcriber.base_transcriber import BaseThreadAsyncTranscriber
-from vocode.utils.whisper_cpp.helpers import transcribe
+from vocode.streaming.utils.audio_dsp import Resampler, pcm_to_array, ulaw2lin
+from vocode.streaming.utils.ring_buffer import SampleRingBuffer
+from vocode.streaming.utils.vad import EnergyVoiceActivityDetector
+from vocode.utils.whisper_cpp.helpers import (
+    WHISPER_SAMPLING_RATE,
+    merge_overlapping_text,
+    transcribe,
+    transcribe_samples,
+)
 from vocode.utils.whisper_cpp.whisper_params import WhisperFullParams
 
-WHISPER_CPP_SAMPLING_RATE = 16000
+WHISPER_CPP_SAMPLING_RATE = WHISPER_SAMPLING_RATE
+# how often the streaming loop checks whether the transcriber was terminated
+INPUT_POLL_SECONDS = 0.1
 
 
 class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConfig]):
@@ -26,8 +39,6 @@ class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConf
         self.buffer_size = round(
             transcriber_config.sampling_rate * transcriber_config.buffer_size_seconds
         )
-        self.buffer = np.empty(self.buffer_size, dtype=np.int16)
-        self.buffer_index = 0
 
         # whisper cpp
         # load library and model
@@ -51,6 +62,38 @@ class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConf
         self.params.single_segment = True
         self.thread_pool_executor = ThreadPoolExecutor(max_workers=1)
 
+        if self.transcriber_config.streaming:
+            self._init_streaming()
+
+    def _init_streaming(self):
+        self.window_size = round(WHISPER_SAMPLING_RATE * self.transcriber_config.window_seconds)
+        self.step_size = round(WHISPER_SAMPLING_RATE * self.transcriber_config.buffer_size_seconds)
+        self.overlap_size = round(
+            WHISPER_SAMPLING_RATE * self.transcriber_config.window_overlap_seconds
+        )
+        self.endpointing_silence_size = round(
+            WHISPER_SAMPLING_RATE * self.transcriber_config.endpointing_silence_seconds
+        )
+        # the audio of the current utterance, at most one window of it
+        self.window = SampleRingBuffer(self.window_size)
+        # whisper reads floats; the window is converted into this buffer instead of a new array
+        self.float_buffer = np.zeros(self.window_size, dtype=np.float32)
+        self.float_buffer_pointer = self.float_buffer.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+        self.vad = EnergyVoiceActivityDetector(self.transcriber_config.speech_threshold_dbfs)
+        self.resampler: Optional[Resampler] = None
+        if self.transcriber_config.sampling_rate != WHISPER_SAMPLING_RATE:
+            self.resampler = Resampler(self.transcriber_config.sampling_rate, WHISPER_SAMPLING_RATE)
+        self._reset_utterance()
+
+    def _reset_utterance(self):
+        self.speech_started = False
+        self.utterance_samples = 0
+        self.trailing_silence_samples = 0
+        self.samples_since_transcribed = 0
+        # transcription of the audio that already slid out of the window
+        self.committed_message = ""
+        self.last_interim_message = ""
+
     def create_new_buffer(self):
         buffer = io.BytesIO()
         wav = wave.open(buffer, "wb")
@@ -60,6 +103,9 @@ class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConf
         return wav, buffer
 
     def _run_loop(self):
+        if self.transcriber_config.streaming:
+            self._run_streaming_loop()
+            return
         in_memory_wav, audio_buffer = self.create_new_buffer()
         message_buffer = ""
         while not self._ended:
@@ -78,5 +124,92 @@ class WhisperCPPTranscriber(BaseThreadAsyncTranscriber[WhisperCPPTranscriberConf
                 if is_final:
                     message_buffer = ""
 
+    def _run_streaming_loop(self):
+        while not self._ended:
+            try:
+                chunk = self.input_janus_queue.sync_q.get(timeout=INPUT_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            self.process_chunk(chunk)
+
+    def decode_chunk(self, chunk: bytes) -> np.ndarray:
+        if self.transcriber_config.audio_encoding == AudioEncoding.MULAW:
+            chunk = ulaw2lin(chunk)
+        if self.resampler is not None:
+            chunk = self.resampler.process(chunk)
+        return pcm_to_array(chunk)
+
+    def process_chunk(self, chunk: bytes):
+        samples = self.decode_chunk(chunk)
+        if not len(samples):
+            return
+        is_speech = self.vad.is_speech(samples)
+        if self.speech_started and len(samples) > self.window.free_space:
+            self._slide_window()
+        self.window.write(samples)
+        if not self.speech_started:
+            if not is_speech:
+                # keep a little audio from before the onset, whisper misses clipped first words
+                self.window.discard(max(0, len(self.window) - self.overlap_size))
+                return
+            self.speech_started = True
+
+        self.utterance_samples += len(samples)
+        self.samples_since_transcribed += len(samples)
+        self.trailing_silence_samples = (
+            0 if is_speech else self.trailing_silence_samples + len(samples)
+        )
+        if self.trailing_silence_samples >= self.endpointing_silence_size:
+            self._finish_utterance()
+        elif self.samples_since_transcribed >= self.step_size:
+            self._send_interim_transcription()
+
+    def transcribe_window(self) -> str:
+        offset = 0
+        for view in self.window.views():
+            np.multiply(
+                view,
+                np.float32(1 / 32768),
+                out=self.float_buffer[offset : offset + len(view)],
+                casting="unsafe",
+            )
+            offset += len(view)
+        message, _ = transcribe_samples(
+            self.whisper, self.params, self.ctx, self.float_buffer_pointer, offset
+        )
+        return message.strip()
+
+    def _slide_window(self):
+        """The utterance outgrew the window: commits what it said so far, and keeps the end of
+        the window so that words cut at the boundary are heard again in the next one."""
+        self.committed_message = merge_overlapping_text(
+            self.committed_message, self.transcribe_window()
+        )
+        self.window.discard(max(0, len(self.window) - self.overlap_size))
+
+    def _send_interim_transcription(self):
+        self.samples_since_transcribed = 0
+        message = merge_overlapping_text(self.committed_message, self.transcribe_window())
+        if message and message != self.last_interim_message:
+            self.last_interim_message = message
+            self.produce_nonblocking(Transcription(message=message, confidence=1.0, is_final=False))
+
+    def _finish_utterance(self):
+        message = merge_overlapping_text(self.committed_message, self.transcribe_window())
+        if message:
+            self.produce_nonblocking(
+                Transcription(
+                    message=message,
+                    confidence=1.0,
+                    is_final=True,
+                    duration_seconds=self.utterance_samples / WHISPER_SAMPLING_RATE,
+                )
+            )
+        # the window still holds the end of this utterance, which must not be heard again if the
+        # caller speaks up before the next onset's pre-roll has pushed it out
+        self.window.clear()
+        self._reset_utterance()
+
     async def terminate(self):
-        pass
+        self._ended = True
+        await super().terminate()
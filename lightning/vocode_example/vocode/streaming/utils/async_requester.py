@@ -1,30 +1,141 @@
-from typing import Optional
+import importlib.util
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Dict, Optional
 
 import aiohttp
 import httpx
 from aiohttp import BaseConnector
-from pydantic import BaseModel
 
 from vocode.streaming.utils.singleton import Singleton
 
+DEFAULT_CONNECTION_LIMIT = 200
+# keeps a single slow provider from taking every connection in the pool
+DEFAULT_CONNECTION_LIMIT_PER_HOST = 50
+DEFAULT_KEEPALIVE_SECONDS = 60
+DEFAULT_DNS_CACHE_SECONDS = 300
+DEFAULT_HTTPX_RETRIES = 2
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class ConnectionStats:
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {**asdict(self), "reused_connections": self.reused_connections}
+
 
 class AsyncRequestor(Singleton):
-    def __init__(self, connector: Optional[BaseConnector] = None):
-        self.session = aiohttp.ClientSession(connector=connector)
-        self.async_client = httpx.AsyncClient()
+    """Process-wide aiohttp session and httpx client, so requests to the same host reuse
+    kept-alive connections instead of paying for DNS, TCP and TLS every time.
+
+    Do not use the session or client as a context manager: that closes them for everyone.
+    Call `close` once, when the process shuts down.
+    """
+
+    def __init__(
+        self,
+        connector: Optional[BaseConnector] = None,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        connection_limit_per_host: int = DEFAULT_CONNECTION_LIMIT_PER_HOST,
+        keepalive_seconds: float = DEFAULT_KEEPALIVE_SECONDS,
+        http2: bool = HTTP2_AVAILABLE,
+    ):
         self.connector = connector
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.http2 = http2
+        self.stats = ConnectionStats()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.async_client: Optional[httpx.AsyncClient] = None
 
-    def get_session(self):
-        if self.session.closed:
-            self.session = aiohttp.ClientSession(connector=self.connector)
+    def _create_session(self) -> aiohttp.ClientSession:
+        trace_config = aiohttp.TraceConfig()
+        # aiohttp < 3.12 annotates its signals for aiosignal < 1.4, which mypy reads wrongly when
+        # a newer aiosignal is installed
+        trace_config.on_request_start.append(
+            self._on_aiohttp_request_start  # type: ignore[arg-type]
+        )
+        trace_config.on_connection_create_end.append(
+            self._on_aiohttp_connection_create_end  # type: ignore[arg-type]
+        )
+        if self.connector is not None:
+            # the caller owns the connector, which outlives any one session
+            return aiohttp.ClientSession(
+                connector=self.connector, connector_owner=False, trace_configs=[trace_config]
+            )
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            keepalive_timeout=self.keepalive_seconds,
+            ttl_dns_cache=DEFAULT_DNS_CACHE_SECONDS,
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    def _create_client(self) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(
+            retries=DEFAULT_HTTPX_RETRIES,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.connection_limit,
+                max_keepalive_connections=self.connection_limit_per_host,
+                keepalive_expiry=self.keepalive_seconds,
+            ),
+        )
+        return httpx.AsyncClient(
+            transport=transport, event_hooks={"request": [self._on_httpx_request]}
+        )
+
+    async def _on_aiohttp_request_start(
+        self,
+        session: aiohttp.ClientSession,
+        trace_config_ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ):
+        self.stats.requests += 1
+
+    async def _on_aiohttp_connection_create_end(
+        self,
+        session: aiohttp.ClientSession,
+        trace_config_ctx: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ):
+        self.stats.new_connections += 1
+
+    async def _on_httpx_request(self, request: httpx.Request):
+        self.stats.requests += 1
+        request.extensions["trace"] = self._on_httpx_trace
+
+    async def _on_httpx_trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.new_connections += 1
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
         return self.session
 
-    def get_client(self):
+    def get_client(self) -> httpx.AsyncClient:
+        if self.async_client is None or self.async_client.is_closed:
+            self.async_client = self._create_client()
         return self.async_client
 
     async def close_session(self):
-        if not self.session.closed:
+        if self.session is not None and not self.session.closed:
             await self.session.close()
 
     async def close_client(self):
-        await self.async_client.aclose()
+        if self.async_client is not None:
+            await self.async_client.aclose()
+
+    async def close(self):
+        await self.close_session()
+        await self.close_client()
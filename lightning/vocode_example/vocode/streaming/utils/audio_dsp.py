@@ -0,0 +1,189 @@
+"""NumPy replacements for the `audioop` functions vocode uses, which is removed in Python 3.13.
+
+All functions take 16-bit little-endian mono PCM (or 8-bit µ-law) as bytes, bytearrays or
+memoryviews, read it without copying and return bytes. µ-law conversion is bit-exact with
+`audioop`.
+"""
+
+import math
+from typing import Union
+
+import numpy as np
+
+AudioBytes = Union[bytes, bytearray, memoryview]
+
+PCM_DTYPE = np.dtype("<i2")
+INT16_MIN = -32768
+INT16_MAX = 32767
+# µ-law encoding of a zero sample
+ULAW_SILENCE_BYTE = 0xFF
+
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159
+# upper bounds of the magnitude segments of the 14-bit µ-law encoder
+ULAW_SEGMENT_ENDS = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+# zero crossings on each side of the sinc resampling filter
+DEFAULT_RESAMPLER_HALF_WIDTH = 16
+DEFAULT_RESAMPLER_KAISER_BETA = 8.6
+# fraction of the lower Nyquist frequency the resampling filter passes
+DEFAULT_RESAMPLER_ROLLOFF = 0.95
+
+
+def _build_ulaw_decode_table() -> np.ndarray:
+    ulaw = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = (((ulaw & 0x0F) << 3) + ULAW_BIAS) << ((ulaw & 0x70) >> 4)
+    return np.where(ulaw & 0x80, ULAW_BIAS - magnitude, magnitude - ULAW_BIAS).astype(PCM_DTYPE)
+
+
+def _build_ulaw_encode_table() -> np.ndarray:
+    # indexed by every 16-bit sample reinterpreted as unsigned, so encoding is a single lookup
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment = np.searchsorted(ULAW_SEGMENT_ENDS, magnitude)
+    ulaw = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return (np.where(segment >= 8, 0x7F, ulaw) ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE_TABLE = _build_ulaw_decode_table()
+ULAW_ENCODE_TABLE = _build_ulaw_encode_table()
+
+
+def pcm_to_array(pcm: AudioBytes) -> np.ndarray:
+    """A read-only int16 view of the samples, without copying them."""
+    return np.frombuffer(pcm, dtype=PCM_DTYPE)
+
+
+def _to_pcm_bytes(samples: np.ndarray) -> bytes:
+    return np.clip(np.rint(samples), INT16_MIN, INT16_MAX).astype(PCM_DTYPE).tobytes()
+
+
+def _check_sample_width(sample_width: int):
+    if sample_width not in (1, 2):
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+
+def lin2ulaw(pcm: AudioBytes, sample_width: int = 2) -> bytes:
+    """Same output as `audioop.lin2ulaw(pcm, sample_width)`."""
+    _check_sample_width(sample_width)
+    if sample_width == 1:
+        samples = np.frombuffer(pcm, dtype=np.int8).astype(np.int16) << 8
+    else:
+        samples = pcm_to_array(pcm)
+    return ULAW_ENCODE_TABLE.take(samples.view(np.uint16)).tobytes()
+
+
+def ulaw2lin(ulaw: AudioBytes, sample_width: int = 2) -> bytes:
+    """Same output as `audioop.ulaw2lin(ulaw, sample_width)`."""
+    _check_sample_width(sample_width)
+    samples = ULAW_DECODE_TABLE.take(np.frombuffer(ulaw, dtype=np.uint8))
+    if sample_width == 1:
+        return (samples >> 8).astype(np.int8).tobytes()
+    return samples.tobytes()
+
+
+def apply_gain(pcm: AudioBytes, gain: float) -> bytes:
+    """Scales the samples by `gain`, clipping instead of wrapping around."""
+    return _to_pcm_bytes(pcm_to_array(pcm) * np.float32(gain))
+
+
+def mix(*pcm_buffers: AudioBytes) -> bytes:
+    """Sums the buffers sample by sample, clipping the result. Shorter buffers are padded with
+    silence."""
+    arrays = [pcm_to_array(pcm) for pcm in pcm_buffers]
+    mixed = np.zeros(max((len(array) for array in arrays), default=0), dtype=np.int32)
+    for array in arrays:
+        mixed[: len(array)] += array
+    return _to_pcm_bytes(mixed)
+
+
+class Resampler:
+    """Polyphase windowed-sinc resampler that keeps its filter state between chunks, so audio
+    resampled chunk by chunk has no discontinuities at the chunk boundaries.
+
+    Output lags the input by `delay_seconds`; `flush` returns the remainder at the end of the
+    stream.
+    """
+
+    def __init__(
+        self,
+        input_sample_rate: int,
+        output_sample_rate: int,
+        half_width: int = DEFAULT_RESAMPLER_HALF_WIDTH,
+        kaiser_beta: float = DEFAULT_RESAMPLER_KAISER_BETA,
+        rolloff: float = DEFAULT_RESAMPLER_ROLLOFF,
+    ):
+        self.input_sample_rate = input_sample_rate
+        self.output_sample_rate = output_sample_rate
+        divisor = math.gcd(input_sample_rate, output_sample_rate)
+        # the input is conceptually upsampled by `up`, filtered and then decimated by `down`
+        self.up = output_sample_rate // divisor
+        self.down = input_sample_rate // divisor
+        filter_length = 2 * half_width * max(self.up, self.down) + 1
+        self.taps_per_phase = math.ceil(filter_length / self.up)
+        cutoff = rolloff / max(self.up, self.down)
+        center = (filter_length - 1) / 2
+        prototype = (
+            cutoff
+            * np.sinc(cutoff * (np.arange(filter_length) - center))
+            * np.kaiser(filter_length, kaiser_beta)
+            * self.up
+        )
+        prototype = np.pad(prototype, (0, self.taps_per_phase * self.up - filter_length))
+        # row p holds the taps applied to input samples j0, j0 - 1, ... for outputs at phase p,
+        # reversed so they line up with a forward window of the input
+        self.phases = prototype.reshape(self.taps_per_phase, self.up).T[:, ::-1].copy()
+        self.delay_seconds = center / (self.up * input_sample_rate)
+        self._history = np.zeros(self.taps_per_phase - 1)
+        # where the next output sample falls, in upsampled samples from the start of the next chunk
+        self._next_position = 0
+        self._partial_sample = b""
+
+    def process(self, pcm: AudioBytes) -> bytes:
+        if self.up == self.down:
+            return bytes(pcm)
+        if self._partial_sample or len(pcm) % 2:
+            data = self._partial_sample + bytes(pcm)
+            whole_length = len(data) - len(data) % 2
+            pcm, self._partial_sample = data[:whole_length], data[whole_length:]
+        samples = pcm_to_array(pcm)
+        if len(samples) == 0:
+            return b""
+        buffer = np.concatenate((self._history, samples))
+        num_outputs = max(-(-(len(samples) * self.up - self._next_position) // self.down), 0)
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.taps_per_phase)
+        output = np.empty(num_outputs)
+        # outputs `up` apart share a phase and their windows start `down` input samples apart, so
+        # each phase is a single matrix-vector product over a strided view of the input
+        for first_output in range(min(self.up, num_outputs)):
+            position = self._next_position + self.down * first_output
+            phase_windows = windows[position // self.up :: self.down]
+            phase_outputs = output[first_output :: self.up]
+            phase_outputs[:] = phase_windows[: len(phase_outputs)] @ self.phases[position % self.up]
+        self._next_position += num_outputs * self.down - len(samples) * self.up
+        self._history = buffer[len(buffer) - len(self._history) :].copy()
+        return _to_pcm_bytes(output)
+
+    def flush(self) -> bytes:
+        """Returns the output still held back by the filter delay, and resets the state."""
+        if self.up == self.down:
+            return b""
+        tail = self.process(bytes(2 * self.taps_per_phase))
+        tail_length = 2 * math.ceil(self.delay_seconds * self.output_sample_rate)
+        self._history[:] = 0
+        self._next_position = 0
+        self._partial_sample = b""
+        return tail[:tail_length]
+
+
+def resample(pcm: AudioBytes, input_sample_rate: int, output_sample_rate: int) -> bytes:
+    """Resamples a complete utterance, compensating for the resampler's delay so the output
+    lines up with the input."""
+    if input_sample_rate == output_sample_rate:
+        return bytes(pcm)
+    resampler = Resampler(input_sample_rate, output_sample_rate)
+    output = resampler.process(pcm) + resampler.flush()
+    delay_samples = round(resampler.delay_seconds * output_sample_rate)
+    num_samples = math.ceil(len(pcm) // 2 * output_sample_rate / input_sample_rate)
+    return output[2 * delay_samples : 2 * (delay_samples + num_samples)]
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+from vocode import getenv
+from vocode.streaming.utils.ring_buffer import SampleRingBuffer
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_MAX_BACKLOG_FRAMES = 64
+
+
+class AudioPreprocessor:
+    """Processes the caller's audio, e.g. suppresses noise, before it reaches the transcriber.
+
+    `process` is handed frames of exactly `frame_length` 16-bit samples, in order, and runs on a
+    worker thread, so it may block. It must return the same number of samples.
+    """
+
+    frame_length: int
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def delete(self):
+        pass
+
+
+class PassthroughAudioPreprocessor(AudioPreprocessor):
+    """Returns every frame as it is, for tests and to measure the overhead of the stage."""
+
+    def __init__(self, frame_length: int = 256):
+        self.frame_length = frame_length
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        return frame
+
+
+class KoalaAudioPreprocessor(AudioPreprocessor):
+    """Picovoice Koala noise suppression, on 16 kHz audio."""
+
+    def __init__(self, access_key: Optional[str] = None):
+        import pvkoala
+
+        self.koala = pvkoala.create(access_key=access_key or os.environ["KOALA_ACCESS_KEY"])
+        self.frame_length = self.koala.frame_length
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        return np.array(self.koala.process(frame), dtype=np.int16)
+
+    def delete(self):
+        self.koala.delete()
+
+
+class AudioPreprocessingExecutor(Singleton):
+    """Process-wide thread pool that runs the audio preprocessors of every conversation, so the
+    number of threads stays bounded however many calls are in progress.
+
+    Set VOCODE_AUDIO_PREPROCESSING_MAX_WORKERS to change the size of the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(
+            getenv("VOCODE_AUDIO_PREPROCESSING_MAX_WORKERS", os.cpu_count() or 1)
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="vocode-audio-preprocessing"
+        )
+
+    def submit(self, func: Callable[[], None]) -> Future:
+        return self.executor.submit(func)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+
+@dataclass
+class AudioPreprocessingStats:
+    frames_processed: int = 0
+    # frames that were dropped, oldest first, because the backlog was full
+    frames_dropped: int = 0
+    # frames passed on unprocessed because the preprocessor raised
+    frames_failed: int = 0
+    max_backlog_frames: int = 0
+    processing_seconds: float = 0.0
+    max_processing_seconds: float = 0.0
+
+    @property
+    def average_processing_seconds(self) -> float:
+        return self.processing_seconds / self.frames_processed if self.frames_processed else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**asdict(self), "average_processing_seconds": self.average_processing_seconds}
+
+
+class AudioPreprocessingWorker:
+    """Runs an AudioPreprocessor off the event loop, between the audio a conversation receives
+    and its transcriber.
+
+    Incoming audio is written to a ring buffer holding at most `max_backlog_frames` frames; when
+    the preprocessor falls that far behind, the oldest frames are dropped rather than delaying
+    the transcript further. While there are whole frames buffered, one job at a time on the
+    shared AudioPreprocessingExecutor reads them, processes them in order and hands the results
+    to `output` on the event loop.
+    """
+
+    def __init__(
+        self,
+        audio_preprocessor: AudioPreprocessor,
+        output: Callable[[bytes], None],
+        max_backlog_frames: int = DEFAULT_MAX_BACKLOG_FRAMES,
+    ):
+        self.audio_preprocessor = audio_preprocessor
+        self.output = output
+        self.frame_length = audio_preprocessor.frame_length
+        self.ring_buffer = SampleRingBuffer(self.frame_length * max_backlog_frames)
+        self.stats = AudioPreprocessingStats()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._job: Optional[Future] = None
+        self._draining = False
+        self._terminated = False
+        # 16-bit samples can be split across chunks
+        self._odd_byte = b""
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+
+    def consume_nonblocking(self, chunk: bytes):
+        if self._terminated:
+            return
+        if self._odd_byte:
+            chunk = self._odd_byte + chunk
+            self._odd_byte = b""
+        if len(chunk) % 2:
+            chunk, self._odd_byte = chunk[:-1], chunk[-1:]
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        with self._lock:
+            overflow = len(self.ring_buffer) + len(samples) - self.ring_buffer.capacity
+            if overflow > 0:
+                # drop whole frames, so the frames still to come keep their boundaries
+                dropped_frames = -(-overflow // self.frame_length)
+                self.ring_buffer.discard(dropped_frames * self.frame_length)
+                self.stats.frames_dropped += dropped_frames
+            self.ring_buffer.write(samples)
+            backlog_frames = len(self.ring_buffer) // self.frame_length
+            self.stats.max_backlog_frames = max(self.stats.max_backlog_frames, backlog_frames)
+            if self._draining or not backlog_frames:
+                return
+            self._draining = True
+        self._job = AudioPreprocessingExecutor().submit(self._drain)
+
+    def _drain(self):
+        """Runs on the executor, until the buffer no longer holds a whole frame."""
+        assert self._loop is not None, "start() must be called first"
+        while True:
+            with self._lock:
+                if self._terminated or len(self.ring_buffer) < self.frame_length:
+                    self._draining = False
+                    return
+                frame = self.ring_buffer.read(self.frame_length)
+            start = time.perf_counter()
+            try:
+                processed = self.audio_preprocessor.process(frame)
+            except Exception:
+                if not self.stats.frames_failed:
+                    logger.exception("Audio preprocessor failed, passing audio on unprocessed")
+                self.stats.frames_failed += 1
+                processed = frame
+            elapsed = time.perf_counter() - start
+            self.stats.frames_processed += 1
+            self.stats.processing_seconds += elapsed
+            self.stats.max_processing_seconds = max(self.stats.max_processing_seconds, elapsed)
+            self._loop.call_soon_threadsafe(self._output, processed.tobytes())
+
+    def _output(self, chunk: bytes):
+        if not self._terminated:
+            self.output(chunk)
+
+    async def terminate(self):
+        with self._lock:
+            self._terminated = True
+        if self._job is not None:
+            await asyncio.wrap_future(self._job)
+        self.audio_preprocessor.delete()
+        logger.info(f"Audio preprocessing stats: {self.stats.to_dict()}")
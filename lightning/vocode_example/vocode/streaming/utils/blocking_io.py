@@ -0,0 +1,32 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from vocode import getenv
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_BLOCKING_IO_MAX_WORKERS = 32
+
+T = TypeVar("T")
+
+
+class BlockingIOExecutor(Singleton):
+    """Process-wide thread pool for blocking SDK calls (Azure, Polly, Google...), so that the
+    number of threads stays bounded no matter how many conversations run in the process.
+
+    Set VOCODE_BLOCKING_IO_MAX_WORKERS to change the size of the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(
+            getenv("VOCODE_BLOCKING_IO_MAX_WORKERS", DEFAULT_BLOCKING_IO_MAX_WORKERS)
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="vocode-blocking-io"
+        )
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
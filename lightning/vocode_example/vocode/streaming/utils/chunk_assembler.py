@@ -0,0 +1,78 @@
+from typing import List, Optional
+
+from vocode.streaming.models.audio import AudioBuffer, AudioEncoding
+from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE, PCM_SILENCE_BYTE
+
+
+class ChunkAssembler:
+    """Cuts audio that arrives in pieces of any size into chunks of exactly `chunk_size` bytes.
+
+    Chunks that lie within a piece are handed out as read-only views of it, without copying. Only
+    a chunk that straddles pieces is copied together, into a buffer preallocated for it, so the
+    cost of a piece depends on its own size and never on how much audio came before it. Pieces
+    must not be modified after they are fed, since the chunks may still be views of them.
+    """
+
+    def __init__(self, chunk_size: int, silence_byte: bytes = PCM_SILENCE_BYTE):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.silence_byte = silence_byte
+        # the start of the next chunk, when the last piece ended partway through one
+        self._partial = memoryview(bytearray(chunk_size))
+        self._partial_length = 0
+
+    @classmethod
+    def for_encoding(cls, chunk_size: int, audio_encoding: AudioEncoding) -> "ChunkAssembler":
+        return cls(
+            chunk_size,
+            MULAW_SILENCE_BYTE if audio_encoding == AudioEncoding.MULAW else PCM_SILENCE_BYTE,
+        )
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._partial_length
+
+    def feed(self, data: AudioBuffer) -> List[memoryview]:
+        """Returns the chunks completed by `data`, in order."""
+        view = memoryview(data)
+        if not view.readonly or view.format != "B":
+            view = view.toreadonly().cast("B")
+        chunk_size = self.chunk_size
+        length = len(view)
+        chunks = []
+        offset = 0
+        if self._partial_length:
+            offset = min(chunk_size - self._partial_length, length)
+            self._partial[self._partial_length : self._partial_length + offset] = view[:offset]
+            self._partial_length += offset
+            if self._partial_length == chunk_size:
+                chunks.append(self._take_partial())
+        while length - offset >= chunk_size:
+            chunks.append(view[offset : offset + chunk_size])
+            offset += chunk_size
+        if offset < length:
+            self._partial[: length - offset] = view[offset:]
+            self._partial_length = length - offset
+        return chunks
+
+    def flush(self, pad: bool = True) -> Optional[memoryview]:
+        """The audio left at the end of a stream, padded with silence to a full chunk unless
+        `pad` is False, or None if the stream ended on a chunk boundary."""
+        if not self._partial_length:
+            return None
+        if not pad:
+            tail = self._partial.toreadonly()[: self._partial_length]
+            self._partial = memoryview(bytearray(self.chunk_size))
+            self._partial_length = 0
+            return tail
+        padding = self.chunk_size - self._partial_length
+        self._partial[self._partial_length :] = self.silence_byte * padding
+        return self._take_partial()
+
+    def _take_partial(self) -> memoryview:
+        chunk = self._partial.toreadonly()
+        # the chunk now belongs to whoever it was handed to, the next one needs a new buffer
+        self._partial = memoryview(bytearray(self.chunk_size))
+        self._partial_length = 0
+        return chunk
@@ -1,10 +1,10 @@
-import audioop
 from enum import Enum
 from typing import Dict, Tuple
 
 import numpy as np
 
 from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.utils.audio_dsp import lin2ulaw
 from vocode.streaming.utils.singleton import Singleton
 
 DEFAULT_DTMF_TONE_LENGTH_SECONDS = 0.3
@@ -65,7 +65,7 @@ class DTMFToneGenerator(Singleton):
         pcm = (tone * MAX_INT).astype(np.int16).tobytes()
         pcm += b"\0" * int(silence_seconds * sampling_rate * 2)
         if audio_encoding == AudioEncoding.MULAW:
-            output = audioop.lin2ulaw(pcm, 2)
+            output = lin2ulaw(pcm)
         else:
             output = pcm
         self.tone_cache[(keypad_entry, sampling_rate, audio_encoding)] = output
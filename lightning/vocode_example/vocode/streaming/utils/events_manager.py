@@ -1,24 +1,200 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+import math
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Union
 
 from loguru import logger
 
 from vocode.streaming.models.events import Event, EventType
 
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 10000
+
+
+class EventsOverflowPolicy(str, Enum):
+    # keep the events already queued and drop the one being published
+    DROP_NEWEST = "drop_newest"
+    # make room by dropping the oldest queued event, so sinks see the most recent state
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass
+class EventsBatchingConfig:
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    # a batch is flushed once it is full, or this long after its first event was published
+    flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
+    overflow_policy: EventsOverflowPolicy = EventsOverflowPolicy.DROP_OLDEST
+
+
+@dataclass
+class EventsManagerStats:
+    published: int = 0
+    # counted once for every sink that misses the event
+    dropped: int = 0
+    max_queue_depth: int = 0
+    # batches handled, and how long handling them took, counted once per sink
+    flushed_batches: int = 0
+    flushed_events: int = 0
+    flush_seconds: float = 0.0
+    max_flush_seconds: float = 0.0
+    sink_errors: int = 0
+
+    @property
+    def average_flush_seconds(self) -> float:
+        return self.flush_seconds / self.flushed_batches if self.flushed_batches else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**asdict(self), "average_flush_seconds": self.average_flush_seconds}
+
+
+class EventsSink:
+    """Receives batches of events from a batching EventsManager, in the order they were
+    published. Each sink has its own queue of batches and its own task, so a slow webhook does
+    not hold up Redis."""
+
+    async def handle_events(self, events: List[Event]):
+        raise NotImplementedError
+
+
+class _SinkWorker:
+    """Hands the batches queued for one sink to it in order, at the sink's own pace."""
+
+    def __init__(
+        self,
+        name: str,
+        handle_events: Callable[[List[Event]], Awaitable[None]],
+        events_manager: "EventsManager",
+        max_batches: int,
+    ):
+        self.name = name
+        self.handle_events = handle_events
+        self.events_manager = events_manager
+        self.max_batches = max_batches
+        self.batches: Deque[List[Event]] = deque()
+        self.batch_available = asyncio.Event()
+        # taken off `batches` and not handled yet, kept so that a cancelled delivery is retried
+        self.batch_in_flight: Optional[List[Event]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def put(self, batch: List[Event], overflow_policy: EventsOverflowPolicy) -> int:
+        """Queues a batch, and returns the number of events dropped to stay within bounds."""
+        dropped = 0
+        if len(self.batches) >= self.max_batches:
+            if overflow_policy == EventsOverflowPolicy.DROP_NEWEST:
+                return len(batch)
+            dropped = len(self.batches.popleft())
+        self.batches.append(batch)
+        self.batch_available.set()
+        return dropped
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            if self.batch_in_flight is None:
+                if not self.batches:
+                    if self.closed:
+                        return
+                    self.batch_available.clear()
+                    await self.batch_available.wait()
+                    continue
+                self.batch_in_flight = self.batches.popleft()
+            await self.events_manager._deliver_batch(
+                self.name, self.handle_events, self.batch_in_flight
+            )
+            self.batch_in_flight = None
+
+    async def close(self):
+        """Waits until every queued batch is handled, then stops the task."""
+        self.closed = True
+        self.batch_available.set()
+        self.start()
+        assert self.task is not None
+        await self.task
+
 
 class EventsManager:
-    def __init__(self, subscriptions: List[EventType] = []):
-        self.queue: asyncio.Queue[Event] = asyncio.Queue()
+    """Queues the events it is subscribed to and hands them to `handle_event` one at a time.
+
+    With a `batching_config`, the queue is bounded and events are sent in batches instead, to
+    every sink, or to `handle_events` if there are none. Every sink gets the batches in order,
+    from its own bounded queue and task, so one slow sink does not delay the others.
+    """
+
+    def __init__(
+        self,
+        subscriptions: List[EventType] = [],
+        batching_config: Optional[EventsBatchingConfig] = None,
+        sinks: List[EventsSink] = [],
+    ):
+        self.batching_config = batching_config
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(
+            maxsize=batching_config.max_queue_size if batching_config else 0
+        )
         self.subscriptions = set(subscriptions)
+        self.sinks = list(sinks)
+        self.stats = EventsManagerStats()
+        # taken off the queue, waiting for the batch to fill up
+        self.pending_events: List[Event] = []
+        self.sink_workers: List[_SinkWorker] = []
+        if batching_config is not None:
+            max_batches = math.ceil(batching_config.max_queue_size / batching_config.max_batch_size)
+            self.sink_workers = [
+                _SinkWorker(type(sink).__name__, sink.handle_events, self, max_batches)
+                for sink in self.sinks
+            ] or [
+                _SinkWorker(
+                    type(self).__name__,
+                    lambda events: self.handle_events(events),
+                    self,
+                    max_batches,
+                )
+            ]
         self.active = False
 
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize() + len(self.pending_events)
+
+    def is_subscribed(self, event_type: EventType) -> bool:
+        """Lets publishers skip building events that would be dropped anyway."""
+        return event_type in self.subscriptions
+
     def publish_event(self, event: Event):
-        if event and event.type in self.subscriptions:
-            self.queue.put_nowait(event)
+        if not event or event.type not in self.subscriptions:
+            return
+        if self.queue.full():
+            assert self.batching_config is not None
+            self.stats.dropped += 1
+            if self.batching_config.overflow_policy == EventsOverflowPolicy.DROP_NEWEST:
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+        self.stats.published += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue.qsize())
+
+    async def publish_event_with_backpressure(self, event: Event):
+        """Waits for room in the queue instead of dropping events, for producers that can."""
+        if not event or event.type not in self.subscriptions:
+            return
+        await self.queue.put(event)
+        self.stats.published += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue.qsize())
 
     async def start(self):
+        if self.batching_config is not None:
+            await self._run_batching_loop(self.batching_config)
+            return
         self.active = True
         while self.active:
             try:
@@ -29,11 +205,71 @@ class EventsManager:
                 break
             await self.handle_event(event)
 
+    async def _run_batching_loop(self, batching_config: EventsBatchingConfig):
+        self.active = True
+        for sink_worker in self.sink_workers:
+            sink_worker.start()
+        while self.active:
+            try:
+                self.pending_events.append(await self.queue.get())
+                deadline = time.monotonic() + batching_config.flush_interval_seconds
+                while len(self.pending_events) < batching_config.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        self.pending_events.append(
+                            await asyncio.wait_for(self.queue.get(), timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                break
+            batch, self.pending_events = self.pending_events, []
+            self._dispatch_batch(batch)
+
+    def _dispatch_batch(self, events: List[Event]):
+        assert self.batching_config is not None
+        for sink_worker in self.sink_workers:
+            self.stats.dropped += sink_worker.put(events, self.batching_config.overflow_policy)
+
+    async def _deliver_batch(
+        self,
+        name: str,
+        handle_events: Callable[[List[Event]], Awaitable[None]],
+        events: List[Event],
+    ):
+        start = time.monotonic()
+        try:
+            await handle_events(events)
+        except Exception:
+            self.stats.sink_errors += 1
+            logger.exception(f"Events sink {name} failed")
+        flush_seconds = time.monotonic() - start
+        self.stats.flushed_batches += 1
+        self.stats.flushed_events += len(events)
+        self.stats.flush_seconds += flush_seconds
+        self.stats.max_flush_seconds = max(self.stats.max_flush_seconds, flush_seconds)
+
     async def handle_event(self, event: Event):
         pass
 
+    async def handle_events(self, events: List[Event]):
+        """Handles a batch when there are no sinks, by default one event at a time."""
+        for event in events:
+            await self.handle_event(event)
+
     async def flush(self):
         self.active = False
+        if self.batching_config is not None:
+            events, self.pending_events = self.pending_events, []
+            while not self.queue.empty():
+                events.append(self.queue.get_nowait())
+            max_batch_size = self.batching_config.max_batch_size
+            for i in range(0, len(events), max_batch_size):
+                self._dispatch_batch(events[i : i + max_batch_size])
+            await asyncio.gather(*(sink_worker.close() for sink_worker in self.sink_workers))
+            return
         while True:
             try:
                 event = self.queue.get_nowait()
@@ -1,8 +1,33 @@
 import io
 import wave
+from typing import Generator, Optional, Tuple, Union
 
 import miniaudio
 
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.utils.audio_dsp import lin2ulaw
+
+# MPEG audio frame header tables for Layer III, indexed by the header bit fields
+# see http://www.mp3-tech.org/programmer/frame_header.html
+MPEG_VERSION_1 = 3
+MPEG_VERSION_RESERVED = 1
+LAYER_III = 1
+MP3_HEADER_SIZE = 4
+ID3V2_HEADER_SIZE = 10
+LAYER_III_BITRATES_KBPS = {
+    MPEG_VERSION_1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    # MPEG 2 and MPEG 2.5 share the same bitrate table
+    0: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+SAMPLE_RATES = {
+    MPEG_VERSION_1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+# miniaudio's stream generator cannot return more than this many frames per read
+MAX_FRAMES_PER_READ = 16384
+
 
 # sampling_rate is the rate of the input, not expected output
 def decode_mp3(mp3_bytes: bytes) -> io.BytesIO:
@@ -19,3 +44,178 @@ def decode_mp3(mp3_bytes: bytes) -> io.BytesIO:
         wave_obj.writeframes(wav_chunk.samples)
     output_bytes_io.seek(0)
     return output_bytes_io
+
+
+def parse_mp3_frame_header(header: Union[bytes, bytearray]) -> Optional[Tuple[int, int, int]]:
+    """Parses a 4 byte MPEG Layer III frame header.
+
+    Returns (frame length in bytes, pcm samples per frame, sample rate) or None if the bytes
+    are not a valid Layer III header.
+    """
+    if len(header) < MP3_HEADER_SIZE or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3
+    layer = (header[1] >> 1) & 0x3
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    if (
+        version == MPEG_VERSION_RESERVED
+        or layer != LAYER_III
+        or bitrate_index in (0, 15)  # free format and invalid bitrates are not supported
+        or sample_rate_index == 3
+    ):
+        return None
+    padding = (header[2] >> 1) & 0x1
+    bitrate = LAYER_III_BITRATES_KBPS[MPEG_VERSION_1 if version == MPEG_VERSION_1 else 0][
+        bitrate_index
+    ]
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+    if version == MPEG_VERSION_1:
+        return 144000 * bitrate // sample_rate + padding, 1152, sample_rate
+    return 72000 * bitrate // sample_rate + padding, 576, sample_rate
+
+
+class _Mp3ChunkSource(miniaudio.StreamableSource):
+    def __init__(self) -> None:
+        self.pending = bytearray()
+
+    def read(self, num_bytes: int) -> bytes:
+        # returning nothing before the stream has ended is safe as long as the decoder is only
+        # asked for audio that the frames it has already buffered can produce
+        data = bytes(self.pending[:num_bytes])
+        del self.pending[:num_bytes]
+        return data
+
+
+class StreamingMp3Decoder:
+    """Incrementally decodes an MP3 byte stream into mono PCM.
+
+    Incoming bytes are scanned for Layer III frame boundaries: only complete frames are handed
+    to the decoder, and it is only asked for the audio that those frames can produce, so every
+    call to `feed` does work proportional to the new bytes. The decoder and resampler state
+    are carried across calls, so there are no artifacts at chunk boundaries.
+
+    The audio of the last `lookahead_frames` complete frames is held back until more data
+    arrives (or `flush` is called): the decoder and resampler read slightly ahead of the audio
+    they output, and running out of input before the end of the stream would end it early.
+    """
+
+    def __init__(
+        self,
+        output_sample_rate: int,
+        output_encoding: AudioEncoding = AudioEncoding.LINEAR16,
+        lookahead_frames: int = 2,
+    ):
+        self.output_sample_rate = output_sample_rate
+        self.output_encoding = output_encoding
+        self.lookahead_frames = lookahead_frames
+        self._source = _Mp3ChunkSource()
+        self._stream: Optional[Generator] = None
+        # bytes that do not make up a complete frame yet
+        self._unparsed = bytearray()
+        self._id3_checked = False
+        self._bytes_to_skip = 0
+        self._input_sample_rate: Optional[int] = None
+        self._samples_per_frame = 0
+        self._num_frames = 0
+        self._output_frames = 0
+
+    def feed(self, mp3_chunk: bytes) -> bytes:
+        self._unparsed.extend(mp3_chunk)
+        self._scan_frames()
+        if self._num_frames <= self.lookahead_frames or self._input_sample_rate is None:
+            return b""
+        if self._stream is None:
+            self._stream = self._open_stream()
+        decodable_input_samples = (
+            self._num_frames - self.lookahead_frames
+        ) * self._samples_per_frame
+        decodable_output_frames = (
+            decodable_input_samples * self.output_sample_rate // self._input_sample_rate
+        )
+        return self._read(decodable_output_frames - self._output_frames)
+
+    def flush(self) -> bytes:
+        self._source.pending.extend(self._unparsed)
+        self._unparsed.clear()
+        if self._stream is None:
+            if not self._source.pending:
+                return b""
+            self._stream = self._open_stream()
+        output = bytearray()
+        for samples in self._stream:
+            output.extend(self._encode(samples.tobytes()))
+        self._stream = None
+        return bytes(output)
+
+    def _open_stream(self) -> Generator:
+        return miniaudio.stream_any(
+            self._source,
+            source_format=miniaudio.FileFormat.MP3,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=1,
+            sample_rate=self.output_sample_rate,
+        )
+
+    def _read(self, num_frames: int) -> bytes:
+        assert self._stream is not None
+        output = bytearray()
+        while num_frames > 0:
+            try:
+                samples = self._stream.send(min(num_frames, MAX_FRAMES_PER_READ))
+            except StopIteration:
+                raise miniaudio.DecodeError(
+                    "mp3 stream ended before all of its frames were decoded"
+                )
+            if not samples:
+                break
+            num_frames -= len(samples)
+            self._output_frames += len(samples)
+            output.extend(self._encode(samples.tobytes()))
+        return bytes(output)
+
+    def _encode(self, pcm: bytes) -> bytes:
+        if self.output_encoding == AudioEncoding.MULAW:
+            return lin2ulaw(pcm)
+        return pcm
+
+    def _scan_frames(self):
+        offset = self._bytes_to_skip
+        if not self._id3_checked:
+            if len(self._unparsed) < ID3V2_HEADER_SIZE:
+                return
+            if self._unparsed[:3] == b"ID3":
+                tag_size = 0
+                for byte in self._unparsed[6:10]:
+                    tag_size = (tag_size << 7) | (byte & 0x7F)
+                offset = ID3V2_HEADER_SIZE + tag_size
+                if self._unparsed[5] & 0x10:  # footer present
+                    offset += ID3V2_HEADER_SIZE
+            self._id3_checked = True
+        if offset > len(self._unparsed):
+            self._bytes_to_skip = offset - len(self._unparsed)
+            self._source.pending.extend(self._unparsed)
+            self._unparsed.clear()
+            return
+        self._bytes_to_skip = 0
+        # everything before this offset is either a complete frame or cannot start one
+        scanned = offset
+        while offset + MP3_HEADER_SIZE <= len(self._unparsed):
+            header = parse_mp3_frame_header(self._unparsed[offset : offset + MP3_HEADER_SIZE])
+            if header is None or (
+                self._input_sample_rate is not None and header[2] != self._input_sample_rate
+            ):
+                # not a frame boundary, resync on the next byte
+                offset += 1
+                scanned = offset
+                continue
+            frame_length, samples_per_frame, sample_rate = header
+            if offset + frame_length > len(self._unparsed):
+                break
+            self._input_sample_rate = sample_rate
+            self._samples_per_frame = samples_per_frame
+            self._num_frames += 1
+            offset += frame_length
+            scanned = offset
+        self._source.pending.extend(self._unparsed[:scanned])
+        del self._unparsed[:scanned]
@@ -1,5 +1,5 @@
 import os
-from typing import Optional, TypeVar
+from typing import Any, Dict, Optional, Tuple, TypeVar
 
 from loguru import logger
 from redis.asyncio import Redis
@@ -10,37 +10,69 @@ from redis.retry import Retry
 from vocode.streaming.utils.singleton import Singleton
 
 WorkerInputType = TypeVar("WorkerInputType")
+
+DEFAULT_REDIS_MAX_CONNECTIONS = 100
+
+
+class RedisClientRegistry(Singleton):
+    """Process-wide Redis clients, one per response type, so the config manager, the audio
+    cache and the message queues share their connection pools instead of opening their own.
+
+    Set REDIS_MAX_CONNECTIONS to bound the size of each pool.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None):
+        self.max_connections = max_connections or int(
+            os.environ.get("REDIS_MAX_CONNECTIONS", DEFAULT_REDIS_MAX_CONNECTIONS)
+        )
+        self.clients: Dict[Tuple[bool, int], Redis] = {}
+
+    def get_client(self, decode_responses: bool, retries: int = 1) -> Redis:
+        key = (decode_responses, retries)
+        client = self.clients.get(key)
+        if client is None:
+            client = self.clients[key] = self._create_client(decode_responses, retries)
+        return client
+
+    def _create_client(self, decode_responses: bool, retries: int) -> Redis:
+        connection_kwargs: Dict[str, Any] = dict(
+            host=os.environ.get("REDISHOST", "localhost"),
+            port=int(os.environ.get("REDISPORT", 6379)),
+            username=os.environ.get("REDISUSER", None),
+            password=os.environ.get("REDISPASSWORD", None),
+            db=0,
+            ssl=bool(os.environ.get("REDISSSL", False)),
+            ssl_cert_reqs="none",
+            max_connections=self.max_connections,
+        )
+        if not decode_responses:
+            return Redis(**connection_kwargs)
+        backoff = ExponentialBackoff() if retries > 1 else NoBackoff()
+        return Redis(  # type: ignore
+            **connection_kwargs,
+            decode_responses=True,
+            retry=Retry(backoff, retries),
+            retry_on_error=[ConnectionError, TimeoutError],
+            health_check_interval=30,
+        )
+
+    async def close(self):
+        clients = list(self.clients.values())
+        self.clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
 # Two separate factories for Redis clients so that the
 # typing gets picked up properly
 
 
 def initialize_redis(retries: int = 1):
-    backoff = ExponentialBackoff() if retries > 1 else NoBackoff()
-    retry = Retry(backoff, retries)
-    return Redis(  # type: ignore
-        host=os.environ.get("REDISHOST", "localhost"),
-        port=int(os.environ.get("REDISPORT", 6379)),
-        username=os.environ.get("REDISUSER", None),
-        password=os.environ.get("REDISPASSWORD", None),
-        decode_responses=True,
-        retry=retry,
-        ssl=bool(os.environ.get("REDISSSL", False)),
-        ssl_cert_reqs="none",
-        retry_on_error=[ConnectionError, TimeoutError],
-        health_check_interval=30,
-    )
+    return RedisClientRegistry().get_client(decode_responses=True, retries=retries)
 
 
 def initialize_redis_bytes():
-    return Redis(
-        host=os.environ.get("REDISHOST", "localhost"),
-        port=int(os.environ.get("REDISPORT", 6379)),
-        username=os.environ.get("REDISUSER", None),
-        password=os.environ.get("REDISPASSWORD", None),
-        db=0,
-        ssl=bool(os.environ.get("REDISSSL", False)),
-        ssl_cert_reqs="none",
-    )
+    return RedisClientRegistry().get_client(decode_responses=False)
 
 
 class RedisGenericMessageQueue(Singleton):
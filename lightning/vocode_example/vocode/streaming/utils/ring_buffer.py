@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+class SampleRingBuffer:
+    """Fixed-capacity FIFO of audio samples, preallocated once.
+
+    Writing past the capacity overwrites the oldest samples. Reads hand out at most two views
+    into the storage (the contents may wrap around its end), so callers can convert or copy the
+    samples straight into their own buffers.
+    """
+
+    def __init__(self, capacity: int, dtype: np.dtype = np.dtype(np.int16)):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.storage = np.zeros(capacity, dtype=dtype)
+        # index of the oldest sample
+        self.start = 0
+        self.length = 0
+        self.overwritten_samples = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def free_space(self) -> int:
+        return self.capacity - self.length
+
+    def write(self, samples: np.ndarray):
+        if len(samples) > self.capacity:
+            self.overwritten_samples += len(samples) - self.capacity
+            samples = samples[-self.capacity :]
+        overflow = max(len(samples) - self.free_space, 0)
+        if overflow:
+            self.discard(overflow)
+            self.overwritten_samples += overflow
+        end = (self.start + self.length) % self.capacity
+        first = min(len(samples), self.capacity - end)
+        self.storage[end : end + first] = samples[:first]
+        self.storage[: len(samples) - first] = samples[first:]
+        self.length += len(samples)
+
+    def views(self, num_samples: Optional[int] = None, from_end: bool = False) -> List[np.ndarray]:
+        """The oldest (or, with `from_end`, the newest) `num_samples` samples, in order."""
+        num_samples = self.length if num_samples is None else min(num_samples, self.length)
+        offset = self.start + (self.length - num_samples if from_end else 0)
+        begin = offset % self.capacity
+        first = min(num_samples, self.capacity - begin)
+        views = [self.storage[begin : begin + first]]
+        if num_samples > first:
+            views.append(self.storage[: num_samples - first])
+        return views
+
+    def read(self, num_samples: int) -> np.ndarray:
+        """Removes and returns a copy of the oldest `num_samples` samples."""
+        views = self.views(num_samples)
+        samples = np.concatenate(views) if len(views) > 1 else views[0].copy()
+        self.discard(len(samples))
+        return samples
+
+    def discard(self, num_samples: int):
+        """Drops the oldest `num_samples` samples."""
+        if num_samples < 0:
+            raise ValueError("num_samples must not be negative")
+        num_samples = min(num_samples, self.length)
+        self.start = (self.start + num_samples) % self.capacity
+        self.length -= num_samples
+
+    def clear(self):
+        self.start = 0
+        self.length = 0
@@ -0,0 +1,76 @@
+from bisect import bisect_left
+from typing import List, Optional
+
+
+class UtteranceTimeline:
+    """The text of a synthesized utterance, indexed by when each piece of it finishes playing.
+
+    Pieces (words, or the characters of an alignment frame) are added in the order they are spoken
+    as the synthesizer's alignment arrives. The end times and the length of the text through each
+    piece are kept in sorted lists, so `text_up_to` finds the cutoff for a point in the audio with
+    a binary search instead of rescanning the utterance for every played chunk.
+    """
+
+    def __init__(self, separator: str = ""):
+        self.separator = separator
+        self._end_times: List[float] = []
+        # the length of the text through each piece
+        self._char_offsets: List[int] = []
+        self._text = ""
+        # pieces not joined onto `_text` yet, which is only needed when the text is read
+        self._pending_parts: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._end_times)
+
+    @property
+    def end_time(self) -> float:
+        return self._end_times[-1] if self._end_times else 0.0
+
+    @property
+    def text(self) -> str:
+        if self._pending_parts:
+            self._text += "".join(self._pending_parts)
+            self._pending_parts = []
+        return self._text
+
+    def append(self, text: str, duration: float):
+        """Adds a piece that plays for `duration` seconds right after the previous one."""
+        self.add(text, self.end_time + duration)
+
+    def add(self, text: str, end_time: float):
+        """Adds a piece that finishes playing `end_time` seconds into the audio."""
+        char_offset = 0
+        if self._end_times:
+            char_offset = self._char_offsets[-1]
+            if self.separator:
+                self._pending_parts.append(self.separator)
+                char_offset += len(self.separator)
+            # keeps the end times sorted if the synthesizer's timestamps ever step back
+            end_time = max(end_time, self._end_times[-1])
+        self._pending_parts.append(text)
+        self._end_times.append(end_time)
+        self._char_offsets.append(char_offset + len(text))
+
+    def index_at(self, seconds: float) -> int:
+        """The index of the piece playing `seconds` into the audio, i.e. the first one that ends
+        at or after it, or of the last piece if they have all ended by then."""
+        if not self._end_times:
+            raise IndexError("the timeline is empty")
+        return min(bisect_left(self._end_times, seconds), len(self._end_times) - 1)
+
+    def end_time_at(self, index: int) -> float:
+        return self._end_times[index]
+
+    def text_through(self, index: int) -> str:
+        """The text of the pieces up to and including the one at `index`."""
+        return self.text[: self._char_offsets[index]]
+
+    def text_up_to(self, seconds: Optional[float]) -> str:
+        """The text up to and including the piece playing `seconds` into the audio, or all of it
+        if `seconds` is None."""
+        if not self._end_times:
+            return ""
+        if seconds is None:
+            return self.text
+        return self.text_through(self.index_at(seconds))
@@ -0,0 +1,168 @@
+import math
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Optional, Union
+
+import numpy as np
+
+from vocode.streaming.models.audio import AudioEncoding
+from vocode.streaming.telephony.constants import MULAW_SILENCE_BYTE, PCM_SILENCE_BYTE
+from vocode.streaming.utils.audio_dsp import ULAW_DECODE_TABLE
+
+DEFAULT_SPEECH_THRESHOLD_DBFS = -45.0
+# 16-bit full scale
+PCM_FULL_SCALE = 32768.0
+KEEPALIVE_CHUNK_SECONDS = 0.02
+
+
+def get_rms_dbfs(samples: np.ndarray) -> float:
+    if not len(samples):
+        return -math.inf
+    samples = samples.astype(np.float64)
+    rms = math.sqrt(np.dot(samples, samples) / len(samples))
+    return 20 * math.log10(rms / PCM_FULL_SCALE) if rms else -math.inf
+
+
+def get_zero_crossing_rate(samples: np.ndarray) -> float:
+    """The fraction of consecutive samples that change sign."""
+    if len(samples) < 2:
+        return 0.0
+    signs = np.signbit(samples)
+    return np.count_nonzero(signs[1:] != signs[:-1]) / (len(samples) - 1)
+
+
+class VoiceActivityDetector:
+    """Decides whether a frame of 16-bit samples contains speech."""
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        raise NotImplementedError
+
+
+class EnergyVoiceActivityDetector(VoiceActivityDetector):
+    """Flags a frame of 16-bit samples as speech when its RMS level is above a threshold.
+
+    Cheap enough to run on every chunk, but it cannot tell speech from other loud noise. With
+    `max_zero_crossing_rate`, loud frames that cross zero more often than voiced speech does,
+    like hiss and static, are not counted as speech either.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = DEFAULT_SPEECH_THRESHOLD_DBFS,
+        max_zero_crossing_rate: Optional[float] = None,
+    ):
+        self.threshold_dbfs = threshold_dbfs
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        # the threshold as a mean square, which saves a square root and a log on every frame
+        self.threshold_mean_square = (PCM_FULL_SCALE * 10 ** (threshold_dbfs / 20)) ** 2
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        if not len(samples):
+            return False
+        samples = samples.astype(np.float32)
+        if np.dot(samples, samples) <= self.threshold_mean_square * len(samples):
+            return False
+        return (
+            self.max_zero_crossing_rate is None
+            or get_zero_crossing_rate(samples) <= self.max_zero_crossing_rate
+        )
+
+
+@dataclass
+class VoiceActivityGateStats:
+    input_bytes: int = 0
+    output_bytes: int = 0
+    keepalives: int = 0
+
+    @property
+    def saved_fraction(self) -> float:
+        return 1 - self.output_bytes / self.input_bytes if self.input_bytes else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**asdict(self), "saved_fraction": self.saved_fraction}
+
+
+class VoiceActivityGate:
+    """Holds back the audio between utterances instead of streaming silence to a transcriber.
+
+    Audio passes until `hangover_seconds` after the last speech, so the transcriber's own
+    endpointing still hears the silence that ends an utterance. After that, only a short chunk
+    of silence is let through every `keepalive_interval_seconds`, which keeps the connection
+    (and senders that give up after a few seconds without audio) alive. The last
+    `pre_roll_seconds` of held back audio are sent ahead of the chunk in which speech is detected,
+    so the start of the first word is not cut off.
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int,
+        audio_encoding: AudioEncoding,
+        detector: Optional[VoiceActivityDetector] = None,
+        pre_roll_seconds: float = 0.3,
+        hangover_seconds: float = 2.0,
+        keepalive_interval_seconds: float = 1.0,
+    ):
+        if audio_encoding not in (AudioEncoding.LINEAR16, AudioEncoding.MULAW):
+            raise ValueError(f"Unsupported audio encoding {audio_encoding}")
+        self.audio_encoding = audio_encoding
+        self.bytes_per_second = sampling_rate * (
+            2 if audio_encoding == AudioEncoding.LINEAR16 else 1
+        )
+        self.detector = detector or EnergyVoiceActivityDetector()
+        self.pre_roll_seconds = pre_roll_seconds
+        self.hangover_seconds = hangover_seconds
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        keepalive_size = round(sampling_rate * KEEPALIVE_CHUNK_SECONDS)
+        self.keepalive_chunk = (
+            PCM_SILENCE_BYTE * 2 * keepalive_size
+            if audio_encoding == AudioEncoding.LINEAR16
+            else MULAW_SILENCE_BYTE * keepalive_size
+        )
+        self.stats = VoiceActivityGateStats()
+        self.is_open = False
+        self.silence_seconds = 0.0
+        self.seconds_since_keepalive = 0.0
+        self.pre_roll: Deque[bytes] = deque()
+        self.pre_roll_bytes = 0
+
+    def process(self, chunk: bytes) -> List[bytes]:
+        """Returns the audio to send on in place of `chunk`, which may be nothing."""
+        self.stats.input_bytes += len(chunk)
+        duration = len(chunk) / self.bytes_per_second
+        if self.audio_encoding == AudioEncoding.MULAW:
+            samples = ULAW_DECODE_TABLE.take(np.frombuffer(chunk, dtype=np.uint8))
+        else:
+            samples = np.frombuffer(chunk, dtype=np.int16, count=len(chunk) // 2)
+        is_speech = self.detector.is_speech(samples)
+
+        output: List[bytes] = []
+        if self.is_open:
+            self.silence_seconds = 0.0 if is_speech else self.silence_seconds + duration
+            if self.silence_seconds <= self.hangover_seconds:
+                output.append(chunk)
+            else:
+                self.is_open = False
+                self.seconds_since_keepalive = 0.0
+                self._hold_back(chunk)
+        elif is_speech:
+            self.is_open = True
+            self.silence_seconds = 0.0
+            output.append(b"".join(self.pre_roll) + chunk if self.pre_roll else chunk)
+            self.pre_roll.clear()
+            self.pre_roll_bytes = 0
+        else:
+            self._hold_back(chunk)
+            self.seconds_since_keepalive += duration
+            if self.seconds_since_keepalive >= self.keepalive_interval_seconds:
+                self.seconds_since_keepalive = 0.0
+                self.stats.keepalives += 1
+                output.append(self.keepalive_chunk)
+        self.stats.output_bytes += sum(len(piece) for piece in output)
+        return output
+
+    def _hold_back(self, chunk: bytes):
+        self.pre_roll.append(chunk)
+        self.pre_roll_bytes += len(chunk)
+        max_pre_roll_bytes = self.pre_roll_seconds * self.bytes_per_second
+        while self.pre_roll and self.pre_roll_bytes - len(self.pre_roll[0]) >= max_pre_roll_bytes:
+            self.pre_roll_bytes -= len(self.pre_roll.popleft())
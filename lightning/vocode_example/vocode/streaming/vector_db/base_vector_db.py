@@ -1,15 +1,19 @@
 import os
-from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
 import aiohttp
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 
 from vocode.streaming.models.agent import AZURE_OPENAI_DEFAULT_API_VERSION
+from vocode.streaming.utils.async_requester import AsyncRequestor
+from vocode.streaming.vector_db.embedding_cache import EmbeddingCache
 
 if TYPE_CHECKING:
     from langchain.docstore.document import Document
 
 DEFAULT_OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"
+# OpenAI accepts up to 2048 inputs per embeddings request
+DEFAULT_EMBEDDING_BATCH_SIZE = 512
 
 
 class VectorDB:
@@ -19,13 +23,8 @@ class VectorDB:
         self,
         aiohttp_session: Optional[aiohttp.ClientSession] = None,
     ):
-        if aiohttp_session:
-            # the caller is responsible for closing the session
-            self.aiohttp_session = aiohttp_session
-            self.should_close_session_on_tear_down = False
-        else:
-            self.aiohttp_session = aiohttp.ClientSession()
-            self.should_close_session_on_tear_down = True
+        # the caller is responsible for closing the session it passes in
+        self._aiohttp_session = aiohttp_session
 
         self.engine = os.getenv("AZURE_OPENAI_TEXT_EMBEDDING_ENGINE")
         if self.engine:
@@ -41,16 +40,47 @@ class VectorDB:
                 api_key=os.getenv("OPENAI_API_KEY"),
             )
 
+    @property
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        # the shared session outlives the vector db, so it is not closed on tear down
+        return self._aiohttp_session or AsyncRequestor().get_session()
+
+    def get_embedding_model(self, model: str = DEFAULT_OPENAI_EMBEDDING_MODEL) -> str:
+        return self.engine if self.engine else model
+
     async def create_openai_embedding(
         self, text, model=DEFAULT_OPENAI_EMBEDDING_MODEL
     ) -> List[float]:
-        params = {
-            "input": text,
-        }
+        """Embeds a query, reusing the process-wide cache of recent query embeddings."""
+        embedding_cache = EmbeddingCache()
+        cache_model = self.get_embedding_model(model)
+        embedding = embedding_cache.get(text, cache_model)
+        if embedding is None:
+            embedding = (await self.create_openai_embeddings([text], model=model))[0]
+            embedding_cache.put(text, cache_model, embedding)
+        return embedding
+
+    async def create_openai_embeddings(
+        self,
+        texts: List[str],
+        model: str = DEFAULT_OPENAI_EMBEDDING_MODEL,
+        batch_size: int = DEFAULT_EMBEDDING_BATCH_SIZE,
+    ) -> List[List[float]]:
+        """Embeds the texts in as few requests as possible, sending each distinct text once.
 
-        params["model"] = self.engine if self.engine else model
+        Returns the embeddings in the same order as the texts. Documents bypass the query
+        embedding cache.
+        """
+        model = self.get_embedding_model(model)
+        unique_texts = list(dict.fromkeys(texts))
+        embeddings: Dict[str, List[float]] = {}
+        for i in range(0, len(unique_texts), batch_size):
+            batch = unique_texts[i : i + batch_size]
+            response = await self.openai_client.embeddings.create(input=batch, model=model)
+            for data in response.data:
+                embeddings[batch[data.index]] = data.embedding
 
-        return (await self.openai_client.embeddings.create(**params)).data[0].embedding
+        return [embeddings[text] for text in texts]
 
     async def add_texts(
         self,
@@ -70,5 +100,4 @@ class VectorDB:
         raise NotImplementedError
 
     async def tear_down(self):
-        if self.should_close_session_on_tear_down:
-            await self.aiohttp_session.close()
+        pass
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from vocode import getenv
+from vocode.streaming.utils.singleton import Singleton
+
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 4096
+
+EmbeddingCacheKey = Tuple[str, str]
+
+
+def normalize_embedding_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+@dataclass
+class EmbeddingCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class EmbeddingCache(Singleton):
+    """Process-wide LRU of query embeddings, keyed by model and whitespace-normalized text.
+
+    Callers keep asking about the same handful of things, so most retrieval queries in a
+    process can skip the embeddings request entirely. Documents are not cached: a bulk
+    ingestion would only push the hot queries out. Entries are stored as float32 arrays and
+    handed out as fresh lists, so callers cannot mutate what is cached.
+
+    Set VOCODE_EMBEDDING_CACHE_MAX_ENTRIES to change the size of the cache, or 0 to disable it.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else int(
+                getenv("VOCODE_EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES)
+            )
+        )
+        self.stats = EmbeddingCacheStats()
+        self.entries: "OrderedDict[EmbeddingCacheKey, np.ndarray]" = OrderedDict()
+
+    @staticmethod
+    def get_key(text: str, model: str) -> EmbeddingCacheKey:
+        return model, normalize_embedding_text(text)
+
+    def get(self, text: str, model: str) -> Optional[List[float]]:
+        key = self.get_key(text, model)
+        embedding = self.entries.get(key)
+        if embedding is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return embedding.tolist()
+
+    def put(self, text: str, model: str, embedding: Sequence[float]):
+        if self.max_entries <= 0:
+            return
+        key = self.get_key(text, model)
+        self.entries.pop(key, None)
+        self.entries[key] = np.array(embedding, dtype=np.float32)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
@@ -2,10 +2,11 @@ from typing import TYPE_CHECKING, Optional
 
 import aiohttp
 
-from vocode.streaming.models.vector_db import PineconeConfig, VectorDBConfig
+from vocode.streaming.models.vector_db import LocalVectorDBConfig, PineconeConfig, VectorDBConfig
 from vocode.streaming.vector_db.base_vector_db import VectorDB
 
 if TYPE_CHECKING:
+    from vocode.streaming.vector_db.local import LocalVectorDB
     from vocode.streaming.vector_db.pinecone import PineconeDB
 
 
@@ -17,6 +18,8 @@ class VectorDBFactory:
     ) -> VectorDB:
         if isinstance(vector_db_config, PineconeConfig):
             return self._get_pinecone_db(vector_db_config, aiohttp_session)
+        if isinstance(vector_db_config, LocalVectorDBConfig):
+            return self._get_local_vector_db(vector_db_config, aiohttp_session)
         raise Exception("Invalid vector db config", vector_db_config.type)
 
     def _get_pinecone_db(
@@ -30,3 +33,17 @@ class VectorDBFactory:
             raise ImportError(
                 f"Missing required dependancies for VectorDB {vector_db_config.type}"
             ) from e
+
+    def _get_local_vector_db(
+        self,
+        vector_db_config: LocalVectorDBConfig,
+        aiohttp_session: Optional[aiohttp.ClientSession],
+    ) -> "LocalVectorDB":
+        try:
+            from vocode.streaming.vector_db.local import LocalVectorDB
+
+            return LocalVectorDB(vector_db_config, aiohttp_session=aiohttp_session)
+        except ImportError as e:
+            raise ImportError(
+                f"Missing required dependancies for VectorDB {vector_db_config.type}"
+            ) from e
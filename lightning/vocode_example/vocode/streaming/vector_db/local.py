@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from vocode.streaming.models.vector_db import LocalVectorDBConfig
+from vocode.streaming.utils.blocking_io import BlockingIOExecutor
+from vocode.streaming.vector_db.base_vector_db import VectorDB
+
+EMBEDDINGS_FILENAME = "embeddings.npy"
+DOCUMENTS_FILENAME = "documents.json"
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    for operator, operand in condition.items():
+        if operator == "$eq" and value != operand:
+            return False
+        if operator == "$ne" and value == operand:
+            return False
+        if operator == "$in" and value not in operand:
+            return False
+        if operator == "$nin" and value in operand:
+            return False
+        if operator not in ("$eq", "$ne", "$in", "$nin"):
+            raise ValueError(f"Unsupported filter operator: {operator}")
+    return True
+
+
+def matches_filter(metadata: dict, filter: dict) -> bool:
+    """Supports the equality subset of Pinecone's metadata filters: values, $eq, $ne, $in, $nin."""
+    return all(
+        _matches_condition(metadata.get(key), condition) for key, condition in filter.items()
+    )
+
+
+class LocalVectorDB(VectorDB):
+    """Exact nearest neighbours over a NumPy matrix of unit-length embeddings, for knowledge
+    bases small enough to live in the process. A query is a single matrix-vector product, so
+    there is no network round trip on top of the embeddings request.
+
+    With `storage_path` set, the index is saved there on every `add_texts` and memory-mapped
+    when loaded, so processes serving the same knowledge base share its pages.
+    """
+
+    def __init__(self, config: LocalVectorDBConfig, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.config = config
+        self._text_key = "text"
+        self.embeddings: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        self.ids: List[str] = []
+        self.namespaces: List[str] = []
+        self.metadatas: List[dict] = []
+        self.namespace_rows: Dict[str, np.ndarray] = {}
+        self.save_lock = asyncio.Lock()
+        if self.config.storage_path is not None:
+            self._load(self.config.storage_path)
+
+    def _load(self, storage_path: str):
+        embeddings_path = os.path.join(storage_path, EMBEDDINGS_FILENAME)
+        documents_path = os.path.join(storage_path, DOCUMENTS_FILENAME)
+        if not os.path.exists(embeddings_path) or not os.path.exists(documents_path):
+            return
+        with open(documents_path) as f:
+            documents = json.load(f)
+        self.embeddings = np.load(embeddings_path, mmap_mode="r")
+        self.ids = [document["id"] for document in documents]
+        self.namespaces = [document["namespace"] for document in documents]
+        self.metadatas = [document["metadata"] for document in documents]
+        self._index_namespaces()
+
+    @staticmethod
+    def _save(storage_path: str, embeddings: np.ndarray, documents: List[dict]) -> np.ndarray:
+        os.makedirs(storage_path, exist_ok=True)
+        embeddings_path = os.path.join(storage_path, EMBEDDINGS_FILENAME)
+        documents_path = os.path.join(storage_path, DOCUMENTS_FILENAME)
+        tmp_suffix = f".{os.getpid()}.tmp"
+        # np.save appends .npy to paths that do not end with it
+        with open(embeddings_path + tmp_suffix, "wb") as f:
+            np.save(f, embeddings)
+        with open(documents_path + tmp_suffix, "w") as f:
+            json.dump(documents, f)
+        os.replace(embeddings_path + tmp_suffix, embeddings_path)
+        os.replace(documents_path + tmp_suffix, documents_path)
+        return np.load(embeddings_path, mmap_mode="r")
+
+    async def _persist(self, storage_path: str):
+        async with self.save_lock:
+            embeddings = self.embeddings
+            documents = [
+                {"id": id, "namespace": namespace, "metadata": metadata}
+                for id, namespace, metadata in zip(self.ids, self.namespaces, self.metadatas)
+            ]
+            saved_embeddings = await BlockingIOExecutor().run(
+                self._save, storage_path, embeddings, documents
+            )
+            # swap the in-memory copy for the mapped file, unless texts were added meanwhile
+            if self.embeddings is embeddings:
+                self.embeddings = saved_embeddings
+
+    def _index_namespaces(self):
+        rows: Dict[str, List[int]] = {}
+        for row, namespace in enumerate(self.namespaces):
+            rows.setdefault(namespace, []).append(row)
+        self.namespace_rows = {
+            namespace: np.asarray(namespace_rows, dtype=np.intp)
+            for namespace, namespace_rows in rows.items()
+        }
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    async def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[str]:
+        """Embeds the texts and adds them to the index, replacing documents with the same ids.
+
+        Args:
+            texts: Iterable of strings to add to the index.
+            metadatas: Optional list of metadatas associated with the texts.
+            ids: Optional list of ids to associate with the texts.
+            namespace: Optional namespace to add the texts to.
+
+        Returns:
+            List of ids from adding the texts into the index.
+        """
+        if namespace is None:
+            namespace = ""
+        texts = list(texts)
+        if not texts:
+            return []
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        new_embeddings = self._normalize(
+            np.asarray(await self.create_openai_embeddings(texts), dtype=np.float32)
+        )
+        if len(self.ids) and new_embeddings.shape[1] != self.embeddings.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {new_embeddings.shape[1]} does not match "
+                f"the index dimension {self.embeddings.shape[1]}"
+            )
+        new_metadatas = []
+        for i, text in enumerate(texts):
+            metadata = dict(metadatas[i]) if metadatas else {}
+            metadata[self._text_key] = text
+            new_metadatas.append(metadata)
+
+        replaced_ids = set(ids)
+        kept_rows = [row for row, id in enumerate(self.ids) if id not in replaced_ids]
+        if len(kept_rows) == len(self.ids):
+            kept_embeddings = self.embeddings
+        else:
+            kept_embeddings = self.embeddings[kept_rows]
+        self.embeddings = (
+            np.concatenate([kept_embeddings, new_embeddings]) if len(kept_rows) else new_embeddings
+        )
+        self.ids = [self.ids[row] for row in kept_rows] + ids
+        self.namespaces = [self.namespaces[row] for row in kept_rows] + [namespace] * len(texts)
+        self.metadatas = [self.metadatas[row] for row in kept_rows] + new_metadatas
+        self._index_namespaces()
+
+        if self.config.storage_path is not None:
+            await self._persist(self.config.storage_path)
+        return ids
+
+    def search_by_embedding(
+        self,
+        embedding: List[float],
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        if namespace is None:
+            namespace = ""
+        rows = self.namespace_rows.get(namespace)
+        if rows is None:
+            return []
+        if filter:
+            rows = rows[[matches_filter(self.metadatas[row], filter) for row in rows.tolist()]]
+        if not len(rows):
+            return []
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+        if len(rows) == len(self.ids):
+            scores = self.embeddings @ query
+        else:
+            scores = self.embeddings[rows] @ query
+        top_k = min(self.config.top_k, len(scores))
+        top = np.argpartition(scores, -top_k)[-top_k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        docs = []
+        for i in top.tolist():
+            metadata = dict(self.metadatas[rows[i]])
+            text = metadata.pop(self._text_key)
+            docs.append((Document(page_content=text, metadata=metadata), float(scores[i])))
+        return docs
+
+    async def similarity_search_with_score(
+        self,
+        query: str,
+        filter: Optional[dict] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """Return the documents most similar to query, along with their cosine similarity.
+
+        Args:
+            query: Text to look up documents similar to.
+            filter: Dictionary of argument(s) to filter on metadata
+            namespace: Namespace to search in. Default will search in '' namespace.
+
+        Returns:
+            List of Documents most similar to the query and score for each
+        """
+        return self.search_by_embedding(
+            await self.create_openai_embedding(query), filter=filter, namespace=namespace
+        )
@@ -50,9 +50,10 @@ class PineconeDB(VectorDB):
             namespace = ""
         # Embed and create the documents
         docs = []
+        texts = list(texts)
         ids = ids or [str(uuid.uuid4()) for _ in texts]
-        for i, text in enumerate(texts):
-            embedding = await self.create_openai_embedding(text)
+        embeddings = await self.create_openai_embeddings(texts)
+        for i, (text, embedding) in enumerate(zip(texts, embeddings)):
             metadata = metadatas[i] if metadatas else {}
             metadata[self._text_key] = text
             docs.append({"id": ids[i], "values": embedding, "metadata": metadata})
@@ -5,28 +5,63 @@ from typing import Tuple
 import numpy as np
 from pydub import AudioSegment
 
+WHISPER_SAMPLING_RATE = 16000
+# whisper.cpp rejects anything shorter
+MIN_TRANSCRIBE_SAMPLES = WHISPER_SAMPLING_RATE // 10
+
 
 def transcribe(whisper, params, ctx, audio_segment: AudioSegment) -> Tuple[str, float]:
     if len(audio_segment) <= 100:
         return "", 0.0
     normalized = (
-        np.frombuffer(audio_segment.set_frame_rate(16000).raw_data, dtype=np.int16).astype(
-            "float32"
-        )
+        np.frombuffer(
+            audio_segment.set_frame_rate(WHISPER_SAMPLING_RATE).raw_data, dtype=np.int16
+        ).astype("float32")
         / 32768.0
     )
-
-    result = whisper.whisper_full(
-        ctypes.c_void_p(ctx),
+    return transcribe_samples(
+        whisper,
         params,
+        ctx,
         normalized.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
         len(normalized),
     )
+
+
+def transcribe_samples(
+    whisper, params, ctx, samples: "ctypes._Pointer[ctypes.c_float]", num_samples: int
+) -> Tuple[str, float]:
+    """Transcribes `num_samples` 16kHz float samples, in [-1, 1], that `samples` points to."""
+    if num_samples <= MIN_TRANSCRIBE_SAMPLES:
+        return "", 0.0
+    result = whisper.whisper_full(ctypes.c_void_p(ctx), params, samples, num_samples)
     if result != 0:
         print("Error: {}".format(result))
         exit(1)
-    text: str = whisper.whisper_full_get_segment_text(ctypes.c_void_p(ctx), 0).decode("utf-8")
+    text = "".join(
+        whisper.whisper_full_get_segment_text(ctypes.c_void_p(ctx), i).decode("utf-8")
+        for i in range(whisper.whisper_full_n_segments(ctypes.c_void_p(ctx)))
+    )
     # heuristic to filter out non-speech
     if not re.search(r"^\w.*", text.strip()):
         return "", 0.0
     return text, 1.0
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w]", "", word).lower()
+
+
+def merge_overlapping_text(previous_text: str, text: str) -> str:
+    """Joins the transcriptions of two windows that overlap in time, dropping the words at the
+    start of `text` that repeat the end of `previous_text`."""
+    previous_words = previous_text.split()
+    words = text.split()
+    normalized_previous_words = [_normalize_word(word) for word in previous_words]
+    normalized_words = [_normalize_word(word) for word in words]
+    overlap = 0
+    for size in range(min(len(previous_words), len(words)), 0, -1):
+        if normalized_previous_words[-size:] == normalized_words[:size]:
+            overlap = size
+            break
+    return " ".join(previous_words + words[overlap:])
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Load test for plivo_app.py: runs the app in one worker against the local fake TTS server
+(lightning_v2/http_streaming/fake_sse_server.py) and connects N simulated Plivo calls at once.
+
+Each simulated call plays the audio it receives like a phone would, and reports:
+  - first audio: from the stream's `start` event to the first audio
+  - extra silence: how long the caller heard nothing, beyond the pauses between segments
+    (anything above zero means the worker could not keep up)
+  - max ahead: how far ahead of playback the app sent audio
+
+    python load_test.py --calls 1 10 50 100
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from typing import Dict, List
+
+import uvicorn
+import websockets
+
+# the fake server lives next to the SSE client, in lightning_v2
+sys.path.append(
+    os.path.join(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        ),
+        "lightning_v2",
+        "http_streaming",
+    )
+)
+from fake_sse_server import FakeLightningSSEServer  # noqa: E402
+
+SAMPLE_WIDTH = 2
+
+
+async def simulate_call(url: str) -> Dict[str, float]:
+    async with websockets.connect(url, max_size=None) as websocket:
+        start = time.perf_counter()
+        await websocket.send(
+            json.dumps({"event": "start", "start": {"streamId": str(uuid.uuid4())}})
+        )
+        first_audio = None
+        # the time at which the caller will have heard everything received so far
+        played_until = start
+        silence = 0.0
+        max_ahead = 0.0
+        audio_seconds = 0.0
+        async for message in websocket:
+            now = time.perf_counter()
+            data = json.loads(message)
+            if data["event"] != "playAudio":
+                continue
+            media = data["media"]
+            duration = (
+                len(base64.b64decode(media["payload"])) / SAMPLE_WIDTH / media["sampleRate"]
+            )
+            if first_audio is None:
+                first_audio = now - start
+            elif now > played_until:
+                silence += now - played_until
+            played_until = max(played_until, now) + duration
+            max_ahead = max(max_ahead, played_until - now - duration)
+            audio_seconds += duration
+    assert first_audio is not None
+    return {
+        "first_audio": first_audio,
+        "silence": silence,
+        "max_ahead": max_ahead,
+        "audio_seconds": audio_seconds,
+    }
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(calls: int, results: List[Dict[str, float]], expected_pauses: float, elapsed: float):
+    first_audio_ms = [result["first_audio"] * 1000 for result in results]
+    extra_silence_ms = [
+        max(0.0, result["silence"] - expected_pauses) * 1000 for result in results
+    ]
+    max_ahead_ms = max(result["max_ahead"] for result in results) * 1000
+    print(
+        f"{calls:>5} calls   first audio p50 {statistics.median(first_audio_ms):7.1f} ms   "
+        f"p95 {percentile(first_audio_ms, 0.95):7.1f} ms   "
+        f"extra silence p95 {percentile(extra_silence_ms, 0.95):7.1f} ms   "
+        f"max ahead {max_ahead_ms:5.0f} ms   wall {elapsed:5.1f} s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--first-chunk-delay-ms", type=float, default=200)
+    parser.add_argument("--chunks-per-segment", type=int, default=20)
+    args = parser.parse_args()
+
+    tts_server = FakeLightningSSEServer(
+        first_chunk_delay_ms=args.first_chunk_delay_ms,
+        chunks_per_request=args.chunks_per_segment,
+    )
+    await tts_server.start()
+    os.environ["SMALLEST_BASE_URL"] = tts_server.base_url
+    import plivo_app
+
+    server = uvicorn.Server(
+        uvicorn.Config(plivo_app.app, host="127.0.0.1", port=0, log_level="warning")
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    url = f"ws://127.0.0.1:{port}/connect_call"
+
+    segments = len(plivo_app.payloads)
+    expected_pauses = (segments - 1) * plivo_app.PAUSE_BETWEEN_SEGMENTS_SECONDS
+    print(
+        f"{segments} segments of {args.chunks_per_segment * 0.1:.1f} s per call, first audio of "
+        f"each after {args.first_chunk_delay_ms:.0f} ms, one worker"
+    )
+    for calls in args.calls:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(simulate_call(url) for _ in range(calls)))
+        report(calls, results, expected_pauses, time.perf_counter() - start)
+
+    server.should_exit = True
+    await server_task
+    await tts_server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,36 +1,55 @@
 # FastAPI-based IVR application
 import asyncio
 import base64
-import io
 import json
+import logging
 import os
-import time
+import sys
 import traceback
 import urllib.parse
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
-import requests
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from jinja2 import Environment, FileSystemLoader
-from pydub import AudioSegment
+
+# the client for both the lightning-v2 and lightning-large streams lives in lightning_v2
+sys.path.append(
+    os.path.join(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        ),
+        "lightning_v2",
+        "http_streaming",
+    )
+)
+from sse_client import BASE_URL, LightningSSEClient, TTSRequestError, TTSStream  # noqa: E402
 
 xml_path = "../templates"  # Update with the correct path to XML templates
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 PLIVO_NGROK_URL = os.environ.get("NGROK_URL")
 
 # Set up Jinja2 template environment
 DEFAULT_TEMPLATE_ENVIRONMENT = Environment(loader=FileSystemLoader(xml_path))
 
-# Initialize FastAPI app
-app = FastAPI()
-timeout = 1  # Timeout for receiving messages in seconds
-
 # API authentication token
 TOKEN = os.environ.get("SMALLEST_API_KEY")
-EXTRA_HEADERS = {"origin": "https://smallest.ai"}
-url = "https://waves-api.smallest.ai/api/v1/lightning-large/stream"
+# point this at a local stand-in, e.g. for load_test.py
+SMALLEST_BASE_URL = os.environ.get("SMALLEST_BASE_URL", BASE_URL)
+
+SAMPLE_WIDTH = 2
+# audio is sent at most this far ahead of what the caller has heard, so Plivo's buffer never
+# runs dry but a hang-up doesn't leave seconds of audio queued
+SEND_AHEAD_SECONDS = 0.3
+# silence between two segments of the script
+PAUSE_BETWEEN_SEGMENTS_SECONDS = 0.5
+# enough decoded chunks to hold a whole prefetched segment
+MAX_BUFFERED_CHUNKS = 1024
 
 # Example payload for speech synthesis
 with open("script.json", "r") as script_file:
@@ -38,39 +57,116 @@ with open("script.json", "r") as script_file:
 
 payloads = [segment for segment in script_data["episode"]]
 
-headers = {"Authorization": f"Bearer {TOKEN}", "Content-Type": "application/json"}
+# one HTTP session per worker, shared by every call, so requests reuse warm connections
+tts_client = LightningSSEClient(
+    api_key=TOKEN or "",
+    model="lightning-large",
+    base_url=SMALLEST_BASE_URL,
+    max_buffered_chunks=MAX_BUFFERED_CHUNKS,
+)
 
 
-# Function to encode audio as WAV format
-def encode_audio_common_wav(frame_input, sample_rate=8000, sample_width=2, channels=1):
-    """Ensure the WAV file is encoded with standard settings"""
-    audio = AudioSegment(
-        data=frame_input,
-        sample_width=sample_width,
-        frame_rate=sample_rate,
-        channels=channels,
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await tts_client.start()
+    yield
+    await tts_client.close()
+
+
+# Initialize FastAPI app
+app = FastAPI(lifespan=lifespan)
+
+
+class AudioPacer:
+    """
+    Paces audio to real time from the number of samples sent rather than a fixed sleep per
+    chunk, so varying chunk sizes and network jitter don't make playback drift or stutter.
+    """
+
+    def __init__(self, sample_rate: int, send_ahead_seconds: float = SEND_AHEAD_SECONDS):
+        self.sample_rate = sample_rate
+        self.send_ahead_seconds = send_ahead_seconds
+        self.start_time: Optional[float] = None
+        self.samples_sent = 0
+
+    @property
+    def seconds_sent(self) -> float:
+        return self.samples_sent / self.sample_rate
+
+    async def wait(self):
+        """Waits until the next chunk is due."""
+        now = asyncio.get_running_loop().time()
+        if self.start_time is None:
+            self.start_time = now
+        elif now > self.start_time + self.seconds_sent:
+            # synthesis fell behind and playback ran dry, so restart the clock from here
+            self.start_time = now - self.seconds_sent
+        delay = self.start_time + self.seconds_sent - self.send_ahead_seconds - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def sent(self, chunk: bytes):
+        self.samples_sent += len(chunk) // SAMPLE_WIDTH
+
+    async def wait_until_played(self):
+        if self.start_time is None:
+            return
+        now = asyncio.get_running_loop().time()
+        await asyncio.sleep(max(0.0, self.start_time + self.seconds_sent - now))
+
+
+def play_audio_message(chunk: bytes, sample_rate: int) -> str:
+    return json.dumps(
+        {
+            "event": "playAudio",
+            "media": {
+                "payload": base64.b64encode(chunk).decode("utf-8"),
+                "sampleRate": sample_rate,
+                "contentType": "audio/x-l16",
+            },
+        }
     )
-    wav_buf = io.BytesIO()
-    audio.export(wav_buf, format="wav")
-    wav_buf.seek(0)
-    return wav_buf.read()
 
 
-# Function to stream audio content asynchronously
-async def waves_streaming(content, chunk_size=640):
-    """Stream content in small chunks for Plivo streaming."""
+async def play_segment(ws: WebSocket, stream: TTSStream, sample_rate: int):
+    pacer = AudioPacer(sample_rate)
+    async for chunk in stream:
+        await pacer.wait()
+        await ws.send_text(play_audio_message(chunk, sample_rate))
+        pacer.sent(chunk)
+    if stream.ttfb_ms is None:
+        logger.warning("Segment finished without any audio")
+    else:
+        logger.info(
+            f"Segment played: first audio after {stream.ttfb_ms:.2f} ms, "
+            f"{stream.chunks_received} chunks, {stream.audio_seconds:.2f} s of audio"
+        )
+    await pacer.wait_until_played()
+
+
+async def play_script(ws: WebSocket, segments: List[dict]):
+    """Plays the segments in order, synthesizing each next one while the current one plays."""
+    streams = [await tts_client.synthesize(**segments[0])]
     try:
-        buffer = io.BytesIO(content)
-        while True:
-            chunk = buffer.read(chunk_size)
-            if not chunk:
-                break
-            await asyncio.sleep(0.012)
-            yield chunk
-    except Exception as e:
-        print(f"Exception occurred: {e}")
-        traceback.print_exc()
-        raise
+        for i, segment in enumerate(segments):
+            if i + 1 < len(segments):
+                streams.append(await tts_client.synthesize(**segments[i + 1]))
+            try:
+                await play_segment(ws, streams[i], segment["sample_rate"])
+            except TTSRequestError as e:
+                logger.error(f"Error in audio streaming: {e}")
+            if i + 1 < len(segments):
+                await asyncio.sleep(PAUSE_BETWEEN_SEGMENTS_SECONDS)
+    finally:
+        # stops a prefetched segment when the caller hangs up
+        await asyncio.gather(*(stream.aclose() for stream in streams))
+
+
+async def receive_until_stop(ws: WebSocket):
+    while True:
+        data = json.loads(await ws.receive_text())
+        if data["event"] == "stop":
+            return
 
 
 # Render XML templates
@@ -105,62 +201,33 @@ async def webhook(request: Request):
 @app.websocket("/connect_call")
 async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
+    tasks: List[asyncio.Task] = []
     try:
-        while True:
-            for payload in payloads:
-                print(payload)
-                data = json.loads(await ws.receive_text())
-                if data["event"] == "start":
-                    stream_id = data["start"]["streamId"]
-
-                try:
-                    start = time.time()
-                    http_response = requests.post(url, json=payload, headers=headers, stream=True)
-                    print(f"TTFB: {1000 * (time.time() - start):.2f} ms")
-                    http_response.raise_for_status()
-                    
-                    audio_chunks = []
-                    for line in http_response.iter_lines():
-                        try:
-                            chunk = line.decode('utf-8')
-                            if chunk.startswith("data: "):
-                                data = json.loads(chunk[6:])
-                                if "audio" in data:
-                                    audio_data = base64.b64decode(data["audio"])
-                                    audio_chunks.append(audio_data)
-                                    
-                                    # Send audio data over WebSocket
-                                    await ws.send_text(
-                                        json.dumps(
-                                            {
-                                                "event": "playAudio",
-                                                "media": {
-                                                    "payload": base64.b64encode(audio_data).decode("utf-8"),
-                                                    "sampleRate": 8000,
-                                                    "contentType": "audio/x-l16",
-                                                },
-                                            }
-                                        )
-                                    )
-                        except json.JSONDecodeError as je:
-                            print(f"JSON Decode Error: {je}")
-                        except Exception as e:
-                            print(f"Error processing chunk: {e}")
-                    
-                    print(f"Total audio chunks: {len(audio_chunks)}")
-                    print(f"Total audio size: {sum(len(chunk) for chunk in audio_chunks)} bytes")
-                except Exception as e:
-                    print(f"Error in audio streaming: {e}")
-
-                time.sleep(5)  # simulate gap between two payloads.
-            break
+        while json.loads(await ws.receive_text())["event"] != "start":
+            pass
+        # the caller's media keeps arriving while the script plays, reading it concurrently
+        # notices a hang-up right away
+        tasks = [
+            asyncio.create_task(play_script(ws, payloads)),
+            asyncio.create_task(receive_until_stop(ws)),
+        ]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+        if tasks[0] in done:
+            await ws.close()
     except WebSocketDisconnect:
-        print("WebSocket disconnected")
+        logger.info("WebSocket disconnected")
     except Exception as e:
-        print(f"Exception in WebSocket handler: {e}")
+        logger.error(f"Exception in WebSocket handler: {e}")
         traceback.print_exc()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # Run FastAPI application
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT")))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compares the blocking `requests` loop that http_streaming_api.py used to run against
+LightningSSEClient, both writing the audio to a WAV file, against the local fake server.
+
+For each it reports the TTFB measured at the response headers (what the old script printed),
+the time to the first audio, the total time, the real-time factor and the peak memory
+allocated while handling an utterance.
+
+    python benchmark_sse_client.py --utterances 20
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+import requests
+from pydub import AudioSegment
+
+from fake_sse_server import FakeLightningSSEServer
+from sse_client import LightningSSEClient, write_wav
+
+PAYLOAD = {"text": "Utterance for the benchmark.", "voice_id": "fake", "sample_rate": 24000}
+
+
+def blocking_requests_stream(url: str, path: str) -> Dict[str, float]:
+    """How http_streaming_api.py streamed before, with the time to first audio recorded too."""
+    start = time.perf_counter()
+    response = requests.post(url, json=PAYLOAD, stream=True)
+    headers_ms = (time.perf_counter() - start) * 1000
+    ttfb_ms = None
+    with open(path, "wb") as f:
+        audio_chunks = []
+        wav_buffer = io.BytesIO()
+        AudioSegment(data=b"", sample_width=2, frame_rate=24000, channels=1).export(
+            wav_buffer, format="wav"
+        )
+        f.write(wav_buffer.getvalue())
+        for line in response.iter_lines():
+            chunk = line.decode("utf-8")
+            if chunk.startswith("data: "):
+                data = json.loads(chunk[6:])
+                if "audio" in data:
+                    audio_data = base64.b64decode(data["audio"])
+                    if ttfb_ms is None:
+                        ttfb_ms = (time.perf_counter() - start) * 1000
+                    audio_chunks.append(audio_data)
+                    f.write(audio_data)
+    total_ms = (time.perf_counter() - start) * 1000
+    audio_seconds = sum(len(chunk) for chunk in audio_chunks) / 2 / 24000
+    assert ttfb_ms is not None
+    return {
+        "headers_ms": headers_ms,
+        "ttfb_ms": ttfb_ms,
+        "total_ms": total_ms,
+        "real_time_factor": total_ms / 1000 / audio_seconds,
+    }
+
+
+async def sse_client_stream(client: LightningSSEClient, path: str) -> Dict[str, float]:
+    stream = await client.synthesize(**PAYLOAD)
+    await write_wav(stream, path)
+    assert stream.headers_ms is not None and stream.ttfb_ms is not None
+    assert stream.total_ms is not None and stream.real_time_factor is not None
+    return {
+        "headers_ms": stream.headers_ms,
+        "ttfb_ms": stream.ttfb_ms,
+        "total_ms": stream.total_ms,
+        "real_time_factor": stream.real_time_factor,
+    }
+
+
+async def measure(run_utterance, utterances: int) -> List[Dict[str, float]]:
+    results = []
+    for _ in range(utterances):
+        tracemalloc.start()
+        result = await run_utterance()
+        result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+        results.append(result)
+    return results
+
+
+def report(name: str, results: List[Dict[str, float]]):
+    def p50(key: str) -> float:
+        return statistics.median(result[key] for result in results)
+
+    print(
+        f"{name:<26} headers {p50('headers_ms'):6.1f} ms   first audio {p50('ttfb_ms'):6.1f} ms   "
+        f"total {p50('total_ms'):7.1f} ms   RTF {p50('real_time_factor'):.3f}   "
+        f"peak {p50('peak_kib'):7.1f} KiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--utterances", type=int, default=20)
+    parser.add_argument("--first-chunk-delay-ms", type=float, default=200)
+    parser.add_argument("--chunks", type=int, default=20)
+    args = parser.parse_args()
+
+    server = FakeLightningSSEServer(
+        first_chunk_delay_ms=args.first_chunk_delay_ms, chunks_per_request=args.chunks
+    )
+    await server.start()
+    url = f"{server.base_url}/lightning-v2/stream"
+    path = os.path.join(tempfile.mkdtemp(), "output.wav")
+    print(
+        f"{args.utterances} utterances of {args.chunks} x 100 ms chunks, first audio after "
+        f"{args.first_chunk_delay_ms:.0f} ms (p50)"
+    )
+
+    results = await measure(
+        lambda: asyncio.to_thread(blocking_requests_stream, url, path), args.utterances
+    )
+    report("requests + iter_lines", results)
+
+    async with LightningSSEClient(api_key="fake", base_url=server.base_url) as client:
+        results = await measure(lambda: sse_client_stream(client, path), args.utterances)
+    report("LightningSSEClient", results)
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
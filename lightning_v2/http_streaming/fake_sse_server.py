@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the Lightning HTTP streaming endpoints (`/lightning-v2/stream` and
+`/lightning-large/stream`).
+
+Answers every request with its response headers right away, then after a configurable delay
+with server-sent events carrying base64 PCM in an `audio` field, paced like a real
+synthesis. Because the headers come well before the first audio, it shows the difference
+between measuring TTFB at the headers and at the first audio.
+
+    python fake_sse_server.py --port 8766
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import struct
+
+from aiohttp import web
+
+
+class FakeLightningSSEServer:
+    def __init__(
+        self,
+        first_chunk_delay_ms: float = 200,
+        chunk_interval_ms: float = 20,
+        chunk_duration_ms: float = 100,
+        chunks_per_request: int = 20,
+    ):
+        self.first_chunk_delay_ms = first_chunk_delay_ms
+        self.chunk_interval_ms = chunk_interval_ms
+        self.chunk_duration_ms = chunk_duration_ms
+        self.chunks_per_request = chunks_per_request
+        self.requests_served = 0
+        self._runner = None
+
+    async def start(self, host: str = "localhost", port: int = 0) -> int:
+        app = web.Application()
+        app.router.add_post("/api/v1/{model}/stream", self._handle_request)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return self._runner.addresses[0][1]
+
+    @property
+    def base_url(self) -> str:
+        assert self._runner is not None
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}/api/v1"
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle_request(self, request: web.Request) -> web.StreamResponse:
+        payload = await request.json()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        audio = base64.b64encode(self._tone(payload.get("sample_rate", 24000))).decode("utf-8")
+        await asyncio.sleep(self.first_chunk_delay_ms / 1000)
+        try:
+            for i in range(self.chunks_per_request):
+                if i:
+                    await asyncio.sleep(self.chunk_interval_ms / 1000)
+                await response.write(f"data: {json.dumps({'audio': audio})}\n\n".encode("utf-8"))
+            await response.write_eof()
+            self.requests_served += 1
+        except ConnectionResetError:
+            # the client stopped reading early
+            pass
+        return response
+
+    def _tone(self, sample_rate: int) -> bytes:
+        num_samples = int(sample_rate * self.chunk_duration_ms / 1000)
+        return b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)))
+            for i in range(num_samples)
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--first-chunk-delay-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    server = FakeLightningSSEServer(first_chunk_delay_ms=args.first_chunk_delay_ms)
+    port = await server.start(args.host, args.port)
+    print(f"Fake Lightning SSE server listening on http://{args.host}:{port}/api/v1")
+    await asyncio.Future()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+A reusable asyncio client for Lightning HTTP streaming TTS, which answers with server-sent
+events (SSE). Works with both `/lightning-v2/stream` and `/lightning-large/stream`.
+
+The event stream is parsed incrementally from the raw bytes as they arrive, and each request
+exposes an async iterator of PCM chunks. At most `max_buffered_chunks` decoded chunks are held
+for a slow consumer; beyond that the client stops reading the response, so the server is slowed
+down by TCP flow control instead of the audio piling up in memory. The client keeps one
+`aiohttp` session, so consecutive requests reuse warm connections.
+
+    async with LightningSSEClient(api_key="...", model="lightning-v2") as client:
+        stream = await client.synthesize("Hello there!", voice_id="<VOICE>")
+        await write_wav(stream, "output.wav")
+        print(stream.ttfb_ms, stream.real_time_factor)
+"""
+import asyncio
+import binascii
+import json
+import time
+import wave
+from typing import List, Optional, Set, Union
+
+import aiohttp
+
+BASE_URL = "https://waves-api.smallest.ai/api/v1"
+MODELS = ("lightning-v2", "lightning-large")
+SAMPLE_WIDTH = 2
+
+# the data of an event, sliced out of the parser's buffer without another copy
+EventData = Union[bytes, bytearray]
+
+
+class TTSRequestError(Exception):
+    pass
+
+
+class SSEParser:
+    """
+    Splits a server-sent event stream into the data of its events, fed with raw bytes in
+    whatever pieces the network delivers. An event ends at a blank line; its `data:` lines
+    are joined with newlines, and comments and other fields are skipped.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._data_lines: List[EventData] = []
+
+    def feed(self, data: bytes) -> List[EventData]:
+        self._buffer += data
+        events: List[EventData] = []
+        start = 0
+        while True:
+            end = self._buffer.find(b"\n", start)
+            if end == -1:
+                break
+            self._handle_line(self._buffer[start:end], events)
+            start = end + 1
+        # only the incomplete last line stays buffered
+        del self._buffer[:start]
+        return events
+
+    def close(self) -> List[EventData]:
+        """Dispatches whatever is left when the stream ends without a final blank line."""
+        events: List[EventData] = []
+        if self._buffer:
+            self._handle_line(self._buffer, events)
+            self._buffer = bytearray()
+        self._handle_line(b"", events)
+        return events
+
+    def _handle_line(self, line: EventData, events: List[EventData]):
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        if not line:
+            if len(self._data_lines) == 1:
+                events.append(self._data_lines[0])
+            elif self._data_lines:
+                events.append(b"\n".join(self._data_lines))
+            self._data_lines = []
+        elif line.startswith(b"data:"):
+            start = 6 if line.startswith(b"data: ") else 5
+            self._data_lines.append(line[start:])
+
+
+class TTSStream:
+    """
+    The audio of a single request, as an async iterator of raw 16-bit mono PCM chunks.
+
+    Records when the response headers arrived (`headers_ms`), when the first audio arrived
+    (`ttfb_ms`, the latency a listener notices), and once the stream is finished, how long
+    it took against how much audio it produced (`real_time_factor`, below 1 is faster than
+    real time).
+    """
+
+    def __init__(self, sample_rate: int, max_buffered_chunks: int):
+        self.sample_rate = sample_rate
+        self.start_time = time.perf_counter()
+        self.headers_ms: Optional[float] = None
+        self.ttfb_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self.chunks_received = 0
+        self.audio_bytes = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_chunks)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.audio_bytes / SAMPLE_WIDTH / self.sample_rate
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        if self.total_ms is None or not self.audio_bytes:
+            return None
+        return self.total_ms / 1000 / self.audio_seconds
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start_time) * 1000
+
+    async def _put_audio(self, audio: bytes):
+        if self.ttfb_ms is None:
+            self.ttfb_ms = self._elapsed_ms()
+        self.chunks_received += 1
+        self.audio_bytes += len(audio)
+        # waits while the consumer is behind, which stops the response from being read
+        await self._queue.put(audio)
+
+    async def _finish(self, error: Optional[Exception] = None):
+        self.total_ms = self._elapsed_ms()
+        await self._queue.put(error)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def read_all(self) -> bytes:
+        return b"".join([chunk async for chunk in self])
+
+    async def aclose(self):
+        """Stops reading the response, for consumers that don't want the rest of the audio."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def write_wav(stream: TTSStream, path: str):
+    """
+    Writes the audio to a WAV file as it arrives. `wave` writes the header before the first
+    chunk and patches the lengths in it when the file is closed, so the audio is never held
+    in memory as a whole.
+    """
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(stream.sample_rate)
+        async for chunk in stream:
+            wav.writeframesraw(chunk)
+
+
+class LightningSSEClient:
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "lightning-v2",
+        base_url: str = BASE_URL,
+        max_buffered_chunks: int = 32,
+        read_timeout_seconds: float = 30,
+        default_params: Optional[dict] = None,
+    ):
+        if model not in MODELS:
+            raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+        self.api_key = api_key
+        self.model = model
+        self.url = f"{base_url}/{model}/stream"
+        self.max_buffered_chunks = max_buffered_chunks
+        self.read_timeout_seconds = read_timeout_seconds
+        self.default_params = default_params or {
+            "language": "en",
+            "sample_rate": 24000,
+            "speed": 1,
+            "consistency": 0.5,
+            "similarity": 0,
+            "enhancement": 1,
+        }
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._streams: Set[TTSStream] = set()
+
+    async def start(self):
+        self.session = aiohttp.ClientSession(
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            # a long utterance can take a while in total, only a stalled read is an error
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=self.read_timeout_seconds),
+        )
+
+    async def close(self):
+        await asyncio.gather(*(stream.aclose() for stream in list(self._streams)))
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "LightningSSEClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def synthesize(self, text: str, voice_id: str, **params) -> TTSStream:
+        """Sends the request and returns its audio stream, which is read in the background."""
+        if self.session is None:
+            raise RuntimeError("LightningSSEClient.start() must be called first")
+        payload = {**self.default_params, **params, "text": text, "voice_id": voice_id}
+        stream = TTSStream(payload["sample_rate"], self.max_buffered_chunks)
+        self._streams.add(stream)
+        stream._task = asyncio.create_task(self._read_response(stream, payload))
+        stream._task.add_done_callback(lambda _: self._streams.discard(stream))
+        return stream
+
+    async def _read_response(self, stream: TTSStream, payload: dict):
+        assert self.session is not None
+        try:
+            async with self.session.post(self.url, json=payload) as response:
+                stream.headers_ms = stream._elapsed_ms()
+                if response.status >= 400:
+                    raise TTSRequestError(f"{response.status}: {await response.text()}")
+                parser = SSEParser()
+                async for data in response.content.iter_any():
+                    for event in parser.feed(data):
+                        await self._handle_event(stream, event)
+                for event in parser.close():
+                    await self._handle_event(stream, event)
+        except asyncio.CancelledError:
+            raise
+        except TTSRequestError as e:
+            await stream._finish(e)
+            return
+        except Exception as e:
+            # the consumer is waiting on the stream, so every failure has to end up there
+            await stream._finish(TTSRequestError(f"request failed: {e!r}"))
+            return
+        await stream._finish()
+
+    async def _handle_event(self, stream: TTSStream, event: EventData):
+        try:
+            data = json.loads(event)
+        except ValueError:
+            # e.g. a "[DONE]" marker
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("status") == "error" or "error" in data:
+            raise TTSRequestError(data.get("message") or data.get("error") or str(data))
+        audio = data.get("audio")
+        if audio:
+            await stream._put_audio(binascii.a2b_base64(audio))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compares opening a websocket per utterance (as ws_streaming_api.py does) against reusing
+the warm connections of LightningV2WebSocketPool, against the local fake server.
+
+    python benchmark_ws_pool.py --utterances 50 --concurrency 4
+"""
+import argparse
+import asyncio
+import base64
+import json
+import statistics
+import time
+import uuid
+from typing import List
+
+import websockets
+
+from fake_tts_server import FakeLightningV2Server
+from ws_connection_pool import LightningV2WebSocketPool
+
+
+async def connection_per_utterance(url: str, text: str) -> float:
+    start = time.perf_counter()
+    ttfb_ms = None
+    async with websockets.connect(url, max_size=None) as websocket:
+        await websocket.send(json.dumps({"text": text, "request_id": str(uuid.uuid4())}))
+        async for message in websocket:
+            data = json.loads(message)
+            if data.get("data", {}).get("audio") and ttfb_ms is None:
+                base64.b64decode(data["data"]["audio"])
+                ttfb_ms = (time.perf_counter() - start) * 1000
+            if data.get("status") == "complete":
+                break
+    assert ttfb_ms is not None
+    return ttfb_ms
+
+
+async def pooled(pool: LightningV2WebSocketPool, text: str) -> float:
+    stream = await pool.synthesize(text, voice_id="fake")
+    await stream.read_all()
+    assert stream.ttfb_ms is not None
+    return stream.ttfb_ms
+
+
+async def run_concurrently(make_request, utterances: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int) -> float:
+        async with semaphore:
+            return await make_request(f"Utterance number {i}.")
+
+    return await asyncio.gather(*(bounded(i) for i in range(utterances)))
+
+
+def report(name: str, ttfbs: List[float], connections: int):
+    ttfbs = sorted(ttfbs)
+    p95 = ttfbs[min(len(ttfbs) - 1, int(len(ttfbs) * 0.95))]
+    print(
+        f"{name:<28} TTFB p50 {statistics.median(ttfbs):7.1f} ms   p95 {p95:7.1f} ms   "
+        f"connections opened: {connections}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--utterances", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--handshake-delay-ms", type=float, default=150)
+    parser.add_argument("--first-chunk-delay-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    server = FakeLightningV2Server(
+        handshake_delay_ms=args.handshake_delay_ms,
+        first_chunk_delay_ms=args.first_chunk_delay_ms,
+    )
+    port = await server.start()
+    url = f"ws://localhost:{port}"
+    print(
+        f"{args.utterances} utterances, concurrency {args.concurrency}, simulated handshake "
+        f"{args.handshake_delay_ms:.0f} ms, first chunk {args.first_chunk_delay_ms:.0f} ms"
+    )
+
+    ttfbs = await run_concurrently(
+        lambda text: connection_per_utterance(url, text), args.utterances, args.concurrency
+    )
+    report("connection per utterance", ttfbs, server.connections_accepted)
+
+    connections_before = server.connections_accepted
+    async with LightningV2WebSocketPool(
+        api_key="fake", url=url, pool_size=args.pool_size
+    ) as pool:
+        ttfbs = await run_concurrently(
+            lambda text: pooled(pool, text), args.utterances, args.concurrency
+        )
+    report("pooled, multiplexed", ttfbs, server.connections_accepted - connections_before)
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the Lightning V2 websocket streaming endpoint.
+
+Speaks the same message format as the real endpoint: every request is answered with
+base64 PCM `chunk` messages followed by a `complete` message, all tagged with the request's
+`request_id`. Requests on the same connection are served concurrently. Connection setup
+and time to first chunk are simulated with configurable delays, so TTFB and connection
+reuse can be benchmarked offline.
+
+    python fake_tts_server.py --port 8765
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import struct
+
+import websockets
+
+
+class FakeLightningV2Server:
+    def __init__(
+        self,
+        handshake_delay_ms: float = 150,
+        first_chunk_delay_ms: float = 80,
+        chunk_interval_ms: float = 10,
+        chunk_duration_ms: float = 100,
+        chunks_per_request: int = 10,
+    ):
+        self.handshake_delay_ms = handshake_delay_ms
+        self.first_chunk_delay_ms = first_chunk_delay_ms
+        self.chunk_interval_ms = chunk_interval_ms
+        self.chunk_duration_ms = chunk_duration_ms
+        self.chunks_per_request = chunks_per_request
+        self.connections_accepted = 0
+        self.requests_served = 0
+        self._server = None
+
+    async def start(self, host: str = "localhost", port: int = 0) -> int:
+        self._server = await websockets.serve(
+            self._handle_connection, host, port, process_request=self._process_request
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _process_request(self, path, request_headers):
+        # stands in for the TCP + TLS + upgrade round trips of a real connection
+        await asyncio.sleep(self.handshake_delay_ms / 1000)
+        return None
+
+    async def _handle_connection(self, websocket, path=None):
+        self.connections_accepted += 1
+        tasks = set()
+        try:
+            async for message in websocket:
+                task = asyncio.create_task(self._serve_request(websocket, json.loads(message)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _serve_request(self, websocket, request: dict):
+        request_id = request.get("request_id")
+        sample_rate = request.get("sample_rate", 24000)
+        audio = base64.b64encode(self._tone(sample_rate)).decode("utf-8")
+        await asyncio.sleep(self.first_chunk_delay_ms / 1000)
+        try:
+            for i in range(self.chunks_per_request):
+                if i:
+                    await asyncio.sleep(self.chunk_interval_ms / 1000)
+                await websocket.send(
+                    json.dumps(
+                        {"status": "chunk", "request_id": request_id, "data": {"audio": audio}}
+                    )
+                )
+            await websocket.send(json.dumps({"status": "complete", "request_id": request_id}))
+            self.requests_served += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    def _tone(self, sample_rate: int) -> bytes:
+        num_samples = int(sample_rate * self.chunk_duration_ms / 1000)
+        return b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)))
+            for i in range(num_samples)
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--handshake-delay-ms", type=float, default=150)
+    parser.add_argument("--first-chunk-delay-ms", type=float, default=80)
+    args = parser.parse_args()
+
+    server = FakeLightningV2Server(
+        handshake_delay_ms=args.handshake_delay_ms,
+        first_chunk_delay_ms=args.first_chunk_delay_ms,
+    )
+    port = await server.start(args.host, args.port)
+    print(f"Fake Lightning V2 server listening on ws://{args.host}:{port}")
+    await asyncio.Future()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+A reusable asyncio client for Lightning V2 websocket streaming TTS.
+
+Instead of opening a new websocket for every utterance, the pool keeps a few warm
+connections to the streaming endpoint and multiplexes concurrent requests over them by
+`request_id`. Each request exposes an async iterator of PCM chunks. Dropped connections
+are re-established in the background with exponential backoff.
+
+    async with LightningV2WebSocketPool(api_key="...") as pool:
+        stream = await pool.synthesize("Hello there!", voice_id="<VOICE>")
+        async for pcm_chunk in stream:
+            ...
+"""
+import asyncio
+import base64
+import json
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+WS_URL = "wss://waves-api.smallest.ai/api/v1/lightning-v2/get_speech/stream"
+
+
+class TTSRequestError(Exception):
+    pass
+
+
+class TTSStream:
+    """
+    The audio of a single request, as an async iterator of raw 16-bit PCM chunks.
+
+    Also records the time to first audio chunk (`ttfb_ms`) and whether the request was
+    sent over a connection that had already been used (`connection_reused`).
+    """
+
+    def __init__(self, request_id: str, connection_reused: bool):
+        self.request_id = request_id
+        self.connection_reused = connection_reused
+        self.start_time = time.perf_counter()
+        self.ttfb_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def _put_audio(self, audio: bytes):
+        if self.ttfb_ms is None:
+            self.ttfb_ms = (time.perf_counter() - self.start_time) * 1000
+        self._queue.put_nowait(audio)
+
+    def _finish(self, error: Optional[Exception] = None):
+        self.total_ms = (time.perf_counter() - self.start_time) * 1000
+        self._queue.put_nowait(error)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def read_all(self) -> bytes:
+        return b"".join([chunk async for chunk in self])
+
+
+class _PooledConnection:
+    """One websocket to the streaming endpoint, reconnected with backoff when it drops."""
+
+    def __init__(self, pool: "LightningV2WebSocketPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.websocket: Optional[Any] = None
+        self.connected = asyncio.Event()
+        self.streams: Dict[str, TTSStream] = {}
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.streams)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self.websocket is not None:
+            await self.websocket.close()
+        self._fail_streams(TTSRequestError("connection pool closed"))
+
+    async def send(self, stream: TTSStream, payload: dict):
+        try:
+            await asyncio.wait_for(self.connected.wait(), self.pool.connection_wait_timeout_seconds)
+        except asyncio.TimeoutError:
+            stream._finish(TTSRequestError(f"connection {self.index} is not connected"))
+            return
+        assert self.websocket is not None
+        self.streams[stream.request_id] = stream
+        self.requests_sent += 1
+        try:
+            await self.websocket.send(json.dumps(payload))
+        except websockets.ConnectionClosed as e:
+            self.streams.pop(stream.request_id, None)
+            stream._finish(TTSRequestError(f"connection closed while sending request: {e}"))
+
+    async def _run(self):
+        backoff = self.pool.initial_backoff_seconds
+        while True:
+            try:
+                self.websocket = await websockets.connect(
+                    self.pool.url,
+                    extra_headers={"Authorization": f"Bearer {self.pool.api_key}"},
+                    open_timeout=self.pool.connect_timeout_seconds,
+                    # audio messages can be larger than the 1 MiB default
+                    max_size=None,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                backoff = await self._back_off(backoff, f"failed ({e})")
+                continue
+            self.connections_opened += 1
+            self.connected.set()
+            received_message = False
+            try:
+                async for message in self.websocket:
+                    if not received_message:
+                        # only a connection that works resets the backoff, so a server that
+                        # accepts connections and closes them right away isn't hammered
+                        received_message = True
+                        backoff = self.pool.initial_backoff_seconds
+                    self._handle_message(message)
+            except websockets.ConnectionClosed:
+                pass
+            finally:
+                self.connected.clear()
+                self._fail_streams(TTSRequestError("connection closed before request completed"))
+            if not received_message:
+                backoff = await self._back_off(backoff, "closed before any message")
+
+    async def _back_off(self, backoff: float, reason: str) -> float:
+        """Waits around `backoff` seconds, and returns the backoff for the next attempt."""
+        delay = backoff * random.uniform(0.5, 1.5)
+        print(f"Connection {self.index} {reason}, retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+        return min(backoff * 2, self.pool.max_backoff_seconds)
+
+    def _handle_message(self, message: str):
+        data = json.loads(message)
+        status = data.get("status") or data.get("payload", {}).get("status")
+        request_id = data.get("request_id")
+        if request_id is None and len(self.streams) > 1:
+            # there is no telling which of the requests on this connection it belongs to
+            self._fail_streams(
+                TTSRequestError(f"message without a request_id on a shared connection: {data}")
+            )
+            return
+        stream = self._find_stream(request_id)
+        if stream is None:
+            return
+        if status == "error":
+            self.streams.pop(stream.request_id, None)
+            stream._finish(TTSRequestError(data.get("message") or data.get("error") or str(data)))
+            return
+        audio_b64 = (data.get("data") or {}).get("audio")
+        if audio_b64:
+            stream._put_audio(base64.b64decode(audio_b64))
+        if status == "complete":
+            self.streams.pop(stream.request_id, None)
+            stream._finish()
+
+    def _find_stream(self, request_id: Optional[str]) -> Optional[TTSStream]:
+        if request_id is not None:
+            return self.streams.get(request_id)
+        # a message without a request id can only belong to the one request on this connection
+        return next(iter(self.streams.values()), None)
+
+    def _fail_streams(self, error: Exception):
+        streams, self.streams = self.streams, {}
+        for stream in streams.values():
+            stream._finish(error)
+
+
+class LightningV2WebSocketPool:
+    def __init__(
+        self,
+        api_key: str,
+        url: str = WS_URL,
+        pool_size: int = 2,
+        connect_timeout_seconds: float = 10,
+        # how long a request waits for its connection to be (re)established
+        connection_wait_timeout_seconds: float = 10,
+        initial_backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30,
+        default_params: Optional[dict] = None,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.pool_size = pool_size
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.connection_wait_timeout_seconds = connection_wait_timeout_seconds
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.default_params = default_params or {
+            "language": "en",
+            "sample_rate": 24000,
+            "speed": 1.0,
+            "consistency": 0.5,
+            "similarity": 0,
+            "enhancement": 1,
+        }
+        self.connections: List[_PooledConnection] = []
+
+    async def start(self, wait_until_connected: bool = True):
+        """Opens the warm connections, so the first request doesn't pay for the handshake."""
+        self.connections = [_PooledConnection(self, i) for i in range(self.pool_size)]
+        for connection in self.connections:
+            connection.start()
+        if wait_until_connected:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(c.connected.wait() for c in self.connections)),
+                    self.connection_wait_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                await self.close()
+                raise TTSRequestError(f"could not connect to {self.url}")
+
+    async def close(self):
+        await asyncio.gather(*(c.close() for c in self.connections))
+        self.connections = []
+
+    async def __aenter__(self) -> "LightningV2WebSocketPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str,
+        request_id: Optional[str] = None,
+        **params,
+    ) -> TTSStream:
+        """Sends a request on the least busy connection and returns its audio stream."""
+        if not self.connections:
+            raise RuntimeError("LightningV2WebSocketPool.start() must be called first")
+        connection = self._pick_connection()
+        stream = TTSStream(
+            request_id=request_id or str(uuid.uuid4()),
+            connection_reused=connection.requests_sent > 0,
+        )
+        payload = {
+            **self.default_params,
+            **params,
+            "text": text,
+            "voice_id": voice_id,
+            "request_id": stream.request_id,
+        }
+        await connection.send(stream, payload)
+        return stream
+
+    def _pick_connection(self) -> _PooledConnection:
+        connected = [c for c in self.connections if c.connected.is_set()]
+        return min(connected or self.connections, key=lambda c: c.in_flight)
+
+    @property
+    def connections_opened(self) -> int:
+        return sum(c.connections_opened for c in self.connections)